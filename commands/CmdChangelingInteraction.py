@@ -1,5 +1,6 @@
 from evennia.commands.default.muxcommand import MuxCommand
 from evennia.utils.utils import make_iter
+from world.wod20th.utils.occupancy import OCCUPANCY
 
 class CmdChangelingInteraction(MuxCommand):
     """
@@ -61,7 +62,7 @@ class CmdChangelingInteraction(MuxCommand):
         fae_view = f"Fae Aspect of {location.name}:\n{fae_desc}\n\n"
 
         # Add fae descriptions of characters in the room
-        characters = [obj for obj in location.contents if obj.has_account and obj != self.caller]
+        characters = [obj for obj in OCCUPANCY.occupants(location) if obj != self.caller]
         if characters:
             fae_view += "Fae Aspects of People:\n"
             for character in characters:
@@ -90,8 +91,8 @@ class CmdChangelingInteraction(MuxCommand):
             return
 
         # Get all Changelings and Kinain in the room
-        fae_perceivers = [obj for obj in self.caller.location.contents 
-                          if obj.has_account and self.is_fae_perceiver(obj)]
+        fae_perceivers = [obj for obj in OCCUPANCY.occupants(self.caller.location)
+                          if self.is_fae_perceiver(obj)]
 
         # Emit the message to all fae perceivers
         for perceiver in fae_perceivers:
@@ -107,8 +108,8 @@ class CmdChangelingInteraction(MuxCommand):
             return
 
         # Get all Changelings and Kinain in the room
-        fae_perceivers = [obj for obj in self.caller.location.contents 
-                          if obj.has_account and self.is_fae_perceiver(obj)]
+        fae_perceivers = [obj for obj in OCCUPANCY.occupants(self.caller.location)
+                          if self.is_fae_perceiver(obj)]
 
         # Pose the action to all fae perceivers
         for perceiver in fae_perceivers:
@@ -1,7 +1,8 @@
 from evennia import default_cmds
 from evennia.utils import ansi
 from commands.CmdPose import PoseBreakMixin
-import re
+from world.wod20th.utils.broadcast import broadcast, SELF, UNDERSTAND, NOT_UNDERSTAND
+from world.wod20th.utils.pose_compiler import CompiledPose
 
 class CmdEmit(PoseBreakMixin, default_cmds.MuxCommand):
     """
@@ -53,72 +54,24 @@ class CmdEmit(PoseBreakMixin, default_cmds.MuxCommand):
                 caller.msg("You need to set a speaking language first with +language <language>")
                 return
 
-        # Filter receivers based on Umbra state
-        filtered_receivers = [
-            obj for obj in caller.location.contents
-            if obj.has_account and obj.db.in_umbra == caller.db.in_umbra
-        ]
-
         # Send pose break before the message
         self.send_pose_break()
 
+        speaking_language = caller.get_speaking_language()
+        emit = CompiledPose(processed_args)
         if 'language' in self.switches:
             # The entire emit is in the set language
-            speaking_language = caller.get_speaking_language()
-            _, msg_understand, msg_not_understand, _ = caller.prepare_say(processed_args, language_only=True)
-
-            for receiver in filtered_receivers:
-                has_universal = any(
-                    merit.lower().replace(' ', '') == 'universallanguage'
-                    for category in receiver.db.stats.get('merits', {}).values()
-                    for merit in category.keys()
-                )
-                
-                if receiver == caller or has_universal or speaking_language in receiver.get_languages():
-                    receiver.msg(msg_understand)
-                else:
-                    receiver.msg(msg_not_understand)
-        else:
+            _, understood, not_understood, _ = caller.prepare_say(processed_args, language_only=True)
+        elif emit.has_speech:
             # Handle mixed language content
-            for receiver in filtered_receivers:
-                if "~" in processed_args:
-                    parts = []
-                    current_pos = 0
-                    for match in re.finditer(r'"~([^"]+)"', processed_args):
-                        # Add text before the speech
-                        parts.append(processed_args[current_pos:match.start()])
-                        
-                        # Process the speech
-                        speech = match.group(1)
-                        _, msg_understand, msg_not_understand, _ = caller.prepare_say(speech, language_only=True)
-                        
-                        # Check for Universal Language merit
-                        has_universal = any(
-                            merit.lower().replace(' ', '') == 'universallanguage'
-                            for category in receiver.db.stats.get('merits', {}).values()
-                            for merit in category.keys()
-                        )
-                        
-                        speaking_language = caller.get_speaking_language()
-                        if receiver == caller or has_universal or (speaking_language and speaking_language in receiver.get_languages()):
-                            parts.append(f'"{msg_understand}"')
-                        else:
-                            parts.append(f'"{msg_not_understand}"')
-                        
-                        current_pos = match.end()
-                    
-                    # Add any remaining text
-                    parts.append(processed_args[current_pos:])
-                    
-                    # Send the final message
-                    receiver.msg(''.join(parts))
-                else:
-                    # No language-tagged content, send as is
-                    receiver.msg(processed_args)
+            understood, not_understood = emit.render(caller)
+        else:
+            # No language-tagged content, everyone sees it as is
+            understood = not_understood = processed_args
+            speaking_language = None
+
+        broadcast(caller, {SELF: understood, UNDERSTAND: understood, NOT_UNDERSTAND: not_understood},
+                  language=speaking_language, universal=True)
 
-        # Add this at the end of the func method
-        try:
-            self.caller.record_scene_activity()
-            self.caller.msg("|wDebug: Emit triggered scene activity check.|n")
-        except Exception as e:
-            self.caller.msg(f"|rDebug Error: {str(e)}|n")
\ No newline at end of file
+        # Counts towards an IC scene if anyone else is here
+        self.caller.record_scene_activity('emit', not_understood, speaking_language, understood)
\ No newline at end of file
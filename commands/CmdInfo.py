@@ -1,10 +1,11 @@
 from evennia.commands.default.muxcommand import MuxCommand
-from world.wod20th.models import Stat, STAT_TYPES, SHIFTER_IDENTITY_STATS, SHIFTER_RENOWN, CLAN, MAGE_FACTION, MAGE_SPHERES, \
+from world.wod20th.models import STAT_TYPES, SHIFTER_IDENTITY_STATS, SHIFTER_RENOWN, CLAN, MAGE_FACTION, MAGE_SPHERES, \
     TRADITION, TRADITION_SUBFACTION, CONVENTION, METHODOLOGIES, NEPHANDI_FACTION, SEEMING, KITH, SEELIE_LEGACIES, \
     UNSEELIE_LEGACIES, ARTS, REALMS, calculate_willpower, calculate_road
 from evennia.utils.ansi import ANSIString
 from evennia.utils.evtable import EvTable
-from django.db.models import Q
+from world.wod20th.utils.stat_catalog import STAT_CATALOG
+from world.wod20th.utils.text_index import DESCRIPTION_INDEX, SearchQuery
 
 class CmdInfo(MuxCommand):
     """
@@ -13,12 +14,15 @@ class CmdInfo(MuxCommand):
     Usage:
       +info
       +info <topic>
-      +info/search <keyword>
+      +info/search <keyword>[=<page>]
       +info/type <stat_type>
       +info/shifter <shifter_type>
 
     Switches:
-      /search   - Search all abilities for a keyword
+      /search   - Search all abilities for a keyword. Names are matched
+                  first; otherwise descriptions are searched, best match
+                  first. Put phrases in "quotes" and narrow results with
+                  type:<stat_type> or splat:<splat>.
       /type     - Show all entries of a specific type (gift, discipline, etc)
       /<splat>  - View only entries matching specified splat
       /shifter  - View gifts for a specific shifter type (garou, ananasi, etc)
@@ -28,6 +32,8 @@ class CmdInfo(MuxCommand):
       +info merits       - View all merits across all splats
       +info/type gift    - View all gifts
       +info/shifter ananasi - View all Ananasi gifts
+      +info/search "silver claws" type:gift=2 - Page 2 of gifts mentioning
+                                                  'silver claws'
     """
     key = "+info"
     aliases = ["info"]
@@ -55,6 +61,7 @@ class CmdInfo(MuxCommand):
     }
     
     ignore_categories = {'other', 'specialty'}  # Categories to ignore in searches
+    search_page_size = 10
 
     def func(self):
         if not self.args and not self.switches:
@@ -64,7 +71,13 @@ class CmdInfo(MuxCommand):
         if 'search' in self.switches:
             if not self.args:
                 return self.caller.msg("Include something to search for!")
-            return self.search_all(self.args.strip())
+            search_str, page = self.args, 1
+            if '=' in self.args:
+                search_str, page_str = self.args.rsplit('=', 1)
+                if not page_str.strip().isdigit() or int(page_str) < 1:
+                    return self.caller.msg("The page must be a positive number.")
+                page = int(page_str)
+            return self.search_all(search_str.strip(), page)
             
         if 'type' in self.switches:
             if not self.args:
@@ -86,7 +99,7 @@ class CmdInfo(MuxCommand):
         elif (subject := self.match_subject(self.args.strip(), only_splat)):
             self.show_subject(subject)
         else:
-            self.caller.msg(f"No matches found for '{self.args.strip()}'.")
+            self.caller.msg(f"No matches found for '{self.args.strip()}'.{STAT_CATALOG.did_you_mean(self.args.strip())}")
 
     def format_header(self, text, width=78):
         """Format a header with consistent width."""
@@ -141,24 +154,19 @@ class CmdInfo(MuxCommand):
         if input_str_lower in ['combo', 'combo discipline', 'combodiscipline']:
             input_str_lower = 'combodiscipline'
         
-        # Build query
-        query = Q(name__iexact=input_str_lower)
-        
-        # Add splat filter if specified
-        if only_splat:
-            query &= Q(splat__iexact=only_splat)
-            
+        def in_splat(stat):
+            return not only_splat or (stat.splat or '').lower() == only_splat.lower()
+
         # Try exact match first
-        result = Stat.objects.filter(query).first()
-        if result:
-            return result
+        for stat in STAT_CATALOG.filter_name(input_str_lower):
+            if in_splat(stat):
+                return stat
             
         # Try partial match if no exact match found
-        query = Q(name__icontains=input_str_lower)
-        if only_splat:
-            query &= Q(splat__iexact=only_splat)
-            
-        return Stat.objects.filter(query).first()
+        for stat in STAT_CATALOG.contains(input_str_lower):
+            if in_splat(stat):
+                return stat
+        return None
 
     def list_categories(self):
         string = self.format_header("+Info Categories", width=78)
@@ -189,17 +197,16 @@ class CmdInfo(MuxCommand):
         stat_types, display_name = category
         string = self.format_header(f"+Info {display_name}", width=78)
         
-        # Build the base query
-        query = Q(stat_type__in=stat_types)
+        results = STAT_CATALOG.by_stat_type(*stat_types)
         
         # Apply splat filter if specified
         if only_splat:
-            query &= Q(splat__iexact=only_splat)
+            results = [r for r in results if (r.splat or '').lower() == only_splat.lower()]
             
         # Get results ordered by name
-        results = Stat.objects.filter(query).order_by('name')
+        results.sort(key=lambda r: r.name)
 
-        if not results.exists():
+        if not results:
             string += f"No {display_name.lower()} found"
             if only_splat:
                 string += f" for {only_splat}"
@@ -319,44 +326,50 @@ class CmdInfo(MuxCommand):
         string += self.format_footer(width=78)
         self.caller.msg(string)
     
-    def search_all(self, input_str):
+    def search_all(self, input_str, page=1):
         # Get all valid stat types from our DISPLAY_CATEGORIES
         valid_stat_types = []
         for stat_types in self.DISPLAY_CATEGORIES.values():
             valid_stat_types.extend(stat_types)
         
         # Remove ignored categories
-        valid_stat_types = [st for st in valid_stat_types if st not in self.ignore_categories]
+        valid_stat_types = {st for st in valid_stat_types if st not in self.ignore_categories}
 
+        query = SearchQuery(input_str)
+        if not query:
+            return self.caller.msg("Include something to search for!")
+        name_str = query.text
+
+        def in_filters(stat):
+            return (stat.stat_type in valid_stat_types
+                    and (not query.stat_type or stat.stat_type.lower() == query.stat_type)
+                    and (not query.splat or (stat.splat or '').lower() == query.splat))
         
         # First try exact name match
-        exact_matches = Stat.objects.filter(
-            name__iexact=input_str,
-            stat_type__in=valid_stat_types
-        )
+        exact_matches = [s for s in STAT_CATALOG.filter_name(name_str) if in_filters(s)]
         
-        if exact_matches.exists():
+        if exact_matches:
             if len(exact_matches) == 1:
                 return self.show_subject(exact_matches[0])
             matches = exact_matches
         else:
             # Try partial name match
-            name_matches = Stat.objects.filter(
-                name__icontains=input_str,
-                stat_type__in=valid_stat_types
-            )
+            matches = [s for s in STAT_CATALOG.contains(name_str) if in_filters(s)]
             
-            if name_matches.exists():
-                matches = name_matches
-            else:
-                # If no name matches, search by description
-                matches = Stat.objects.filter(
-                    description__icontains=input_str,
-                    stat_type__in=valid_stat_types
-                )
+            if not matches:
+                # If no name matches, search the descriptions
+                stats_by_id = {s.id: s for s in STAT_CATALOG.all()}
+                matches = [stats_by_id[stat_id] for stat_id in DESCRIPTION_INDEX.search(query, valid_stat_types)
+                           if stat_id in stats_by_id]
                 
-        if not matches.exists():
+        if not matches:
             return self.caller.msg(f"No matches found containing the text '{input_str}'.")
+
+        page_size = self.search_page_size
+        page_count = (len(matches) + page_size - 1) // page_size
+        if page > page_count:
+            return self.caller.msg(f"There are only {page_count} page(s) of results for '{input_str}'.")
+        page_matches = matches[(page - 1) * page_size:page * page_size]
             
         string = self.format_header(f"+Info Search: {input_str}", width=78)
         table = EvTable("|wName|n", "|wSplat|n", "|wType|n", "|wDescription|n", border="none")
@@ -365,7 +378,7 @@ class CmdInfo(MuxCommand):
         table.reformat_column(2, width=15, align="l")
         table.reformat_column(3, width=23, align="l")
         
-        for result in matches[:10]:
+        for result in page_matches:
             desc = result.description[:20] + "..." if result.description and len(result.description) > 20 else ""
             table.add_row(
                 result.name,
@@ -376,8 +389,8 @@ class CmdInfo(MuxCommand):
             
         string += ANSIString(table)
         matches_string = f"\r\n    Found |w{len(matches)}|n matches"
-        if len(matches) > 10:
-            matches_string += " (showing first 10)"
+        if page_count > 1:
+            matches_string += f" (page {page} of {page_count}, use +info/search {input_str}=<page>)"
         string += matches_string + "\r\n"
 
         string += self.format_footer(width=78)
@@ -393,8 +406,8 @@ class CmdInfo(MuxCommand):
             self.caller.msg(f"No stat type found matching '{stat_type}'.")
             return
             
-        results = Stat.objects.filter(stat_type__iexact=stat_type).order_by('name')
-        if not results.exists():
+        results = sorted(STAT_CATALOG.by_stat_type(stat_type), key=lambda r: r.name)
+        if not results:
             self.caller.msg(f"No entries found of type '{stat_type}'.")
             return
             
@@ -406,12 +419,12 @@ class CmdInfo(MuxCommand):
     def show_shifter_gifts(self, shifter_type):
         """Show all gifts for a specific shifter type."""
         # Get all gifts for the specified shifter type
-        results = Stat.objects.filter(
-            stat_type='gift',
-            shifter_type__iexact=shifter_type
-        ).order_by('name')
+        results = sorted(
+            (r for r in STAT_CATALOG.by_shifter_type(shifter_type) if r.stat_type == 'gift'),
+            key=lambda r: r.name
+        )
         
-        if not results.exists():
+        if not results:
             return self.caller.msg(f"No gifts found for shifter type '{shifter_type}'.")
         
         string = self.format_header(f"+Info {shifter_type.title()} Gifts", width=78)
@@ -2,6 +2,7 @@ from evennia.commands.default.muxcommand import MuxCommand
 from evennia.utils import utils
 from evennia.utils.search import search_object
 from typeclasses.characters import Character
+from world.wod20th.utils.plane_state import plane_of
 
 class CmdLook(MuxCommand):
     """
@@ -57,7 +58,7 @@ class CmdLook(MuxCommand):
             possible_chars = [obj for obj in location.contents 
                             if obj.has_account and obj.key.lower() == args.lower()]
             
-            if possible_chars and possible_chars[0].db.in_umbra != caller.db.in_umbra:
+            if possible_chars and plane_of(possible_chars[0]) != plane_of(caller):
                 caller.msg(f"Could not find '{args}'.")
             else:
                 caller.msg(f"You don't see '{args}' here.")
@@ -69,7 +70,7 @@ class CmdLook(MuxCommand):
 
         # Check if the found object is in the same Umbra state
         if hasattr(look_at_obj, 'has_account') and look_at_obj.has_account:
-            if look_at_obj.db.in_umbra != caller.db.in_umbra:
+            if plane_of(look_at_obj) != plane_of(caller):
                 caller.msg(f"Could not find '{args}'.")
                 return
 
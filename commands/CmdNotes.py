@@ -6,6 +6,7 @@ from evennia.utils.utils import crop
 from evennia.utils.ansi import ANSIString
 from world.wod20th.utils.ansi_utils import wrap_ansi
 from world.wod20th.utils.formatting import header, footer, divider, format_stat
+from world.wod20th.utils.occupancy import OCCUPANCY
 from collections import defaultdict
 from django.utils import timezone
 from evennia import logger
@@ -395,8 +396,7 @@ class CmdNotes(MuxCommand):
             self.caller.msg("You are not in any location.")
             return
         
-        characters = [obj for obj in self.caller.location.contents 
-                     if obj.has_account and obj != self.caller]
+        characters = [obj for obj in OCCUPANCY.occupants(self.caller.location) if obj != self.caller]
         
         if not characters:
             self.caller.msg("No other characters found in this location.")
@@ -1,5 +1,7 @@
 from evennia import default_cmds
-import re
+from evennia.utils.utils import make_iter
+from world.wod20th.utils.broadcast import broadcast, SELF, UNDERSTAND, NOT_UNDERSTAND
+from world.wod20th.utils.pose_compiler import CompiledPose
 
 class PoseBreakMixin:
     """
@@ -13,19 +15,10 @@ class PoseBreakMixin:
             return  # Don't send pose breaks in OOC Areas
             
         pose_break = f"\n|y{'=' * 30}> |w{caller.name}|n |y<{'=' * 30}|n"
-        
-        # Filter receivers based on Umbra state
-        filtered_receivers = [
-            obj for obj in caller.location.contents
-            if obj.has_account and obj.db.in_umbra == caller.db.in_umbra
-        ]
-        
-        for receiver in filtered_receivers:
-            if receiver != caller and (not exclude or receiver not in exclude):
-                receiver.msg(pose_break)
-        
+
         # Always send the pose break to the caller
-        caller.msg(pose_break)
+        broadcast(caller, {SELF: pose_break, UNDERSTAND: pose_break},
+                  exclude=[obj for obj in make_iter(exclude) if obj != caller] if exclude else None)
 
     def msg_contents(self, message, exclude=None, from_obj=None, **kwargs):
         """
@@ -106,53 +99,17 @@ class CmdPose(PoseBreakMixin, default_cmds.MuxCommand):
         # Get the character's speaking language
         speaking_language = caller.get_speaking_language()
 
-        # Filter receivers based on Umbra state
-        filtered_receivers = [
-            obj for obj in caller.location.contents
-            if obj.has_account and obj.db.in_umbra == caller.db.in_umbra
-        ]
-
-        # Process the pose for each receiver
-        for receiver in filtered_receivers:
-            # If there's language-tagged speech in the pose, process it
-            if "~" in processed_args:
-                parts = []
-                current_pos = 0
-                for match in re.finditer(r'"~([^"]+)"', processed_args):
-                    # Add text before the speech
-                    parts.append(processed_args[current_pos:match.start()])
-                    
-                    # Process the speech
-                    speech = match.group(1)
-                    _, msg_understand, msg_not_understand, _ = caller.prepare_say(speech, language_only=True)
-                    
-                    # Check for Universal Language merit
-                    has_universal = any(
-                        merit.lower().replace(' ', '') == 'universallanguist'
-                        for category in receiver.db.stats.get('merits', {}).values()
-                        for merit in category.keys()
-                    )
-                    
-                    if receiver == caller or has_universal or (speaking_language and speaking_language in receiver.get_languages()):
-                        parts.append(f'"{msg_understand}"')
-                    else:
-                        parts.append(f'"{msg_not_understand}"')
-                    
-                    current_pos = match.end()
-                
-                # Add any remaining text
-                parts.append(processed_args[current_pos:])
-                
-                # Construct final message
-                final_message = f"{poser_name} {''.join(parts)}"
-                receiver.msg(final_message)
-            else:
-                # No language-tagged speech, send normal pose
-                receiver.msg(f"{poser_name} {processed_args}")
-
-        # Add this at the end of the func method
-        try:
-            caller.record_scene_activity()
-            caller.msg("|wDebug: Pose triggered scene activity check.|n")
-        except Exception as e:
-            caller.msg(f"|rDebug Error: {str(e)}|n")
+        pose = CompiledPose(processed_args)
+        if pose.has_speech:
+            # Language-tagged speech: those who don't follow the language
+            # see a placeholder instead of each tagged quote
+            understood, not_understood = pose.render(caller, prefix=f"{poser_name} ")
+            broadcast(caller, {SELF: understood, UNDERSTAND: understood, NOT_UNDERSTAND: not_understood},
+                      language=speaking_language, universal=True)
+        else:
+            # No language-tagged speech, send normal pose
+            understood = not_understood = f"{poser_name} {processed_args}"
+            broadcast(caller, {SELF: understood, UNDERSTAND: understood})
+
+        # Counts towards an IC scene if anyone else is here
+        caller.record_scene_activity('pose', not_understood, speaking_language, understood)
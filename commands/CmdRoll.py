@@ -4,7 +4,7 @@ from evennia.utils import inherits_from
 from world.wod20th.models import Stat
 from world.wod20th.utils.dice_rolls import roll_dice, interpret_roll_results
 import re
-from difflib import get_close_matches
+from world.wod20th.utils.stat_catalog import STAT_CATALOG
 from datetime import datetime
 
 class CmdRoll(default_cmds.MuxCommand):
@@ -111,11 +111,11 @@ class CmdRoll(default_cmds.MuxCommand):
                 elif stat_value == 0 and full_name:
                     description.append(f"{sign} |w{full_name}|n")
                     detailed_description.append(f"{sign} |w{full_name} (0)|n")
-                    warnings.append(f"|rWarning: Stat '{full_name}' not found or has no value. Treating as 0.|n")
+                    warnings.append(f"|rWarning: Stat '{full_name}' not found or has no value. Treating as 0.{self.suggest_stat(full_name)}|n")
                 else:
                     description.append(f"{sign} |h|x{full_name}|n")
                     detailed_description.append(f"{sign} |h|x{full_name} (0)|n")
-                    warnings.append(f"|rWarning: Stat '{full_name}' not found or has no value. Treating as 0.|n")
+                    warnings.append(f"|rWarning: Stat '{full_name}' not found or has no value. Treating as 0.{self.suggest_stat(full_name)}|n")
 
         # Apply health penalties
         health_penalty = self.get_health_penalty(self.caller)
@@ -169,104 +169,20 @@ class CmdRoll(default_cmds.MuxCommand):
     def get_stat_value_and_name(self, stat_name):
         """
         Retrieve the value and full name of a stat for the character by searching the character's stats.
-        Uses fuzzy matching to handle abbreviations and partial matches.
-        Always uses 'temp' value if available, otherwise uses 'perm'.
+        Handles abbreviations and partial matches (see world.wod20th.utils.roll_index).
+        Uses the 'temp' value if the stat has one, otherwise 'perm'.
         """
         if not inherits_from(self.caller, "typeclasses.characters.Character"):
             self.caller.msg("Error: This command can only be used by characters.")
             return 0, stat_name.capitalize()
 
-        character_stats = self.caller.db.stats or {}
-        
-        # Normalize input but preserve spaces for exact matching
-        normalized_input = stat_name.lower().strip()
-        normalized_nospace = normalized_input.replace('-', '').replace(' ', '')
-
-        # Common abbreviations mapping
-        abbreviations = {
-            'str': 'strength',
-            'dex': 'dexterity',
-            'sta': 'stamina',
-            'cha': 'charisma',
-            'man': 'manipulation',
-            'app': 'appearance',
-            'per': 'perception',
-            'int': 'intelligence',
-            'wit': 'wits'
-        }
-
-        # Check if input is a common abbreviation
-        if normalized_nospace in abbreviations:
-            normalized_input = abbreviations[normalized_nospace]
-            normalized_nospace = normalized_input
-
-        print(f"DEBUG: Looking for stat: '{normalized_input}' (nospace: '{normalized_nospace}')")
-        print(f"DEBUG: Character stats structure: {character_stats.keys()}")
-        print(f"DEBUG: Secondary abilities: {character_stats.get('secondary_abilities', {})}")
-
-        # Special handling for Primal-Urge
-        if normalized_nospace in ['primalurge', 'primal']:
-            if 'abilities' in character_stats and 'talent' in character_stats['abilities']:
-                stat_data = character_stats['abilities']['talent'].get('Primal-Urge', {})
-                if stat_data:
-                    if 'temp' in stat_data and stat_data['temp'] != 0:
-                        return stat_data['temp'], 'Primal-Urge'
-                    return stat_data.get('perm', 0), 'Primal-Urge'
-            return 0, 'Primal-Urge'
-
-        # Direct check for secondary abilities first
-        if 'secondary_abilities' in character_stats:
-            for ability_type, abilities in character_stats['secondary_abilities'].items():
-                print(f"DEBUG: Checking {ability_type}: {abilities}")
-                for stat, stat_data in abilities.items():
-                    print(f"DEBUG: Comparing '{stat.lower()}' with '{normalized_input}'")
-                    if stat.lower() == normalized_input:
-                        print(f"DEBUG: Found direct match in secondary abilities: {stat} with data {stat_data}")
-                        if 'temp' in stat_data and stat_data['temp'] != 0:
-                            return stat_data['temp'], stat
-                        return stat_data.get('perm', 0), stat
-
-        # Gather all stats with their full paths
-        all_stats = []
-        
-        # Check regular stats
-        for category, cat_stats in character_stats.items():
-            if category == 'secondary_abilities':
-                continue  # Skip here, we'll handle secondary abilities separately
-            for stat_type, stats in cat_stats.items():
-                for stat, stat_data in stats.items():
-                    if stat == 'Primal-Urge':
-                        continue
-                    normalized_name = stat.lower()
-                    normalized_nospace_name = normalized_name.replace('-', '').replace(' ', '')
-                    all_stats.append((normalized_name, normalized_nospace_name, stat, category, stat_type, stat_data))
-
-        # First try exact matches with spaces
-        exact_matches = [s for s in all_stats if s[0] == normalized_input]
-        if exact_matches:
-            _, _, full_name, category, stat_type, stat_data = exact_matches[0]
-            if 'temp' in stat_data:
-                return stat_data['temp'], full_name
-            return stat_data.get('perm', 0), full_name
-
-        # Try without spaces
-        exact_matches = [s for s in all_stats if s[1] == normalized_nospace]
-        if exact_matches:
-            _, _, full_name, category, stat_type, stat_data = exact_matches[0]
-            if 'temp' in stat_data:
-                return stat_data['temp'], full_name
-            return stat_data.get('perm', 0), full_name
-
-        # If no exact match, try prefix matching
-        prefix_matches = [s for s in all_stats if s[0].startswith(normalized_input) or s[1].startswith(normalized_nospace)]
-        if prefix_matches:
-            prefix_matches.sort(key=lambda x: len(x[0]))  # Sort by length to get shortest match
-            _, _, full_name, category, stat_type, stat_data = prefix_matches[0]
-            if 'temp' in stat_data:
-                return stat_data['temp'], full_name
-            return stat_data.get('perm', 0), full_name
+        return self.caller.stats.roll_index().lookup(stat_name)
 
-        return 0, stat_name.capitalize()
+    def suggest_stat(self, name):
+        """Return a 'did you mean' hint if name isn't a known stat at all."""
+        if not name or STAT_CATALOG.get(name):
+            return ""
+        return STAT_CATALOG.did_you_mean(name)
 
     def display_roll_log(self):
         """
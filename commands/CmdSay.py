@@ -1,5 +1,6 @@
 from evennia.commands.default.muxcommand import MuxCommand
 from commands.CmdPose import PoseBreakMixin
+from world.wod20th.utils.broadcast import broadcast, SELF, UNDERSTAND, NOT_UNDERSTAND
 
 class CmdSay(PoseBreakMixin, MuxCommand):
     """
@@ -46,40 +47,9 @@ class CmdSay(PoseBreakMixin, MuxCommand):
         # Prepare the say messages
         msg_self, msg_understand, msg_not_understand, language = caller.prepare_say(speech)
 
-        # Filter receivers based on Umbra state
-        filtered_receivers = [
-            obj for obj in caller.location.contents
-            if obj.has_account and obj.db.in_umbra == caller.db.in_umbra
-        ]
+        # Staff and those with Universal Language understand every language
+        broadcast(caller, {SELF: msg_self, UNDERSTAND: msg_understand, NOT_UNDERSTAND: msg_not_understand},
+                  language=language, staff=True, universal=True)
 
-        # Send messages to receivers
-        for receiver in filtered_receivers:
-            if receiver != caller:
-                # Check for Universal Language merit
-                has_universal = any(
-                    merit.lower().replace(' ', '') == 'universallanguage'
-                    for category in receiver.db.stats.get('merits', {}).values()
-                    for merit in category.keys()
-                )
-
-                # Get the languages the receiver knows
-                receiver_languages = receiver.get_languages()
-
-                # If they have Universal Language, know the language, or it's not a language-tagged message
-                if has_universal or not language or (language and language in receiver_languages):
-                    _, msg_understand, _, _ = caller.prepare_say(speech, viewer=receiver)
-                    receiver.msg(msg_understand)
-                else:
-                    _, _, msg_not_understand, _ = caller.prepare_say(speech, viewer=receiver)
-                    receiver.msg(msg_not_understand)
-            else:
-                # The speaker always understands their own speech
-                msg_self, _, _, _ = caller.prepare_say(speech, viewer=receiver)
-                receiver.msg(msg_self)
-
-        # Add this at the end of the func method
-        try:
-            self.caller.record_scene_activity()
-            self.caller.msg("|wDebug: Say triggered scene activity check.|n")
-        except Exception as e:
-            self.caller.msg(f"|rDebug Error: {str(e)}|n")
+        # Counts towards an IC scene if anyone else is here
+        self.caller.record_scene_activity('say', msg_not_understand, language, msg_understand)
@@ -0,0 +1,188 @@
+from itertools import islice
+
+from evennia import default_cmds
+from evennia.utils.search import search_object
+from evennia.utils.utils import run_async
+from django.utils import timezone
+from world.wod20th.utils.formatting import header, footer
+from world.wod20th.utils.occupancy import OCCUPANCY
+from world.wod20th.utils.scene_log import SCENE_LOG, SCENE_LOG_STATS, SCENE_KEY_PATTERN, format_entry
+from world.wod20th.utils.scene_tracker import SCENES
+
+# Lines per message when exporting a whole log
+EXPORT_CHUNK = 200
+
+
+class CmdScene(default_cmds.MuxCommand):
+    """
+    Read scene logs.
+
+    Usage:
+      +scene/list              - Your recent scenes
+      +scene/list <name>       - Someone else's recent scenes (Staff only)
+      +scene/log [<page>]      - The log of the scene you're in
+      +scene/log <scene>=<page> - The log of a past scene
+      +scene/export [<scene>]  - The whole log of a scene, in chunks
+      +scene/stats             - Scene log writer counters (Staff only)
+
+    Every say, pose, emit and roll in a scene is logged. The material world
+    and the Umbra of a room have separate scenes. <scene> is a number from
+    your +scene/list or a scene key. You can read the logs of
+    scenes you took part in; staff can read any. Speech in a language shows
+    as it did to those who didn't follow it, unless you speak the language.
+
+    Examples:
+      +scene/log 2
+      +scene/log 3=1
+      +scene/export 42-20261017193000
+    """
+
+    key = "+scene"
+    locks = "cmd:all()"
+    help_category = "Character"
+
+    def func(self):
+        """Execute command"""
+        if "list" in self.switches:
+            self.list_scenes()
+        elif "log" in self.switches:
+            self.show_log()
+        elif "export" in self.switches:
+            self.export_log()
+        elif "stats" in self.switches:
+            self.show_stats()
+        else:
+            self.caller.msg("Usage: +scene/list, +scene/log [<scene>=]<page> or +scene/export [<scene>]")
+
+    def is_staff(self):
+        return self.caller.check_permstring("builders")
+
+    def find_scene(self, ref):
+        """
+        Return the key of the scene ref names, or of the scene the caller
+        is in if ref is blank. Returns None, having said why, if there's no
+        such scene or the caller may not read it.
+        """
+        caller = self.caller
+        if not ref:
+            session = SCENES.current(caller) or SCENES.session(caller.location, OCCUPANCY.plane(caller))
+            if session is None:
+                caller.msg("You aren't in a scene. See +scene/list for past ones.")
+                return None
+            key = session.key
+        elif ref.isdigit():
+            history = SCENES.history(caller)
+            if not 1 <= int(ref) <= len(history):
+                caller.msg(f"There's no scene {ref} in your +scene/list.")
+                return None
+            key = history[int(ref) - 1].scene_key
+        elif SCENE_KEY_PATTERN.match(ref):
+            key = ref
+        else:
+            caller.msg(f"'{ref}' isn't a scene. Use a number from +scene/list or a scene key.")
+            return None
+
+        if not self.is_staff() and not SCENES.took_part(caller, key):
+            caller.msg("You can only read the logs of scenes you took part in.")
+            return None
+        return key
+
+    def list_scenes(self):
+        caller = self.caller
+        target = caller
+        if self.args:
+            if not self.is_staff():
+                caller.msg("You don't have permission to list others' scenes.")
+                return
+            target = search_object(self.args.strip(), typeclass='typeclasses.characters.Character')
+            if not target:
+                caller.msg(f"Character '{self.args.strip()}' not found.")
+                return
+            target = target[0]
+
+        history = SCENES.history(target)
+        if not history:
+            caller.msg(f"{'You have' if target == caller else f'{target.key} has'} no logged scenes.")
+            return
+
+        string = header(f"Scenes for {target.key}", width=78)
+        string += f"|w{'#':>3}  {'Started':<17} {'Room':<26} {'Key':<20} Status|n\n"
+        for number, record in enumerate(history, 1):
+            started = timezone.localtime(record.started_at).strftime("%Y-%m-%d %H:%M")
+            room = record.room.key if record.room else "(gone)"
+            if record.ended_at is None:
+                status = "|gongoing|n"
+            else:
+                status = "counted" if record.completed else "short"
+            string += f"{number:>3}  {started:<17} {room[:26]:<26} {record.scene_key:<20} {status}\n"
+        string += footer(width=78)
+        caller.msg(string)
+
+    def show_log(self):
+        caller = self.caller
+        if self.rhs is not None:
+            ref, page = self.lhs.strip(), self.rhs.strip()
+        else:
+            ref, page = "", self.args.strip() or "1"
+        if not page.isdigit() or int(page) < 1:
+            caller.msg("Usage: +scene/log [<page>] or +scene/log <scene>=<page>")
+            return
+        key = self.find_scene(ref)
+        if not key:
+            return
+        number = int(page)
+
+        def _at_return(result):
+            entries, more = result
+            if not entries:
+                caller.msg("Nothing has been logged yet." if number == 1 else f"There's no page {number}.")
+                return
+            string = header(f"Scene {key}, page {number}", width=78)
+            if number == 1:
+                string += f"|wParticipants:|n {', '.join(SCENES.participants(key))}\n\n"
+            string += "\n".join(format_entry(entry, caller) for entry in entries) + "\n"
+            if more:
+                string += f"\n|wMore: +scene/log {ref + '=' if ref else ''}{number + 1}|n\n"
+            string += footer(width=78)
+            caller.msg(string)
+
+        def _at_err(failure):
+            caller.msg("|rCould not read the scene log.|n")
+
+        # Reading means decompressing; keep it off the reactor
+        run_async(SCENE_LOG.page, key, number, at_return=_at_return, at_err=_at_err)
+
+    def export_log(self):
+        caller = self.caller
+        key = self.find_scene(self.args.strip())
+        if not key:
+            return
+        entries = SCENE_LOG.entries(key)
+
+        def _next_chunk():
+            return list(islice(entries, EXPORT_CHUNK))
+
+        def _at_return(chunk):
+            if chunk:
+                caller.msg("\n".join(format_entry(entry, caller) for entry in chunk))
+            if len(chunk) == EXPORT_CHUNK:
+                run_async(_next_chunk, at_return=_at_return, at_err=_at_err)
+            else:
+                caller.msg(footer(width=78))
+
+        def _at_err(failure):
+            caller.msg("|rCould not read the scene log.|n")
+
+        # One chunk at a time, so a long log never sits in memory whole
+        caller.msg(header(f"Scene {key}", width=78) + f"|wParticipants:|n {', '.join(SCENES.participants(key))}\n")
+        run_async(_next_chunk, at_return=_at_return, at_err=_at_err)
+
+    def show_stats(self):
+        if not self.is_staff():
+            self.caller.msg("You don't have permission to view scene log stats.")
+            return
+        stats = SCENE_LOG_STATS
+        self.caller.msg(
+            f"Scene log: {stats['entries']} lines logged, {stats['written']} written in {stats['writes']} writes, "
+            f"{SCENE_LOG.pending()} waiting, {stats['dropped']} dropped, {stats['errors']} failed."
+        )
@@ -1,7 +1,9 @@
 from evennia import Command, default_cmds
-from world.wod20th.models import Stat, SHIFTER_IDENTITY_STATS, SHIFTER_RENOWN, calculate_willpower, calculate_road
+from world.wod20th.models import SHIFTER_IDENTITY_STATS, SHIFTER_RENOWN, calculate_willpower, calculate_road
+from world.wod20th.utils.stat_catalog import STAT_CATALOG
 from evennia.utils import search
 import re
+import copy
 from commands.CmdLanguage import CmdLanguage
 
 
@@ -181,6 +183,12 @@ class CmdSelfStat(default_cmds.MuxCommand):
 
     def func(self):
         """Execute the command."""
+        # Save the sheet once, however many stats the change touches
+        with self.caller.stats.batch():
+            self.modify_stats()
+
+    def modify_stats(self):
+        """Apply the requested change to the caller's stats."""
         # Check if character is approved
         if self.caller.db.approved:
             self.caller.msg("|rError: Approved characters cannot use chargen commands. Please contact staff for any needed changes.|n")
@@ -190,17 +198,14 @@ class CmdSelfStat(default_cmds.MuxCommand):
             self.caller.msg("|rUsage: +selfstat <stat>[(<instance>)]/[<category>]=[+-]<value>|n")
             return
 
-        # Get all matching stats
-        matching_stats = Stat.objects.filter(name__iexact=self.stat_name)
-        if not matching_stats.exists():
-            # If exact match fails, try a case-insensitive contains search
-            matching_stats = Stat.objects.filter(name__icontains=self.stat_name)
-            if not matching_stats.exists():
-                self.caller.msg(f"|rStat '{self.stat_name}' not found.|n")
-                return
+        # Get all matching stats (exact name first, then substring)
+        matching_stats = STAT_CATALOG.search(self.stat_name)
+        if not matching_stats:
+            self.caller.msg(f"|rStat '{self.stat_name}' not found.{STAT_CATALOG.did_you_mean(self.stat_name)}|n")
+            return
 
         # If multiple stats found and no category specified, show options
-        if matching_stats.count() > 1 and not self.category:
+        if len(matching_stats) > 1 and not self.category:
             # Group stats by category and stat_type
             stat_options = []
             for s in matching_stats:
@@ -212,13 +217,16 @@ class CmdSelfStat(default_cmds.MuxCommand):
 
         # If category is specified, find the matching stat
         if self.category:
-            stat = matching_stats.filter(stat_type__iexact=self.category).first()
+            stat = next((s for s in matching_stats if s.stat_type.lower() == self.category.lower()), None)
             if not stat:
                 self.caller.msg(f"|rNo stat '{self.stat_name}' found with category '{self.category}'.|n")
                 return
         else:
             # If only one stat found, use it
-            stat = matching_stats.first()
+            stat = matching_stats[0]
+
+        # Catalog entries are shared, so work on a copy from here on
+        stat = copy.copy(stat)
 
         # Use the canonical name from the database
         self.stat_name = stat.name
@@ -1,7 +1,13 @@
+import copy
 from evennia import default_cmds
-from world.wod20th.models import Stat, SHIFTER_IDENTITY_STATS, SHIFTER_RENOWN, calculate_willpower, calculate_road
+from world.wod20th.models import Stat, SHIFTER_IDENTITY_STATS, SHIFTER_RENOWN, SHIFTERS_WITHOUT_RAGE
+from world.wod20th.utils.stat_catalog import STAT_CATALOG
 from evennia.utils import search
 from evennia.utils.search import search_object
+from evennia.utils.evtable import EvTable
+from evennia.utils.ansi import ANSIString
+from world.wod20th.utils.formatting import header, footer
+from world.wod20th.utils.stat_query import find_characters, StatQueryError
 from typeclasses.characters import Character
 
 PATH_VIRTUES = {
@@ -41,6 +47,7 @@ class CmdStats(default_cmds.MuxCommand):
       +stats me/<stat>[(<instance>)]/<category>=[+-]<value>
       +stats <character>=reset
       +stats me=reset
+      +stats/find[/<page>] <query>
 
     Examples:
       +stats Bob/Strength/Physical=+2
@@ -52,12 +59,25 @@ class CmdStats(default_cmds.MuxCommand):
 
     This is the staff version of +selfstat with the same functionality
     but can be used on any character.
+
+    +stats/find lists every character matching a query over their stats:
+      +stats/find Clan=Toreador and Auspex>=3 and approved
+      +stats/find Natural Linguist
+      +stats/find/2 merits:Natural Linguist or Willpower.temp<3
+      +stats/find not (Splat=Vampire or Splat=Mortal)
+
+    Compare with = != > >= < <=, combine with and, or, not and brackets.
+    A stat name alone means the character has it above 0, category:Stat
+    limits it to one category, and Stat.temp compares the temporary value.
+    Quote values that contain and/or/not, e.g. Enlightenment="Power and the
+    Inner Voice". 'approved' matches approved characters.
     """
 
     key = "+stats"
     aliases = ["stats", "+setstats", "setstats"]
     locks = "cmd:perm(Builder)"
     help_category = "Staff"
+    find_page_size = 20
 
     def parse(self):
         """
@@ -120,6 +140,9 @@ class CmdStats(default_cmds.MuxCommand):
 
     def func(self):
         """Implement the command"""
+        if 'find' in self.switches:
+            return self.find_characters()
+
         if not self.character_name:
             self.caller.msg("|rUsage: +stats <character>/<stat>[(<instance>)]/[<category>]=[+-]<value>|n")
             return
@@ -151,6 +174,46 @@ class CmdStats(default_cmds.MuxCommand):
                 self.caller.msg(f"|rCharacter '{self.character_name}' not found.|n")
                 return
 
+        # Save the sheet once, however many stats the change touches
+        with character.stats.batch():
+            self.modify_stats(character)
+
+    def find_characters(self):
+        """List characters matching a stat query (+stats/find)."""
+        query = self.args.strip()
+        if not query:
+            return self.caller.msg("|rUsage: +stats/find[/<page>] <query>|n")
+        page = next((int(switch) for switch in self.switches if switch.isdigit()), 1)
+        if page < 1:
+            return self.caller.msg("|rThe page must be a positive number.|n")
+
+        try:
+            results = find_characters(query, page, self.find_page_size)
+        except StatQueryError as err:
+            return self.caller.msg(f"|r{err}|n")
+        if not results.total:
+            return self.caller.msg(f"No characters match '{query}'.")
+        if page > results.page_count:
+            return self.caller.msg(f"There are only {results.page_count} page(s) of results for '{query}'.")
+
+        string = header(f"Stat Search: {query}", width=78)
+        table = EvTable("|wName|n", "|wStats|n", border="none")
+        table.reformat_column(0, width=25, align="l")
+        table.reformat_column(1, width=53, align="l")
+        for _char_id, name, stats in results.results:
+            table.add_row(name, ", ".join(
+                f"{stat} {perm}" if temp in (None, perm) else f"{stat} {perm}({temp})"
+                for stat, perm, temp in stats
+            ))
+        string += ANSIString(table)
+        string += f"\r\n    Found |w{results.total}|n characters"
+        if results.page_count > 1:
+            string += f" (page {page} of {results.page_count}, use +stats/find/<page> {query})"
+        string += "\r\n" + footer(width=78)
+        self.caller.msg(string)
+
+    def modify_stats(self, character):
+        """Apply the requested change to character's stats."""
         # When setting splat for the first time or resetting stats
         if self.stat_name and self.stat_name.lower() == 'splat':
             if not self.value_change:
@@ -170,7 +233,7 @@ class CmdStats(default_cmds.MuxCommand):
                 return
             elif self.value_change.lower() == 'splat':
                 # Get current splat if it exists
-                current_splat = character.db.stats.get('other', {}).get('splat', {}).get('Splat', {}).get('perm')
+                current_splat = character.stats.get('other', 'splat', 'Splat')
                 if current_splat:
                     # Reinitialize with current splat
                     self.initialize_stats(character, current_splat)
@@ -182,17 +245,14 @@ class CmdStats(default_cmds.MuxCommand):
             self.caller.msg("|rUsage: +stats <character>/<stat>[(<instance>)]/[<category>]=[+-]<value>|n")
             return
 
-        # Get all matching stats
-        matching_stats = Stat.objects.filter(name__iexact=self.stat_name)
-        if not matching_stats.exists():
-            # If exact match fails, try a case-insensitive contains search
-            matching_stats = Stat.objects.filter(name__icontains=self.stat_name)
-            if not matching_stats.exists():
-                self.caller.msg(f"|rStat '{self.stat_name}' not found.|n")
-                return
+        # Get all matching stats (exact name first, then substring)
+        matching_stats = STAT_CATALOG.search(self.stat_name)
+        if not matching_stats:
+            self.caller.msg(f"|rStat '{self.stat_name}' not found.{STAT_CATALOG.did_you_mean(self.stat_name)}|n")
+            return
 
         # If multiple stats found and no category specified, show options
-        if matching_stats.count() > 1 and not self.category:
+        if len(matching_stats) > 1 and not self.category:
             # Group stats by category and stat_type
             stat_options = []
             for s in matching_stats:
@@ -204,20 +264,23 @@ class CmdStats(default_cmds.MuxCommand):
 
         # If category is specified, find the matching stat
         if self.category:
-            stat = matching_stats.filter(stat_type__iexact=self.category).first()
+            stat = next((s for s in matching_stats if s.stat_type.lower() == self.category.lower()), None)
             if not stat:
                 self.caller.msg(f"|rNo stat '{self.stat_name}' found with category '{self.category}'.|n")
                 return
         else:
             # If only one stat found, use it
-            stat = matching_stats.first()
+            stat = matching_stats[0]
+
+        # Catalog entries are shared, so work on a copy from here on
+        stat = copy.copy(stat)
 
         # Use the canonical name from the database
         self.stat_name = stat.name
 
         # Special handling for Shifter Rank
         if stat.name == 'Rank':
-            splat = character.db.stats.get('other', {}).get('splat', {}).get('Splat', {}).get('perm', '')
+            splat = character.stats.get('other', 'splat', 'Splat', default='')
             if splat and splat == 'Shifter':
                 stat.category = 'identity'
                 stat.stat_type = 'lineage'
@@ -242,21 +305,18 @@ class CmdStats(default_cmds.MuxCommand):
         # Handle stat removal (empty value) - Move this before validation
 
         if not self.value_change:
-            if stat.category in character.db.stats and stat.stat_type in character.db.stats[stat.category]:
-                if full_stat_name in character.db.stats[stat.category][stat.stat_type]:
-                    del character.db.stats[stat.category][stat.stat_type][full_stat_name]
-                    self.caller.msg(f"|gRemoved stat '{full_stat_name}' from {character.name}.|n")
-                    character.msg(f"|y{self.caller.name}|n |rremoved your stat|n '|y{full_stat_name}|n'.")
-                    
-                    # Check if we need to update languages after merit removal
-                    if (stat.category == 'merits' and 
-                        (stat.name == 'Language' or stat.name == 'Natural Linguist')):
-                        character.handle_language_merit_change()
-
-                    return
-                else:
-                    self.caller.msg(f"|rStat '{full_stat_name}' not found on {character.name}.|n")
-                    return
+            if character.stats.has(stat.category, stat.stat_type, full_stat_name):
+                character.stats.remove(stat.category, stat.stat_type, full_stat_name)
+                self.caller.msg(f"|gRemoved stat '{full_stat_name}' from {character.name}.|n")
+                character.msg(f"|y{self.caller.name}|n |rremoved your stat|n '|y{full_stat_name}|n'.")
+
+                # Check if we need to update languages after merit removal
+                if (stat.category == 'merits' and
+                    (stat.name == 'Language' or stat.name == 'Natural Linguist')):
+                    character.handle_language_merit_change()
+            else:
+                self.caller.msg(f"|rStat '{full_stat_name}' not found on {character.name}.|n")
+            return
 
         # Check if the character passes the stat's lock_string
         try:
@@ -310,7 +370,7 @@ class CmdStats(default_cmds.MuxCommand):
             is_number = False
 
         # Check if the stat exists for the character and get the current value
-        if not hasattr(character.db, "stats"):
+        if not character.attributes.has('stats'):
             character.db.stats = {}
 
         current_value = character.get_stat(stat.category, stat.stat_type, full_stat_name, temp=self.temp)
@@ -422,13 +482,13 @@ class CmdStats(default_cmds.MuxCommand):
 
         # After setting a stat, recalculate Willpower and Road
         if full_stat_name in ['Courage', 'Self-Control', 'Conscience', 'Conviction', 'Instinct']:
-            new_willpower = calculate_willpower(character)
+            new_willpower = character.derived.willpower
             # Set both permanent and temporary values for Willpower
             character.set_stat('pools', 'dual', 'Willpower', new_willpower, temp=False)
             character.set_stat('pools', 'dual', 'Willpower', new_willpower, temp=True)
             self.caller.msg(f"|gRecalculated Willpower to {new_willpower}.|n")
 
-            new_road = calculate_road(character)
+            new_road = character.derived.road
             character.set_stat('pools', 'moral', 'Road', new_road, temp=False)
             self.caller.msg(f"|gRecalculated Road to {new_road}.|n")
 
@@ -469,7 +529,7 @@ class CmdStats(default_cmds.MuxCommand):
 
         # Special handling for Shifter Rank
         if stat.name == 'Rank':
-            splat = character.db.stats.get('other', {}).get('splat', {}).get('Splat', {}).get('perm', '')
+            splat = character.stats.get('other', 'splat', 'Splat', default='')
             if splat and splat == 'Shifter':
                 stat.category = 'identity'
                 stat.stat_type = 'lineage'
@@ -481,15 +541,15 @@ class CmdStats(default_cmds.MuxCommand):
 
         # Special handling for Appearance stat
         if stat.name == 'Appearance':
-            splat = character.db.stats.get('other', {}).get('splat', {}).get('Splat', {}).get('perm', '')
-            clan = character.db.stats.get('identity', {}).get('lineage', {}).get('Clan', {}).get('perm', '')
+            splat = character.stats.get('other', 'splat', 'Splat', default='')
+            clan = character.stats.get('identity', 'lineage', 'Clan', default='')
             
             if splat and splat == 'Vampire' and clan in ['Nosferatu', 'Samedi']:
                 self.caller.msg("Nosferatu and Samedi vampires always have Appearance 0.")
                 return
             
             if splat and splat == 'Shifter':
-                form = character.db.stats.get('other', {}).get('form', {}).get('Form', {}).get('temp', '')
+                form = character.stats.get('other', 'form', 'Form', temp=True, default='')
                 if form == 'Crinos':
                     self.caller.msg("Characters in Crinos form always have Appearance 0.")
                     return
@@ -585,10 +645,6 @@ class CmdStats(default_cmds.MuxCommand):
 
     def update_virtues_for_enlightenment(self, character):
         """Update virtues based on enlightenment path"""
-        # Initialize virtues if they don't exist
-        if 'virtues' not in character.db.stats:
-            character.db.stats['virtues'] = {'moral': {}}
-        
         # Get or set default enlightenment
         enlightenment = character.get_stat('identity', 'personal', 'Enlightenment', temp=False)
         if not enlightenment:
@@ -627,23 +683,25 @@ class CmdStats(default_cmds.MuxCommand):
         virtues = path_virtues.get(enlightenment, ['Conscience', 'Self-Control', 'Courage'])
         
         # Remove any existing virtues that aren't in the new set
-        current_virtues = list(character.db.stats['virtues']['moral'].keys())
-        for virtue in current_virtues:
+        for _category, _stat_type, virtue, _perm, _temp in list(character.stats.items('virtues', 'moral')):
             if virtue not in virtues:
-                del character.db.stats['virtues']['moral'][virtue]
+                character.stats.remove('virtues', 'moral', virtue)
         
         # Set default values for new virtues
         for virtue in virtues:
-            if virtue not in character.db.stats['virtues']['moral']:
-                character.db.stats['virtues']['moral'][virtue] = {'perm': 1, 'temp': 1}
+            if not character.stats.has('virtues', 'moral', virtue):
+                character.stats.set('virtues', 'moral', virtue, 1)
+                character.stats.set('virtues', 'moral', virtue, 1, temp=True)
 
     def apply_splat_pools(self, character, splat):
         """Apply the correct pools and bio stats based on the character's splat."""
         # Remove all existing pools except Willpower
-        character.db.stats['pools'] = {k: v for k, v in character.db.stats.get('pools', {}).items() if k == 'Willpower'}
+        for _category, stat_type, name, _perm, _temp in list(character.stats.items('pools')):
+            if name != 'Willpower':
+                character.stats.remove('pools', stat_type, name)
 
         # Add Willpower for all characters if it doesn't exist
-        if 'Willpower' not in character.db.stats['pools']:
+        if not character.stats.has('pools', 'dual', 'Willpower'):
             character.set_stat('pools', 'dual', 'Willpower', 1, temp=False)
             character.set_stat('pools', 'dual', 'Willpower', 1, temp=True)
 
@@ -673,342 +731,22 @@ class CmdStats(default_cmds.MuxCommand):
     def apply_shifter_stats(self, character):
         """Apply shifter-specific stats"""
         shifter_type = character.get_stat('identity', 'lineage', 'Type')
-        breed = character.get_stat('identity', 'lineage', 'Breed', '').lower()
-        
-        # Common Breed-based Gnosis values
-        COMMON_BREED_GNOSIS = {
-            'homid': 1,
-            'metis': 3,
-            'lupus': 5,  # Animal-Born
-            'animal-born': 5
-        }
-        self.caller.msg(f"Debug: Applying stats for shifter type: {shifter_type}")
+        # Worked out from type, breed, auspice, etc.; see SHIFTER_POOLS
+        pools = character.derived.starting_pools
+
+        if shifter_type in SHIFTERS_WITHOUT_RAGE:
+            character.stats.remove('pools', 'dual', 'Rage')
+        for pool, rating in pools.items():
+            character.set_stat('pools', 'dual', pool, rating, temp=False)
+            character.set_stat('pools', 'dual', pool, rating, temp=True)
 
         if shifter_type == 'Ajaba':
-            aspect = character.get_stat('identity', 'lineage', 'Aspect', '').lower()
-            self.caller.msg(f"Debug: Found Ajaba with aspect: {aspect}")
-            
-            AJABA_ASPECT_STATS = {
-                'dawn': {'rage': 5, 'gnosis': 1},
-                'midnight': {'rage': 3, 'gnosis': 3},
-                'dusk': {'rage': 1, 'gnosis': 5}
-            }
-            
-            # Set base Willpower for all Ajaba
-            self.caller.msg("Debug: Setting Ajaba Willpower to 3")
-            character.set_stat('pools', 'dual', 'Willpower', 3, temp=False)
-            character.set_stat('pools', 'dual', 'Willpower', 3, temp=True)
-            
-            if aspect in AJABA_ASPECT_STATS:
-                stats = AJABA_ASPECT_STATS[aspect]
-                self.caller.msg(f"Debug: Setting Ajaba Rage to {stats['rage']} and Gnosis to {stats['gnosis']}")
-                # Set Rage
-                character.set_stat('pools', 'dual', 'Rage', stats['rage'], temp=False)
-                character.set_stat('pools', 'dual', 'Rage', stats['rage'], temp=True)
-                # Set Gnosis
-                character.set_stat('pools', 'dual', 'Gnosis', stats['gnosis'], temp=False)
-                character.set_stat('pools', 'dual', 'Gnosis', stats['gnosis'], temp=True)
-                
-                self.caller.msg(f"Set Ajaba stats - Willpower: 3, Rage: {stats['rage']}, Gnosis: {stats['gnosis']}")
+            if 'Rage' in pools:
+                self.caller.msg(f"Set Ajaba stats - Willpower: 3, Rage: {pools['Rage']}, Gnosis: {pools['Gnosis']}")
             else:
+                aspect = (character.get_stat('identity', 'lineage', 'Aspect') or '').lower()
                 self.caller.msg(f"|rWarning: Invalid Ajaba aspect: {aspect}. Valid aspects are: Dawn, Midnight, Dusk|n")
 
-        elif shifter_type == 'Ananasi':
-            # Remove Rage if it exists
-            if 'Rage' in character.db.stats.get('pools', {}):
-                del character.db.stats['pools']['Rage']
-            # Set Blood pool
-            character.set_stat('pools', 'dual', 'Blood', 10, temp=False)
-            character.set_stat('pools', 'dual', 'Blood', 10, temp=True)
-            # Set breed-based stats
-            if breed == 'homid':
-                character.set_stat('pools', 'dual', 'Willpower', 3, temp=False)
-                character.set_stat('pools', 'dual', 'Willpower', 3, temp=True)
-                character.set_stat('pools', 'dual', 'Gnosis', 1, temp=False)
-                character.set_stat('pools', 'dual', 'Gnosis', 1, temp=True)
-            elif breed in ['arachnid', 'animal-born']:
-                character.set_stat('pools', 'dual', 'Willpower', 4, temp=False)
-                character.set_stat('pools', 'dual', 'Willpower', 4, temp=True)
-                character.set_stat('pools', 'dual', 'Gnosis', 5, temp=False)
-                character.set_stat('pools', 'dual', 'Gnosis', 5, temp=True)
-
-        elif shifter_type == 'Bastet':
-            tribe = character.get_stat('identity', 'lineage', 'Tribe', '').lower()
-            BASTET_TRIBE_STATS = {
-                'balam': {'rage': 4, 'willpower': 3},
-                'bubasti': {'rage': 1, 'willpower': 5},
-                'ceilican': {'rage': 3, 'willpower': 3},
-                'khan': {'rage': 5, 'willpower': 2},
-                'pumonca': {'rage': 4, 'willpower': 4},
-                'qualmi': {'rage': 2, 'willpower': 5},
-                'simba': {'rage': 5, 'willpower': 2},
-                'swara': {'rage': 2, 'willpower': 4}
-            }
-            if tribe in BASTET_TRIBE_STATS:
-                stats = BASTET_TRIBE_STATS[tribe]
-                character.set_stat('pools', 'dual', 'Rage', stats['rage'], temp=False)
-                character.set_stat('pools', 'dual', 'Rage', stats['rage'], temp=True)
-                character.set_stat('pools', 'dual', 'Willpower', stats['willpower'], temp=False)
-                character.set_stat('pools', 'dual', 'Willpower', stats['willpower'], temp=True)
-            if breed in COMMON_BREED_GNOSIS:
-                character.set_stat('pools', 'dual', 'Gnosis', COMMON_BREED_GNOSIS[breed], temp=False)
-                character.set_stat('pools', 'dual', 'Gnosis', COMMON_BREED_GNOSIS[breed], temp=True)
-
-        elif shifter_type == 'Corax':
-            character.set_stat('pools', 'dual', 'Rage', 1, temp=False)
-            character.set_stat('pools', 'dual', 'Rage', 1, temp=True)
-            character.set_stat('pools', 'dual', 'Gnosis', 6, temp=False)
-            character.set_stat('pools', 'dual', 'Gnosis', 6, temp=True)
-            character.set_stat('pools', 'dual', 'Willpower', 3, temp=False)
-            character.set_stat('pools', 'dual', 'Willpower', 3, temp=True)
-
-        elif shifter_type == 'Gurahl':
-            character.set_stat('pools', 'dual', 'Willpower', 6, temp=False)
-            character.set_stat('pools', 'dual', 'Willpower', 6, temp=True)
-            if breed == 'homid':
-                character.set_stat('pools', 'dual', 'Rage', 3, temp=False)
-                character.set_stat('pools', 'dual', 'Rage', 3, temp=True)
-                character.set_stat('pools', 'dual', 'Gnosis', 4, temp=False)
-                character.set_stat('pools', 'dual', 'Gnosis', 4, temp=True)
-            elif breed in ['lupus', 'animal-born']:
-                character.set_stat('pools', 'dual', 'Rage', 4, temp=False)
-                character.set_stat('pools', 'dual', 'Rage', 4, temp=True)
-                character.set_stat('pools', 'dual', 'Gnosis', 5, temp=False)
-                character.set_stat('pools', 'dual', 'Gnosis', 5, temp=True)
-
-        elif shifter_type == 'Kitsune':
-            path = character.get_stat('identity', 'lineage', 'Path', '').lower()
-            breed = character.get_stat('identity', 'lineage', 'Breed', '').lower()
-            
-            # Set base Willpower
-            character.set_stat('pools', 'dual', 'Willpower', 5, temp=False)
-            character.set_stat('pools', 'dual', 'Willpower', 5, temp=True)
-            
-            # Set Path-based Rage
-            KITSUNE_PATH_RAGE = {
-                'kataribe': 2,
-                'gukutsushi': 2,
-                'doshi': 3,
-                'eji': 4
-            }
-            if path in KITSUNE_PATH_RAGE:
-                character.set_stat('pools', 'dual', 'Rage', KITSUNE_PATH_RAGE[path], temp=False)
-                character.set_stat('pools', 'dual', 'Rage', KITSUNE_PATH_RAGE[path], temp=True)
-            
-            # Set Breed-based Gnosis
-            KITSUNE_BREED_GNOSIS = {
-                'kojin': 3,
-                'homid': 3,
-                'roko': 5,
-                'animal-born': 5,
-                'shinju': 4,
-                'metis': 4
-                
-            }
-            if breed in KITSUNE_BREED_GNOSIS:
-                character.set_stat('pools', 'dual', 'Gnosis', KITSUNE_BREED_GNOSIS[breed], temp=False)
-                character.set_stat('pools', 'dual', 'Gnosis', KITSUNE_BREED_GNOSIS[breed], temp=True)
-
-        elif shifter_type == 'Mokole':
-            breed = character.get_stat('identity', 'lineage', 'Breed', '').lower()
-            auspice = character.get_stat('identity', 'lineage', 'Auspice', '').lower()
-            varna = character.get_stat('identity', 'lineage', 'Varna', '').lower()
-            
-            # Set Breed-based Gnosis
-            MOKOLE_BREED_GNOSIS = {
-                'homid': 2,
-                'animal-born': 4,
-                'suchid': 4  # Alternative name for animal-born
-            }
-            if breed in MOKOLE_BREED_GNOSIS:
-                character.set_stat('pools', 'dual', 'Gnosis', MOKOLE_BREED_GNOSIS[breed], temp=False)
-                character.set_stat('pools', 'dual', 'Gnosis', MOKOLE_BREED_GNOSIS[breed], temp=True)
-            
-            # Set Auspice-based Willpower
-            MOKOLE_AUSPICE_WILLPOWER = {
-                'rising sun striking': 3,
-                'noonday sun unshading': 5,
-                'setting sun warding': 3,
-                'shrouded sun concealing': 4,
-                'midnight sun shining': 4,
-                'decorated suns gathering': 5,
-                'solar eclipse crowning': 5,
-                'hemanta': 2,
-                'zarad': 3,
-                'grisma': 4,
-                'vasanta': 5
-            }
-            if auspice in MOKOLE_AUSPICE_WILLPOWER:
-                character.set_stat('pools', 'dual', 'Willpower', MOKOLE_AUSPICE_WILLPOWER[auspice], temp=False)
-                character.set_stat('pools', 'dual', 'Willpower', MOKOLE_AUSPICE_WILLPOWER[auspice], temp=True)
-            
-            # Set Varna-based Rage
-            MOKOLE_VARNA_RAGE = {
-                'champsa': 3,
-                'gharial': 4,
-                'halpatee': 4,
-                'karna': 3,
-                'makara': 3,
-                'ora': 5,
-                'piasa': 4,
-                'syrta': 4,
-                'unktehi': 5
-            }
-            if varna in MOKOLE_VARNA_RAGE:
-                character.set_stat('pools', 'dual', 'Rage', MOKOLE_VARNA_RAGE[varna], temp=False)
-                character.set_stat('pools', 'dual', 'Rage', MOKOLE_VARNA_RAGE[varna], temp=True)
-
-        elif shifter_type == 'Nagah':
-            breed = character.get_stat('identity', 'lineage', 'Breed', '').lower()
-            auspice = character.get_stat('identity', 'lineage', 'Auspice', '').lower()
-            
-            # Set base Willpower
-            character.set_stat('pools', 'dual', 'Willpower', 4, temp=False)
-            character.set_stat('pools', 'dual', 'Willpower', 4, temp=True)
-            
-            # Set Breed-based Gnosis
-            NAGAH_BREED_GNOSIS = {
-                'balaram': 1,  # specific homid name
-                'homid': 1,  # homid
-                'balaram': 1,  # specific metis name
-                'metis': 1,  # metis
-                'animal-born': 5,
-                'vasuki': 5    # animal-born specific name for nagah
-            }
-            if breed in NAGAH_BREED_GNOSIS:
-                character.set_stat('pools', 'dual', 'Gnosis', NAGAH_BREED_GNOSIS[breed], temp=False)
-                character.set_stat('pools', 'dual', 'Gnosis', NAGAH_BREED_GNOSIS[breed], temp=True)
-            
-            # Set Auspice-based Rage
-            NAGAH_AUSPICE_RAGE = {
-                'kamakshi': 3,
-                'kartikeya': 4,
-                'kamsa': 3,
-                'kali': 4
-            }
-            if auspice in NAGAH_AUSPICE_RAGE:
-                character.set_stat('pools', 'dual', 'Rage', NAGAH_AUSPICE_RAGE[auspice], temp=False)
-                character.set_stat('pools', 'dual', 'Rage', NAGAH_AUSPICE_RAGE[auspice], temp=True)
-
-        elif shifter_type == 'Nuwisha':
-            breed = character.get_stat('identity', 'lineage', 'Breed', '').lower()
-            
-            # Remove Rage if it exists
-            if 'Rage' in character.db.stats.get('pools', {}):
-                del character.db.stats['pools']['Rage']
-            
-            # Set base Willpower
-            character.set_stat('pools', 'dual', 'Willpower', 4, temp=False)
-            character.set_stat('pools', 'dual', 'Willpower', 4, temp=True)
-            
-            # Set Breed-based Gnosis
-            NUWISHA_BREED_GNOSIS = {
-                'homid': 1,
-                'animal-born': 5,
-                'latrani': 5  # Alternative name for animal-born
-            }
-            if breed in NUWISHA_BREED_GNOSIS:
-                character.set_stat('pools', 'dual', 'Gnosis', NUWISHA_BREED_GNOSIS[breed], temp=False)
-                character.set_stat('pools', 'dual', 'Gnosis', NUWISHA_BREED_GNOSIS[breed], temp=True)
-
-        elif shifter_type == 'Ratkin':
-            breed = character.get_stat('identity', 'lineage', 'Breed', '').lower()
-            aspect = character.get_stat('identity', 'lineage', 'Aspect', '').lower()
-            
-            # Set base Willpower
-            character.set_stat('pools', 'dual', 'Willpower', 3, temp=False)
-            character.set_stat('pools', 'dual', 'Willpower', 3, temp=True)
-            
-            # Set Breed-based Gnosis
-            if breed in COMMON_BREED_GNOSIS:
-                character.set_stat('pools', 'dual', 'Gnosis', COMMON_BREED_GNOSIS[breed], temp=False)
-                character.set_stat('pools', 'dual', 'Gnosis', COMMON_BREED_GNOSIS[breed], temp=True)
-            
-            # Set Aspect-based Rage
-            RATKIN_ASPECT_RAGE = {
-                'tunnel runner': 1,
-                'shadow seer': 2,
-                'knife skulker': 3,
-                'warrior': 5,
-                'engineer': 2,
-                'plague lord': 3,
-                'munchmausen': 4,
-                'twitcher': 5
-            }
-            if aspect in RATKIN_ASPECT_RAGE:
-                character.set_stat('pools', 'dual', 'Rage', RATKIN_ASPECT_RAGE[aspect], temp=False)
-                character.set_stat('pools', 'dual', 'Rage', RATKIN_ASPECT_RAGE[aspect], temp=True)
-
-        elif shifter_type == 'Rokea':
-            breed = character.get_stat('identity', 'lineage', 'Breed', '').lower()
-            auspice = character.get_stat('identity', 'lineage', 'Auspice', '').lower()
-            
-            # Set base Willpower
-            character.set_stat('pools', 'dual', 'Willpower', 4, temp=False)
-            character.set_stat('pools', 'dual', 'Willpower', 4, temp=True)
-            
-            # Set Breed-based Gnosis
-            ROKEA_BREED_GNOSIS = {
-                'homid': 1,
-                'animal-born': 5,
-                'squamus': 5  # Alternative name for animal-born
-            }
-            if breed in ROKEA_BREED_GNOSIS:
-                character.set_stat('pools', 'dual', 'Gnosis', ROKEA_BREED_GNOSIS[breed], temp=False)
-                character.set_stat('pools', 'dual', 'Gnosis', ROKEA_BREED_GNOSIS[breed], temp=True)
-            
-            # Set Auspice-based Rage
-            ROKEA_AUSPICE_RAGE = {
-                'brightwater': 5,
-                'dimwater': 4,
-                'darkwater': 3
-            }
-            if auspice in ROKEA_AUSPICE_RAGE:
-                character.set_stat('pools', 'dual', 'Rage', ROKEA_AUSPICE_RAGE[auspice], temp=False)
-                character.set_stat('pools', 'dual', 'Rage', ROKEA_AUSPICE_RAGE[auspice], temp=True)
-
-        elif shifter_type == 'Garou':
-            auspice = character.get_stat('identity', 'lineage', 'Auspice', '').lower()
-            breed = character.get_stat('identity', 'lineage', 'Breed', '').lower()
-            tribe = character.get_stat('identity', 'lineage', 'Tribe', '').lower()
-            
-            # Set Auspice-based Rage
-            GAROU_AUSPICE_RAGE = {
-                'ahroun': 5,
-                'galliard': 4,
-                'philodox': 3,
-                'theurge': 2,
-                'ragabash': 1
-            }
-            if auspice in GAROU_AUSPICE_RAGE:
-                character.set_stat('pools', 'dual', 'Rage', GAROU_AUSPICE_RAGE[auspice], temp=False)
-                character.set_stat('pools', 'dual', 'Rage', GAROU_AUSPICE_RAGE[auspice], temp=True)
-            
-            # Set Breed-based Gnosis
-            if breed in COMMON_BREED_GNOSIS:
-                character.set_stat('pools', 'dual', 'Gnosis', COMMON_BREED_GNOSIS[breed], temp=False)
-                character.set_stat('pools', 'dual', 'Gnosis', COMMON_BREED_GNOSIS[breed], temp=True)
-            
-            # Set Tribe-based Willpower
-            GAROU_TRIBE_WILLPOWER = {
-                'black furies': 3,
-                'bone gnawers': 4,
-                'children of gaia': 4,
-                'fianna': 3,
-                'get of fenris': 3,
-                'glass walkers': 3,
-                'red talons': 3,
-                'shadow lords': 3,
-                'silent striders': 3,
-                'silver fangs': 3,
-                'stargazers': 4,
-                'uktena': 3,
-                'wendigo': 4
-            }
-            if tribe in GAROU_TRIBE_WILLPOWER:
-                character.set_stat('pools', 'dual', 'Willpower', GAROU_TRIBE_WILLPOWER[tribe], temp=False)
-                character.set_stat('pools', 'dual', 'Willpower', GAROU_TRIBE_WILLPOWER[tribe], temp=True)
-
     def apply_mage_stats(self, character):
         # Add Mage-specific pools
         character.set_stat('pools', 'dual', 'Quintessence', 1, temp=False)
@@ -1036,8 +774,7 @@ class CmdStats(default_cmds.MuxCommand):
         character.set_stat('identity', 'lineage', 'Unseelie Legacy', '')
 
         # Remove the generic 'Legacy' stat if it exists
-        if 'Legacy' in character.db.stats.get('identity', {}).get('lineage', {}):
-            del character.db.stats['identity']['lineage']['Legacy']
+        character.stats.remove('identity', 'lineage', 'Legacy')
 
         # Ensure these stats are added to the database if they don't exist
         for stat_name in ['Kith', 'Seeming', 'House', 'Seelie Legacy', 'Unseelie Legacy']:
@@ -1068,9 +805,14 @@ class CmdStats(default_cmds.MuxCommand):
             character.set_stat('identity', 'lineage', 'Nephandi Faction', '')
 
         # Remove any stats that don't apply to the new faction
+        kept = {
+            'traditions': ['Tradition', 'Traditions Subfaction'],
+            'technocracy': ['Convention', 'Methodology'],
+            'nephandi': ['Nephandi Faction'],
+        }.get(faction.lower(), [])
         for stat in ['Tradition', 'Traditions Subfaction', 'Convention', 'Methodology', 'Nephandi Faction']:
-            if stat not in character.db.stats.get('identity', {}).get('lineage', {}):
-                character.db.stats['identity']['lineage'].pop(stat, None)
+            if stat not in kept:
+                character.stats.remove('identity', 'lineage', stat)
 
         self.caller.msg(f"|gApplied {faction} specific stats to {character.name}.|n")
         character.msg(f"|gYour {faction} specific stats have been applied.|n")
@@ -1078,28 +820,27 @@ class CmdStats(default_cmds.MuxCommand):
     def apply_shifter_pools(self, character, shifter_type):
         """Apply the correct pools and renown based on the Shifter's type."""
         # Ensure Willpower exists
-        if 'Willpower' not in character.db.stats.get('pools', {}):
+        if not character.stats.has('pools', 'dual', 'Willpower'):
             character.set_stat('pools', 'dual', 'Willpower', 1, temp=False)
             character.set_stat('pools', 'dual', 'Willpower', 1, temp=True)
 
-        # Set Gnosis for all Shifter types
-        character.set_stat('pools', 'dual', 'Gnosis', 1, temp=False)
-        character.set_stat('pools', 'dual', 'Gnosis', 1, temp=True)
+        # Set Gnosis for all Shifter types, from breed etc. where already known
+        pools = character.derived.starting_pools
+        character.set_stat('pools', 'dual', 'Gnosis', pools.get('Gnosis', 1), temp=False)
+        character.set_stat('pools', 'dual', 'Gnosis', pools.get('Gnosis', 1), temp=True)
 
         if shifter_type == 'Ananasi':
             # Remove Rage if it exists
-            if 'Rage' in character.db.stats.get('pools', {}):
-                del character.db.stats['pools']['Rage']
+            character.stats.remove('pools', 'dual', 'Rage')
             # Add Blood
             character.set_stat('pools', 'dual', 'Blood', 10, temp=False)
             character.set_stat('pools', 'dual', 'Blood', 10, temp=True)
         else:
             # Remove Blood if it exists
-            if 'Blood' in character.db.stats.get('pools', {}):
-                del character.db.stats['pools']['Blood']
+            character.stats.remove('pools', 'dual', 'Blood')
             # Add Rage
-            character.set_stat('pools', 'dual', 'Rage', 1, temp=False)
-            character.set_stat('pools', 'dual', 'Rage', 1, temp=True)
+            character.set_stat('pools', 'dual', 'Rage', pools.get('Rage', 1), temp=False)
+            character.set_stat('pools', 'dual', 'Rage', pools.get('Rage', 1), temp=True)
 
         # Set Renown
         renown_types = SHIFTER_RENOWN.get(shifter_type, [])
@@ -1112,7 +853,7 @@ class CmdStats(default_cmds.MuxCommand):
     def set_stat(self, target, category, stat_type, stat_name, value, temp=False):
         """Set a stat value."""
         # Get the stat definition
-        stat = Stat.objects.filter(name=stat_name).first()
+        stat = next((s for s in STAT_CATALOG.filter_name(stat_name) if s.name == stat_name), None)
         if not stat:
             self.caller.msg(f"Stat '{stat_name}' not found.")
             return False
@@ -1276,14 +1017,10 @@ class CmdSpecialty(MuxCommand):
                 self.caller.msg(f"|rCharacter '{self.character_name}' not found.|n")
                 return
 
-        # Fetch the stat definition from the database
-        try:
-            matching_stats = Stat.objects.filter(name__icontains=self.stat_name.strip())
-        except Exception as e:
-            self.caller.msg(f"|rError fetching stats: {e}|n")
-            return
+        # Fetch the stat definition from the catalog
+        matching_stats = STAT_CATALOG.contains(self.stat_name.strip())
 
-        if not matching_stats.exists():
+        if not matching_stats:
             self.caller.msg(f"|rNo stats matching '{self.stat_name}' found in the database.|n")
             return
 
@@ -1291,7 +1028,7 @@ class CmdSpecialty(MuxCommand):
             self.caller.msg(f"|rMultiple stats matching '{self.stat_name}' found: {[stat.name for stat in matching_stats]}. Please be more specific.|n")
             return
 
-        stat = matching_stats.first()
+        stat = matching_stats[0]
         stat_name = stat.name
 
         specialties = character.db.specialties or {}
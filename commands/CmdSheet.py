@@ -2,12 +2,14 @@ from evennia.commands.default.muxcommand import MuxCommand
 from evennia.utils.search import search_object
 from world.wod20th.models import Stat, SHIFTER_IDENTITY_STATS, SHIFTER_RENOWN, CLAN, MAGE_FACTION, MAGE_SPHERES, \
     TRADITION, TRADITION_SUBFACTION, CONVENTION, METHODOLOGIES, NEPHANDI_FACTION, SEEMING, KITH, SEELIE_LEGACIES, \
-    UNSEELIE_LEGACIES, ARTS, REALMS, calculate_willpower, calculate_road, MORTALPLUS_TYPES, MORTALPLUS_POWERS, \
+    UNSEELIE_LEGACIES, ARTS, REALMS, MORTALPLUS_TYPES, MORTALPLUS_POWERS, \
     MORTALPLUS_POOLS
 
 from evennia.utils.ansi import ANSIString
 from world.wod20th.utils.damage import format_damage, format_status, format_damage_stacked
 from world.wod20th.utils.formatting import format_stat, header, footer, divider
+from world.wod20th.utils.sheet_cache import get_cached_sheet, cache_sheet
+from world.wod20th.utils.ability_layout import ABILITY_LAYOUTS, SECONDARY_COLUMNS
 from itertools import zip_longest
 from typeclasses.characters import Character
 
@@ -87,11 +89,6 @@ class CmdSheet(MuxCommand):
 
     def func(self):
         """Execute the command."""
-        # Initialize lists at the start of the function
-        self.pools_list = []
-        self.virtues_list = []
-        self.status_list = []
-
         name = self.args.strip()
         if not name:
             name = self.caller.key
@@ -142,6 +139,23 @@ class CmdSheet(MuxCommand):
         if not stats:
             character.db.stats = {}
 
+        # Staff see dbrefs in names, so they get their own cached copy
+        tier = 'staff' if self.caller.check_permstring("builders") else 'player'
+        width = self.client_width()
+        string = get_cached_sheet(character, tier, width)
+        if string is None:
+            string = self.render_sheet(character)
+            cache_sheet(character, tier, width, string)
+
+        # Send the complete sheet to the caller
+        self.caller.msg(string)
+
+    def render_sheet(self, character):
+        """Build the full sheet for character, as seen by the caller."""
+        self.pools_list = []
+        self.virtues_list = []
+        self.status_list = []
+
         string = header(f"Character Sheet for:|n {character.get_display_name(self.caller)}")
 
         string += header("Identity", width=78, color="|y")
@@ -375,72 +389,10 @@ class CmdSheet(MuxCommand):
         string += divider("Knowledges", width=25, fillchar=" ") + "\n"
 
 
-        def get_abilities_for_splat(character, stat_type):
-            """Helper function to get abilities for a specific splat and stat type"""
-            splat = character.db.stats.get('other', {}).get('splat', {}).get('Splat', {}).get('perm', '')
-            shifter_type = character.db.stats.get('identity', {}).get('lineage', {}).get('Type', {}).get('perm', '')
-            clan = character.db.stats.get('identity', {}).get('lineage', {}).get('Clan', {}).get('perm', '')
-
-            # Define base abilities for each category
-            BASE_ABILITIES = {
-                'talent': ['Alertness', 'Athletics', 'Awareness', 'Brawl', 'Empathy', 
-                          'Expression', 'Intimidation', 'Leadership', 'Streetwise', 'Subterfuge'],
-                'skill': ['Animal Ken', 'Crafts', 'Drive', 'Etiquette', 'Firearms', 
-                         'Larceny', 'Melee', 'Performance', 'Stealth', 'Survival', 'Technology'],
-                'knowledge': ['Academics', 'Computer', 'Cosmology', 'Enigmas', 'Finance', 'Investigation', 
-                            'Law', 'Medicine', 'Occult', 'Politics', 'Science']
-            }
-            
-            # Get base abilities first
-            abilities = list(Stat.objects.filter(
-                category='abilities',
-                stat_type=stat_type,
-                name__in=BASE_ABILITIES[stat_type]
-            ).order_by('name'))
-            
-            # Add splat-specific abilities
-            if splat == 'Shifter':
-                if stat_type == 'talent':
-                    # Add Primal-Urge for all shifters
-                    primal_urge = Stat.objects.filter(name='Primal-Urge').first()
-                    if primal_urge:
-                        # Insert Primal-Urge in alphabetical order
-                        insert_index = next((i for i, ability in enumerate(abilities) 
-                                           if ability.name > 'Primal-Urge'), len(abilities))
-                        abilities.insert(insert_index, primal_urge)
-                    
-                    # Add Flight ONLY for specific shifter types
-                    if shifter_type and shifter_type.strip() in ['Corax', 'Camazotz', 'Mokole']:
-                        flight = Stat.objects.filter(name='Flight').first()
-                        if flight:
-                            # Insert Flight in alphabetical order
-                            insert_index = next((i for i, ability in enumerate(abilities) 
-                                               if ability.name > 'Flight'), len(abilities))
-                            abilities.insert(insert_index, flight)
-                
-                elif stat_type == 'knowledge':
-                    # Add Rituals for all shifters
-                    rituals = Stat.objects.filter(name='Rituals').first()
-                    if rituals:
-                        # Insert Rituals in alphabetical order
-                        insert_index = next((i for i, ability in enumerate(abilities) 
-                                           if ability.name > 'Rituals'), len(abilities))
-                        abilities.insert(insert_index, rituals)
-            
-            # Add Flight for Gargoyle vampires
-            elif splat == 'Vampire' and clan and clan.strip() == 'Gargoyle' and stat_type == 'talent':
-                flight = Stat.objects.filter(name='Flight').first()
-                if flight:
-                    # Insert Flight in alphabetical order
-                    insert_index = next((i for i, ability in enumerate(abilities) 
-                                       if ability.name > 'Flight'), len(abilities))
-                    abilities.insert(insert_index, flight)
-
-            return abilities
-
-        talents = get_abilities_for_splat(character, 'talent')
-        skills = get_abilities_for_splat(character, 'skill')
-        knowledges = get_abilities_for_splat(character, 'knowledge')
+        layout = ABILITY_LAYOUTS.for_character(character)
+        talents = layout.primary['talent']
+        skills = layout.primary['skill']
+        knowledges = layout.primary['knowledge']
 
         # Function to format abilities with padding for skills and knowledges
         def format_ability(ability, category):
@@ -490,9 +442,6 @@ class CmdSheet(MuxCommand):
         string += divider("Skills", width=25, fillchar=" ") + " "
         string += divider("Knowledges", width=25, fillchar=" ") + "\n"
 
-        # Get splat-specific secondary abilities
-        splat = character.db.stats.get('other', {}).get('splat', {}).get('Splat', {}).get('perm', '')
-
         # Function to format abilities with padding for skills and knowledges
         def format_secondary_ability(ability_name, category):
             value = character.get_stat('secondary_abilities', category, ability_name)
@@ -501,52 +450,10 @@ class CmdSheet(MuxCommand):
                 return " " * 1 + formatted.ljust(22)
             return formatted.ljust(25)
 
-        # Initialize empty lists for each category
-        formatted_secondary_talents = []
-        formatted_secondary_skills = []
-        formatted_secondary_knowledges = []
-
-        # Base secondary abilities for all characters
-        base_secondary_talents = ['Carousing', 'Diplomacy', 'Intrigue', 'Mimicry', 'Scrounging', 'Seduction', 'Style']
-        base_secondary_skills = ['Archery', 'Fortune-Telling', 'Fencing', 'Gambling', 'Jury-Rigging', 'Pilot', 'Torture']
-        base_secondary_knowledges = ['Area Knowledge', 'Cultural Savvy', 'Demolitions', 'Herbalism', 'Media', 'Power-Brokering', 'Vice']
-
-        # Add base secondary abilities for all characters
-        formatted_secondary_talents.extend([
-            format_secondary_ability(talent, 'secondary_talent')
-            for talent in base_secondary_talents
-        ])
-        formatted_secondary_skills.extend([
-            format_secondary_ability(skill, 'secondary_skill')
-            for skill in base_secondary_skills
-        ])
-        formatted_secondary_knowledges.extend([
-            format_secondary_ability(knowledge, 'secondary_knowledge')
-            for knowledge in base_secondary_knowledges
-        ])
-
-        # If character is a Mage, add Mage-specific secondary abilities
-        if splat.lower() == 'mage':
-            # Secondary Talents
-            mage_secondary_talents = ['High Ritual', 'Blatancy']
-            formatted_secondary_talents.extend([
-                format_secondary_ability(talent, 'secondary_talent')
-                for talent in mage_secondary_talents
-            ])
-
-            # Secondary Skills
-            mage_secondary_skills = ['Microgravity Ops', 'Energy Weapons', 'Helmsman', 'Biotech']
-            formatted_secondary_skills.extend([
-                format_secondary_ability(skill, 'secondary_skill')
-                for skill in mage_secondary_skills
-            ])
-
-            # Secondary Knowledges
-            mage_secondary_knowledges = ['Hypertech', 'Cybernetics', 'Paraphysics', 'Xenobiology']
-            formatted_secondary_knowledges.extend([
-                format_secondary_ability(knowledge, 'secondary_knowledge')
-                for knowledge in mage_secondary_knowledges
-            ])
+        formatted_secondary_talents, formatted_secondary_skills, formatted_secondary_knowledges = (
+            [format_secondary_ability(name, category) for name in layout.secondary[category]]
+            for category in SECONDARY_COLUMNS
+        )
 
         # For secondary abilities
         max_len = max(
@@ -736,9 +643,7 @@ class CmdSheet(MuxCommand):
 
         # Process pools based on splat
         if splat.lower() == 'vampire':
-            # Get generation for blood pool calculation
-            generation = character.db.stats.get('identity', {}).get('lineage', {}).get('Generation', {}).get('perm', '13th')
-            max_blood = calculate_blood_pool(generation)
+            max_blood = character.derived.blood_pool
             
             self.pools_list.append(format_stat('Blood Pool', f"{format_pool_value(character, 'Blood')}/{max_blood}", width=25))
             self.pools_list.append(format_stat('Willpower', format_pool_value(character, 'Willpower'), width=25))
@@ -823,7 +728,7 @@ class CmdSheet(MuxCommand):
                     self.virtues_list.append(f" {virtue}{dots}{virtue_value}".ljust(25))
                 
                 # Add Humanity
-                humanity_value = calculate_road(character)
+                humanity_value = character.derived.road
                 dots = "." * (19 - len("Humanity"))
                 self.virtues_list.append(f" Humanity{dots}{humanity_value}".ljust(25))
             else:
@@ -859,8 +764,7 @@ class CmdSheet(MuxCommand):
         else:
             string += header("Unapproved Character", width=78, fillchar="-")
 
-        # Send the complete sheet to the caller
-        self.caller.msg(string)
+        return string
 
 def format_pool_value(character, pool_name):
     """Format a pool value with both permanent and temporary values."""
@@ -874,40 +778,6 @@ def format_pool_value(character, pool_name):
 
     return f"{perm}({temp})" if temp != perm else str(perm)
 
-def calculate_blood_pool(generation):
-    """
-    Calculate blood pool based on vampire generation.
-    
-    Args:
-        generation (str): Character's generation (e.g. '7th', '13th')
-        
-    Returns:
-        int: Maximum blood pool for that generation
-    """
-    # Extract number from generation string and convert to int
-    try:
-        gen_num = int(''.join(filter(str.isdigit, str(generation))))
-    except (ValueError, TypeError):
-        gen_num = 13  # Default to 13th generation if invalid/missing
-
-    # Calculate blood pool based on generation
-    if gen_num >= 13:
-        return 10
-    elif gen_num == 12:
-        return 11
-    elif gen_num == 11:
-        return 12
-    elif gen_num == 10:
-        return 13
-    elif gen_num == 9:
-        return 14
-    elif gen_num == 8:
-        return 15
-    elif gen_num == 7:
-        return 20
-    else:
-        return 10  # Default to 10 for any unexpected values
-
 def format_pool_value(character, pool_name):
     """Format a pool value with both permanent and temporary values."""
     perm = character.get_stat('pools', 'dual', pool_name, temp=False)
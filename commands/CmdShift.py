@@ -3,8 +3,9 @@ from unicodedata import category
 from evennia import default_cmds
 from evennia.utils import evtable
 from typeclasses.characters import Character
-from world.wod20th.models import ShapeshifterForm, Stat
+from world.wod20th.models import ShapeshifterForm
 from world.wod20th.utils.formatting import format_stat
+from world.wod20th.utils.form_modifiers import FORM_MODIFIERS, CompiledForm
 
 from random import randint
 from typing import List, Tuple
@@ -58,6 +59,7 @@ class CmdShift(default_cmds.MuxCommand):
       +shift/setdeedname <deed name>
       +shift/setformname <form name> = <form-specific name>
       +shift/name <form name> = <new name>
+      +shift/pool <form name> = <stat>+<stat>...
       +shift/list
 
     Switches:
@@ -67,6 +69,7 @@ class CmdShift(default_cmds.MuxCommand):
       /setdeedname - Set your character's deed name for use in most shifted forms
       /setformname - Set a specific name for the character when in a particular form
       /name - Set a new name for the form you're shifting into
+      /pool - Show what a dice pool would be in a form, without shifting
       /list - Display all available forms for your character
 
     This command allows you to change your character's shapeshifter form.
@@ -77,6 +80,8 @@ class CmdShift(default_cmds.MuxCommand):
     The /setdeedname switch sets your character's deed name for use in most shifted forms.
     The /setformname switch lets you set a specific name for your character when in a particular form.
     The /name switch allows you to set a new name for the form you're shifting into.
+    The /pool switch shows a dice pool as it would be in another form, e.g.
+    +shift/pool crinos = str+brawl
     The /list switch displays all available forms for your character.
 
     In shift messages, use {truename} for the character's true name, {deedname} for the deed name,
@@ -148,33 +153,29 @@ class CmdShift(default_cmds.MuxCommand):
         elif "name" in self.switches:
             self._set_form_name_with_shift(character)
             return
+        elif "pool" in self.switches:
+            self._show_form_pool(character)
+            return
 
         form_name = self.args.strip()
-        try:
-            # Get the character's shifter type
-            shifter_type = self.caller.db.stats.get('identity', {}).get('lineage', {}).get('Type', {}).get('perm', '').lower()
-            
-            # Look up form by both name and shifter type
-            form = ShapeshifterForm.objects.get(
-                name__iexact=form_name,
-                shifter_type=shifter_type
-            )
-        except ShapeshifterForm.DoesNotExist:
+        compiled = self._get_compiled_form(character, form_name)
+        if not compiled:
             self.caller.msg(f"The form '{form_name}' is not available to your shifter type.")
             return
-        except ShapeshifterForm.MultipleObjectsReturned:
-            self.caller.msg(f"Error: Multiple forms found with name '{form_name}'. Please contact an admin.")
-            return
-
-        if "roll" in self.switches:
-            success = self._shift_with_roll(character, form)
-        elif "rage" in self.switches:
-            success = self._shift_with_rage(character, form)
-        else:
-            success = self._shift_default(character, form)
-
+        form = compiled.form
+
+        # Rage spend, reset and form modifiers are saved together
+        with character.stats.batch():
+            if "roll" in self.switches:
+                success = self._shift_with_roll(character, form)
+            elif "rage" in self.switches:
+                success = self._shift_with_rage(character, form)
+            else:
+                success = self._shift_default(character, form)
+
+            if success:
+                self._apply_form_changes(character, form)
         if success:
-            self._apply_form_changes(character, form)
             self._display_shift_message(character, form)
 
     def is_valid_character(self, obj):
@@ -183,6 +184,33 @@ class CmdShift(default_cmds.MuxCommand):
         """
         return True
 
+    def _get_compiled_form(self, character, form_name):
+        """Look up a form by name for the character's shifter type."""
+        shifter_type = character.get_stat('identity', 'lineage', 'Type', temp=False) or ''
+        return FORM_MODIFIERS.get(shifter_type, form_name)
+
+    def _show_form_pool(self, character):
+        """Show a dice pool as it would be in a form, without shifting."""
+        if "=" not in self.args:
+            self.caller.msg("Usage: +shift/pool <form name> = <stat>+<stat>...")
+            return
+
+        form_name, pool = self.args.split("=", 1)
+        form_name = form_name.strip()
+        terms = [term.strip() for term in pool.split("+") if term.strip()]
+        if not terms:
+            self.caller.msg("Usage: +shift/pool <form name> = <stat>+<stat>...")
+            return
+
+        compiled = self._get_compiled_form(character, form_name)
+        if not compiled:
+            self.caller.msg(f"The form '{form_name}' is not available to your shifter type.")
+            return
+
+        total, parts = compiled.dice_pool(character.stats, terms)
+        breakdown = " + ".join(f"{name} {value}" for name, value in parts)
+        self.caller.msg(f"In {compiled.name} form: {breakdown} = |w{total}|n dice.")
+
     def _list_available_forms(self):
         character = self.caller
         shifter_type = character.db.stats.get('identity', {}).get('lineage', {}).get('Type', {}).get('perm', '').lower()
@@ -238,19 +266,11 @@ class CmdShift(default_cmds.MuxCommand):
 
     def _reset_stats(self, character):
         """Reset all stats to their permanent values."""
-        for category, subcats in character.db.stats.items():
-            if isinstance(subcats, dict):
-                for subcat, stats in subcats.items():
-                    if isinstance(stats, dict):
-                        for stat, values in stats.items():
-                            if isinstance(values, dict) and 'perm' in values:
-                                # Reset temp to match perm
-                                perm_value = values['perm']
-                                character.db.stats[category][subcat][stat] = {
-                                    'perm': perm_value,
-                                    'temp': perm_value
-                                }
-                                print(f"DEBUG: Reset {category}.{subcat}.{stat} to perm={perm_value}, temp={perm_value}")
+        character.stats.bulk_set(
+            [(category, stat_type, name, perm)
+             for category, stat_type, name, perm, _temp in character.stats.items()],
+            temp=True
+        )
 
     def _shift_with_roll(self, character, form):
         """Attempt to shift using a dice roll."""
@@ -278,10 +298,10 @@ class CmdShift(default_cmds.MuxCommand):
             return False
 
     def _shift_with_rage(self, character, form):
-        current_rage = character.db.stats.get('pools', {}).get('dual', {}).get('Rage', {}).get('temp', 0)
+        current_rage = character.stats.get('pools', 'dual', 'Rage', temp=True, default=0)
         if current_rage >= 1:
             # Spend 1 Rage point for automatic shift
-            character.db.stats['pools']['dual']['Rage']['temp'] = current_rage - 1
+            character.stats.set('pools', 'dual', 'Rage', current_rage - 1, temp=True)
             self.caller.msg(f"You spend a point of Rage to force the change into {form.name} form. (Remaining Rage: {current_rage - 1})")
             return True
         else:
@@ -308,21 +328,17 @@ class CmdShift(default_cmds.MuxCommand):
         """Apply form changes and preserve abilities."""
         # If it's Homid form, reset everything to base stats
         if form.name.lower() == 'homid':
-            print(f"DEBUG: Setting Homid form for {character.name}")
             character.attributes.add('current_form', 'Homid')
             character.db.current_form = 'Homid'
             character.db.display_name = character.key
             
             # Reset all attributes to their permanent values
-            for category in ['physical', 'social', 'mental']:
-                if category in character.db.stats.get('attributes', {}):
-                    for stat, values in character.db.stats['attributes'][category].items():
-                        perm_value = values.get('perm', 0)
-                        character.db.stats['attributes'][category][stat] = {
-                            'perm': perm_value,
-                            'temp': perm_value
-                        }
-                        print(f"DEBUG: Reset {category}.{stat} to perm={perm_value}, temp={perm_value}")
+            character.stats.bulk_set(
+                [(category, stat_type, name, perm)
+                 for category, stat_type, name, perm, _temp in character.stats.items('attributes')
+                 if stat_type in ('physical', 'social', 'mental')],
+                temp=True
+            )
             return
         
         # For non-Homid forms
@@ -434,9 +450,11 @@ class CmdShift(default_cmds.MuxCommand):
         self.caller.msg(f"Your name for {form_name} form set to: {new_name}")
 
         # Perform the shift
-        success = self._shift_default(character, form)
+        with character.stats.batch():
+            success = self._shift_default(character, form)
+            if success:
+                self._apply_form_changes(character, form)
         if success:
-            self._apply_form_changes(character, form)
             self._display_shift_message(character, form)
 
     def _get_form_name(self, character, form):
@@ -445,67 +463,8 @@ class CmdShift(default_cmds.MuxCommand):
         return character.attributes.get(f"form_name_{form.name.lower()}", character.db.deed_name or character.db.gradient_name or character.key)
 
     def _apply_form_modifiers(self, character, form):
-        """Apply stat modifiers from the form."""
-        # If shifting to Homid, just reset stats to permanent values
-        if form.name.lower() == 'homid':
-            self._reset_stats(character)
-            return
-        
-        # For non-Homid forms, first reset all stats to permanent values
-        self._reset_stats(character)
-        
-        # List of forms that set Appearance to 0
-        zero_appearance_forms = [
-            'crinos',      # All shapeshifters
-            'anthros',     # Ajaba war form
-            'arthren',     # Gurahl war form
-            'sokto',       # Bastet war form
-            'chatro'       # Bastet battle form
-        ]
-
-        # Then apply form modifiers
-        for stat, mod in form.stat_modifiers.items():
-            stat_obj = Stat.objects.get(name__iexact=stat, category='attributes')
-            if stat_obj.category and stat_obj.stat_type:
-                # Get permanent value
-                perm_value = character.get_stat(stat_obj.category, stat_obj.stat_type, stat_obj.name, temp=False)
-                # Calculate new temporary value
-                temp_value = max(0, perm_value + mod)  # Ensure non-negative
-                
-                # Ensure the category and subcategory exist
-                if stat_obj.category not in character.db.stats:
-                    character.db.stats[stat_obj.category] = {}
-                if stat_obj.stat_type not in character.db.stats[stat_obj.category]:
-                    character.db.stats[stat_obj.category][stat_obj.stat_type] = {}
-                
-                # Set both permanent and temporary values
-                character.db.stats[stat_obj.category][stat_obj.stat_type][stat_obj.name] = {
-                    'perm': perm_value,
-                    'temp': temp_value
-                }
-                print(f"DEBUG: Set {stat} perm={perm_value}, temp={temp_value}")
-
-        # Handle Appearance last (after other modifiers)
-        if form.name.lower() in zero_appearance_forms:
-            # Get the permanent Appearance value
-            appearance_perm = character.db.stats.get('attributes', {}).get('social', {}).get('Appearance', {}).get('perm', 0)
-            
-            # Ensure the social subcategory exists
-            if 'social' not in character.db.stats['attributes']:
-                character.db.stats['attributes']['social'] = {}
-            
-            # Set Appearance with permanent value preserved but temp value at 0
-            character.db.stats['attributes']['social']['Appearance'] = {
-                'perm': appearance_perm,
-                'temp': 0
-            }
-            print(f"DEBUG: Set Appearance perm={appearance_perm}, temp=0")
-            
-            # Also handle Manipulation in Crinos form
-            if form.name.lower() == 'crinos':
-                manip_perm = character.db.stats.get('attributes', {}).get('social', {}).get('Manipulation', {}).get('perm', 0)
-                character.db.stats['attributes']['social']['Manipulation'] = {
-                    'perm': manip_perm,
-                    'temp': max(0, manip_perm - 2)  # -2 penalty in Crinos
-                }
-                print(f"DEBUG: Set Manipulation perm={manip_perm}, temp={max(0, manip_perm - 2)}")
+        """Reset stats to their permanent values and apply the form's modifiers in one write."""
+        compiled = FORM_MODIFIERS.get(form.shifter_type, form.name)
+        if compiled is None or compiled.form.pk != form.pk:
+            compiled = CompiledForm(form)
+        character.stats.bulk_set(compiled.shift_entries(character.stats), temp=True)
@@ -1,5 +1,6 @@
 from evennia.commands.default.muxcommand import MuxCommand
 from evennia.utils.utils import time_format
+from world.wod20th.utils.plane_state import in_umbra
 
 class CmdUmbraInteraction(MuxCommand):
     """
@@ -42,7 +43,7 @@ class CmdUmbraInteraction(MuxCommand):
     def do_step(self):
         """Handle stepping into or out of the Umbra."""
         # If already in Umbra, just return to material world
-        if self.caller.tags.get("in_umbra", category="state"):
+        if in_umbra(self.caller):
             if self.caller.location.return_from_umbra(self.caller):
                 self.caller.msg("You have returned to the material world.")
             else:
@@ -68,7 +69,6 @@ class CmdUmbraInteraction(MuxCommand):
             
             # Attempt to step sideways
             if room.step_sideways(self.caller):
-                self.caller.tags.add("in_umbra", category="state")
                 self.caller.msg("You have stepped sideways into the Umbra.")
             else:
                 self.caller.msg("You failed to step sideways into the Umbra.")
@@ -78,7 +78,7 @@ class CmdUmbraInteraction(MuxCommand):
 
     def do_peek(self):
         """Handle peeking across the Gauntlet."""
-        if self.caller.tags.get("in_umbra", category="state"):
+        if in_umbra(self.caller):
             self.caller.msg("You're already in the Umbra. Use +step to return to the material world.")
         else:
             # Get the peek result and handle any line breaks
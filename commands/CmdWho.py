@@ -2,6 +2,7 @@ import time
 from evennia import SESSION_HANDLER as evennia
 from evennia.utils import utils
 from world.wod20th.utils.formatting import header, footer, divider
+from world.wod20th.utils.plane_state import in_umbra
 from evennia.utils.utils import class_from_module
 from evennia.utils.ansi import strip_ansi
 from django.conf import settings
@@ -36,7 +37,7 @@ class CmdWho(COMMAND_DEFAULT_CLASS):
             name_suffix = ""
             if puppet.check_permstring("builders"):
                 name_suffix += f"*{name_suffix}"
-            if puppet.tags.has("in_umbra", category="state"):
+            if in_umbra(puppet):
                 name_suffix = f"@{name_suffix}"
             if puppet.db.lfrp:
                 name_suffix = f"${name_suffix}"
@@ -2,8 +2,10 @@ from evennia import default_cmds
 from evennia.utils.search import search_object
 from evennia.utils.evtable import EvTable
 from datetime import datetime
+from django.utils import timezone
 from decimal import Decimal, ROUND_DOWN, InvalidOperation
 from typeclasses.characters import Character
+from world.wod20th.utils.scene_tracker import SCENES
 
 class CmdXP(default_cmds.MuxCommand):
     """
@@ -182,28 +184,19 @@ class CmdXP(default_cmds.MuxCommand):
 
             if "endscene" in self.switches:
                 caller = self.caller
-                if not caller.db.scene_data or not caller.db.scene_data['current_scene']:
+                session = SCENES.current(caller)
+                if not session:
                     caller.msg("You don't have an active scene to end.")
                     return
 
-                # Get all players in the room
-                players_in_room = [
-                    obj for obj in caller.location.contents 
-                    if (hasattr(obj, 'has_account') and 
-                        obj.has_account and 
-                        obj.db.in_umbra == caller.db.in_umbra)
-                ]
-
                 caller.msg("\n|wEnding scene for all participants...|n")
 
-                # End scene for each player
-                for player in players_in_room:
-                    if (hasattr(player.db, 'scene_data') and 
-                        player.db.scene_data and 
-                        player.db.scene_data['current_scene']):
-                        player.end_scene()
-                        player.msg("\n|wScene ended by {}.|n".format(caller.name))
-                        self._display_xp(player)
+                # End scene for each participant
+                for record in SCENES.end_scene(session.room, session.plane).values():
+                    player = record.character
+                    player.report_scene_end(record)
+                    player.msg("\n|wScene ended by {}.|n".format(caller.name))
+                    self._display_xp(player)
 
                 # Announce scene end to room
                 caller.location.msg_contents(
@@ -354,8 +347,7 @@ class CmdXP(default_cmds.MuxCommand):
             try:
                 # Find all character objects that:
                 # 1. Are not staff
-                # 2. Have scene data
-                # 3. Have completed at least one scene this week
+                # 2. Have completed at least one scene this week
                 characters = Character.objects.filter(
                     db_typeclass_path__contains='characters.Character'
                 )
@@ -363,15 +355,14 @@ class CmdXP(default_cmds.MuxCommand):
                 base_xp = Decimal('4.00')
                 awarded_count = 0
                 
+                completed = SCENES.completed_counts()
                 for char in characters:
                     # Skip if character is staff
                     if hasattr(char, 'check_permstring') and char.check_permstring("builders"):
                         continue
                         
-                    # Skip if no scene data or no completed scenes
-                    if (not hasattr(char, 'db') or 
-                        not char.db.scene_data or 
-                        not char.db.scene_data.get('completed_scenes', 0)):
+                    # Skip if no completed scenes
+                    if not completed.get(char.id) and not (char.db.scene_data or {}).get('completed_scenes', 0):
                         continue
                         
                     # Award XP if they've participated in scenes
@@ -487,44 +478,34 @@ class CmdXP(default_cmds.MuxCommand):
         footer = f"{'|b-|n' * total_width}"
         
         # Add scene tracking status
-        scene_data = character.db.scene_data
-        if scene_data:
-            scene_title = "|y Scene Status |n"
-            scene_title_len = len(scene_title)
-            scene_dash_count = (total_width - scene_title_len) // 2
-            scene_header = f"{'|b-|n' * scene_dash_count}{scene_title}{'|b-|n' * (total_width - scene_dash_count - scene_title_len)}\n"
-            
-            scene_section = ""
-            if scene_data['current_scene']:
-                duration = (datetime.now() - scene_data['current_scene']).total_seconds() / 60
-                scene_section += f"Current scene duration: {int(duration)} minutes\n"
-                if scene_data['last_activity']:
-                    last_activity = (datetime.now() - scene_data['last_activity']).total_seconds() / 60
-                    scene_section += f"Last activity: {int(last_activity)} minutes ago\n"
-            else:
-                scene_section += "No active scene\n"
-            
-            scene_section += f"Completed scenes this week: {scene_data['completed_scenes']}\n"
-            
-            display = (
-                header +
-                exp_header +
-                exp_section +
-                activity_header +
-                activity_section +
-                scene_header +
-                scene_section +
-                footer
-            )
+        record, completed = SCENES.status(character)
+        scene_title = "|y Scene Status |n"
+        scene_title_len = len(scene_title)
+        scene_dash_count = (total_width - scene_title_len) // 2
+        scene_header = f"{'|b-|n' * scene_dash_count}{scene_title}{'|b-|n' * (total_width - scene_dash_count - scene_title_len)}\n"
+
+        scene_section = ""
+        if record:
+            now = timezone.now()
+            duration = (now - record.started_at).total_seconds() / 60
+            scene_section += f"Current scene duration: {int(duration)} minutes\n"
+            last_activity = (now - record.last_activity).total_seconds() / 60
+            scene_section += f"Last activity: {int(last_activity)} minutes ago\n"
         else:
-            display = (
-                header +
-                exp_header +
-                exp_section +
-                activity_header +
-                activity_section +
-                footer
-            )
+            scene_section += "No active scene\n"
+
+        scene_section += f"Completed scenes this week: {completed}\n"
+
+        display = (
+            header +
+            exp_header +
+            exp_section +
+            activity_header +
+            activity_section +
+            scene_header +
+            scene_section +
+            footer
+        )
         
         self.caller.msg(display) 
 
@@ -316,3 +316,46 @@ class CmdTestLock(MuxCommand):
             import traceback
             self.caller.msg(traceback.format_exc())
 
+
+
+class CmdOutputStats(MuxCommand):
+    """
+    Show how much output is being sent to the Portal
+
+    Usage:
+        @outputstats
+        @outputstats/reset
+        @outputstats/off
+        @outputstats/on
+
+    Messages are msg() calls to a session; sends are payloads that
+    actually cross the Server -> Portal link. While a command runs, each
+    session's output is held and sent as one payload at the end. Use
+    /off and /on to compare with and without that buffering, and /reset
+    to zero the counters in between.
+    """
+
+    key = "@outputstats"
+    locks = "cmd:perm(Admin)"
+    help_category = "Admin"
+
+    def func(self):
+        from world.wod20th.utils.output_buffer import OUTPUT_BUFFER, OUTPUT_STATS, reset_output_stats
+
+        if "reset" in self.switches:
+            reset_output_stats()
+            self.caller.msg("Output counters reset.")
+            return
+        if "off" in self.switches or "on" in self.switches:
+            OUTPUT_BUFFER.enabled = "on" in self.switches
+            self.caller.msg(f"Output buffering {'enabled' if OUTPUT_BUFFER.enabled else 'disabled'}.")
+            return
+
+        messages, sends = OUTPUT_STATS['messages'], OUTPUT_STATS['sends']
+        self.caller.msg(
+            f"Output buffering: {'on' if OUTPUT_BUFFER.enabled else 'off'}\n"
+            f"Commands: {OUTPUT_STATS['commands']}\n"
+            f"Messages: {messages}\n"
+            f"Portal sends: {sends}"
+            + (f" ({messages / sends:.1f} messages per send)" if sends else "")
+        )
@@ -2,11 +2,19 @@
 
 from evennia import Command
 from evennia.utils.evmenu import EvMenu
-from world.wod20th.models import Stat, SHIFTER_IDENTITY_STATS, SHIFTER_RENOWN, SHIFTER_RENOWN, CLAN, MAGE_FACTION, MAGE_SPHERES, TRADITION, TRADITION_SUBFACTION, CONVENTION, METHODOLOGIES, NEPHANDI_FACTION, SEEMING, KITH, SEELIE_LEGACIES, UNSEELIE_LEGACIES, ARTS, REALMS, calculate_willpower, calculate_road
+from world.wod20th.models import SHIFTER_IDENTITY_STATS, SHIFTER_RENOWN, SHIFTER_RENOWN, CLAN, MAGE_FACTION, MAGE_SPHERES, TRADITION, TRADITION_SUBFACTION, CONVENTION, METHODOLOGIES, NEPHANDI_FACTION, SEEMING, KITH, SEELIE_LEGACIES, UNSEELIE_LEGACIES, ARTS, REALMS
 from typeclasses.characters import Character
 from evennia.commands.default.muxcommand import MuxCommand
 from world.jobs.models import Job, Queue
 from django.utils import timezone
+from world.wod20th.utils.stat_catalog import STAT_CATALOG
+from world.wod20th.utils.ability_layout import ABILITY_LAYOUTS, CHARGEN_COLUMNS
+
+
+def _lineage_stats(name):
+    """Return the identity/lineage stat definitions with the given name."""
+    return [stat for stat in STAT_CATALOG.filter_name(name)
+            if stat.category == "identity" and stat.stat_type == "lineage"]
 
 class CmdCharGen(Command):
     """
@@ -58,81 +66,85 @@ def _apply_chargen_data(caller):
     if not caller.db.stats:
         caller.db.stats = {}
 
-    # Apply splat
-    splat = chargen_data.get('splat', '')
-    caller.db.stats['other'] = {'splat': {'Splat': {'perm': splat}}}
-
-    # Apply basic information
-    caller.db.concept = chargen_data.get('concept', '')
-    caller.db.nature = chargen_data.get('nature', '')
-    caller.db.demeanor = chargen_data.get('demeanor', '')
-    caller.db.clan = chargen_data.get('clan', '')
-
-    # Apply attributes
-    for category, attributes in chargen_data.get('attributes', {}).items():
-        for attr, value in attributes.items():
-            caller.set_stat(category, 'attribute', attr, value)
-
-    # Apply abilities
-    for category, abilities in chargen_data.get('abilities', {}).items():
-        for ability, value in abilities.items():
-            caller.set_stat(category, 'ability', ability, value)
-
-    # Apply disciplines or other splat-specific powers
-    splat = caller.db.stats.get('other', {}).get('splat', {}).get('Splat', {}).get('perm', '')
-    if splat.lower() == 'vampire':
-        for discipline, value in chargen_data.get('disciplines', {}).items():
-            caller.set_stat('powers', 'discipline', discipline, value)
-    elif splat.lower() == 'mage':
-        for sphere, value in chargen_data.get('spheres', {}).items():
-            caller.set_stat('powers', 'sphere', sphere, value)
-    elif splat.lower() == 'changeling':
-        for art, value in chargen_data.get('arts', {}).items():
-            caller.set_stat('powers', 'art', art, value)
-        for realm, value in chargen_data.get('realms', {}).items():
-            caller.set_stat('powers', 'realm', realm, value)
-    elif splat.lower() == 'shifter':
-        for gift, value in chargen_data.get('gifts', {}).items():
-            caller.set_stat('powers', 'gift', gift, value)
-
-    # Apply backgrounds
-    for background, value in chargen_data.get('backgrounds', {}).items():
-        caller.set_stat('backgrounds', 'background', background, value)
-
-    # Apply virtues
-    for virtue, value in chargen_data.get('virtues', {}).items():
-        caller.set_stat('virtues', 'moral', virtue, value)
-
-    # Apply splat-specific stats
-    if splat.lower() == 'vampire':
-        caller.set_stat('pools', 'dual', 'Blood', 10, temp=False)
-        caller.set_stat('pools', 'dual', 'Blood', 10, temp=True)
-    elif splat.lower() == 'shifter':
-        caller.set_stat('pools', 'dual', 'Gnosis', 1, temp=False)
-        caller.set_stat('pools', 'dual', 'Gnosis', 1, temp=True)
-        caller.set_stat('pools', 'dual', 'Rage', 1, temp=False)
-        caller.set_stat('pools', 'dual', 'Rage', 1, temp=True)
-    elif splat.lower() == 'mage':
-        caller.set_stat('pools', 'dual', 'Quintessence', 1, temp=False)
-        caller.set_stat('pools', 'dual', 'Quintessence', 1, temp=True)
-        caller.set_stat('pools', 'dual', 'Paradox', 0, temp=False)
-        caller.set_stat('pools', 'dual', 'Paradox', 0, temp=True)
-        caller.set_stat('other', 'advantage', 'Arete', 1, temp=False)
-    elif splat.lower() == 'changeling':
-        caller.set_stat('pools', 'dual', 'Glamour', 1, temp=False)
-        caller.set_stat('pools', 'dual', 'Glamour', 1, temp=True)
-        caller.set_stat('pools', 'dual', 'Banality', 5, temp=False)
-        caller.set_stat('pools', 'dual', 'Banality', 5, temp=True)
-
-    # Calculate and set Willpower
-    new_willpower = calculate_willpower(caller)
-    caller.set_stat('pools', 'dual', 'Willpower', new_willpower, temp=False)
-    caller.set_stat('pools', 'dual', 'Willpower', new_willpower, temp=True)
-
-    # Calculate and set Road (for Vampires)
-    if splat.lower() == 'vampire':
-        new_road = calculate_road(caller)
-        caller.set_stat('pools', 'moral', 'Road', new_road, temp=False)
+    # Buffer every stat change and save the sheet once at the end
+    with caller.stats.batch():
+        # Apply splat
+        splat = chargen_data.get('splat', '')
+        for category, stat_type, name, _perm, _temp in list(caller.stats.items('other')):
+            caller.stats.remove(category, stat_type, name)
+        caller.stats.set('other', 'splat', 'Splat', splat)
+
+        # Apply basic information
+        caller.db.concept = chargen_data.get('concept', '')
+        caller.db.nature = chargen_data.get('nature', '')
+        caller.db.demeanor = chargen_data.get('demeanor', '')
+        caller.db.clan = chargen_data.get('clan', '')
+
+        # Apply attributes
+        for category, attributes in chargen_data.get('attributes', {}).items():
+            for attr, value in attributes.items():
+                caller.set_stat(category, 'attribute', attr, value)
+
+        # Apply abilities
+        for category, abilities in chargen_data.get('abilities', {}).items():
+            for ability, value in abilities.items():
+                caller.set_stat(category, 'ability', ability, value)
+
+        # Apply disciplines or other splat-specific powers
+        splat = caller.stats.get('other', 'splat', 'Splat', default='')
+        if splat.lower() == 'vampire':
+            for discipline, value in chargen_data.get('disciplines', {}).items():
+                caller.set_stat('powers', 'discipline', discipline, value)
+        elif splat.lower() == 'mage':
+            for sphere, value in chargen_data.get('spheres', {}).items():
+                caller.set_stat('powers', 'sphere', sphere, value)
+        elif splat.lower() == 'changeling':
+            for art, value in chargen_data.get('arts', {}).items():
+                caller.set_stat('powers', 'art', art, value)
+            for realm, value in chargen_data.get('realms', {}).items():
+                caller.set_stat('powers', 'realm', realm, value)
+        elif splat.lower() == 'shifter':
+            for gift, value in chargen_data.get('gifts', {}).items():
+                caller.set_stat('powers', 'gift', gift, value)
+
+        # Apply backgrounds
+        for background, value in chargen_data.get('backgrounds', {}).items():
+            caller.set_stat('backgrounds', 'background', background, value)
+
+        # Apply virtues
+        for virtue, value in chargen_data.get('virtues', {}).items():
+            caller.set_stat('virtues', 'moral', virtue, value)
+
+        # Apply splat-specific stats
+        if splat.lower() == 'vampire':
+            caller.set_stat('pools', 'dual', 'Blood', 10, temp=False)
+            caller.set_stat('pools', 'dual', 'Blood', 10, temp=True)
+        elif splat.lower() == 'shifter':
+            caller.set_stat('pools', 'dual', 'Gnosis', 1, temp=False)
+            caller.set_stat('pools', 'dual', 'Gnosis', 1, temp=True)
+            caller.set_stat('pools', 'dual', 'Rage', 1, temp=False)
+            caller.set_stat('pools', 'dual', 'Rage', 1, temp=True)
+        elif splat.lower() == 'mage':
+            caller.set_stat('pools', 'dual', 'Quintessence', 1, temp=False)
+            caller.set_stat('pools', 'dual', 'Quintessence', 1, temp=True)
+            caller.set_stat('pools', 'dual', 'Paradox', 0, temp=False)
+            caller.set_stat('pools', 'dual', 'Paradox', 0, temp=True)
+            caller.set_stat('other', 'advantage', 'Arete', 1, temp=False)
+        elif splat.lower() == 'changeling':
+            caller.set_stat('pools', 'dual', 'Glamour', 1, temp=False)
+            caller.set_stat('pools', 'dual', 'Glamour', 1, temp=True)
+            caller.set_stat('pools', 'dual', 'Banality', 5, temp=False)
+            caller.set_stat('pools', 'dual', 'Banality', 5, temp=True)
+
+        # Calculate and set Willpower
+        new_willpower = caller.derived.willpower
+        caller.set_stat('pools', 'dual', 'Willpower', new_willpower, temp=False)
+        caller.set_stat('pools', 'dual', 'Willpower', new_willpower, temp=True)
+
+        # Calculate and set Road (for Vampires)
+        if splat.lower() == 'vampire':
+            new_road = caller.derived.road
+            caller.set_stat('pools', 'moral', 'Road', new_road, temp=False)
 
     # Clear chargen data
     caller.attributes.remove('chargen')
@@ -245,7 +257,7 @@ def _set_splat(caller, raw_string, **kwargs):
 
 def node_vampire_clan(caller):
     text = "Choose your vampire clan:"
-    clans = Stat.objects.filter(category="identity", stat_type="lineage", name="Clan")
+    clans = _lineage_stats("Clan")
     options = [{"key": str(i+1), "desc": clan, "goto": (_set_clan, {"clan": clan})} 
                for i, clan in enumerate(clans[0].values)]
     options.append({"key": "0", "desc": "Return to main menu", "goto": "node_start"})
@@ -359,13 +371,13 @@ def _set_mage_faction(caller, raw_string, **kwargs):
 
 def node_mage_tradition(caller):
     text = "Choose your mage tradition:"
-    traditions = Stat.objects.filter(category="identity", stat_type="lineage", name="Tradition")
-    if not traditions.exists():
+    traditions = _lineage_stats("Tradition")
+    if not traditions:
         caller.msg("No traditions found in the database. Please contact an admin.")
         return "node_start"
     
     options = []
-    for i, tradition in enumerate(traditions.first().values):
+    for i, tradition in enumerate(traditions[0].values):
         options.append({
             "key": str(i+1),
             "desc": tradition,
@@ -387,13 +399,13 @@ def node_mage_subfaction(caller):
         return "node_start"
     
     text = f"Choose your subfaction within the {tradition}:"
-    subfactions = Stat.objects.filter(category="identity", stat_type="lineage", name="Tradition Subfaction")
-    if not subfactions.exists():
+    subfactions = _lineage_stats("Tradition Subfaction")
+    if not subfactions:
         caller.msg("No subfactions found in the database. Please contact an admin.")
         return "node_start"
     
     options = []
-    for i, subfaction in enumerate(subfactions.first().values):
+    for i, subfaction in enumerate(subfactions[0].values):
         if subfaction.startswith(tradition):
             options.append({
                 "key": str(len(options) + 1),
@@ -411,13 +423,13 @@ def _set_subfaction(caller, raw_string, **kwargs):
 
 def node_mage_convention(caller):
     text = "Choose your Technocratic Convention:"
-    conventions = Stat.objects.filter(category="identity", stat_type="lineage", name="Convention")
-    if not conventions.exists():
+    conventions = _lineage_stats("Convention")
+    if not conventions:
         caller.msg("No conventions found in the database. Please contact an admin.")
         return "node_start"
     
     options = []
-    for i, convention in enumerate(conventions.first().values):
+    for i, convention in enumerate(conventions[0].values):
         options.append({
             "key": str(i+1),
             "desc": convention,
@@ -439,13 +451,13 @@ def node_mage_methodology(caller):
         return "node_start"
     
     text = f"Choose your methodology within {convention}:"
-    methodologies = Stat.objects.filter(category="identity", stat_type="lineage", name="Methodology")
-    if not methodologies.exists():
+    methodologies = _lineage_stats("Methodology")
+    if not methodologies:
         caller.msg("No methodologies found in the database. Please contact an admin.")
         return "node_start"
     
     options = []
-    for i, methodology in enumerate(methodologies.first().values):
+    for i, methodology in enumerate(methodologies[0].values):
         if methodology.startswith(convention):
             options.append({
                 "key": str(len(options) + 1),
@@ -463,13 +475,13 @@ def _set_methodology(caller, raw_string, **kwargs):
 
 def node_nephandi_faction(caller):
     text = "Choose your Nephandi faction:"
-    factions = Stat.objects.filter(category="identity", stat_type="lineage", name="Nephandi Faction")
-    if not factions.exists():
+    factions = _lineage_stats("Nephandi Faction")
+    if not factions:
         caller.msg("No Nephandi factions found in the database. Please contact an admin.")
         return "node_start"
     
     options = []
-    for i, faction in enumerate(factions.first().values):
+    for i, faction in enumerate(factions[0].values):
         options.append({
             "key": str(i+1),
             "desc": faction,
@@ -486,7 +498,7 @@ def _set_nephandi_faction(caller, raw_string, **kwargs):
 
 def node_changeling_kith(caller):
     text = "Choose your changeling kith:"
-    kiths = Stat.objects.filter(category="identity", stat_type="lineage", name="Kith")
+    kiths = _lineage_stats("Kith")
     options = [{"key": str(i+1), "desc": kith, "goto": (_set_kith, {"kith": kith})} 
                for i, kith in enumerate(kiths[0].values)]
     options.append({"key": "0", "desc": "Return to main menu", "goto": "node_start"})
@@ -500,7 +512,7 @@ def _set_kith(caller, raw_string, **kwargs):
 
 def node_changeling_seeming(caller):
     text = "Choose your changeling seeming:"
-    seemings = Stat.objects.filter(category="identity", stat_type="lineage", name="Seeming")
+    seemings = _lineage_stats("Seeming")
     options = [{"key": str(i+1), "desc": seeming, "goto": (_set_seeming, {"seeming": seeming})} 
                for i, seeming in enumerate(seemings[0].values)]
     options.append({"key": "0", "desc": "Return to main menu", "goto": "node_start"})
@@ -514,7 +526,7 @@ def _set_seeming(caller, raw_string, **kwargs):
 
 def node_changeling_house(caller):
     text = "Choose your changeling house (optional):"
-    houses = Stat.objects.filter(category="identity", stat_type="lineage", name="House")
+    houses = _lineage_stats("House")
     options = [{"key": str(i+1), "desc": house, "goto": (_set_house, {"house": house})} 
                for i, house in enumerate(houses[0].values)]
     options.append({"key": "0", "desc": "No house / Return to main menu", "goto": "node_start"})
@@ -675,27 +687,14 @@ def node_abilities(caller):
     else:
         return node_distribute_ability_points(caller)
 
+def get_ability_layout(caller):
+    """Get the ability layout for the splat, shifter type and clan picked so far"""
+    chargen = caller.db.chargen
+    return ABILITY_LAYOUTS.get(chargen.get('splat'), chargen.get('shifter_type'), chargen.get('clan'))
+
 def get_available_abilities(character, category):
     """Get both basic and splat-specific abilities for the category"""
-    splat = character.db.chargen.get('splat', '')
-    
-    # Get basic abilities
-    abilities = list(Stat.objects.filter(
-        category='abilities',
-        stat_type=category,
-        splat__isnull=True
-    ))
-    
-    # Get splat-specific abilities if splat is set
-    if splat:
-        splat_abilities = list(Stat.objects.filter(
-            category='abilities',
-            stat_type=category,
-            splat__iexact=splat
-        ))
-        abilities.extend(splat_abilities)
-    
-    return sorted(abilities, key=lambda x: x.name)
+    return list(get_ability_layout(character).primary[CHARGEN_COLUMNS[category]])
 
 def node_distribute_ability_points(caller):
     current_category = caller.db.chargen['ability_order'][0]
@@ -874,7 +873,7 @@ def node_talents(caller):
         caller.db.chargen["abilities"] = {"talents": {}, "skills": {}, "knowledges": {}}
     
     text = "Assign points to Talents:"
-    talents = Stat.objects.filter(category="abilities", stat_type="talent")
+    talents = get_ability_layout(caller).primary["talent"]
     options = [{"key": str(i+1), "desc": talent.name, "goto": (_set_ability, {"category": "talents", "ability": talent.name})} 
                for i, talent in enumerate(talents)]
     options.append({"key": "0", "desc": "Return to abilities menu", "goto": "node_abilities"})
@@ -914,7 +913,7 @@ def node_skills(caller):
         caller.db.chargen["abilities"] = {"talents": {}, "skills": {}, "knowledges": {}}
     
     text = "Assign points to Skills:"
-    skills = Stat.objects.filter(category="abilities", stat_type="skill")
+    skills = get_ability_layout(caller).primary["skill"]
     options = [{"key": str(i+1), "desc": skill.name, "goto": (_set_ability, {"category": "skills", "ability": skill.name})} 
                for i, skill in enumerate(skills)]
     options.append({"key": "0", "desc": "Return to abilities menu", "goto": "node_abilities"})
@@ -925,7 +924,7 @@ def node_knowledges(caller):
         caller.db.chargen["abilities"] = {"talents": {}, "skills": {}, "knowledges": {}}
     
     text = "Assign points to Knowledges:"
-    knowledges = Stat.objects.filter(category="abilities", stat_type="knowledge")
+    knowledges = get_ability_layout(caller).primary["knowledge"]
     options = [{"key": str(i+1), "desc": knowledge.name, "goto": (_set_ability, {"category": "knowledges", "ability": knowledge.name})} 
                for i, knowledge in enumerate(knowledges)]
     options.append({"key": "0", "desc": "Return to abilities menu", "goto": "node_abilities"})
@@ -954,7 +953,7 @@ def node_disciplines(caller):
         caller.db.chargen["disciplines"] = {}
     
     text = "Assign points to Disciplines:"
-    disciplines = Stat.objects.filter(category="powers", stat_type="discipline")
+    disciplines = STAT_CATALOG.by_category("powers", "discipline")
     options = [{"key": str(i+1), "desc": discipline.name, "goto": (_set_power, {"category": "disciplines", "power": discipline.name})} 
                for i, discipline in enumerate(disciplines)]
     options.append({"key": "0", "desc": "Return to main menu", "goto": "node_start"})
@@ -996,7 +995,7 @@ def node_gifts(caller):
         caller.db.chargen["gifts"] = {}
     
     text = "Choose Gifts for your character:"
-    gifts = Stat.objects.filter(category="powers", stat_type="gift")
+    gifts = STAT_CATALOG.by_category("powers", "gift")
     options = [{"key": str(i+1), "desc": gift.name, "goto": (_set_power, {"category": "gifts", "power": gift.name})} 
                for i, gift in enumerate(gifts)]
     options.append({"key": "0", "desc": "Return to main menu", "goto": "node_start"})
@@ -1007,7 +1006,7 @@ def node_spheres(caller):
         caller.db.chargen["spheres"] = {}
     
     text = "Assign points to Spheres:"
-    spheres = Stat.objects.filter(category="powers", stat_type="sphere")
+    spheres = STAT_CATALOG.by_category("powers", "sphere")
     options = [{"key": str(i+1), "desc": sphere.name, "goto": (_set_power, {"category": "spheres", "power": sphere.name})} 
                for i, sphere in enumerate(spheres)]
     options.append({"key": "0", "desc": "Return to main menu", "goto": "node_start"})
@@ -1018,7 +1017,7 @@ def node_arts(caller):
         caller.db.chargen["arts"] = {}
     
     text = "Assign points to Arts:"
-    arts = Stat.objects.filter(category="powers", stat_type="art")
+    arts = STAT_CATALOG.by_category("powers", "art")
     options = [{"key": str(i+1), "desc": art.name, "goto": (_set_power, {"category": "arts", "power": art.name})} 
                for i, art in enumerate(arts)]
     options.append({"key": "0", "desc": "Return to main menu", "goto": "node_start"})
@@ -1029,7 +1028,7 @@ def node_backgrounds(caller):
         caller.db.chargen["backgrounds"] = {}
     
     text = "Assign points to Backgrounds:"
-    backgrounds = Stat.objects.filter(category="backgrounds", stat_type="background")
+    backgrounds = STAT_CATALOG.by_category("backgrounds", "background")
     options = [{"key": str(i+1), "desc": background.name, "goto": (_set_background, {"background": background.name})} 
                for i, background in enumerate(backgrounds)]
     options.append({"key": "0", "desc": "Return to main menu", "goto": "node_start"})
@@ -1061,7 +1060,7 @@ def node_virtues(caller):
         caller.db.chargen["virtues"] = {}
     
     text = "Assign points to Virtues:"
-    virtues = Stat.objects.filter(category="virtues", stat_type="moral")
+    virtues = STAT_CATALOG.by_category("virtues", "moral")
     options = [{"key": str(i+1), "desc": virtue.name, "goto": (_set_virtue, {"virtue": virtue.name})} 
                for i, virtue in enumerate(virtues)]
     options.append({"key": "0", "desc": "Return to main menu", "goto": "node_start"})
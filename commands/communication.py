@@ -2,6 +2,8 @@ from evennia.commands.default.muxcommand import MuxCommand
 from evennia import search_object
 from evennia.utils.utils import inherits_from
 from typeclasses.characters import Character
+from world.wod20th.utils.occupancy import OCCUPANCY
+from world.wod20th.utils.plane_state import UMBRA, plane_of, set_plane
 
 class AdminCommand(MuxCommand):
     """
@@ -65,10 +67,7 @@ class CmdOOC(MuxCommand):
             self_message = f"|r<|n|yOOC|n|r>|n You say, \"{ooc_message}\""
 
         # Filter receivers based on Umbra state
-        filtered_receivers = [
-            obj for obj in location.contents
-            if obj.has_account and obj.db.in_umbra == self.caller.db.in_umbra
-        ]
+        filtered_receivers = OCCUPANCY.occupants(location, OCCUPANCY.plane(self.caller))
 
         # Send the message to filtered receivers
         for receiver in filtered_receivers:
@@ -291,22 +290,13 @@ class CmdSummon(AdminCommand):
             return
 
         # Handle Umbra/Material state
-        caller_in_umbra = caller.tags.has("in_umbra", category="state")
-        target_in_umbra = target.tags.has("in_umbra", category="state")
-        
-        if caller_in_umbra != target_in_umbra:
-            # Remove current state
-            if target_in_umbra:
-                target.tags.remove("in_umbra", category="state")
-            else:
-                target.tags.remove("in_material", category="state")
-            
-            # Add new state to match caller
-            if caller_in_umbra:
-                target.tags.add("in_umbra", category="state")
+        caller_plane = plane_of(caller)
+        if plane_of(target) != caller_plane:
+            # Match the caller
+            set_plane(target, caller_plane)
+            if caller_plane == UMBRA:
                 target.msg("You shift into the Umbra.")
             else:
-                target.tags.add("in_material", category="state")
                 target.msg("You shift into the Material realm.")
 
         target.move_to(caller.location, quiet=True)
@@ -365,22 +355,13 @@ class CmdJoin(AdminCommand):
             return
 
         # Handle Umbra/Material state
-        caller_in_umbra = caller.tags.has("in_umbra", category="state")
-        target_in_umbra = target.tags.has("in_umbra", category="state")
-        
-        if caller_in_umbra != target_in_umbra:
-            # Remove current state
-            if caller_in_umbra:
-                caller.tags.remove("in_umbra", category="state")
-            else:
-                caller.tags.remove("in_material", category="state")
-            
-            # Add new state to match target
-            if target_in_umbra:
-                caller.tags.add("in_umbra", category="state")
+        target_plane = plane_of(target)
+        if plane_of(caller) != target_plane:
+            # Match the target
+            set_plane(caller, target_plane)
+            if target_plane == UMBRA:
                 caller.msg("You shift into the Umbra.")
             else:
-                caller.tags.add("in_material", category="state")
                 caller.msg("You shift into the Material realm.")
 
         caller.move_to(target.location, quiet=True)
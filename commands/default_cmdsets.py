@@ -37,7 +37,7 @@ from commands.building import (
 
 from commands.CmdUmbraInteraction import CmdUmbraInteraction
 from commands.communication import CmdMeet, CmdPlusIc, CmdPlusOoc, CmdOOC, CmdSummon, CmdJoin
-from commands.admin import CmdApprove, CmdUnapprove, CmdAdminLook, CmdTestLock
+from commands.admin import CmdApprove, CmdUnapprove, CmdAdminLook, CmdTestLock, CmdOutputStats
 from commands.CmdPump import CmdPump
 from commands.CmdSpendGain import CmdSpendGain
 from commands.where import CmdWhere
@@ -64,6 +64,7 @@ from commands.CmdLFRP import CmdLFRP
 from evennia.commands.default import cmdset_character, cmdset_account
 from commands.CmdXP import CmdXP
 from commands.CmdXPCost import CmdXPCost
+from commands.CmdScene import CmdScene
 from commands.CmdWho import CmdWho
 from evennia.commands.default import comms
 from commands.housing import CmdRent, CmdVacate, CmdSetApartmentDesc, CmdSetApartmentExit, CmdManageHome, CmdUpdateApartments, CmdListApartments, CmdUpdateExits
@@ -131,6 +132,7 @@ class CharacterCmdSet(cmdset_character.CharacterCmdSet):
         self.add(CmdSelfStat())
         self.add(CmdXP())
         self.add(CmdXPCost())
+        self.add(CmdScene())
         self.add(CmdWho())
         self.add(CmdRent())
         self.add(CmdVacate())
@@ -176,6 +178,7 @@ class AccountCmdSet(cmdset_account.AccountCmdSet):
         self.add(CmdListApartments())
         self.add(CmdUpdateExits())
         self.add(CmdTestLock())
+        self.add(CmdOutputStats())
 
 class UnloggedinCmdSet(default_cmds.UnloggedinCmdSet):
     """
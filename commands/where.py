@@ -2,6 +2,7 @@ from evennia import default_cmds
 from evennia.server.sessionhandler import SESSIONS
 from evennia.utils.ansi import ANSIString
 from world.wod20th.utils.formatting import header, footer, divider
+from world.wod20th.utils.plane_state import in_umbra
 from evennia.utils.evtable import EvTable
 from collections import defaultdict
 
@@ -75,7 +76,7 @@ class CmdWhere(default_cmds.MuxCommand):
         name_suffix = "*" if puppet.check_permstring("builders") else ""
         
         # Add state indicators to suffix
-        if puppet.tags.has("in_umbra", category="state"):
+        if in_umbra(puppet):
             name_suffix = f"@{name_suffix}"
         if puppet.db.lfrp:
             name_suffix = f"${name_suffix}"
@@ -86,7 +87,7 @@ class CmdWhere(default_cmds.MuxCommand):
         padded_name = ANSIString(base_name).ljust(20)
         
         # Apply color codes after padding
-        if puppet.tags.has("in_umbra", category="state"):
+        if in_umbra(puppet):
             padded_name = f"|b{padded_name}|n"
         if puppet.db.lfrp:
             padded_name = f"|y{padded_name}|n"
@@ -30,8 +30,7 @@ def at_server_start():
     how it was shut down.
     """
     try:
-        from world.wod20th.forms import create_shifter_forms
-        from world.wod20th.utils.init_db import load_stats
+        from world.wod20th.utils.init_db import seed_game_data
         from world.wod20th.locks import LOCK_FUNCS  # Import the lock functions
         from django.conf import settings
         from evennia.locks import lockfuncs
@@ -40,17 +39,23 @@ def at_server_start():
         # Get the absolute path to the data directory
         data_dir = os.path.join(settings.GAME_DIR, 'data')
         
-        create_shifter_forms()
-        load_stats(data_dir)
+        # Seeds shapeshifter forms and stats in the background, and only
+        # if the data changed since the last boot
+        seed_game_data(data_dir)
         
         # Register the lock functions
         for name, func in LOCK_FUNCS.items():
             setattr(lockfuncs, name, func)
         
-        print("Initialized shapeshifter forms, stats, and custom locks")
+        print("Initialized custom locks")
     except Exception as e:
         print(f"Error during initialization: {e}")
 
+    # Save live scene activity every few minutes
+    from evennia import TICKER_HANDLER
+    from world.wod20th.utils.scene_tracker import FLUSH_INTERVAL, flush_scenes
+    TICKER_HANDLER.add(FLUSH_INTERVAL, flush_scenes, idstring="scene_flush", persistent=False)
+
 
 
 def at_server_stop():
@@ -58,7 +63,10 @@ def at_server_stop():
     This is called just before the server is shut down, regardless
     of it is for a reload, reset or shutdown.
     """
-    pass
+    from world.wod20th.utils.scene_tracker import flush_scenes
+    from world.wod20th.utils.scene_log import SCENE_LOG
+    flush_scenes()
+    SCENE_LOG.close()
 
 
 def at_server_reload_start():
@@ -22,6 +22,7 @@ settings file:
 """
 
 from evennia.server.serversession import ServerSession as BaseServerSession
+from world.wod20th.utils.output_buffer import OUTPUT_BUFFER
 
 
 class ServerSession(BaseServerSession):
@@ -32,6 +33,19 @@ class ServerSession(BaseServerSession):
     Each account gets one or more sessions assigned to them whenever they connect
     to the game server. All communication between game and account goes
     through their session(s).
+
+    Output sent while a command runs is held and coalesced per session;
+    see world.wod20th.utils.output_buffer.
     """
 
-    pass
+    def data_in(self, **kwargs):
+        with OUTPUT_BUFFER.command():
+            super().data_in(**kwargs)
+
+    def data_out(self, **kwargs):
+        if not OUTPUT_BUFFER.hold(self, kwargs):
+            self.send_out(**kwargs)
+
+    def send_out(self, **kwargs):
+        """Send to the Portal now, bypassing the output buffer."""
+        super().data_out(**kwargs)
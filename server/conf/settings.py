@@ -89,6 +89,15 @@ INSTALLED_APPS += (
 BASE_ROOM_TYPECLASS = "typeclasses.rooms.RoomParent"
 BASE_CHANNEL_TYPECLASS = "typeclasses.channels.Channel"
 
+# On-disk cache of the +info/search description index
+INFO_SEARCH_INDEX_PATH = os.path.join(GAME_DIR, "server", "info_search.idx")
+
+# Compressed scene logs; see world.wod20th.utils.scene_log
+SCENE_LOG_DIR = os.path.join(GAME_DIR, "server", "logs", "scenes")
+
+# Sessions that coalesce each command's output; see world.wod20th.utils.output_buffer
+SERVER_SESSION_CLASS = "server.conf.serversession.ServerSession"
+
   # Change 8001 to your desired websocket port
 ######################################################################
 # Settings given in secret_settings.py override those in this file.
@@ -9,18 +9,27 @@ here you can define how all characters will look and behave by default.
 from evennia.objects.objects import DefaultCharacter
 from evennia.utils.utils import lazy_property
 from evennia.utils.ansi import ANSIString
-from world.wod20th.models import Stat
 from world.wod20th.utils.ansi_utils import wrap_ansi
 import re
 import random
 from datetime import datetime, timedelta
-from world.wod20th.utils.language_data import AVAILABLE_LANGUAGES
+from django.utils import timezone
+from world.wod20th.utils.language_handler import LanguageHandler
+from world.wod20th.utils.broadcast import broadcast, SELF, UNDERSTAND, NOT_UNDERSTAND
+from world.wod20th.utils.occupancy import OCCUPANCY
+from world.wod20th.utils.plane_state import MATERIAL, in_umbra, set_plane
+from world.wod20th.utils.scene_tracker import SCENES, MIN_SCENE_MINUTES, is_scene_location
+from world.wod20th.utils.scene_log import SCENE_LOG
 
 from django.contrib.auth.models import User
 from django.db import models
 from decimal import Decimal, ROUND_DOWN, InvalidOperation
 import json
 from world.wod20th.utils.formatting import header, footer, divider
+from world.wod20th.utils.stat_catalog import STAT_CATALOG
+from evennia.typeclasses.attributes import ModelAttributeBackend
+from world.wod20th.utils.stat_handler import StatHandler, StatAttributeHandler
+from world.wod20th.utils.derived_stats import DerivedStats
 
 class Character(DefaultCharacter):
     """
@@ -43,12 +52,11 @@ class Character(DefaultCharacter):
         self.db.languages = ["English"]
         self.db.speaking_language = "English"
         
-        self.tags.add("in_material", category="state")
+        set_plane(self, MATERIAL)
         self.db.unfindable = False
         self.db.fae_desc = ""
 
         self.db.approved = False  # Ensure all new characters start unapproved
-        self.db.in_umbra = False  # Use a persistent attribute instead of a tag
         
         # Initialize health tracking
         self.db.agg = 0
@@ -69,14 +77,25 @@ class Character(DefaultCharacter):
             'scenes_this_week': 0  # Number of scenes this week
         }
 
-        # Scene tracking
-        self.db.scene_data = {
-            'current_scene': None,  # Will store start time of current scene
-            'scene_location': None, # Location where scene started
-            'last_activity': None,  # Last time character was active in scene
-            'completed_scenes': 0,  # Number of completed scenes this week
-            'last_weekly_reset': datetime.now()  # For weekly scene count reset
-        }
+    @lazy_property
+    def attributes(self):
+        """Attributes, with db.stats kept up to date from the stat rows."""
+        return StatAttributeHandler(self, ModelAttributeBackend)
+
+    @lazy_property
+    def stats(self):
+        """This character's stats; see world.wod20th.utils.stat_handler."""
+        return StatHandler(self)
+
+    @lazy_property
+    def derived(self):
+        """Willpower, Road, etc. worked out from stats; see world.wod20th.utils.derived_stats."""
+        return DerivedStats(self)
+
+    @lazy_property
+    def languages(self):
+        """Known languages; see world.wod20th.utils.language_handler."""
+        return LanguageHandler(self)
 
     @lazy_property
     def notes(self):
@@ -178,40 +197,7 @@ class Character(DefaultCharacter):
         """
         Get the character's known languages.
         """
-        # Get current languages, initialize if needed
-        current_languages = self.db.languages or []
-        
-        # Convert to list if it's not already
-        if not isinstance(current_languages, list):
-            current_languages = [current_languages]
-        
-        # Clean up the languages list
-        cleaned_languages = []
-        seen = set()
-        
-        # First pass: extract all language strings and clean them
-        for entry in current_languages:
-            # Convert to string and clean it
-            lang_str = str(entry).replace('"', '').replace("'", '').replace('[', '').replace(']', '')
-            # Split on commas and process each part
-            for part in lang_str.split(','):
-                clean_lang = part.strip()
-                if clean_lang and clean_lang.lower() not in seen:
-                    # Check if it's a valid language
-                    for available_lang in AVAILABLE_LANGUAGES.values():
-                        if available_lang.lower() == clean_lang.lower():
-                            cleaned_languages.append(available_lang)
-                            seen.add(available_lang.lower())
-                            break
-        
-        # Ensure English is first
-        if "English" in cleaned_languages:
-            cleaned_languages.remove("English")
-        cleaned_languages.insert(0, "English")
-        
-        # Store the cleaned list back to the database
-        self.db.languages = cleaned_languages
-        return cleaned_languages
+        return self.languages.all()
 
     def set_speaking_language(self, language):
         """
@@ -221,11 +207,8 @@ class Character(DefaultCharacter):
             self.db.speaking_language = None
             return
             
-        # Get clean language list
-        known_languages = self.get_languages()
-        
         # Case-insensitive check
-        for known in known_languages:
+        for known in self.get_languages():
             if known.lower() == language.lower():
                 self.db.speaking_language = known
                 return
@@ -350,31 +333,25 @@ class Character(DefaultCharacter):
 
     def step_sideways(self):
         """Attempt to step sideways into the Umbra."""
-        if self.db.in_umbra:
+        if in_umbra(self):
             self.msg("You are already in the Umbra.")
             return False
         
         if self.location:
+            # The room moves us on success
             success = self.location.step_sideways(self)
             if success:
-                # Use attributes.add for more reliable attribute setting
-                self.attributes.add('in_umbra', True)
-                self.tags.remove("in_material", category="state")
-                self.tags.add("in_umbra", category="state")
                 self.location.msg_contents(f"{self.name} shimmers and fades from view as they step into the Umbra.", exclude=[self])
             return success
         return False
 
     def return_from_umbra(self):
         """Return from the Umbra to the material world."""
-        if not self.db.in_umbra:
+        if not in_umbra(self):
             self.msg("You are not in the Umbra.")
             return False
         
-        # Use attributes.add for more reliable attribute setting
-        self.attributes.add('in_umbra', False)
-        self.tags.remove("in_umbra", category="state")
-        self.tags.add("in_material", category="state")
+        set_plane(self, MATERIAL)
         self.location.msg_contents(f"{self.name} shimmers into view as they return from the Umbra.", exclude=[self])
         return True
 
@@ -435,6 +412,19 @@ class Character(DefaultCharacter):
         # Send message directly to the room
         self.location.msg_contents(string, exclude=[self], from_obj=self)
 
+    def at_post_move(self, source_location, move_type="move", **kwargs):
+        """Keep the room occupancy index current."""
+        OCCUPANCY.update(self)
+        super().at_post_move(source_location, move_type=move_type, **kwargs)
+
+    def at_post_puppet(self, **kwargs):
+        super().at_post_puppet(**kwargs)
+        OCCUPANCY.update(self)
+
+    def at_post_unpuppet(self, account=None, session=None, **kwargs):
+        super().at_post_unpuppet(account=account, session=session, **kwargs)
+        OCCUPANCY.update(self)
+
     def announce_move_to(self, source_location, msg=None, mapping=None, **kwargs):
         """
         Called just after arriving in a new room.
@@ -452,98 +442,46 @@ class Character(DefaultCharacter):
         if not self.location:
             return
 
-        # Filter receivers based on Umbra state
-        filtered_receivers = [
-            r for r in self.location.contents 
-            if hasattr(r, 'has_account') and r.has_account and r.db.in_umbra == self.db.in_umbra
-        ]
+        if kwargs.get('whisper') or receivers:
+            # Whispers go only to their receivers, and stay out of the scene log
+            super().at_say(message, msg_self=msg_self, msg_location=msg_location, receivers=receivers,
+                           msg_receivers=msg_receivers, **kwargs)
+            self.record_scene_activity()
+            return
 
-        # Prepare the say messages
+        # Prepare the say messages and send them to those on our plane
         msg_self, msg_understand, msg_not_understand, language = self.prepare_say(message)
+        broadcast(self, {SELF: msg_self, UNDERSTAND: msg_understand, NOT_UNDERSTAND: msg_not_understand},
+                  language=language)
 
-        # Send messages to receivers
-        for receiver in filtered_receivers:
-            if receiver != self:
-                if language and language in receiver.get_languages():
-                    receiver.msg(msg_understand)
-                else:
-                    receiver.msg(msg_not_understand)
-
-        # Send message to the speaker
-        self.msg(msg_self)
-
-        # Check if this is an IC scene
-        if (self.location and 
-            hasattr(self.location, 'db') and 
-            self.location.db.roomtype != 'OOC Area' and
-            any(obj for obj in self.location.contents 
-                if obj != self and 
-                hasattr(obj, 'has_account') and 
-                obj.has_account)):
-            self.record_scene_activity()
+        # Counts towards an IC scene if anyone else is here
+        self.record_scene_activity('say', msg_not_understand, language, msg_understand)
 
     def at_pose(self, pose_understand, pose_not_understand, pose_self, speaking_language):
         if not self.location:
             return
 
-        # Filter receivers based on Umbra state
-        filtered_receivers = [
-            r for r in self.location.contents 
-            if hasattr(r, 'has_account') and r.has_account and r.db.in_umbra == self.db.in_umbra
-        ]
-
-        # Send messages to receivers
-        for receiver in filtered_receivers:
-            if receiver != self:
-                if speaking_language and speaking_language in receiver.get_languages():
-                    receiver.msg(pose_understand)
-                else:
-                    receiver.msg(pose_not_understand)
-
-        # Send message to the poser
-        self.msg(pose_self)
+        # Send the pose to those on our plane
+        groups = broadcast(self, {SELF: pose_self, UNDERSTAND: pose_understand, NOT_UNDERSTAND: pose_not_understand},
+                           language=speaking_language)
 
         # Log the pose (only visible to those in the same realm)
-        self.location.msg_contents(pose_understand, exclude=filtered_receivers + [self], from_obj=self)
-
-        # Check if this is an IC scene
-        if (self.location and 
-            hasattr(self.location, 'db') and 
-            self.location.db.roomtype != 'OOC Area' and
-            any(obj for obj in self.location.contents 
-                if obj != self and 
-                hasattr(obj, 'has_account') and 
-                obj.has_account)):
-            self.record_scene_activity()
+        self.location.msg_contents(pose_understand, exclude=[obj for group in groups.values() for obj in group] + [self],
+                                   from_obj=self)
+
+        # Counts towards an IC scene if anyone else is here
+        self.record_scene_activity('pose', pose_not_understand, speaking_language, pose_understand)
 
     def at_emote(self, message, msg_self=None, msg_location=None, receivers=None, msg_receivers=None, **kwargs):
         """Display an emote to the room."""
         if not self.location:
             return
 
-        # Filter receivers based on Umbra state
-        filtered_receivers = [
-            r for r in self.location.contents 
-            if hasattr(r, 'has_account') and r.has_account and r.db.in_umbra == self.db.in_umbra
-        ]
-        
-        # Send the emote to filtered receivers
-        for receiver in filtered_receivers:
-            if receiver != self:
-                receiver.msg(message)
-        
-        # Send the emote to the emitter
-        self.msg(msg_self or message)
-
-        # Check if this is an IC scene
-        if (self.location and 
-            hasattr(self.location, 'db') and 
-            self.location.db.roomtype != 'OOC Area' and
-            any(obj for obj in self.location.contents 
-                if obj != self and 
-                hasattr(obj, 'has_account') and 
-                obj.has_account)):
-            self.record_scene_activity()
+        # Send the emote to those on our plane
+        broadcast(self, {SELF: msg_self or message, UNDERSTAND: message})
+
+        # Counts towards an IC scene if anyone else is here
+        self.record_scene_activity('emit', message)
 
     def get_stat(self, category, subcategory, stat_name, temp=False):
         """
@@ -555,62 +493,36 @@ class Character(DefaultCharacter):
             stat_name (str): Name of the stat
             temp (bool): Whether to get temporary or permanent value
         """
-        if not hasattr(self.db, "stats") or not self.db.stats:
-            return None
-
-        category_stats = self.db.stats.get(category, {})
-        if subcategory:
-            type_stats = category_stats.get(subcategory, {})
-        else:
-            type_stats = category_stats
-
-        if stat_name in type_stats:
-            return type_stats[stat_name].get('temp' if temp else 'perm', 0)
-
-        return None
+        return self.stats.get(category, subcategory, stat_name, temp=temp)
 
     def set_stat(self, category, stat_type, stat_name, value, temp=False):
         """Set a stat value."""
-        if not hasattr(self, 'db') or not self.db.stats:
+        if not self.attributes.has('stats'):
             return
 
         # Store old Natural Linguist state before any changes
-        had_natural_linguist = False
-        for cat in self.db.stats.get('merits', {}).values():
-            if any(merit.lower().replace(' ', '') == 'naturallinguist' 
-                  for merit, data in cat.items() 
-                  if data.get('perm', 0) > 0):
-                had_natural_linguist = True
-                break
-
-        # Create nested dictionaries if they don't exist
-        if category not in self.db.stats:
-            self.db.stats[category] = {}
-        if stat_type not in self.db.stats[category]:
-            self.db.stats[category][stat_type] = {}
-        
-        # If stat doesn't exist, create it with both perm and temp values
-        if stat_name not in self.db.stats[category][stat_type]:
-            self.db.stats[category][stat_type][stat_name] = {'perm': 0, 'temp': 0}
+        had_natural_linguist = any(
+            name.lower().replace(' ', '') == 'naturallinguist' and (perm or 0) > 0
+            for _cat, _type, name, perm, _temp in self.stats.items('merits')
+        )
 
         # Special handling for Appearance stat
         if stat_name == 'Appearance':
-            splat = self.db.stats.get('other', {}).get('splat', {}).get('Splat', {}).get('perm', '')
-            clan = self.db.stats.get('identity', {}).get('lineage', {}).get('Clan', {}).get('perm', '')
-            form = self.db.stats.get('other', {}).get('form', {}).get('Form', {}).get('temp', '')
+            splat = self.stats.get('other', 'splat', 'Splat', default='')
+            clan = self.stats.get('identity', 'lineage', 'Clan', default='')
+            form = self.stats.get('other', 'form', 'Form', temp=True, default='')
 
             # Force Appearance to 0 for specific cases
             if (splat == 'Vampire' and clan in ['Nosferatu', 'Samedi']) or \
                (splat == 'Shifter' and form == 'Crinos'):
-                value = 0
-                self.db.stats[category][stat_type][stat_name]['perm'] = 0
-                self.db.stats[category][stat_type][stat_name]['temp'] = 0
+                with self.stats.batch():
+                    self.stats.set(category, stat_type, stat_name, 0)
+                    self.stats.set(category, stat_type, stat_name, 0, temp=True)
                 return
 
         # Normal stat setting
-        key = 'temp' if temp else 'perm'
-        old_value = self.db.stats[category][stat_type][stat_name].get(key, 0)
-        self.db.stats[category][stat_type][stat_name][key] = value
+        old_value = self.stats.get(category, stat_type, stat_name, temp=temp, default=0)
+        self.stats.set(category, stat_type, stat_name, value, temp=temp)
 
         # If this is a language-related merit change
         if not self.db.approved and not temp:  # Only during chargen, only for permanent changes
@@ -626,19 +538,15 @@ class Character(DefaultCharacter):
 
         # If value is 0, remove the stat entirely (do this after language validation)
         if value == 0:
-            del self.db.stats[category][stat_type][stat_name]
-            # Clean up empty dictionaries
-            if not self.db.stats[category][stat_type]:
-                del self.db.stats[category][stat_type]
-            if not self.db.stats[category]:
-                del self.db.stats[category]
+            self.stats.remove(category, stat_type, stat_name)
 
     def check_stat_value(self, category, stat_type, stat_name, value, temp=False):
         """
         Check if a value is valid for a stat, considering instances if applicable.
         """
-        from world.wod20th.models import Stat  
-        stat = Stat.objects.filter(name=stat_name, category=category, stat_type=stat_type).first()
+        stat = STAT_CATALOG.get(stat_name, stat_type)
+        if stat and stat.category != category:
+            stat = None
         if stat:
             stat_values = stat.values
             return value in stat_values['temp'] if temp else value in stat_values['perm']
@@ -715,9 +623,7 @@ class Character(DefaultCharacter):
 
     def can_have_ability(self, ability_name):
         """Check if character can have a specific ability based on splat."""
-        from world.wod20th.models import Stat
-        
-        stat = Stat.objects.filter(name=ability_name).first()
+        stat = STAT_CATALOG.get(ability_name)
         if not stat or not stat.splat:
             return True
             
@@ -1002,167 +908,44 @@ class Character(DefaultCharacter):
         self.db.xp['last_scene'] = now.isoformat()
         self.db.xp['scenes_this_week'] += 1
 
-    def start_scene(self):
-        """Start tracking a new scene."""
-        now = datetime.now()
-        self.db.scene_data['current_scene'] = now
-        self.db.scene_data['scene_location'] = self.location
-        self.db.scene_data['last_activity'] = now
-
     def end_scene(self):
         """End current scene and check if it counts."""
-        
-        if not self.db.scene_data['current_scene']:
+        record = SCENES.leave(self)
+        if record is None:
             self.msg("|rNo current scene to end.|n")
             return False
-
-        now = datetime.now()
-        scene_start = self.db.scene_data['current_scene']
-        last_activity = self.db.scene_data['last_activity']
-
-        # Check if scene meets duration requirement (20 minutes)
-        duration = (now - scene_start).total_seconds() / 60
-
-        if duration >= 20:  # Scene must be 20+ mins
-            self.db.scene_data['completed_scenes'] += 1
-            self.msg(f"|gScene completed and counted! Total completed scenes: {self.db.scene_data['completed_scenes']}|n")
-        else:
-            self.msg(f"|rScene too short to count ({int(duration)} minutes - needs 20+)|n")
-            
-        # Reset scene tracking
-        self.db.scene_data['current_scene'] = None
-        self.db.scene_data['scene_location'] = None
-        self.db.scene_data['last_activity'] = None
-
+        self.report_scene_end(record)
         return True
 
-    def check_scene_status(self):
-        """Check if we should start/continue/end a scene."""
-        # Ensure scene_data exists
-        if not hasattr(self.db, 'scene_data') or not self.db.scene_data:
-            self.db.scene_data = {
-                'current_scene': None,
-                'scene_location': None,
-                'last_activity': None,
-                'completed_scenes': 0,
-                'last_weekly_reset': datetime.now()
-            }
-
-        now = datetime.now()
-        
-        # Check for weekly reset
-        if self.db.scene_data['last_weekly_reset']:
-            days_since_reset = (now - self.db.scene_data['last_weekly_reset']).days
-            if days_since_reset >= 7:
-                old_count = self.db.scene_data['completed_scenes']
-                self.db.scene_data['completed_scenes'] = 0
-                self.db.scene_data['last_weekly_reset'] = now
-      # If not in a valid scene location, end any current scene
-        if not self.location or not self.is_valid_scene_location():
-            if self.db.scene_data['current_scene']:
-                self.end_scene()
-            return
-
-        # If in a new location, end current scene and start new one
-        if (self.db.scene_data['scene_location'] and 
-            self.db.scene_data['scene_location'] != self.location):
-            self.end_scene()
-            self.start_scene()
-            return
-
-        # If not in a scene but in valid location, start one
-        if not self.db.scene_data['current_scene']:
-            self.start_scene()
+    def report_scene_end(self, record):
+        """Tell the character whether the scene they just left counts."""
+        if record.completed:
+            self.msg(f"|gScene completed and counted! Total completed scenes: {SCENES.completed_count(self)}|n")
+        else:
+            duration = (record.ended_at - record.started_at).total_seconds() / 60
+            self.msg(f"|rScene too short to count ({int(duration)} minutes - needs {MIN_SCENE_MINUTES}+)|n")
 
     def is_valid_scene_location(self):
         """Check if current location is valid for scene tracking."""
-        if not self.location:
-            return False
-            
-        # Must be IC room
-        if (hasattr(self.location, 'db') and 
-            getattr(self.location.db, 'roomtype', None) == 'OOC Area'):
-            return False
-            
-        # Must have other players present
-        other_players = [
-            obj for obj in self.location.contents 
-            if (obj != self and 
-                hasattr(obj, 'has_account') and 
-                obj.has_account and
-                obj.db.in_umbra == self.db.in_umbra)  # Must be in same realm
-        ]
-        
-        valid = len(other_players) > 0
-        if not valid:
-            self.msg("|rNo other players in location.|n")
-        else:
-            self.msg(f"|wFound {len(other_players)} other players.|n")
-        return valid
+        return is_scene_location(self)
 
-    def record_scene_activity(self):
-        """Record activity in current scene."""
-        now = datetime.now()
-        self.msg("|wChecking scene status...|n")
-
-        # Initialize scene_data if it doesn't exist
-        if not hasattr(self.db, 'scene_data') or not self.db.scene_data:
-            self.msg("|wInitializing scene data...|n")
-            self.db.scene_data = {
-                'current_scene': None,
-                'scene_location': None,
-                'last_activity': None,
-                'completed_scenes': 0,
-                'last_weekly_reset': datetime.now()
-            }
-
-        self.check_scene_status()
-        if self.db.scene_data['current_scene']:
-            self.db.scene_data['last_activity'] = now
-            self.msg("|wScene activity recorded.|n")
-        else:
-            self.msg("|rNo active scene to record.|n")
-
-    def at_say(self, message, msg_self=None, msg_location=None, receivers=None, msg_receivers=None, **kwargs):
-        """Hook method for the say command."""
-        super().at_say(message, msg_self, msg_location, receivers, msg_receivers, **kwargs)
-        self.record_scene_activity()
-
-    def at_pose(self, pose_understand, pose_not_understand, pose_self, speaking_language):
-        """Handle poses."""
-        super().at_pose(pose_understand, pose_not_understand, pose_self, speaking_language)
-        self.record_scene_activity()
-
-    def at_emote(self, message, msg_self=None, msg_location=None, receivers=None, msg_receivers=None, **kwargs):
-        """Display an emote to the room."""
-        super().at_emote(message, msg_self, msg_location, receivers, msg_receivers, **kwargs)
-        self.record_scene_activity()
-
-    def at_init(self):
+    def record_scene_activity(self, kind=None, text=None, language=None, understood=None):
         """
-        Called when object is first created and after each server reload.
+        Record activity in the room's scene, joining or starting it if
+        there's someone else here; see world.wod20th.utils.scene_tracker.
+        If text is given ('say', 'pose' or 'emit' as kind), it goes in the
+        scene's log. For language-tagged speech, text is what those who
+        didn't follow language saw and understood what those who did saw.
         """
-        super().at_init()
-        
-        # Initialize scene_data if it doesn't exist
-        if not hasattr(self.db, 'scene_data'):
-            self.db.scene_data = {
-                'current_scene': None,  # Will store start time of current scene
-                'scene_location': None, # Location where scene started
-                'last_activity': None,  # Last time character was active in scene
-                'completed_scenes': 0,  # Number of completed scenes this week
-                'last_weekly_reset': datetime.now()  # For weekly scene count reset
-            }
+        record = SCENES.record_activity(self)
+        if record is not None and text:
+            SCENE_LOG.append(record.scene_key, kind, self.key, text, language=language, understood=understood)
+        return record
 
     def init_scene_data(self):
-        """Force initialize scene data."""
-        self.db.scene_data = {
-            'current_scene': None,
-            'scene_location': None,
-            'last_activity': None,
-            'completed_scenes': 0,
-            'last_weekly_reset': datetime.now()
-        }
+        """Reset scene tracking: leave any current scene without reporting it."""
+        SCENES.leave(self)
+        self.attributes.remove('scene_data')
         self.msg("|wScene data initialized.|n")
 
     def calculate_xp_cost(self, stat_name, new_rating, category=None, current_rating=None, subcategory=None):
@@ -1584,45 +1367,35 @@ class Character(DefaultCharacter):
         
         footer = f"{'|b-|n' * total_width}"
         
-        # Add scene tracking status if available
-        scene_data = character.db.scene_data
-        if scene_data:
-            scene_title = "|y Scene Status |n"
-            scene_title_len = len(scene_title)
-            scene_dash_count = (total_width - scene_title_len) // 2
-            scene_header = f"{'|b-|n' * scene_dash_count}{scene_title}{'|b-|n' * (total_width - scene_dash_count - scene_title_len)}\n"
-            
-            scene_section = ""
-            if scene_data['current_scene']:
-                duration = (datetime.now() - scene_data['current_scene']).total_seconds() / 60
-                scene_section += f"Current scene duration: {int(duration)} minutes\n"
-                if scene_data['last_activity']:
-                    last_activity = (datetime.now() - scene_data['last_activity']).total_seconds() / 60
-                    scene_section += f"Last activity: {int(last_activity)} minutes ago\n"
-            else:
-                scene_section += "No active scene\n"
-            
-            scene_section += f"Completed scenes this week: {scene_data['completed_scenes']}\n"
-            
-            display = (
-                header +
-                exp_header +
-                exp_section +
-                activity_header +
-                activity_section +
-                scene_header +
-                scene_section +
-                footer
-            )
+        # Add scene tracking status
+        record, completed = SCENES.status(character)
+        scene_title = "|y Scene Status |n"
+        scene_title_len = len(scene_title)
+        scene_dash_count = (total_width - scene_title_len) // 2
+        scene_header = f"{'|b-|n' * scene_dash_count}{scene_title}{'|b-|n' * (total_width - scene_dash_count - scene_title_len)}\n"
+
+        scene_section = ""
+        if record:
+            now = timezone.now()
+            duration = (now - record.started_at).total_seconds() / 60
+            scene_section += f"Current scene duration: {int(duration)} minutes\n"
+            last_activity = (now - record.last_activity).total_seconds() / 60
+            scene_section += f"Last activity: {int(last_activity)} minutes ago\n"
         else:
-            display = (
-                header +
-                exp_header +
-                exp_section +
-                activity_header +
-                activity_section +
-                footer
-            )
+            scene_section += "No active scene\n"
+
+        scene_section += f"Completed scenes this week: {completed}\n"
+
+        display = (
+            header +
+            exp_header +
+            exp_section +
+            activity_header +
+            activity_section +
+            scene_header +
+            scene_section +
+            footer
+        )
         
         return display
 
@@ -3,11 +3,21 @@ from evennia.utils.utils import make_iter, justify
 from evennia.utils.ansi import ANSIString
 from evennia.utils import ansi
 from world.wod20th.utils.ansi_utils import wrap_ansi
-from world.wod20th.utils.formatting import header, footer, divider
+from world.wod20th.utils.formatting import header, footer
+from world.wod20th.utils.occupancy import OCCUPANCY
+from world.wod20th.utils.scene_log import SCENE_LOG
+from world.wod20th.utils.scene_tracker import SCENES
+from world.wod20th.utils.plane_state import MATERIAL, UMBRA, PLANES, plane_of, set_plane
+from world.wod20th.utils.room_render import (
+    get_room_frame, fragment, section_divider, shortdesc_column, format_room_desc, invalidate_room_render
+)
 from datetime import datetime
 import random
 from evennia.utils.search import search_channel
 
+# Width of a room look
+ROOM_WIDTH = 78
+
 class RoomParent(DefaultRoom):
 
  
@@ -30,122 +40,44 @@ class RoomParent(DefaultRoom):
 
         return name
 
+    def at_rename(self, oldname, newname):
+        """The cached look header shows the room's name."""
+        super().at_rename(oldname, newname)
+        invalidate_room_render(self)
+
     def return_appearance(self, looker, **kwargs):
         if not looker:
             return ""
 
-        name = self.get_display_name(looker, **kwargs)
-        
         # Check if the looker is in the Umbra or peeking into it
-        in_umbra = looker.tags.get("in_umbra", category="state")
-        peeking_umbra = kwargs.get("peek_umbra", False)
+        plane = UMBRA if plane_of(looker) == UMBRA or kwargs.get("peek_umbra", False) else MATERIAL
         
         # Set color scheme based on umbra state
-        border_color = "|B" if (in_umbra or peeking_umbra) else "|r"
-        
-        # Choose the appropriate description
-        if (in_umbra or peeking_umbra) and self.db.umbra_desc:
-            desc = self.db.umbra_desc
-        else:
-            desc = self.db.desc
+        border_color = "|B" if plane == UMBRA else "|r"
 
-        # Update all dividers to use the new color scheme
-        string = header(name, width=78, bcolor=border_color, fillchar=ANSIString(f"{border_color}-|n")) + "\n"
-        
-        # Process room description
-        if desc:
-            # Process description while preserving ANSI codes
-            desc = str(desc)  # Start with raw string to preserve all codes
-            
-            # Split description into paragraphs using %R or %r while preserving ANSI
-            paragraphs = []
-            for p in desc.split('%R'):
-                paragraphs.extend(p.split('%r'))
-            
-            formatted_paragraphs = []
-            for paragraph in paragraphs:
-                if not paragraph.strip():
-                    continue
-                
-                # Split paragraph into lines by tabs
-                tab_lines = []
-                for line in paragraph.split('%t'):
-                    tab_lines.extend(line.split('%T'))
-                
-                formatted_lines = []
-                for i, line in enumerate(tab_lines):
-                    line = line.strip()
-                    if i > 0:  # Add indentation for tabbed lines
-                        # Check if line starts with a color code
-                        if line.startswith('|'):
-                            color_end = line.find(' ')
-                            if color_end > 0:
-                                # Preserve color code and add indentation after it
-                                color_code = line[:color_end]
-                                rest_of_line = line[color_end:].strip()
-                                line = f"{color_code}    {rest_of_line}"
-                            else:
-                                line = "    " + line
-                        else:
-                            line = "    " + line
-                    
-                    # Process line for word wrapping while preserving ANSI
-                    wrapped = wrap_ansi(line, width=78)
-                    if wrapped:
-                        formatted_lines.append(wrapped)
-                
-                if formatted_lines:
-                    formatted_paragraphs.append("\n".join(formatted_lines))
-            
-            # Join all paragraphs with single newlines
-            string += "\n".join(formatted_paragraphs) + "\n"
-
-        # List all characters in the room
-        characters = []
-        for obj in self.contents:
-            if obj.has_account:
-                # Use tag state for comparison
-                obj_umbra_tag = obj.tags.get("in_umbra", category="state")
-                looker_umbra_tag = looker.tags.get("in_umbra", category="state")
-                
-                if obj_umbra_tag == looker_umbra_tag:
-                    characters.append(obj)
+        # The header, description and footer only change when the room is
+        # edited; see world.wod20th.utils.room_render
+        head, foot = get_room_frame(self, (plane, ROOM_WIDTH, looker.check_permstring("builders")),
+                                    lambda: self.render_frame(looker, plane, border_color, **kwargs))
+        string = head
+
+        # List all characters in the room on the looker's plane
+        characters = OCCUPANCY.occupants(self, OCCUPANCY.plane(looker))
 
         if characters:
-            string += divider("Characters", width=78, fillchar=ANSIString(f"{border_color}-|n")) + "\n"
+            string += section_divider("Characters", border_color)
             for character in characters:
                 idle_time = self.idle_time_display(character.idle_time)
-
-                shortdesc = character.db.shortdesc
-                if shortdesc:
-                    shortdesc_str = f"{shortdesc}"
-                else:
-                    shortdesc_str ="|h|xType '|n+shortdesc <desc>|h|x' to set a short description.|n"
-
-                if len(ANSIString(shortdesc_str).strip()) > 55:
-                    shortdesc_str = ANSIString(shortdesc_str)[:55]
-                    shortdesc_str = ANSIString(shortdesc_str[:-3] + "...|n")
-                else:
-                    shortdesc_str = ANSIString(shortdesc_str).ljust(55, ' ')
-                
-                string += ANSIString(f" {character.get_display_name(looker).ljust(12)} {ANSIString(idle_time).rjust(7)}|n {shortdesc_str}\n")
+                string += ANSIString(f" {character.get_display_name(looker).ljust(12)} {ANSIString(idle_time).rjust(7)}|n {shortdesc_column(character)}\n")
 
         # List all objects in the room
         objects = [obj for obj in self.contents if not obj.has_account and not obj.destination]
         if objects:
-            string += divider("Objects", width=78, fillchar=ANSIString(f"{border_color}-|n")) + "\n"
-            
-            # get shordesc or dhoe s blsnk string
+            string += section_divider("Objects", border_color)
             for obj in objects:
-                if obj.db.shortdesc:
-                    shortdesc = obj.db.shortdesc
-                else:
-                    shortdesc = ""
-
-
-            # if looker builder+ show dbref.
-
-                string +=" "+  ANSIString(f"{obj.get_display_name(looker)}").ljust(25) + ANSIString(f"{shortdesc}") .ljust(53, ' ') + "\n"
+                name, shortdesc = obj.get_display_name(looker), obj.db.shortdesc or ""
+                string += fragment(obj, (name, shortdesc), lambda: " " + ANSIString(f"{name}").ljust(25)
+                                   + ANSIString(f"{shortdesc}").ljust(53, ' ') + "\n")
 
         # List all exits
         exits = [ex for ex in self.contents if ex.destination and ex.access(looker, "view")]
@@ -157,7 +89,8 @@ class RoomParent(DefaultRoom):
                 exit_name = exit.get_display_name(looker)
                 short = min(aliases, key=len) if aliases else ""
                 
-                exit_string = ANSIString(f" <|y{short.upper()}|n> {exit_name}")
+                exit_string = fragment(exit, (short, exit_name),
+                                       lambda: ANSIString(f" <|y{short.upper()}|n> {exit_name}"))
                 
                 if any(word in exit_name for word in ['Sector', 'District', 'Neighborhood']):
                     direction_strings.append(exit_string)
@@ -166,14 +99,40 @@ class RoomParent(DefaultRoom):
 
             # Display Directions
             if direction_strings:
-                string += divider("Directions", width=78, fillchar=ANSIString(f"{border_color}-|n")) + "\n"
+                string += section_divider("Directions", border_color)
                 string += self.format_exit_columns(direction_strings)
 
             # Display Exits
             if exit_strings:
-                string += divider("Exits", width=78, fillchar=ANSIString(f"{border_color}-|n")) + "\n"
+                string += section_divider("Exits", border_color)
                 string += self.format_exit_columns(exit_strings) + "\n"
 
+        string += foot
+
+        return string
+
+    def render_frame(self, looker, plane, border_color, **kwargs):
+        """
+        Build the parts of a look that only change when the room does.
+
+        Returns:
+            tuple: (header and description, footer).
+        """
+        name = self.get_display_name(looker, **kwargs)
+        
+        # Choose the appropriate description
+        if plane == UMBRA and self.db.umbra_desc:
+            desc = self.db.umbra_desc
+        else:
+            desc = self.db.desc
+
+        # Update all dividers to use the new color scheme
+        head = header(name, width=78, bcolor=border_color, fillchar=ANSIString(f"{border_color}-|n")) + "\n"
+        
+        # Process room description
+        if desc:
+            head += format_room_desc(desc, width=ROOM_WIDTH) + "\n"
+
         # Get room type and resources
         room_type = self.db.roomtype or "Unknown"
         resources = self.db.resources
@@ -184,9 +143,8 @@ class RoomParent(DefaultRoom):
         footer_length = len(ANSIString(footer_text))
         padding = 78 - footer_length - 2  # -2 for the brackets
 
-        string += ANSIString(f"{border_color}{'-' * padding}[|c{footer_text}{border_color}]|n")
-
-        return string
+        foot = ANSIString(f"{border_color}{'-' * padding}[|c{footer_text}{border_color}]|n")
+        return head, foot
 
     def format_exit_columns(self, exit_strings):
         # Split into two columns
@@ -357,17 +315,16 @@ class RoomParent(DefaultRoom):
             exclude = make_iter(exclude)
             contents = [obj for obj in contents if obj not in exclude]
 
-        for obj in contents:
-            if hasattr(obj, 'is_character') and obj.is_character:
-                # Check if the character is in the same plane (Umbra or material)
-                if from_obj and hasattr(from_obj, 'tags'):
-                    sender_in_umbra = from_obj.tags.get("in_umbra", category="state")
-                    receiver_in_umbra = obj.tags.get("in_umbra", category="state")
-                    
-                    if sender_in_umbra != receiver_in_umbra:
-                        continue  # Skip this character if they're in a different plane
+        # Skip characters in a different plane (Umbra or material)
+        other_plane = set()
+        if from_obj and hasattr(from_obj, 'tags'):
+            sender_plane = OCCUPANCY.plane(from_obj)
+            other_plane = {obj.id for plane in PLANES if plane != sender_plane
+                           for obj in OCCUPANCY.occupants(self, plane)}
 
-            obj.msg(text=text, from_obj=from_obj, mapping=mapping, **kwargs)
+        for obj in contents:
+            if obj.id not in other_plane:
+                obj.msg(text=text, from_obj=from_obj, mapping=mapping, **kwargs)
 
     def step_sideways(self, character):
         """
@@ -377,8 +334,7 @@ class RoomParent(DefaultRoom):
         successes, ones = self.roll_gnosis(character, difficulty)
         
         if successes > 0:
-            character.tags.remove("in_material", category="state")
-            character.tags.add("in_umbra", category="state")
+            set_plane(character, UMBRA)
             character.msg("You successfully step sideways into the Umbra.")
             self.msg_contents(f"{character.name} shimmers and fades from view as they step into the Umbra.", exclude=character, from_obj=character)
             return True
@@ -405,8 +361,7 @@ class RoomParent(DefaultRoom):
         successes, ones = self.roll_gnosis(character, difficulty)
         
         if successes > 0:
-            character.tags.remove("in_umbra", category="state")
-            character.tags.add("in_material", category="state")
+            set_plane(character, MATERIAL)
             character.msg("You step back into the material world.")
             self.msg_contents(f"{character.name} shimmers into view as they return from the Umbra.", exclude=character, from_obj=character)
             return True
@@ -682,6 +637,10 @@ class RoomParent(DefaultRoom):
         if len(self.db.roll_log) > 10:
             self.db.roll_log = self.db.roll_log[-10:]
 
+        # The scene log keeps them all; rolls are shown on every plane
+        for session in SCENES.sessions(self):
+            SCENE_LOG.append(session.key, 'roll', roller, f"|rRoll>|n {roller} rolls {description} |r=>|n {result}")
+
     def get_roll_log(self):
         """
         Get the roll log for this room.
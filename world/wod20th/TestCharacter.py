@@ -0,0 +1,32 @@
+from unittest.mock import MagicMock, patch
+from evennia.utils.test_resources import EvenniaTest
+from evennia.utils import create
+
+class TestCharacterWhisper(EvenniaTest):
+    def setUp(self):
+        super().setUp()
+        self.speaker = create.create_object("typeclasses.characters.Character", key="Speaker", location=self.room1)
+        self.listener = create.create_object("typeclasses.characters.Character", key="Listener", location=self.room1)
+        self.bystander = create.create_object("typeclasses.characters.Character", key="Bystander", location=self.room1)
+        for character in (self.speaker, self.listener, self.bystander):
+            character.msg = MagicMock()
+        patcher = patch('typeclasses.characters.SCENE_LOG')
+        self.scene_log = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _heard(self, character):
+        return " ".join(str(call) for call in character.msg.call_args_list)
+
+    @patch('typeclasses.characters.broadcast')
+    def test_whisper_reaches_only_receivers(self, broadcast):
+        self.speaker.at_say("meet me at midnight", msg_self=True, receivers=[self.listener], whisper=True)
+        broadcast.assert_not_called()
+        self.scene_log.append.assert_not_called()
+        self.assertIn("meet me at midnight", self._heard(self.listener))
+        self.assertIn("meet me at midnight", self._heard(self.speaker))
+        self.assertNotIn("meet me at midnight", self._heard(self.bystander))
+
+    @patch('typeclasses.characters.broadcast')
+    def test_say_is_broadcast(self, broadcast):
+        self.speaker.at_say("hello")
+        broadcast.assert_called_once()
@@ -26,21 +26,21 @@ class TestCmdSelfStat(EvenniaTest):
         expected = "|rUsage: +selfstat <stat>[(<instance>)]/[<category>]=[+-]<value>|n"
         self.assertEqual(self.character.msg.call_args[0][0], expected)
 
-    @patch('commands.CmdSelfStat.Stat.objects.filter')
-    def test_func_stat_not_found(self, mock_filter):
-        mock_filter.return_value = []
+    @patch('commands.CmdSelfStat.STAT_CATALOG.search')
+    def test_func_stat_not_found(self, mock_search):
+        mock_search.return_value = []
         self.cmd.args = "NonexistentStat/Physical=+1"
         self.cmd.func()
         expected = "|rNo stats matching 'NonexistentStat' found in the database.|n"
         self.assertEqual(self.character.msg.call_args[0][0], expected)
 
-    @patch('commands.CmdSelfStat.Stat.objects.filter')
-    def test_func_update_stat(self, mock_filter):
+    @patch('commands.CmdSelfStat.STAT_CATALOG.search')
+    def test_func_update_stat(self, mock_search):
         mock_stat = MagicMock()
         mock_stat.name = "Strength"
         mock_stat.category = "attributes"
         mock_stat.stat_type = "physical"
-        mock_filter.return_value = [mock_stat]
+        mock_search.return_value = [mock_stat]
         
         self.cmd.args = "Strength/Physical=3"
         self.cmd.func()
@@ -0,0 +1,32 @@
+from unittest.mock import MagicMock
+from evennia.utils.test_resources import EvenniaTest
+from commands.CmdSetStats import CmdStats
+from evennia.utils import create
+
+class TestCmdSetStatsBatch(EvenniaTest):
+    def setUp(self):
+        super().setUp()
+        self.character = create.create_object("typeclasses.characters.Character", key="TestChar", location=self.room1)
+        self.character.db.stats = {
+            'other': {'splat': {'Splat': {'perm': 'Shifter', 'temp': 'Shifter'}}},
+            'pools': {'dual': {'Willpower': {'perm': 4, 'temp': 4},
+                               'Rage': {'perm': 3, 'temp': 3},
+                               'Blood': {'perm': 10, 'temp': 10}}},
+        }
+        self.cmd = CmdStats()
+        self.cmd.caller = MagicMock()
+
+    def test_splat_pools_in_batch(self):
+        with self.character.stats.batch():
+            self.cmd.apply_splat_pools(self.character, 'Mortal')
+            self.assertFalse(self.character.stats.has('pools', 'dual', 'Rage'))
+        self.assertEqual(self.character.db.stats['pools'], {'dual': {'Willpower': {'perm': 4, 'temp': 4}}})
+
+    def test_shifter_pools_in_batch(self):
+        with self.character.stats.batch():
+            self.cmd.apply_shifter_pools(self.character, 'Ananasi')
+            self.assertFalse(self.character.stats.has('pools', 'dual', 'Rage'))
+            self.assertEqual(self.character.stats.get('pools', 'dual', 'Blood'), 10)
+        pools = self.character.db.stats['pools']['dual']
+        self.assertNotIn('Rage', pools)
+        self.assertEqual(pools['Willpower']['perm'], 4)
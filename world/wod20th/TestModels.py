@@ -0,0 +1,12 @@
+import unittest
+from world.wod20th.models import Stat
+
+class TestStatQuerySet(unittest.TestCase):
+    def test_lookups_use_lower(self):
+        # Compare against LOWER(column) so the functional indexes apply
+        sql = str(Stat.objects.named("Primal-Urge").query)
+        self.assertIn('LOWER("wod20th_stat"."name") = primal-urge', sql)
+        sql = str(Stat.objects.of_type("Gift").query)
+        self.assertIn('LOWER("wod20th_stat"."stat_type") = gift', sql)
+        sql = str(Stat.objects.for_splat("Shifter", "gift").query)
+        self.assertIn('LOWER("wod20th_stat"."splat") = shifter', sql)
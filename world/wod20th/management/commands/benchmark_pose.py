@@ -0,0 +1,89 @@
+import re
+import time
+
+import evennia
+evennia._init()
+
+import django
+django.setup()
+
+from django.core.management.base import BaseCommand
+from typeclasses.characters import Character
+from world.wod20th.utils.pose_compiler import CompiledPose
+
+POSE = ('leans on the bar and says, "~Two more, and put it on his tab." She glances back. '
+        '"~You did say you were buying." Then, louder, "Cheers!" and "~Don\'t look now."')
+RECEIVERS = (1, 10, 50)
+
+
+class _Speaker:
+    """Just enough of a Character for prepare_say."""
+    name = key = 'Benchmark'
+    location = None
+    prepare_say = Character.prepare_say
+
+    def get_speaking_language(self):
+        return 'Spanish'
+
+
+class _Listener:
+    def __init__(self, index):
+        self.languages = ['English', 'Spanish'] if index % 2 else ['English']
+        self.merits = {'mental': {'Eidetic Memory': 1}, 'social': {'Natural Linguist': 1}}
+        self.received = None
+
+    def msg(self, text):
+        self.received = text
+
+
+class Command(BaseCommand):
+    help = ('Time a language-tagged pose sent to 1, 10 and 50 receivers: parsed and '
+            'rendered per receiver, as CmdPose used to, against compiled once with '
+            'CompiledPose. Uses in-memory stand-ins; nothing touches the database.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=500, help='Poses to time per case')
+
+    def per_receiver(self, speaker, listeners):
+        """The old CmdPose loop: parse, prepare_say and check merits per receiver."""
+        language = speaker.get_speaking_language()
+        for listener in listeners:
+            parts, position = [], 0
+            for match in re.finditer(r'"~([^"]+)"', POSE):
+                parts.append(POSE[position:match.start()])
+                _, msg_understand, msg_not_understand, _ = speaker.prepare_say(match.group(1), language_only=True)
+                has_universal = any(merit.lower().replace(' ', '') == 'universallanguage'
+                                    for category in listener.merits.values() for merit in category)
+                if has_universal or language in listener.languages:
+                    parts.append(f'"{msg_understand}"')
+                else:
+                    parts.append(f'"{msg_not_understand}"')
+                position = match.end()
+            parts.append(POSE[position:])
+            listener.msg(f"{speaker.key} {''.join(parts)}")
+
+    def compiled(self, speaker, listeners):
+        """Compile and render once, then hand each receiver its variant."""
+        language = speaker.get_speaking_language()
+        understood, not_understood = CompiledPose(POSE).render(speaker, prefix=f"{speaker.key} ")
+        for listener in listeners:
+            listener.msg(understood if language in listener.languages else not_understood)
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        speaker = _Speaker()
+        self.stdout.write(self.style.NOTICE(f'ms per pose ({repeat} runs each):'))
+        for count in RECEIVERS:
+            listeners = [_Listener(i) for i in range(count)]
+            timings, received = {}, {}
+            for label, send in (('per receiver', self.per_receiver), ('compiled', self.compiled)):
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    send(speaker, listeners)
+                timings[label] = (time.perf_counter() - start) * 1000 / repeat
+                received[label] = [listener.received for listener in listeners]
+            if received['per receiver'] != received['compiled']:
+                self.stderr.write(f'  {count} receivers: output differs between the two')
+            before, after = timings['per receiver'], timings['compiled']
+            self.stdout.write(f'  {count:3} receivers  {before:8.4f} -> {after:8.4f}'
+                              f'  ({before / after if after else 0:.1f}x)')
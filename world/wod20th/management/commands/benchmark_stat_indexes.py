@@ -0,0 +1,107 @@
+import time
+
+import evennia
+evennia._init()
+
+import django
+django.setup()
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from world.wod20th.models import Stat, CATEGORIES
+
+SPLATS = ['Vampire', 'Shifter', 'Mage', 'Changeling', 'Mortal+', 'Possessed', 'Companion', None]
+STAT_TYPES = ['attribute', 'talent', 'skill', 'knowledge', 'background', 'discipline',
+              'gift', 'rite', 'sphere', 'art', 'merit', 'flaw', 'lineage', 'power', 'other']
+
+
+class _Rollback(Exception):
+    """Raised to throw away the synthetic catalog."""
+
+
+class Command(BaseCommand):
+    help = ('Compare query plans and timings for the hot Stat queries with and without '
+            'the Stat indexes, on a synthetic catalog. Nothing is written: the rows are '
+            'created and the indexes dropped inside a transaction that is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50000, help='Synthetic stats to create')
+        parser.add_argument('--repeat', type=int, default=200, help='Runs of each query to time')
+
+    def queries(self):
+        return [
+            ('name (case-insensitive)', lambda: Stat.objects.named('SYNTHETIC STAT 31337')),
+            ('stat_type (case-insensitive)', lambda: Stat.objects.of_type('GIFT')),
+            ('category + stat_type', lambda: Stat.objects.in_category('powers', 'discipline')),
+            ('splat + stat_type', lambda: Stat.objects.for_splat('Shifter', 'gift')),
+        ]
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        try:
+            with transaction.atomic():
+                self.populate(rows)
+                self.stdout.write(self.style.NOTICE(f'With indexes ({rows} synthetic stats):'))
+                with_indexes = self.measure(repeat, 'with indexes')
+                # Plain DROP INDEX: SQLite's schema editor refuses to run
+                # inside an open transaction.
+                with connection.cursor() as cursor:
+                    for index in Stat._meta.indexes:
+                        cursor.execute(f'DROP INDEX {connection.ops.quote_name(index.name)}')
+                self.stdout.write(self.style.NOTICE('Without indexes:'))
+                without_indexes = self.measure(repeat, 'without indexes')
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        self.stdout.write(self.style.NOTICE('Summary (ms per query):'))
+        for label, _query in self.queries():
+            before, after = without_indexes[label], with_indexes[label]
+            self.stdout.write(f'  {label:30} {before:8.3f} -> {after:8.3f}'
+                              f'  ({before / after if after else 0:.1f}x)')
+
+    def populate(self, rows):
+        categories = [key for key, _label in CATEGORIES]
+        batch = []
+        for i in range(rows):
+            batch.append(Stat(
+                name=f'Synthetic Stat {i}',
+                description='',
+                game_line='general',
+                category=categories[i % len(categories)],
+                stat_type=STAT_TYPES[(i // 7) % len(STAT_TYPES)],
+                splat=SPLATS[i % len(SPLATS)],
+                values=[],
+            ))
+            if len(batch) >= 1000:
+                Stat.objects.bulk_create(batch)
+                batch = []
+        Stat.objects.bulk_create(batch)
+        # Give the planner fresh statistics
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def explain(self, queryset, phase):
+        """
+        EXPLAIN a queryset. The phase is added as a comment so the SQL text
+        differs between phases; sqlite3 caches prepared statements by text
+        and would otherwise return the plan from before the indexes were
+        dropped.
+        """
+        sql, params = queryset.query.get_compiler(connection=connection).as_sql()
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql} -- {phase}', params)
+            return [' '.join(str(col) for col in row) for row in cursor.fetchall()]
+
+    def measure(self, repeat, phase):
+        timings = {}
+        for label, query in self.queries():
+            plan = self.explain(query(), phase)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                list(query().values_list('id', flat=True))
+            timings[label] = (time.perf_counter() - start) * 1000 / repeat
+            self.stdout.write(f'  {label}: {timings[label]:.3f} ms')
+            for line in plan:
+                self.stdout.write(f'      {line}')
+        return timings
@@ -0,0 +1,85 @@
+import time
+
+import evennia
+evennia._init()
+
+import django
+django.setup()
+
+from django.core.management.base import BaseCommand
+from evennia.utils.ansi import ANSIString
+from world.wod20th.utils.ansi_utils import visible_width, wrap_ansi
+
+WORDS = ('|rcrimson|n', 'mist', 'curls', 'over', 'the', '%chcracked%cn', 'flagstones,', '|[bblue|n',
+         'lanterns', '|125flicker|n', 'and', 'the', '||old||', 'sign', 'creaks', 'on', 'its', 'chain.')
+SIZES = (1024, 10 * 1024)
+WIDTH = 78
+
+
+def description(size):
+    """A colored room description of about size characters, in paragraphs."""
+    words, length = [], 0
+    while length < size:
+        word = WORDS[len(words) % len(WORDS)]
+        words.append(word + ('\n' if len(words) % 90 == 89 else ''))
+        length += len(word) + 1
+    return ' '.join(words)
+
+
+def legacy_wrap_ansi(text, width):
+    """wrap_ansi as it was: a str() of the whole text per character, an ANSIString per word."""
+    ansi_text = ANSIString(text)
+    words, current_word, current_codes = [], "", ""
+    for i, char in enumerate(str(ansi_text)):
+        if char == '|' and i + 1 < len(str(ansi_text)):
+            current_codes += char + str(ansi_text)[i + 1]
+            continue
+        elif char == ' ':
+            if current_word:
+                words.append(current_codes + current_word)
+                current_word, current_codes = "", ""
+            else:
+                words.append(' ')
+        else:
+            current_word += char
+    if current_word:
+        words.append(current_codes + current_word)
+    lines, current_line, current_length = [], [], 0
+    for word in words:
+        word_length = len(ANSIString(word).clean())
+        if current_length + word_length <= width:
+            current_line.append(word)
+            current_length += word_length + (1 if current_length > 0 else 0)
+        else:
+            if current_line:
+                lines.append(" ".join(current_line))
+            current_line, current_length = [word], word_length
+    if current_line:
+        lines.append(" ".join(current_line))
+    return "\n".join(lines)
+
+
+class Command(BaseCommand):
+    help = ('Time wrap_ansi on 1 KB and 10 KB colored descriptions against the old '
+            'wrapper (a full-text str() per character and an ANSIString per word). '
+            'Nothing touches the database.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Wraps to time per case')
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        self.stdout.write(self.style.NOTICE(f'ms per wrap at width {WIDTH} ({repeat} runs each):'))
+        for size in SIZES:
+            text = description(size)
+            timings = {}
+            for label, wrap in (('legacy', legacy_wrap_ansi), ('single pass', wrap_ansi)):
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    wrapped = wrap(text, WIDTH)
+                timings[label] = (time.perf_counter() - start) * 1000 / repeat
+            if any(visible_width(line) > WIDTH for line in wrapped.split('\n')):
+                self.stderr.write(f'  {size} bytes: a line is wider than {WIDTH}')
+            before, after = timings['legacy'], timings['single pass']
+            self.stdout.write(f'  {len(text) / 1024:5.1f} KB  {before:9.2f} -> {after:7.2f}'
+                              f'  ({before / after if after else 0:.0f}x, {len(text) / 1024 / after * 1000:,.0f} KB/s)')
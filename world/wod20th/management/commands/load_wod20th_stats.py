@@ -1,8 +1,5 @@
-import json
 import os
 from django.core.management.base import BaseCommand
-from django.core.exceptions import ValidationError
-from django.db import transaction, connection, IntegrityError
 
 # Import Evennia and initialize it
 import evennia
@@ -14,6 +11,9 @@ django.setup()
 
 # Import the Stat model
 from world.wod20th.models import Stat, CATEGORIES, STAT_TYPES
+from world.wod20th.utils.stat_loader import (
+    parse_stat_files, list_stat_files, diff_stats, apply_diff
+)
 
 class Command(BaseCommand):
     help = 'Load WoD20th stats from JSON files in a directory'
@@ -21,95 +21,72 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('--dir', type=str, default='data', help='Directory containing JSON files')
         parser.add_argument('--file', type=str, help='Specific JSON file to load (optional)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report what would change without writing anything')
+        parser.add_argument('--jobs', type=int, default=1,
+                            help='Number of processes to parse JSON files with')
 
     def handle(self, *args, **options):
         data_dir = options['dir']
         specific_file = options['file']
+        dry_run = options['dry_run']
 
         if specific_file:
             # Process single file
-            file_path = os.path.join(data_dir, specific_file)
-            self.process_file(file_path)
+            file_paths = [os.path.join(data_dir, specific_file)]
+            if not os.path.exists(file_paths[0]):
+                self.stdout.write(self.style.ERROR(f'File not found: {file_paths[0]}'))
+                return
         else:
             # Process all JSON files in directory
             if not os.path.isdir(data_dir):
                 self.stdout.write(self.style.ERROR(f'Directory not found: {data_dir}'))
                 return
+            file_paths = list_stat_files(data_dir)
+
+        self.stdout.write(self.style.NOTICE(f'Parsing {len(file_paths)} JSON file(s) in {data_dir}...'))
+        records = []
+        for file_path, file_records, errors in parse_stat_files(file_paths, jobs=max(1, options['jobs'])):
+            for error in errors:
+                self.stdout.write(self.style.ERROR(error))
+            records.extend(file_records)
+            self.stdout.write(f'  {os.path.basename(file_path)}: {len(file_records)} stats')
 
-            self.stdout.write(self.style.NOTICE(f'Processing JSON files in {data_dir}...'))
-            for filename in os.listdir(data_dir):
-                if filename.endswith('.json'):
-                    file_path = os.path.join(data_dir, filename)
-                    self.process_file(file_path)
+        diff = diff_stats(records)
 
-    def process_file(self, file_path):
-        if not os.path.exists(file_path):
-            self.stdout.write(self.style.ERROR(f'File not found: {file_path}'))
+        if dry_run:
+            self.report_diff(diff)
             return
 
         try:
-            self.stdout.write(self.style.NOTICE(f'Processing {file_path}...'))
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-                
-            # Handle both single stats and lists of stats
-            if isinstance(data, list):
-                for stat_data in data:
-                    self.process_stat(stat_data)
-            elif isinstance(data, dict):
-                # If it's a dictionary of stats
-                for stat_name, stat_data in data.items():
-                    if isinstance(stat_data, dict):
-                        # If it's already a dict, just add the name
-                        stat_data['name'] = stat_name
-                        self.process_stat(stat_data)
-                    else:
-                        # If it's just a value, create a basic stat dict
-                        self.process_stat({
-                            'name': stat_name,
-                            'value': stat_data,
-                            'category': 'other',
-                            'stat_type': 'other'
-                        })
-
-            self.stdout.write(self.style.SUCCESS(f'Successfully loaded stats from {file_path}'))
-        except json.JSONDecodeError:
-            self.stdout.write(self.style.ERROR(f'Invalid JSON in file: {file_path}'))
+            created, updated = apply_diff(diff)
         except Exception as e:
-            self.stdout.write(self.style.ERROR(f'Error processing {file_path}: {str(e)}'))
-
-    def process_stat(self, stat_data):
-        if not isinstance(stat_data, dict):
-            self.stdout.write(self.style.ERROR(f'Invalid stat data format: {stat_data}'))
+            self.stdout.write(self.style.ERROR(f'Error writing stats, nothing was saved: {str(e)}'))
             return
 
-        name = stat_data.get('name')
-        if not name:
-            self.stdout.write(self.style.ERROR('Stat missing name'))
-            return
-
-        # Create or update the stat
-        try:
-            stat, created = Stat.objects.update_or_create(
-                name=name,
-                defaults={
-                    'description': stat_data.get('description', ''),
-                    'game_line': stat_data.get('game_line', 'general'),
-                    'category': stat_data.get('category', 'other'),
-                    'stat_type': stat_data.get('stat_type', 'other'),
-                    'values': stat_data.get('values', []),
-                    'splat': stat_data.get('splat'),
-                    'hidden': stat_data.get('hidden', False),
-                    'locked': stat_data.get('locked', False),
-                    'instanced': stat_data.get('instanced', False),
-                    'default': stat_data.get('default')
-                }
-            )
-
-            action = 'Created' if created else 'Updated'
-            self.stdout.write(self.style.SUCCESS(f'{action} stat: {name}'))
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f'Error creating/updating stat {name}: {str(e)}'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Loaded stats: {created} created, {updated} updated, {diff.unchanged} unchanged'
+        ))
+        self.report_stale(diff)
+
+    def report_diff(self, diff):
+        """Print what a load would change."""
+        for record in diff.to_create:
+            self.stdout.write(self.style.SUCCESS(f"  + {record['name']} ({record['stat_type']})"))
+        for _row_id, record, changed in diff.to_update:
+            self.stdout.write(self.style.WARNING(
+                f"  ~ {record['name']} ({record['stat_type']}): {', '.join(changed)}"
+            ))
+        self.report_stale(diff)
+        self.stdout.write(self.style.NOTICE(f'Dry run: {diff.summary()}'))
+
+    def report_stale(self, diff):
+        """Warn about rows a load leaves behind, e.g. when a stat's stat_type changed."""
+        for row_id, name, stat_type in diff.stale:
+            self.stdout.write(self.style.WARNING(
+                f"  ! {name} ({stat_type}), row {row_id}, matches no loaded stat but shares its "
+                f"name with a new one; delete it if the stat's type changed"
+            ))
 
     def handle_ability(self, ability_data):
         """Handle loading an ability stat"""
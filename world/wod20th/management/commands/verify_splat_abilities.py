@@ -12,25 +12,19 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         # Check basic abilities
-        basic_abilities = Stat.objects.filter(
-            category='abilities',
-            splat__isnull=True
-        )
+        basic_abilities = Stat.objects.in_category('abilities').filter(splat__isnull=True)
         self.stdout.write(f"Found {basic_abilities.count()} basic abilities")
         
         # Check splat-specific abilities
         for splat in ['Shifter', 'Changeling', 'Vampire', 'Mage']:
-            splat_abilities = Stat.objects.filter(
-                category='abilities',
-                splat=splat
-            )
+            splat_abilities = Stat.objects.for_splat(splat).filter(category='abilities')
             self.stdout.write(f"Found {splat_abilities.count()} {splat} abilities:")
             for ability in splat_abilities:
                 self.stdout.write(f"  - {ability.name} ({ability.stat_type})")
         
         # Verify Primal-Urge specifically
         try:
-            primal_urge = Stat.objects.get(name='Primal-Urge')
+            primal_urge = Stat.objects.named('Primal-Urge').get()
             self.stdout.write(f"\nPrimal-Urge details:")
             self.stdout.write(f"  Category: {primal_urge.category}")
             self.stdout.write(f"  Stat Type: {primal_urge.stat_type}")
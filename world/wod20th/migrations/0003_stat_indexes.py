@@ -0,0 +1,29 @@
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wod20th", "0002_migrate_notes_to_attributes"),
+        ("wod20th", "0002_populate_note_ids"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="stat",
+            index=models.Index(Lower("name"), name="wod20th_stat_name_lower"),
+        ),
+        migrations.AddIndex(
+            model_name="stat",
+            index=models.Index(Lower("stat_type"), name="wod20th_stat_type_lower"),
+        ),
+        migrations.AddIndex(
+            model_name="stat",
+            index=models.Index(fields=["category", "stat_type"], name="wod20th_stat_category_type"),
+        ),
+        migrations.AddIndex(
+            model_name="stat",
+            index=models.Index(fields=["splat", "stat_type"], name="wod20th_stat_splat_type"),
+        ),
+    ]
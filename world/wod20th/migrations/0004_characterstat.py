@@ -0,0 +1,94 @@
+from django.db import migrations, models
+from django.db.models.functions import Lower
+import django.db.models.deletion
+
+BATCH_SIZE = 200
+
+
+def flatten_stats(stats):
+    """Same as world.wod20th.utils.stat_handler.flatten_stats, frozen here."""
+    flat = {}
+    for category, types in (stats or {}).items():
+        if not isinstance(types, dict):
+            continue
+        for stat_type, entries in types.items():
+            if not isinstance(entries, dict):
+                continue
+            if 'perm' in entries or 'temp' in entries:
+                flat[(category, '', stat_type)] = (entries.get('perm', 0), entries.get('temp'))
+                continue
+            for name, data in entries.items():
+                if isinstance(data, dict):
+                    flat[(category, stat_type, name)] = (data.get('perm', 0), data.get('temp'))
+    return flat
+
+
+def copy_sheets(apps, schema_editor):
+    """Copy every character's db.stats into CharacterStat, a batch of sheets at a time."""
+    ObjectDB = apps.get_model('objects', 'ObjectDB')
+    CharacterStat = apps.get_model('wod20th', 'CharacterStat')
+    links = ObjectDB.db_attributes.through.objects.filter(
+        attribute__db_key='stats',
+        attribute__db_category__isnull=True,
+        attribute__db_attrtype__isnull=True,
+    ).values_list('objectdb_id', 'attribute__db_value')
+
+    rows = []
+    for char_id, stats in links.iterator(chunk_size=BATCH_SIZE):
+        for (category, stat_type, name), (perm, temp) in flatten_stats(stats).items():
+            rows.append(CharacterStat(character_id=char_id, category=category, stat_type=stat_type,
+                                      name=name, perm=perm, temp=temp))
+        if len(rows) >= BATCH_SIZE:
+            CharacterStat.objects.bulk_create(rows, ignore_conflicts=True)
+            rows = []
+    CharacterStat.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+def clear_rows(apps, schema_editor):
+    # db.stats is never removed, so there is nothing to copy back
+    apps.get_model('wod20th', 'CharacterStat').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wod20th", "0003_stat_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CharacterStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("category", models.CharField(max_length=100)),
+                ("stat_type", models.CharField(blank=True, default="", max_length=100)),
+                ("name", models.CharField(max_length=255)),
+                ("perm", models.JSONField(blank=True, default=None, null=True)),
+                ("temp", models.JSONField(blank=True, default=None, null=True)),
+                (
+                    "character",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="character_stats",
+                        to="objects.objectdb",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("character", "category", "stat_type", "name")},
+                "indexes": [
+                    models.Index(fields=["category", "stat_type", "name"], name="wod20th_charstat_stat"),
+                    models.Index(Lower("name"), name="wod20th_charstat_name_lower"),
+                ],
+            },
+        ),
+        migrations.RunPython(copy_sheets, clear_rows),
+    ]
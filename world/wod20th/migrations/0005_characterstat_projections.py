@@ -0,0 +1,68 @@
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Lower
+
+BATCH_SIZE = 500
+
+
+def project_stat_value(value):
+    """Same as world.wod20th.models.project_stat_value, frozen here."""
+    number = None
+    if isinstance(value, int) and not isinstance(value, bool):
+        number = value
+    elif isinstance(value, str) and value.strip().lstrip('-').isdigit():
+        number = int(value)
+    text = '' if value is None else str(value).lower()[:255]
+    return number, text
+
+
+def fill_projections(apps, schema_editor):
+    CharacterStat = apps.get_model('wod20th', 'CharacterStat')
+    rows = []
+    for row in CharacterStat.objects.only('perm', 'temp').iterator(chunk_size=BATCH_SIZE):
+        row.perm_number, row.perm_text = project_stat_value(row.perm)
+        row.temp_number, row.temp_text = project_stat_value(row.temp)
+        rows.append(row)
+        if len(rows) >= BATCH_SIZE:
+            CharacterStat.objects.bulk_update(rows, ['perm_number', 'perm_text', 'temp_number', 'temp_text'])
+            rows = []
+    CharacterStat.objects.bulk_update(rows, ['perm_number', 'perm_text', 'temp_number', 'temp_text'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wod20th", "0004_characterstat"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="characterstat",
+            name="perm_number",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="characterstat",
+            name="perm_text",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="characterstat",
+            name="temp_number",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="characterstat",
+            name="temp_text",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name="characterstat",
+            index=models.Index(Lower("name"), F("perm_number"), name="wod20th_charstat_perm_number"),
+        ),
+        migrations.AddIndex(
+            model_name="characterstat",
+            index=models.Index(Lower("name"), F("perm_text"), name="wod20th_charstat_perm_text"),
+        ),
+        migrations.RunPython(fill_projections, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wod20th", "0005_characterstat_projections"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SceneRecord",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("started_at", models.DateTimeField()),
+                ("last_activity", models.DateTimeField()),
+                ("ended_at", models.DateTimeField(blank=True, null=True)),
+                ("completed", models.BooleanField(default=False)),
+                ("awarded", models.BooleanField(default=False)),
+                (
+                    "character",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="scene_records",
+                        to="objects.objectdb",
+                    ),
+                ),
+                (
+                    "room",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="objects.objectdb",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["completed", "awarded", "character"], name="wod20th_scene_unawarded"),
+                    models.Index(fields=["character", "ended_at"], name="wod20th_scene_character"),
+                    models.Index(fields=["room", "ended_at"], name="wod20th_scene_room"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wod20th", "0006_scenerecord"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scenerecord",
+            name="scene_key",
+            field=models.CharField(blank=True, db_index=True, default="", max_length=32),
+        ),
+    ]
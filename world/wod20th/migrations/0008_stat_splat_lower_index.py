@@ -0,0 +1,21 @@
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Lower
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wod20th", "0007_scenerecord_scene_key"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="stat",
+            name="wod20th_stat_splat_type",
+        ),
+        migrations.AddIndex(
+            model_name="stat",
+            index=models.Index(Lower("splat"), F("stat_type"), name="wod20th_stat_splat_lower_type"),
+        ),
+    ]
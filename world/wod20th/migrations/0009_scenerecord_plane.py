@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wod20th", "0008_stat_splat_lower_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scenerecord",
+            name="plane",
+            field=models.CharField(default="material", max_length=16),
+        ),
+    ]
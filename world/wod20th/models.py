@@ -2,6 +2,8 @@
 import re
 from django.db import models
 from django.db.models import JSONField  # Use the built-in JSONField
+from django.db.models import F
+from django.db.models.functions import Lower
 from django.forms import ValidationError
 from evennia.locks.lockhandler import LockHandler
 from django.conf import settings
@@ -202,6 +204,29 @@ MORTALPLUS_POOLS = {
         'Quintessence': {'default': 0, 'max': 10}
     },
 }
+
+
+class StatQuerySet(models.QuerySet):
+    """
+    Case-insensitive lookups written against Lower(...) so they can use the
+    functional indexes on Stat. (``name__iexact`` compiles to LIKE on SQLite
+    and UPPER() on PostgreSQL, neither of which can use them.)
+    """
+
+    def named(self, name):
+        return self.alias(name_lower=Lower('name')).filter(name_lower=name.lower())
+
+    def of_type(self, stat_type):
+        return self.alias(stat_type_lower=Lower('stat_type')).filter(stat_type_lower=stat_type.lower())
+
+    def in_category(self, category, stat_type=None):
+        qs = self.filter(category=category)
+        return qs.filter(stat_type=stat_type) if stat_type else qs
+
+    def for_splat(self, splat, stat_type=None):
+        qs = self.alias(splat_lower=Lower('splat')).filter(splat_lower=splat.lower())
+        return qs.filter(stat_type=stat_type) if stat_type else qs
+
 class Stat(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField(default='')  # Changed to non-nullable with default empty string
@@ -325,9 +350,70 @@ class Stat(models.Model):
                 if tribe.lower() not in valid_tribes and tribe.lower() != 'none':
                     raise ValidationError({'tribe': f'Invalid tribe: {tribe}'})
 
+    objects = StatQuerySet.as_manager()
+
     class Meta:
         app_label = 'wod20th'
         unique_together = ('name', 'stat_type')
+        indexes = [
+            models.Index(Lower('name'), name='wod20th_stat_name_lower'),
+            models.Index(Lower('stat_type'), name='wod20th_stat_type_lower'),
+            models.Index(fields=['category', 'stat_type'], name='wod20th_stat_category_type'),
+            models.Index(Lower('splat'), F('stat_type'), name='wod20th_stat_splat_lower_type'),
+        ]
+
+class CharacterStat(models.Model):
+    """
+    One stat on one character. Read and written through the character's
+    StatHandler (``character.stats``), see world.wod20th.utils.stat_handler.
+    """
+    character = models.ForeignKey(ObjectDB, related_name='character_stats', on_delete=models.CASCADE)
+    category = models.CharField(max_length=100)
+    # '' for stats stored directly under their category
+    stat_type = models.CharField(max_length=100, blank=True, default='')
+    name = models.CharField(max_length=255)
+    perm = JSONField(null=True, blank=True, default=None)
+    temp = JSONField(null=True, blank=True, default=None)
+    # perm and temp as a number (if they are one) and as lowercase text, so
+    # cross-character queries can compare them in SQL; see set_values().
+    perm_number = models.IntegerField(null=True, blank=True)
+    perm_text = models.CharField(max_length=255, blank=True, default='')
+    temp_number = models.IntegerField(null=True, blank=True)
+    temp_text = models.CharField(max_length=255, blank=True, default='')
+
+    VALUE_FIELDS = ['perm', 'temp', 'perm_number', 'perm_text', 'temp_number', 'temp_text']
+
+    class Meta:
+        app_label = 'wod20th'
+        unique_together = ('character', 'category', 'stat_type', 'name')
+        indexes = [
+            models.Index(fields=['category', 'stat_type', 'name'], name='wod20th_charstat_stat'),
+            models.Index(Lower('name'), name='wod20th_charstat_name_lower'),
+            models.Index(Lower('name'), F('perm_number'), name='wod20th_charstat_perm_number'),
+            models.Index(Lower('name'), F('perm_text'), name='wod20th_charstat_perm_text'),
+        ]
+
+    def __str__(self):
+        return f"{self.character_id}: {self.category}/{self.stat_type}/{self.name}"
+
+    def set_values(self, perm, temp):
+        """Set perm and temp along with their number/text projections."""
+        self.perm, self.temp = perm, temp
+        self.perm_number, self.perm_text = project_stat_value(perm)
+        self.temp_number, self.temp_text = project_stat_value(temp)
+
+def project_stat_value(value):
+    """
+    Return (number, text) for a stat value: the value as an int, or None if
+    it isn't a whole number, and the value as lowercase text ('' for None).
+    """
+    number = None
+    if isinstance(value, int) and not isinstance(value, bool):
+        number = value
+    elif isinstance(value, str) and value.strip().lstrip('-').isdigit():
+        number = int(value)
+    text = '' if value is None else str(value).lower()[:255]
+    return number, text
 
 class CharacterSheet(SharedMemoryModel):
     account = models.OneToOneField(AccountDB, related_name='character_sheet', on_delete=models.CASCADE, null=True)
@@ -337,76 +423,114 @@ class CharacterSheet(SharedMemoryModel):
     class Meta:
         app_label = 'wod20th'
 
+class SceneRecord(models.Model):
+    """
+    One character's part in one scene: opened when they first act in a
+    room's scene, closed when they leave it or it ends. Live scenes are
+    tracked in memory; see world.wod20th.utils.scene_tracker.
+    """
+    character = models.ForeignKey(ObjectDB, related_name='scene_records', on_delete=models.CASCADE)
+    room = models.ForeignKey(ObjectDB, related_name='+', null=True, on_delete=models.SET_NULL)
+    # Each plane of a room has its own scene (see plane_state)
+    plane = models.CharField(max_length=16, default='material')
+    # Shared by everyone in the same scene; names its log (see scene_log)
+    scene_key = models.CharField(max_length=32, blank=True, default='', db_index=True)
+    started_at = models.DateTimeField()
+    last_activity = models.DateTimeField()
+    # None while the scene is still going
+    ended_at = models.DateTimeField(null=True, blank=True)
+    # Long enough to count towards weekly XP
+    completed = models.BooleanField(default=False)
+    # Already counted by a weekly XP award
+    awarded = models.BooleanField(default=False)
+
+    class Meta:
+        app_label = 'wod20th'
+        indexes = [
+            models.Index(fields=['completed', 'awarded', 'character'], name='wod20th_scene_unawarded'),
+            models.Index(fields=['character', 'ended_at'], name='wod20th_scene_character'),
+            models.Index(fields=['room', 'ended_at'], name='wod20th_scene_room'),
+        ]
+
+    def __str__(self):
+        return f"{self.character_id} in {self.room_id} from {self.started_at}"
+
 
 from django.db import models
 from evennia.utils.idmapper.models import SharedMemoryModel
 
+# Enlightenment -> the two virtues that add up to its Road rating
+ROAD_VIRTUES = {
+    'Humanity': ('Conscience', 'Self-Control'),
+    'Night': ('Conviction', 'Instinct'),
+    'Beast': ('Conviction', 'Instinct'),
+    'Harmony': ('Conscience', 'Instinct'),
+    'Evil Revelations': ('Conviction', 'Self-Control'),
+    'Self-Focus': ('Conviction', 'Instinct'),
+    'Scorched Heart': ('Conviction', 'Self-Control'),
+    'Entelechy': ('Conviction', 'Self-Control'),
+    'Sharia El-Sama': ('Conscience', 'Self-Control'),
+    'Asakku': ('Conviction', 'Instinct'),
+    'Death and the Soul': ('Conviction', 'Self-Control'),
+    'Honorable Accord': ('Conscience', 'Self-Control'),
+    'Feral Heart': ('Conviction', 'Instinct'),
+    'Orion': ('Conviction', 'Instinct'),
+    'Power and the Inner Voice': ('Conviction', 'Instinct'),
+    'Lilith': ('Conviction', 'Instinct'),
+    'Caine': ('Conviction', 'Instinct'),
+    'Cathari': ('Conviction', 'Instinct'),
+    'Redemption': ('Conscience', 'Self-Control'),
+    'Metamorphosis': ('Conviction', 'Instinct'),
+    'Bones': ('Conviction', 'Self-Control'),
+    'Typhon': ('Conviction', 'Self-Control'),
+    'Paradox': ('Conviction', 'Self-Control'),
+    'Blood': ('Conviction', 'Self-Control'),
+    'Hive': ('Conviction', 'Instinct')
+}
+
+def _virtues(character):
+    """Return the character's moral virtues as {name: perm}."""
+    handler = getattr(character, 'stats', None)
+    if handler is None or not hasattr(handler, 'items'):
+        return {name: data.get('perm', 0)
+                for name, data in character.db.stats.get('virtues', {}).get('moral', {}).items()}
+    # Read through the handler so changes buffered in stats.batch() count
+    return {name: perm for _category, _type, name, perm, _temp in handler.items('virtues', 'moral')}
+
+def willpower_from_virtues(virtues, enlightenment):
+    """
+    Willpower for a set of virtues ({name: perm}): Courage plus Conviction on
+    most non-Humanity paths, Courage plus Conscience otherwise. Never below 1.
+    """
+    courage = virtues.get('Courage') or 0
+    if enlightenment and enlightenment != 'Humanity':
+        willpower = courage + (virtues.get('Conviction') or 0)
+    else:
+        willpower = courage + (virtues.get('Conscience') or 0)
+    return willpower if willpower > 0 else 1
+
+def road_from_virtues(virtues, enlightenment):
+    """Road rating for a set of virtues ({name: perm}); 0 for unknown paths."""
+    if enlightenment not in ROAD_VIRTUES:
+        return 0
+    virtue1, virtue2 = ROAD_VIRTUES[enlightenment]
+    return (virtues.get(virtue1) or 0) + (virtues.get(virtue2) or 0)
+
 def calculate_willpower(character):
     """Calculate Willpower based on virtues."""
     try:
-        # Get the character's virtues
-        virtues = character.db.stats.get('virtues', {}).get('moral', {})
-        
-        # Get Courage value (common to all paths)
-        courage = virtues.get('Courage', {}).get('perm', 0)
-        
-        # Get the other relevant virtue based on path
-        enlightenment = character.get_stat('identity', 'personal', 'Enlightenment')
-        
-        if enlightenment and enlightenment != 'Humanity':
-            # For most non-Humanity paths
-            conviction = virtues.get('Conviction', {}).get('perm', 0)
-            willpower = courage + conviction
-        else:
-            # For Humanity and paths using Conscience
-            conscience = virtues.get('Conscience', {}).get('perm', 0)
-            willpower = courage + conscience
-            
-        return willpower if willpower > 0 else 1
-        
+        return willpower_from_virtues(
+            _virtues(character),
+            character.get_stat('identity', 'personal', 'Enlightenment')
+        )
     except (AttributeError, KeyError):
         return 1
 
 def calculate_road(character):
-    enlightenment = character.get_stat('identity', 'personal', 'Enlightenment', temp=False)
-    virtues = character.db.stats.get('virtues', {}).get('moral', {})
-
-    path_virtues = {
-        'Humanity': ('Conscience', 'Self-Control'),
-        'Night': ('Conviction', 'Instinct'),
-        'Beast': ('Conviction', 'Instinct'),
-        'Harmony': ('Conscience', 'Instinct'),
-        'Evil Revelations': ('Conviction', 'Self-Control'),
-        'Self-Focus': ('Conviction', 'Instinct'),
-        'Scorched Heart': ('Conviction', 'Self-Control'),
-        'Entelechy': ('Conviction', 'Self-Control'),
-        'Sharia El-Sama': ('Conscience', 'Self-Control'),
-        'Asakku': ('Conviction', 'Instinct'),
-        'Death and the Soul': ('Conviction', 'Self-Control'),
-        'Honorable Accord': ('Conscience', 'Self-Control'),
-        'Feral Heart': ('Conviction', 'Instinct'),
-        'Orion': ('Conviction', 'Instinct'),
-        'Power and the Inner Voice': ('Conviction', 'Instinct'),
-        'Lilith': ('Conviction', 'Instinct'),
-        'Caine': ('Conviction', 'Instinct'),
-        'Cathari': ('Conviction', 'Instinct'),
-        'Redemption': ('Conscience', 'Self-Control'),
-        'Metamorphosis': ('Conviction', 'Instinct'),
-        'Bones': ('Conviction', 'Self-Control'),
-        'Typhon': ('Conviction', 'Self-Control'),
-        'Paradox': ('Conviction', 'Self-Control'),
-        'Blood': ('Conviction', 'Self-Control'),
-        'Hive': ('Conviction', 'Instinct')
-    }
-
-    if enlightenment in path_virtues:
-        virtue1, virtue2 = path_virtues[enlightenment]
-        value1 = virtues.get(virtue1, {}).get('perm', 0)
-        value2 = virtues.get(virtue2, {}).get('perm', 0)
-        return value1 + value2
-    else:
-        # If the enlightenment is not recognized, return 0 or a default value
-        return 0
+    return road_from_virtues(
+        _virtues(character),
+        character.get_stat('identity', 'personal', 'Enlightenment', temp=False)
+    )
 
 class ShapeshifterForm(models.Model):
     name = models.CharField(max_length=50)
@@ -561,6 +685,104 @@ SHIFTER_RENOWN: Dict[str, Union[List[str], Dict[str, Dict[str, List[int]]]]] = {
     "Rokea": ["Valor", "Harmony", "Innovation"]
 }
 
+# Starting pools for each shifter type. A rating is either fixed or
+# (lineage stat, {lowercased value: rating}).
+COMMON_BREED_GNOSIS = {'homid': 1, 'metis': 3, 'lupus': 5, 'animal-born': 5}
+SHIFTER_POOLS = {
+    'Ajaba': {
+        'Willpower': 3,
+        'Rage': ('Aspect', {'dawn': 5, 'midnight': 3, 'dusk': 1}),
+        'Gnosis': ('Aspect', {'dawn': 1, 'midnight': 3, 'dusk': 5}),
+    },
+    'Ananasi': {
+        'Blood': 10,
+        'Willpower': ('Breed', {'homid': 3, 'arachnid': 4, 'animal-born': 4}),
+        'Gnosis': ('Breed', {'homid': 1, 'arachnid': 5, 'animal-born': 5}),
+    },
+    'Bastet': {
+        'Rage': ('Tribe', {'balam': 4, 'bubasti': 1, 'ceilican': 3, 'khan': 5,
+                           'pumonca': 4, 'qualmi': 2, 'simba': 5, 'swara': 2}),
+        'Willpower': ('Tribe', {'balam': 3, 'bubasti': 5, 'ceilican': 3, 'khan': 2,
+                                'pumonca': 4, 'qualmi': 5, 'simba': 2, 'swara': 4}),
+        'Gnosis': ('Breed', COMMON_BREED_GNOSIS),
+    },
+    'Corax': {'Rage': 1, 'Gnosis': 6, 'Willpower': 3},
+    'Gurahl': {
+        'Willpower': 6,
+        'Rage': ('Breed', {'homid': 3, 'lupus': 4, 'animal-born': 4}),
+        'Gnosis': ('Breed', {'homid': 4, 'lupus': 5, 'animal-born': 5}),
+    },
+    'Kitsune': {
+        'Willpower': 5,
+        'Rage': ('Path', {'kataribe': 2, 'gukutsushi': 2, 'doshi': 3, 'eji': 4}),
+        'Gnosis': ('Breed', {'kojin': 3, 'homid': 3, 'roko': 5, 'animal-born': 5,
+                             'shinju': 4, 'metis': 4}),
+    },
+    'Mokole': {
+        'Gnosis': ('Breed', {'homid': 2, 'animal-born': 4, 'suchid': 4}),
+        'Willpower': ('Auspice', {
+            'rising sun striking': 3, 'noonday sun unshading': 5, 'setting sun warding': 3,
+            'shrouded sun concealing': 4, 'midnight sun shining': 4,
+            'decorated suns gathering': 5, 'solar eclipse crowning': 5,
+            'hemanta': 2, 'zarad': 3, 'grisma': 4, 'vasanta': 5,
+        }),
+        'Rage': ('Varna', {'champsa': 3, 'gharial': 4, 'halpatee': 4, 'karna': 3, 'makara': 3,
+                           'ora': 5, 'piasa': 4, 'syrta': 4, 'unktehi': 5}),
+    },
+    'Nagah': {
+        'Willpower': 4,
+        'Gnosis': ('Breed', {'balaram': 1, 'homid': 1, 'metis': 1, 'animal-born': 5, 'vasuki': 5}),
+        'Rage': ('Auspice', {'kamakshi': 3, 'kartikeya': 4, 'kamsa': 3, 'kali': 4}),
+    },
+    'Nuwisha': {
+        'Willpower': 4,
+        'Gnosis': ('Breed', {'homid': 1, 'animal-born': 5, 'latrani': 5}),
+    },
+    'Ratkin': {
+        'Willpower': 3,
+        'Gnosis': ('Breed', COMMON_BREED_GNOSIS),
+        'Rage': ('Aspect', {'tunnel runner': 1, 'shadow seer': 2, 'knife skulker': 3, 'warrior': 5,
+                            'engineer': 2, 'plague lord': 3, 'munchmausen': 4, 'twitcher': 5}),
+    },
+    'Rokea': {
+        'Willpower': 4,
+        'Gnosis': ('Breed', {'homid': 1, 'animal-born': 5, 'squamus': 5}),
+        'Rage': ('Auspice', {'brightwater': 5, 'dimwater': 4, 'darkwater': 3}),
+    },
+    'Garou': {
+        'Rage': ('Auspice', {'ahroun': 5, 'galliard': 4, 'philodox': 3, 'theurge': 2, 'ragabash': 1}),
+        'Gnosis': ('Breed', COMMON_BREED_GNOSIS),
+        'Willpower': ('Tribe', {
+            'black furies': 3, 'bone gnawers': 4, 'children of gaia': 4, 'fianna': 3,
+            'get of fenris': 3, 'glass walkers': 3, 'red talons': 3, 'shadow lords': 3,
+            'silent striders': 3, 'silver fangs': 3, 'stargazers': 4, 'uktena': 3, 'wendigo': 4,
+        }),
+    },
+}
+# Shifters that have no Rage pool at all
+SHIFTERS_WITHOUT_RAGE = ('Ananasi', 'Nuwisha')
+
+def shifter_starting_pools(shifter_type, lineage):
+    """
+    Starting pool ratings for a shifter.
+
+    Args:
+        shifter_type (str): Garou, Bastet, etc.
+        lineage (dict): The character's lineage stats, e.g. {'Breed': 'Homid'}.
+
+    Returns:
+        dict: {pool: rating}. Pools that depend on a lineage stat the
+        character hasn't set (or set to something unknown) are left out.
+    """
+    pools = {}
+    for pool, rating in SHIFTER_POOLS.get(shifter_type, {}).items():
+        if isinstance(rating, tuple):
+            stat_name, table = rating
+            rating = table.get(str(lineage.get(stat_name) or '').lower())
+        if rating is not None:
+            pools[pool] = rating
+    return pools
+
 CLAN = {
     'Brujah', 'Gangrel', 'Malkavian', 'Nosferatu', 'Toreador', 'Tremere', 'Ventrue', 'Lasombra', 
     'Tzimisce', 'Assamite', 'Followers of Set', 'Hecata', 'Ravnos', 'Baali', 'Blood Brothers', 
@@ -3,6 +3,7 @@ from world.wod20th.forms import create_shifter_forms
 from datetime import datetime, timedelta
 from evennia.utils.search import search_object
 from typeclasses.characters import Character
+from world.wod20th.utils.scene_tracker import SCENES
 from decimal import Decimal
 
 class InitShifterFormsScript(DefaultScript):
@@ -55,13 +56,18 @@ class WeeklyXPScript(DefaultScript):
     def at_repeat(self):
         """Called every week."""
         characters = search_object(typeclass="typeclasses.characters.Character")
+        completed = SCENES.completed_counts()
+        counted = []
         
         for char in characters:
             if not char.has_account:
                 continue
+            counted.append(char.id)
                 
-            # Check if they completed at least one valid scene
-            if char.db.scene_data and char.db.scene_data.get('completed_scenes', 0) > 0:
+            # Check if they completed at least one valid scene (scene_data
+            # holds the count from before scenes were recorded in SceneRecord)
+            legacy = char.db.scene_data.get('completed_scenes', 0) if char.db.scene_data else 0
+            if completed.get(char.id, 0) + legacy > 0:
                 # Use the character's add_xp method if it exists, otherwise update directly
                 if hasattr(char, 'award_ic_xp'):
                     char.award_ic_xp(4.00)
@@ -97,5 +103,6 @@ class WeeklyXPScript(DefaultScript):
             
             # Reset scene counter
             if char.db.scene_data:
-                char.db.scene_data['completed_scenes'] = 0
-                char.db.scene_data['last_weekly_reset'] = datetime.now() 
\ No newline at end of file
+                char.attributes.remove('scene_data')
+
+        SCENES.mark_awarded(counted) 
\ No newline at end of file
@@ -0,0 +1,115 @@
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+from evennia.objects.models import ObjectDB
+from evennia.typeclasses.attributes import Attribute
+from .models import ShapeshifterForm, Stat
+from .utils.stat_catalog import STAT_CATALOG, bump_stat_generation
+from .utils.text_index import DESCRIPTION_INDEX
+from .utils.sheet_cache import SHEET_ATTRIBUTES, invalidate_sheet
+from .utils.form_modifiers import FORM_MODIFIERS
+from .utils.occupancy import OCCUPANCY
+from .utils.plane_state import MATERIAL, UMBRA, refresh_plane
+from .utils.room_render import ROOM_ATTRIBUTES, invalidate_room_render
+
+
+@receiver(post_save, sender=Stat)
+def stat_saved(sender, instance, **kwargs):
+    """Keep the in-memory stat catalog in step with the table."""
+    generation = bump_stat_generation()
+    STAT_CATALOG.add(instance)
+    DESCRIPTION_INDEX.update(instance, generation)
+
+
+@receiver(post_delete, sender=Stat)
+def stat_deleted(sender, instance, **kwargs):
+    generation = bump_stat_generation()
+    STAT_CATALOG.discard(instance)
+    DESCRIPTION_INDEX.remove(instance, generation)
+
+
+@receiver(post_save, sender=ShapeshifterForm)
+@receiver(post_delete, sender=ShapeshifterForm)
+def shapeshifter_form_changed(sender, instance, **kwargs):
+    """Recompile forms after one is edited."""
+    FORM_MODIFIERS.invalidate()
+
+
+@receiver(post_save, sender=Attribute)
+def character_stats_saved(sender, instance, **kwargs):
+    """Bring CharacterStat rows in line after code writes db.stats directly."""
+    if instance.db_key != 'stats' or instance.db_category or instance.db_attrtype:
+        return
+    from .utils.stat_handler import StatHandler
+    for obj in instance.objectdb_set.all():
+        handler = getattr(obj, 'stats', None)
+        if isinstance(handler, StatHandler):
+            handler.at_legacy_saved()
+
+
+@receiver(post_save, sender=Attribute)
+@receiver(pre_delete, sender=Attribute)
+def sheet_attribute_changed(sender, instance, **kwargs):
+    """Drop cached +sheet renders when health, XP, etc. change."""
+    if instance.db_key not in SHEET_ATTRIBUTES or instance.db_category or instance.db_attrtype:
+        return
+    for obj in instance.objectdb_set.all():
+        invalidate_sheet(obj)
+
+
+@receiver(post_save, sender=Attribute)
+@receiver(pre_delete, sender=Attribute)
+def language_attribute_changed(sender, instance, **kwargs):
+    """Drop cached language lists when db.languages changes."""
+    if instance.db_key != 'languages' or instance.db_category or instance.db_attrtype:
+        return
+    for obj in instance.objectdb_set.all():
+        obj.ndb.language_cache = None
+
+
+@receiver(post_save, sender=Attribute)
+@receiver(pre_delete, sender=Attribute)
+def room_attribute_changed(sender, instance, **kwargs):
+    """Drop cached room looks when a room's desc, name, etc. change."""
+    if instance.db_key not in ROOM_ATTRIBUTES or instance.db_category or instance.db_attrtype:
+        return
+    for obj in instance.objectdb_set.all():
+        invalidate_room_render(obj)
+
+
+@receiver(m2m_changed, sender=ObjectDB.db_attributes.through)
+def cached_attribute_added(sender, instance, action, pk_set, **kwargs):
+    """New Attributes are saved before they're linked to their object, so catch the link."""
+    if action != 'post_add' or not isinstance(instance, ObjectDB):
+        return
+    watched = set()
+    if instance.ndb.sheet_cache:
+        watched |= SHEET_ATTRIBUTES
+    if instance.ndb.language_cache is not None:
+        watched.add('languages')
+    if instance.ndb.render_cache:
+        watched |= ROOM_ATTRIBUTES
+    if not watched:
+        return
+    keys = set(Attribute.objects.filter(pk__in=pk_set, db_key__in=watched, db_category__isnull=True,
+                                        db_attrtype__isnull=True).values_list('db_key', flat=True))
+    if keys & SHEET_ATTRIBUTES:
+        invalidate_sheet(instance)
+    if 'languages' in keys:
+        instance.ndb.language_cache = None
+    if keys & ROOM_ATTRIBUTES:
+        invalidate_room_render(instance)
+
+
+@receiver(m2m_changed, sender=ObjectDB.db_tags.through)
+def tags_changed(sender, instance, action, **kwargs):
+    """
+    Tags changed outside set_plane() may move an object between planes;
+    drop its cached plane and re-index it on the plane its tags now say.
+    """
+    if action in ('post_add', 'post_remove', 'post_clear') and isinstance(instance, ObjectDB):
+        refresh_plane(instance)
+        if OCCUPANCY.is_indexed(instance):
+            # The tag handler updates its cache after this signal, so ask the database
+            umbra = instance.db_tags.filter(db_key="in_umbra", db_category="state").exists()
+            instance.ndb.plane = UMBRA if umbra else MATERIAL
+            OCCUPANCY.update(instance)
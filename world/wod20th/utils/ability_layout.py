@@ -0,0 +1,126 @@
+"""
+Ability layouts: which abilities a sheet or chargen shows, in which column
+and in what order.
+
+Every character of the same splat, shifter type and clan gets the same
+layout, so layouts are compiled once per combination and shared:
+
+    layout = ABILITY_LAYOUTS.for_character(character)
+    layout.primary['talent']              # Stats, in display order
+    layout.secondary['secondary_skill']   # stat names, in display order
+
+Layouts are rebuilt when the stat catalog changes. They're shared between
+callers, so treat them as read-only.
+"""
+from collections import namedtuple
+
+from world.wod20th.utils.stat_catalog import STAT_CATALOG
+
+PRIMARY_COLUMNS = ('talent', 'skill', 'knowledge')
+SECONDARY_COLUMNS = ('secondary_talent', 'secondary_skill', 'secondary_knowledge')
+
+BASE_ABILITIES = {
+    'talent': ('Alertness', 'Athletics', 'Awareness', 'Brawl', 'Empathy',
+               'Expression', 'Intimidation', 'Leadership', 'Streetwise', 'Subterfuge'),
+    'skill': ('Animal Ken', 'Crafts', 'Drive', 'Etiquette', 'Firearms',
+              'Larceny', 'Melee', 'Performance', 'Stealth', 'Survival', 'Technology'),
+    'knowledge': ('Academics', 'Computer', 'Cosmology', 'Enigmas', 'Finance', 'Investigation',
+                  'Law', 'Medicine', 'Occult', 'Politics', 'Science'),
+}
+
+BASE_SECONDARY_ABILITIES = {
+    'secondary_talent': ('Carousing', 'Diplomacy', 'Intrigue', 'Mimicry', 'Scrounging', 'Seduction', 'Style'),
+    'secondary_skill': ('Archery', 'Fortune-Telling', 'Fencing', 'Gambling', 'Jury-Rigging', 'Pilot', 'Torture'),
+    'secondary_knowledge': ('Area Knowledge', 'Cultural Savvy', 'Demolitions', 'Herbalism', 'Media',
+                            'Power-Brokering', 'Vice'),
+}
+
+MAGE_SECONDARY_ABILITIES = {
+    'secondary_talent': ('High Ritual', 'Blatancy'),
+    'secondary_skill': ('Microgravity Ops', 'Energy Weapons', 'Helmsman', 'Biotech'),
+    'secondary_knowledge': ('Hypertech', 'Cybernetics', 'Paraphysics', 'Xenobiology'),
+}
+
+FLYING_SHIFTERS = ('Corax', 'Camazotz', 'Mokole')
+
+# Chargen's ability categories and the column each one fills
+CHARGEN_COLUMNS = {'Talents': 'talent', 'Skills': 'skill', 'Knowledges': 'knowledge'}
+
+AbilityLayout = namedtuple('AbilityLayout', 'primary secondary')
+
+
+def layout_key(splat, shifter_type='', clan=''):
+    """
+    Reduce a character's splat, shifter type and clan to the parts that
+    change its layout, so e.g. every Mortal shares one layout.
+    """
+    splat = str(splat or '').strip()
+    shifter_type = str(shifter_type or '').strip() if splat == 'Shifter' else ''
+    clan = str(clan or '').strip() if splat == 'Vampire' else ''
+    return splat, shifter_type, clan
+
+
+def splat_extras(splat, shifter_type='', clan=''):
+    """Return {column: (stat name, ...)} of the abilities a splat adds to the base ones."""
+    splat, shifter_type, clan = layout_key(splat, shifter_type, clan)
+    if splat == 'Shifter':
+        talents = ('Primal-Urge', 'Flight') if shifter_type in FLYING_SHIFTERS else ('Primal-Urge',)
+        return {'talent': talents, 'knowledge': ('Rituals',)}
+    if splat == 'Vampire' and clan == 'Gargoyle':
+        return {'talent': ('Flight',)}
+    return {}
+
+
+class AbilityLayouts:
+    """
+    Compiles and caches ability layouts.
+
+    Args:
+        catalog (StatCatalog): Where the ability Stats come from.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self._layouts = {}
+        self._version = None
+
+    def compile(self, splat, shifter_type='', clan=''):
+        """Build a layout without caching it."""
+        extras = splat_extras(splat, shifter_type, clan)
+        primary = {}
+        for column in PRIMARY_COLUMNS:
+            base = BASE_ABILITIES[column]
+            abilities = [stat for stat in self.catalog.by_category('abilities', column) if stat.name in base]
+            for name in extras.get(column, ()):
+                stat = self.catalog.get(name)
+                if stat:
+                    abilities.append(stat)
+            primary[column] = tuple(sorted(abilities, key=lambda stat: stat.name))
+
+        secondary = dict(BASE_SECONDARY_ABILITIES)
+        if layout_key(splat)[0].lower() == 'mage':
+            secondary = {column: names + MAGE_SECONDARY_ABILITIES[column]
+                         for column, names in secondary.items()}
+        return AbilityLayout(primary, secondary)
+
+    def get(self, splat, shifter_type='', clan=''):
+        """Return the layout for a splat, shifter type and clan."""
+        if self._version != self.catalog.version:
+            self._layouts.clear()
+            self._version = self.catalog.version
+        key = layout_key(splat, shifter_type, clan)
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = self._layouts[key] = self.compile(*key)
+        return layout
+
+    def for_character(self, character):
+        """Return the layout for a character's current splat, shifter type and clan."""
+        return self.get(
+            character.get_stat('other', 'splat', 'Splat', temp=False),
+            character.get_stat('identity', 'lineage', 'Type', temp=False),
+            character.get_stat('identity', 'lineage', 'Clan', temp=False),
+        )
+
+
+ABILITY_LAYOUTS = AbilityLayouts(STAT_CATALOG)
@@ -1,78 +1,230 @@
-import textwrap
-from evennia.utils.ansi import strip_raw_ansi, ANSIString
+"""
+ANSI-aware text wrapping.
 
-def wrap_ansi(text, width, left_padding=0, right_padding=0):
+wrap_ansi() wraps text that carries Evennia/MUX color markup (|r, |[b,
+|500, |=a, |#ff0000, %ch, %cr, ...) or raw ANSI codes, counting only what
+shows on screen. The text is tokenized once with a single pattern built
+from Evennia's own ANSI parser tables, so whatever the parser treats as a
+color code takes no width here, and the wrap is a single pass over the
+tokens: linear in the length of the text.
+
+    wrap_ansi("|rA long, red|n description ...", width=78)
+    wrap_ansi(note.text, width=76, left_padding=2, hanging_indent=4)
+
+Markup is kept as written (escapes like || included), so the result is
+still markup, ready for msg().
+"""
+import re
+
+from evennia.utils.ansi import ANSI_PARSER
+
+TAB_WIDTH = 4
+
+
+def _markup_pattern(parser):
+    """Build the tokenizer pattern from parser's markup tables."""
+    breaks, tabs, zero_width = [], [], []
+    for code, value in parser.ansi_map:
+        if value == '\r\n':
+            breaks.append(code)
+        elif value == '\t':
+            tabs.append(code)
+        elif not value.strip():
+            # |_ and |> are spaces that don't break a line
+            continue
+        else:
+            zero_width.append(code)
+    zero_width.extend(code for code, _ in parser.ansi_xterm256_bright_bg_map)
+    literal_codes = sorted(zero_width, key=len, reverse=True)
+    codes = (
+        [re.escape(code) for code in literal_codes]
+        + [r'\|\[?#(?:[0-9a-fA-F]{6}|[0-9a-fA-F]{3})',    # truecolor
+           r'(?:\||%c)\[?(?:[0-5]{3}|=[a-z])',             # xterm256 and greyscale
+           r'\|l[cu].*?\|lt', r'\|le',                     # MXP links show only their text
+           r'\x1b\[[0-9;]*m']                              # raw ANSI
+    )
+    spaces = sorted((code for code, value in parser.ansi_map if value.strip() == '' and value not in ('\r\n', '\t')),
+                    key=len, reverse=True)
+    groups = [
+        ('escape', [r'\|\|', r'\{\{']),
+        ('break', [r'\r?\n'] + [re.escape(code) for code in breaks]),
+        ('tab', [r'\t'] + [re.escape(code) for code in tabs]),
+        ('code', codes),
+        ('hard_space', [re.escape(code) for code in spaces]),
+        ('space', [r' +']),
+        ('text', [r'[^ \t\r\n|%{\x1b]+', r'.']),
+    ]
+    return re.compile('|'.join(f"(?P<{name}>{'|'.join(patterns)})" for name, patterns in groups if patterns))
+
+
+TOKEN_PATTERN = _markup_pattern(ANSI_PARSER)
+# Visible width of the spaces that don't break a line
+_HARD_SPACE_WIDTH = {code: len(value) for code, value in ANSI_PARSER.ansi_map
+                     if value.strip() == '' and value not in ('\r\n', '\t')}
+
+
+def tokenize(text):
+    """
+    Split text into (kind, source, visible width) tokens, where kind is
+    'text', 'code', 'space' or 'break'.
+    """
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text):
+        kind, source = match.lastgroup, match.group()
+        if kind == 'text':
+            tokens.append(('text', source, len(source)))
+        elif kind == 'space':
+            tokens.append(('space', source, len(source)))
+        elif kind == 'code':
+            tokens.append(('code', source, 0))
+        elif kind == 'escape':
+            tokens.append(('text', source, 1))
+        elif kind == 'hard_space':
+            tokens.append(('text', source, _HARD_SPACE_WIDTH[source]))
+        elif kind == 'tab':
+            tokens.append(('space', source, TAB_WIDTH))
+        else:
+            tokens.append(('break', source, 0))
+    return tokens
+
+
+def visible_width(text):
+    """Return how many columns text takes on screen."""
+    return sum(width for _, _, width in tokenize(str(text)))
+
+
+class _Wrapper:
+    """One wrap_ansi() call's state: the lines so far and the word being read."""
+
+    def __init__(self, width, hanging_indent):
+        self.width = width
+        self.hanging = " " * hanging_indent
+        self.lines = []
+        self.line = []
+        self.line_width = 0
+        self.paragraph_start = True
+        # The word being read, and the spaces before it
+        self.word = []
+        self.word_width = 0
+        self.space = []
+        self.space_width = 0
+
+    def available(self):
+        return self.width if self.paragraph_start else self.width - len(self.hanging)
+
+    def end_line(self):
+        prefix = "" if self.paragraph_start else self.hanging
+        self.lines.append(prefix + "".join(self.line))
+        self.line = []
+        self.line_width = 0
+        self.paragraph_start = False
+
+    def add_space(self, source, width):
+        self.end_word()
+        self.space.append((source, width))
+        self.space_width += width
+
+    def add_word(self, source, width):
+        self.word.append((source, width))
+        self.word_width += width
+
+    def take_space(self, keep):
+        """Put the pending spaces on the line, or only their codes if not keep."""
+        self.line.extend(source for source, width in self.space if keep or not width)
+        if keep:
+            self.line_width += self.space_width
+        self.space, self.space_width = [], 0
+
+    def end_word(self):
+        word, width = self.word, self.word_width
+        if not word:
+            return
+        self.word, self.word_width = [], 0
+        if not width:
+            # Just color codes; they stay in order with the spaces around them
+            self.space.extend(word)
+            return
+        # Leading spaces are kept only as a paragraph's indent
+        keep = bool(self.line_width or self.paragraph_start)
+        if self.line_width and self.line_width + self.space_width + width > self.available():
+            self.end_line()
+            keep = False
+        self.take_space(keep)
+        if self.line_width + width <= self.available():
+            self.line.extend(source for source, _ in word)
+            self.line_width += width
+            return
+        # Longer than the room left on the line: break it
+        for source, token_width in word:
+            self.add_broken(source, token_width)
+
+    def add_broken(self, source, width):
+        if len(source) != width:
+            # A code, escape or hard space; these stay whole
+            if width and self.line_width + width > self.available():
+                self.end_line()
+            self.line.append(source)
+            self.line_width += width
+            return
+        while source:
+            room = self.available() - self.line_width
+            if room <= 0:
+                self.end_line()
+                continue
+            self.line.append(source[:room])
+            self.line_width += len(source[:room])
+            source = source[room:]
+
+    def end_paragraph(self):
+        self.end_word()
+        self.take_space(False)
+        self.end_line()
+        self.paragraph_start = True
+
+    def finish(self):
+        """Return the wrapped lines."""
+        self.end_word()
+        self.take_space(False)
+        if self.line and not self.line_width and self.lines:
+            # Codes after the last text, e.g. a closing |n
+            self.lines[-1] += "".join(self.line)
+        elif self.line or not self.lines or not self.paragraph_start:
+            self.end_line()
+        return self.lines
+
+
+def wrap_ansi(text, width, left_padding=0, right_padding=0, hanging_indent=0):
     """
     Wraps a string to the specified width, preserving ANSI codes, with optional left and right padding.
 
     Args:
-        text (str): The text to wrap.
+        text (str): The text to wrap. Newlines (and |/, %r) start a new
+            paragraph.
         width (int): The width to wrap the text to, including padding.
         left_padding (int): The amount of padding to add to the left side.
         right_padding (int): The amount of padding to add to the right side.
+        hanging_indent (int): Extra indent for every line of a paragraph
+            but its first.
 
     Returns:
         str: The wrapped text with padding.
     """
     if left_padding + right_padding >= width:
         raise ValueError("Combined padding is too large for the given width.")
-
-    # Convert to ANSIString to handle color codes
-    ansi_text = ANSIString(text)
-    
-    # Get clean text for wrapping calculations
-    clean_text = ansi_text.clean()
-    
-    # Calculate actual display width
     wrap_width = width - left_padding - right_padding
+    if hanging_indent >= wrap_width:
+        raise ValueError("Hanging indent is too large for the given width.")
+    if not text:
+        return ""
 
-    # Split into words while preserving color codes
-    words = []
-    current_word = ""
-    current_codes = ""
-    
-    for i, char in enumerate(str(ansi_text)):
-        if char == '|' and i + 1 < len(str(ansi_text)):
-            current_codes += char + str(ansi_text)[i + 1]
-            continue
-        elif char == ' ':
-            if current_word:
-                words.append(current_codes + current_word)
-                current_word = ""
-                current_codes = ""
-            else:
-                words.append(' ')
+    wrapper = _Wrapper(wrap_width, hanging_indent)
+    for kind, source, token_width in tokenize(str(text)):
+        if kind == 'space':
+            wrapper.add_space(source, token_width)
+        elif kind == 'break':
+            wrapper.end_paragraph()
         else:
-            current_word += char
-    
-    if current_word:
-        words.append(current_codes + current_word)
-
-    # Build wrapped lines
-    lines = []
-    current_line = []
-    current_length = 0
-
-    for word in words:
-        word_clean = ANSIString(word).clean()
-        word_length = len(word_clean)
-        
-        if current_length + word_length <= wrap_width:
-            current_line.append(word)
-            current_length += word_length + (1 if current_length > 0 else 0)
-        else:
-            if current_line:
-                lines.append(" ".join(current_line))
-            current_line = [word]
-            current_length = word_length
-
-    if current_line:
-        lines.append(" ".join(current_line))
+            wrapper.add_word(source, token_width)
 
     # Add padding
-    padded_lines = [
-        " " * left_padding + line + " " * right_padding
-        for line in lines
-    ]
-
-    return "\n".join(padded_lines)
+    return "\n".join(" " * left_padding + line + " " * right_padding for line in wrapper.finish())
@@ -0,0 +1,128 @@
+"""
+Room broadcasts for say, pose and emote.
+
+A speaker's audience is every puppeted character in the same room and on
+the same plane (material or Umbra), as kept by the occupancy index.
+broadcast() splits that audience once into groups that see the same text:
+
+    SELF            the speaker
+    UNDERSTAND      listeners who follow the language spoken (or everyone,
+                    for untagged text)
+    NOT_UNDERSTAND  everyone else
+
+then renders each group's message once and sends it to every member:
+
+    msg_self, msg_understand, msg_not_understand, language = speaker.prepare_say(speech)
+    broadcast(speaker, {SELF: msg_self, UNDERSTAND: msg_understand,
+                        NOT_UNDERSTAND: msg_not_understand}, language=language)
+
+A message may be a callable, which is only called if its group has anyone
+in it. BROADCAST_STATS counts broadcasts, renders and deliveries.
+"""
+from world.wod20th.utils.occupancy import OCCUPANCY
+
+SELF = 'self'
+UNDERSTAND = 'understand'
+NOT_UNDERSTAND = 'not_understand'
+
+# Merit names (lowercased, without spaces) that let a listener follow any language
+UNIVERSAL_LANGUAGE_MERITS = frozenset({'universallanguage', 'universallinguist', 'universallanguist'})
+
+# Process-wide counters: 'renders' is messages built, 'deliveries' is
+# msg() calls made.
+BROADCAST_STATS = {'broadcasts': 0, 'renders': 0, 'deliveries': 0}
+
+
+def same_plane_listeners(speaker):
+    """Return the puppeted characters in speaker's room and on speaker's plane."""
+    return OCCUPANCY.occupants(speaker.location, OCCUPANCY.plane(speaker))
+
+
+def is_staff(listener):
+    """Staff follow every language."""
+    account = listener.account
+    return bool(account) and (account.check_permstring("admin") or account.check_permstring("builder"))
+
+
+def has_universal_language(listener):
+    """
+    Return True if listener has a merit letting them follow any language.
+    The answer is kept in ndb until the listener's sheet changes.
+    """
+    stats = listener.stats
+    cached = listener.ndb.universal_language
+    if cached is None or cached[0] is not stats or cached[1] != stats.version:
+        found = any(name.lower().replace(' ', '') in UNIVERSAL_LANGUAGE_MERITS
+                    for _category, _stat_type, name, _perm, _temp in stats.items('merits'))
+        cached = listener.ndb.universal_language = (stats, stats.version, found)
+    return cached[2]
+
+
+def follows(listener, language, staff=False, universal=False):
+    """
+    True if listener follows speech in language (None: untagged, which
+    everyone follows). staff and universal as for partition_audience.
+    """
+    return (not language or listener.languages.knows(language)
+            or (staff and is_staff(listener))
+            or (universal and has_universal_language(listener)))
+
+
+def partition_audience(speaker, language=None, staff=False, universal=False, exclude=None):
+    """
+    Split speaker's audience by who follows language.
+
+    Args:
+        speaker (Object): Who is speaking.
+        language (str): Language spoken, or None if everyone follows.
+        staff (bool): Staff follow every language.
+        universal (bool): Listeners with Universal Language follow every language.
+        exclude (list): Listeners to leave out.
+
+    Returns:
+        dict: {SELF: [...], UNDERSTAND: [...], NOT_UNDERSTAND: [...]}.
+    """
+    groups = {SELF: [], UNDERSTAND: [], NOT_UNDERSTAND: []}
+    for listener in same_plane_listeners(speaker):
+        if exclude and listener in exclude:
+            continue
+        if listener == speaker:
+            group = SELF
+        elif follows(listener, language, staff, universal):
+            group = UNDERSTAND
+        else:
+            group = NOT_UNDERSTAND
+        groups[group].append(listener)
+    return groups
+
+
+def broadcast(speaker, messages, language=None, staff=False, universal=False, exclude=None):
+    """
+    Send each audience group its message.
+
+    Args:
+        speaker (Object): Who is speaking.
+        messages (dict): {group: text, or callable returning text}. Groups
+            without a message get nothing; the speaker gets the SELF
+            message even if they're not on the audience list.
+        language, staff, universal, exclude: See partition_audience.
+
+    Returns:
+        dict: The audience groups, as from partition_audience.
+    """
+    groups = partition_audience(speaker, language, staff, universal, exclude)
+    if SELF in messages and not groups[SELF]:
+        groups[SELF].append(speaker)
+
+    BROADCAST_STATS['broadcasts'] += 1
+    for group, listeners in groups.items():
+        message = messages.get(group)
+        if not listeners or message is None:
+            continue
+        if callable(message):
+            message = message()
+        BROADCAST_STATS['renders'] += 1
+        for listener in listeners:
+            listener.msg(message)
+        BROADCAST_STATS['deliveries'] += len(listeners)
+    return groups
@@ -0,0 +1,221 @@
+"""
+Derived stats: values worked out from other stats rather than set directly.
+
+Each derived stat declares the stats (and other derived stats) it is
+computed from, which makes the whole set a small dependency graph:
+
+    virtues, Enlightenment        -> willpower, road
+    Splat, shifter lineage        -> starting_pools -> rage, gnosis
+    Splat, Generation, Mortal+    -> blood_pool (and starting_pools, for Ananasi)
+
+``character.derived`` holds the current values. It listens for stat changes
+on the character's stats handler and marks only the derived stats that
+depend on a changed stat as stale; those are recomputed on next read, and
+everything else is a plain dict lookup:
+
+    character.derived.willpower
+    character.derived['blood_pool']
+"""
+from world.wod20th.models import (
+    MORTALPLUS_POOLS, SHIFTER_POOLS, road_from_virtues, shifter_starting_pools,
+    willpower_from_virtues
+)
+
+SPLAT = ('other', 'splat', 'Splat')
+ENLIGHTENMENT = ('identity', 'personal', 'Enlightenment')
+GENERATION = ('identity', 'lineage', 'Generation')
+MORTALPLUS_TYPE = ('identity', 'lineage', 'Mortal+ Type')
+SHIFTER_TYPE = ('identity', 'lineage', 'Type')
+VIRTUES = tuple(('virtues', 'moral', name) for name in
+                ('Courage', 'Conscience', 'Conviction', 'Instinct', 'Self-Control'))
+# Every lineage stat a shifter's starting pools are looked up by
+SHIFTER_LINEAGE = tuple(
+    ('identity', 'lineage', name) for name in sorted({
+        rating[0] for pools in SHIFTER_POOLS.values()
+        for rating in pools.values() if isinstance(rating, tuple)
+    })
+)
+
+
+class DerivedStat:
+    """
+    One derived stat.
+
+    Args:
+        name (str): Name it is read by, e.g. character.derived.willpower.
+        inputs (tuple): (category, stat_type, name) keys of the stats it is
+            computed from, and names of other derived stats.
+        compute (callable): Called with {input: value}; returns the value.
+    """
+
+    def __init__(self, name, inputs, compute):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.compute = compute
+
+
+class DerivedGraph:
+    """
+    A set of derived stats, with every stat mapped to the derived stats it
+    affects, directly or through another derived stat.
+
+    Args:
+        stats (iterable): DerivedStats; each one's derived inputs must come
+            before it.
+    """
+
+    def __init__(self, stats):
+        self.stats = {}
+        dependents = {}
+        for stat in stats:
+            for dep in stat.inputs:
+                if isinstance(dep, str) and dep not in self.stats:
+                    raise ValueError(f"Derived stat '{stat.name}' depends on unknown '{dep}'.")
+                dependents.setdefault(dep, []).append(stat.name)
+            self.stats[stat.name] = stat
+
+        self.affected = {}
+        for dep in dependents:
+            if isinstance(dep, str):
+                continue
+            names, queue = set(), list(dependents[dep])
+            while queue:
+                name = queue.pop()
+                if name not in names:
+                    names.add(name)
+                    queue.extend(dependents.get(name, ()))
+            self.affected[dep] = frozenset(names)
+
+
+def calculate_blood_pool(generation):
+    """
+    Calculate blood pool based on vampire generation.
+
+    Args:
+        generation (str): Character's generation (e.g. '7th', '13th')
+
+    Returns:
+        int: Maximum blood pool for that generation
+    """
+    # Extract number from generation string and convert to int
+    try:
+        gen_num = int(''.join(filter(str.isdigit, str(generation))))
+    except (ValueError, TypeError):
+        gen_num = 13  # Default to 13th generation if invalid/missing
+
+    # Calculate blood pool based on generation
+    if gen_num >= 13:
+        return 10
+    elif gen_num == 12:
+        return 11
+    elif gen_num == 11:
+        return 12
+    elif gen_num == 10:
+        return 13
+    elif gen_num == 9:
+        return 14
+    elif gen_num == 8:
+        return 15
+    elif gen_num == 7:
+        return 20
+    else:
+        return 10  # Default to 10 for any unexpected values
+
+
+def _splat(values):
+    return str(values[SPLAT] or '').lower()
+
+
+def _virtue_values(values):
+    return {key[2]: values[key] for key in VIRTUES if values[key] is not None}
+
+
+def _willpower(values):
+    return willpower_from_virtues(_virtue_values(values), values[ENLIGHTENMENT])
+
+
+def _road(values):
+    return road_from_virtues(_virtue_values(values), values[ENLIGHTENMENT])
+
+
+def _starting_pools(values):
+    splat = _splat(values)
+    if splat == 'shifter':
+        lineage = {key[2]: values[key] for key in SHIFTER_LINEAGE}
+        return shifter_starting_pools(values[SHIFTER_TYPE], lineage)
+    if splat == 'mortal+':
+        return {pool: data['default']
+                for pool, data in MORTALPLUS_POOLS.get(values[MORTALPLUS_TYPE], {}).items()}
+    return {}
+
+
+def _blood_pool(values):
+    """Maximum blood pool, or None for characters without one."""
+    splat = _splat(values)
+    if splat == 'vampire':
+        return calculate_blood_pool(values[GENERATION] or '13th')
+    if splat == 'mortal+':
+        return MORTALPLUS_POOLS.get(values[MORTALPLUS_TYPE], {}).get('Blood', {}).get('max')
+    return values['starting_pools'].get('Blood')
+
+
+DERIVED_GRAPH = DerivedGraph([
+    DerivedStat('willpower', VIRTUES + (ENLIGHTENMENT,), _willpower),
+    DerivedStat('road', VIRTUES + (ENLIGHTENMENT,), _road),
+    DerivedStat('starting_pools', (SPLAT, SHIFTER_TYPE, MORTALPLUS_TYPE) + SHIFTER_LINEAGE,
+                _starting_pools),
+    DerivedStat('rage', ('starting_pools',), lambda values: values['starting_pools'].get('Rage')),
+    DerivedStat('gnosis', ('starting_pools',), lambda values: values['starting_pools'].get('Gnosis')),
+    DerivedStat('blood_pool', (SPLAT, GENERATION, MORTALPLUS_TYPE, 'starting_pools'), _blood_pool),
+])
+
+
+class DerivedStats:
+    """
+    A character's derived stats, available as ``character.derived``.
+
+    Values are cached; a stat change marks the derived stats depending on it
+    as stale, and those are recomputed the next time they are read. Values
+    that are dicts (starting_pools) are shared and must not be modified.
+    """
+
+    def __init__(self, obj, graph=DERIVED_GRAPH):
+        self.obj = obj
+        self.graph = graph
+        self._values = {}
+        self._stale = set(graph.stats)
+        obj.stats.subscribe(self._changed)
+
+    def _changed(self, keys):
+        if keys is None:
+            self._stale.update(self.graph.stats)
+            return
+        affected = self.graph.affected
+        for key in keys:
+            names = affected.get(key)
+            if names:
+                self._stale.update(names)
+
+    def __getitem__(self, name):
+        if name in self._stale:
+            stat = self.graph.stats[name]
+            handler = self.obj.stats
+            values = {
+                dep: self[dep] if isinstance(dep, str) else handler.get(*dep)
+                for dep in stat.inputs
+            }
+            self._values[name] = stat.compute(values)
+            self._stale.discard(name)
+        return self._values[name]
+
+    def __getattr__(self, name):
+        graph = self.__dict__.get('graph')
+        if graph is not None and name in graph.stats:
+            return self[name]
+        raise AttributeError(name)
+
+    def get(self, name, default=None):
+        """Return a derived stat, or default if there is no such derived stat."""
+        if name not in self.graph.stats:
+            return default
+        return self[name]
@@ -0,0 +1,152 @@
+"""
+Compiled shapeshifter form modifiers.
+
+Each ShapeshifterForm is compiled once into a modifier vector over the nine
+attributes, in ATTRIBUTES order, with the war-form rules (Appearance drops to
+0, Crinos takes -2 Manipulation) folded in. Forms are loaded and compiled per
+shifter type the first time that type shifts, and dropped again when a form
+is saved or deleted (see world.wod20th.signals).
+
+Shifting is then one pass over the vector and one bulk_set:
+
+    form = FORM_MODIFIERS.get('garou', 'Crinos')
+    character.stats.bulk_set(form.shift_entries(character.stats), temp=True)
+
+and the same vector answers "what would this pool be in Crinos?" without
+touching the sheet:
+
+    FORM_MODIFIERS.get('garou', 'Crinos').dice_pool(character.stats, ['str', 'brawl'])
+"""
+from world.wod20th.utils.roll_index import RollIndex
+
+ATTRIBUTES = (
+    ('physical', 'Strength'), ('physical', 'Dexterity'), ('physical', 'Stamina'),
+    ('social', 'Charisma'), ('social', 'Manipulation'), ('social', 'Appearance'),
+    ('mental', 'Perception'), ('mental', 'Intelligence'), ('mental', 'Wits'),
+)
+ATTRIBUTE_INDEX = {name.lower(): index for index, (_, name) in enumerate(ATTRIBUTES)}
+APPEARANCE = ATTRIBUTE_INDEX['appearance']
+MANIPULATION = ATTRIBUTE_INDEX['manipulation']
+
+# Forms that set Appearance to 0
+ZERO_APPEARANCE_FORMS = (
+    'crinos',      # All shapeshifters
+    'anthros',     # Ajaba war form
+    'arthren',     # Gurahl war form
+    'sokto',       # Bastet war form
+    'chatro',      # Bastet battle form
+)
+CRINOS_MANIPULATION = -2
+
+
+class CompiledForm:
+    """
+    A ShapeshifterForm reduced to what a shift does to the sheet.
+
+    Args:
+        form (ShapeshifterForm): The form row.
+
+    Attributes:
+        offsets (tuple): Per attribute, the modifier to add to the permanent
+            value, or None if the form leaves that attribute alone.
+        zeroed (frozenset): Indexes of attributes the form sets to 0.
+    """
+
+    def __init__(self, form):
+        self.form = form
+        self.name = form.name
+        offsets = [None] * len(ATTRIBUTES)
+        zeroed = set()
+        for stat, mod in (form.stat_modifiers or {}).items():
+            index = ATTRIBUTE_INDEX.get(str(stat).strip().lower())
+            if index is not None:
+                offsets[index] = mod
+        name = form.name.lower()
+        if name in ZERO_APPEARANCE_FORMS:
+            zeroed.add(APPEARANCE)
+            if name == 'crinos':
+                offsets[MANIPULATION] = CRINOS_MANIPULATION
+        self.offsets = tuple(offsets)
+        self.zeroed = frozenset(zeroed)
+
+    def apply(self, perms):
+        """
+        Return the temporary attribute values in this form, given the
+        permanent ones (both in ATTRIBUTES order; None where unchanged).
+        """
+        return tuple(
+            0 if index in self.zeroed else None if offset is None else max(0, perm + offset)
+            for index, (perm, offset) in enumerate(zip(perms, self.offsets))
+        )
+
+    def _attribute_values(self, stats):
+        perms = [stats.get('attributes', stat_type, name) or 0 for stat_type, name in ATTRIBUTES]
+        return {
+            ('attributes', stat_type, name): value
+            for (stat_type, name), value in zip(ATTRIBUTES, self.apply(perms))
+            if value is not None
+        }
+
+    def shift_entries(self, stats):
+        """
+        Return bulk_set entries (temp=True) for shifting into this form:
+        every stat back to its permanent value, then the form's attributes.
+        """
+        values = {(category, stat_type, name): perm
+                  for category, stat_type, name, perm, _temp in stats.items()}
+        values.update(self._attribute_values(stats))
+        return [key + (value,) for key, value in values.items()]
+
+    def preview(self, stats):
+        """
+        Return the sheet as it would be in this form, as StatHandler.items()
+        style (category, stat_type, name, perm, temp) tuples. Nothing is saved.
+        """
+        values = self._attribute_values(stats)
+        entries = []
+        for category, stat_type, name, perm, _temp in stats.items():
+            key = (category, stat_type, name)
+            entries.append(key + (perm, values.pop(key, perm)))
+        entries.extend(key + (0, value) for key, value in values.items())
+        return entries
+
+    def dice_pool(self, stats, terms):
+        """
+        Resolve roll terms against the sheet as it would be in this form.
+
+        Returns:
+            tuple: (total dice, [(stat name, value), ...]).
+        """
+        index = RollIndex(self.preview(stats))
+        parts = [(name, value) for value, name in map(index.lookup, terms)]
+        return sum(value for _, value in parts), parts
+
+
+class FormModifiers:
+    """Compiled forms, loaded and cached per shifter type."""
+
+    def __init__(self):
+        self._by_type = {}
+
+    def forms(self, shifter_type):
+        """Return {lowercased form name: CompiledForm} for a shifter type."""
+        shifter_type = (shifter_type or '').strip().lower()
+        forms = self._by_type.get(shifter_type)
+        if forms is None:
+            from world.wod20th.models import ShapeshifterForm
+            forms = {}
+            for form in ShapeshifterForm.objects.filter(shifter_type=shifter_type).order_by('id'):
+                forms.setdefault(form.name.lower(), CompiledForm(form))
+            self._by_type[shifter_type] = forms
+        return forms
+
+    def get(self, shifter_type, name):
+        """Return the CompiledForm for a shifter type's form, or None."""
+        return self.forms(shifter_type).get((name or '').strip().lower())
+
+    def invalidate(self):
+        """Drop every compiled form; they're reloaded on next use."""
+        self._by_type.clear()
+
+
+FORM_MODIFIERS = FormModifiers()
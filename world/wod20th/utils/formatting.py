@@ -1,6 +1,5 @@
 from evennia.utils.ansi import ANSIString
-from collections import defaultdict
-from world.wod20th.models import Stat
+from world.wod20th.utils.ability_layout import ABILITY_LAYOUTS, CHARGEN_COLUMNS
 
 def format_stat(stat, value, width=25, default=None, tempvalue=None, allow_zero=False):
     """Format a stat for display with proper spacing and temporary values."""
@@ -82,29 +81,17 @@ def divider(title, width=78, fillchar="-", color="|r", text_color="|n"):
 
 def format_abilities(character):
     """Format abilities section of character sheet."""
-    abilities = defaultdict(dict)
-    
-    # Get all standard abilities
-    for stat in Stat.objects.filter(stat_type__in=['talent', 'skill', 'knowledge']):
-        value = character.get_stat('abilities', stat.stat_type, stat.name)
-        if value is not None:
-            abilities[stat.category][stat.name] = value
-
-    # Get splat-specific abilities
-    for stat in Stat.objects.filter(stat_type='ability'):
-        if character.can_have_ability(stat.name):
-            value = character.get_stat('abilities', 'ability', stat.name)
-            if value is not None:
-                # Add to appropriate category based on the ability's category
-                abilities[stat.category][stat.name] = value
-    
+    layout = ABILITY_LAYOUTS.for_character(character)
+
     # Format output
     output = []
-    for category in ['Talents', 'Skills', 'Knowledges']:
-        if abilities[category]:
+    for category, stat_type in CHARGEN_COLUMNS.items():
+        values = [(stat.name, character.get_stat('abilities', stat_type, stat.name))
+                  for stat in layout.primary[stat_type]]
+        values = [(name, value) for name, value in values if value is not None]
+        if values:
             output.append(f"{category:^20}")
-            for name, value in sorted(abilities[category].items()):
-                if value is not None:
-                    output.append(f"{name:.<20}{value}")
-            
+            for name, value in values:
+                output.append(f"{name:.<20}{value}")
+
     return "\n".join(output)
@@ -0,0 +1,199 @@
+"""
+Trigram and prefix index for fuzzy name matching.
+
+Used by the stat catalog to resolve partial, abbreviated and misspelled stat
+names without scanning every name. Each name is indexed under its lowercase
+form and a compact form with spaces and hyphens removed, so 'primal urge',
+'primalurge' and 'Primal-Urge' all land on the same entry.
+
+Names can be added and removed one at a time; nothing is rebuilt wholesale.
+"""
+from bisect import bisect_left, insort
+from collections import defaultdict, Counter
+
+# Shorthand players use for the core attributes.
+STAT_ABBREVIATIONS = {
+    'str': 'strength',
+    'dex': 'dexterity',
+    'sta': 'stamina',
+    'cha': 'charisma',
+    'man': 'manipulation',
+    'app': 'appearance',
+    'per': 'perception',
+    'int': 'intelligence',
+    'wit': 'wits',
+}
+
+
+def normalize(text):
+    """Lowercase and trim a name."""
+    return (text or '').strip().lower()
+
+
+def compact(text):
+    """Normalize a name and strip spaces and hyphens."""
+    return normalize(text).replace('-', '').replace(' ', '')
+
+
+def trigrams(text, pad=True):
+    """
+    Return the set of trigrams in text.
+
+    Padded trigrams (two leading blanks, one trailing) weight the start of a
+    word, which is where abbreviations and typos usually agree. Unpadded
+    trigrams are used for substring tests.
+    """
+    if pad:
+        text = f"  {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class FuzzyIndex:
+    """
+    Index of names supporting substring, prefix, abbreviation and
+    ranked similarity lookups.
+
+    All lookups return the lowercase form of the indexed names; callers map
+    those back to their own objects.
+    """
+
+    def __init__(self, abbreviations=None):
+        self.abbreviations = abbreviations if abbreviations is not None else STAT_ABBREVIATIONS
+        # term (lowercase or compact form) -> set of lowercase names
+        self._terms = defaultdict(set)
+        # trigram -> set of terms containing it
+        self._grams = defaultdict(set)
+        # every term, sorted, for prefix searches
+        self._sorted = []
+
+    def _terms_for(self, key):
+        return {key, key.replace('-', '').replace(' ', '')}
+
+    def add(self, name):
+        """Index a name. Adding a name twice is harmless."""
+        key = normalize(name)
+        if not key:
+            return
+        for term in self._terms_for(key):
+            if term not in self._terms:
+                insort(self._sorted, term)
+                for gram in trigrams(term):
+                    self._grams[gram].add(term)
+            self._terms[term].add(key)
+
+    def discard(self, name):
+        """Remove a name from the index."""
+        key = normalize(name)
+        for term in self._terms_for(key):
+            keys = self._terms.get(term)
+            if not keys or key not in keys:
+                continue
+            keys.discard(key)
+            if keys:
+                continue
+            del self._terms[term]
+            pos = bisect_left(self._sorted, term)
+            if pos < len(self._sorted) and self._sorted[pos] == term:
+                del self._sorted[pos]
+            for gram in trigrams(term):
+                terms = self._grams.get(gram)
+                if terms is not None:
+                    terms.discard(term)
+                    if not terms:
+                        del self._grams[gram]
+
+    def clear(self):
+        self._terms.clear()
+        self._grams.clear()
+        self._sorted.clear()
+
+    def __contains__(self, name):
+        return normalize(name) in self._terms
+
+    def __len__(self):
+        return len({key for keys in self._terms.values() for key in keys})
+
+    def _keys(self, terms):
+        return {key for term in terms for key in self._terms[term]}
+
+    def prefix(self, text):
+        """Return names that start with text (ignoring spaces and hyphens)."""
+        result = set()
+        for probe in {normalize(text), compact(text)}:
+            if not probe:
+                continue
+            pos = bisect_left(self._sorted, probe)
+            while pos < len(self._sorted) and self._sorted[pos].startswith(probe):
+                result.update(self._terms[self._sorted[pos]])
+                pos += 1
+        return sorted(result, key=lambda key: (len(key), key))
+
+    def contains(self, text):
+        """Return names containing text as a substring."""
+        text = normalize(text)
+        if not text:
+            return []
+        grams = trigrams(text, pad=False)
+        if not grams:
+            # Too short for trigrams; a scan is still cheap at this size.
+            return sorted(self._keys(term for term in self._terms if text in term))
+        postings = sorted((self._grams.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return sorted(self._keys(term for term in candidates if text in term))
+
+    def expand(self, text):
+        """
+        Expand an abbreviation to a single name, or return None.
+
+        Tries the abbreviation table, then an exact match, then the shortest
+        name starting with the text, then names whose words each start with
+        the corresponding word of the text ('prim urge' -> 'primal-urge').
+        """
+        key = normalize(text)
+        if not key:
+            return None
+        probe = compact(key)
+        if probe in self.abbreviations:
+            return self.abbreviations[probe]
+        for term in (key, probe):
+            if term in self._terms:
+                return min(self._terms[term])
+        matches = self.prefix(key)
+        if matches:
+            return matches[0]
+        words = key.replace('-', ' ').split()
+        if len(words) > 1:
+            for name in self.prefix(words[0]):
+                name_words = name.replace('-', ' ').split()
+                if len(name_words) == len(words) and all(
+                        nw.startswith(w) for nw, w in zip(name_words, words)):
+                    return name
+        return None
+
+    def suggest(self, text, limit=5, cutoff=0.3):
+        """
+        Return up to limit names similar to text, best first.
+
+        Similarity is the Dice coefficient over padded trigrams, so only
+        names sharing at least one trigram with the text are ever scored.
+        """
+        key = normalize(text)
+        if not key:
+            return []
+        scores = {}
+        for probe in {key, compact(key)}:
+            grams = trigrams(probe)
+            shared = Counter()
+            for gram in grams:
+                for term in self._grams.get(gram, ()):
+                    shared[term] += 1
+            for term, count in shared.items():
+                score = 2.0 * count / (len(grams) + len(term) + 1)
+                for name in self._terms[term]:
+                    if score > scores.get(name, 0):
+                        scores[name] = score
+        ranked = sorted(
+            ((score, name) for name, score in scores.items() if score >= cutoff),
+            key=lambda item: (-item[0], len(item[1]), item[1])
+        )
+        return [name for score, name in ranked[:limit]]
@@ -1,34 +1,135 @@
+"""
+Boot-time seeding of game data.
+
+Boot seeds the basic stats and splat abilities (BOOT_DATA_FILES) and the
+built-in shapeshifter form table. Seeding only creates stats that aren't in
+the database yet; existing rows, staff edits included, are left alone.
+Loading the rest of data/, and overwriting rows, is done on purpose with
+`evennia load_wod20th_stats`.
+
+Each source is fingerprinted with a SHA-1 hash, and the hashes from the last
+successful seed are kept in the database as a ServerConfig entry. On boot
+only the sources whose hash changed are re-seeded, and that work runs in a
+thread so the server can take logins straight away. A boot with no data
+changes touches nothing.
+"""
+import hashlib
 import json
-from pathlib import Path
-from world.wod20th.models import Stat
-
-def load_stats(data_dir):
-    """Load all stats from JSON files"""
-    import os
-    
-    # Load basic stats
-    basic_stats_path = os.path.join(data_dir, 'attributes_merits_flaws_basic_backgrounds.json')
-    with open(basic_stats_path) as f:
-        basic_stats = json.load(f)
-    
-    # Load splat-specific abilities
-    splat_abilities_path = os.path.join(data_dir, 'splat_abilities.json')
-    with open(splat_abilities_path) as f:
-        splat_abilities = json.load(f)
-    
-    # Create basic stats
-    for stat_data in basic_stats:
-        Stat.objects.get_or_create(
-            name=stat_data['name'],
-            defaults=stat_data
-        )
-    
-    # Create splat-specific abilities
-    for splat, categories in splat_abilities.items():
-        for category, abilities in categories.items():
-            for ability_data in abilities.values():
-                print(f"Creating/updating {ability_data['name']} for {splat}")  # Debug print
-                Stat.objects.get_or_create(
-                    name=ability_data['name'],
-                    defaults=ability_data
-                ) 
\ No newline at end of file
+import os
+
+from django.db import close_old_connections
+from evennia.server.models import ServerConfig
+from evennia.utils import logger
+from evennia.utils.utils import run_async
+
+from world.wod20th.utils.stat_catalog import STAT_CATALOG
+from world.wod20th.utils.stat_loader import parse_stat_files, missing_stats, apply_diff
+
+# The data files seeded at boot
+BOOT_DATA_FILES = ('attributes_merits_flaws_basic_backgrounds.json', 'splat_abilities.json')
+
+MANIFEST_KEY = "wod20th_data_manifest"
+# Manifest entry for the form table in world.wod20th.forms
+SHIFTER_FORMS_KEY = "__shifter_forms__"
+
+
+def file_hash(path):
+    """Return the SHA-1 of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compute_manifest(data_dir):
+    """Hash every source seeded at boot. Returns {source name: hash}."""
+    from world.wod20th.forms import SHIFTER_FORMS
+
+    manifest = {}
+    for filename in BOOT_DATA_FILES:
+        path = os.path.join(data_dir, filename)
+        if os.path.exists(path):
+            manifest[filename] = file_hash(path)
+    manifest[SHIFTER_FORMS_KEY] = hashlib.sha1(
+        json.dumps(SHIFTER_FORMS, sort_keys=True).encode('utf-8')
+    ).hexdigest()
+    return manifest
+
+
+def get_stored_manifest():
+    return ServerConfig.objects.conf(MANIFEST_KEY, default={}) or {}
+
+
+def store_manifest(manifest):
+    ServerConfig.objects.conf(MANIFEST_KEY, value=manifest)
+
+
+def changed_sources(manifest, stored):
+    """Return the source names whose hash differs from the stored manifest."""
+    return sorted(name for name, digest in manifest.items() if stored.get(name) != digest)
+
+
+def load_stats(data_dir, filenames=None):
+    """
+    Create the stats from data_dir's boot files that aren't in the database yet.
+
+    Args:
+        data_dir (str): The data directory.
+        filenames (list, optional): Only load these of BOOT_DATA_FILES.
+
+    Returns:
+        StatDiff: What was written.
+    """
+    file_paths = []
+    for filename in BOOT_DATA_FILES:
+        path = os.path.join(data_dir, filename)
+        if (filenames is None or filename in filenames) and os.path.exists(path):
+            file_paths.append(path)
+    records = []
+    for file_path, file_records, errors in parse_stat_files(file_paths):
+        for error in errors:
+            logger.log_err(error)
+        records.extend(file_records)
+    diff = missing_stats(records)
+    # The caller may be in a worker thread, so leave the catalog to it.
+    apply_diff(diff, invalidate=False)
+    return diff
+
+
+def _seed(data_dir, changed):
+    """Worker-thread half of seed_game_data."""
+    from world.wod20th.forms import create_shifter_forms
+
+    try:
+        if SHIFTER_FORMS_KEY in changed:
+            create_shifter_forms()
+        filenames = [name for name in changed if name != SHIFTER_FORMS_KEY]
+        return load_stats(data_dir, filenames) if filenames else None
+    finally:
+        close_old_connections()
+
+
+def seed_game_data(data_dir):
+    """
+    Seed stats and shapeshifter forms from data_dir if anything changed
+    since the last boot. Returns immediately; the seeding itself runs in
+    a thread.
+    """
+    manifest = compute_manifest(data_dir)
+    changed = changed_sources(manifest, get_stored_manifest())
+    if not changed:
+        logger.log_info("Game data unchanged since last boot; skipping seeding.")
+        return
+
+    def _at_return(diff):
+        STAT_CATALOG.invalidate()
+        store_manifest(manifest)
+        summary = f" ({diff.summary()})" if diff is not None else ""
+        logger.log_info(f"Seeded game data from {len(changed)} changed source(s){summary}.")
+
+    def _at_err(failure):
+        logger.log_err(f"Seeding game data failed; it will be retried next boot: {failure}")
+
+    logger.log_info(f"Seeding game data in the background: {', '.join(changed)}")
+    run_async(_seed, data_dir, changed, at_return=_at_return, at_err=_at_err)
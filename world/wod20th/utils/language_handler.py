@@ -0,0 +1,90 @@
+"""
+Per-character known languages, available as ``character.languages``.
+
+The list is stored in ``db.languages``, but older characters have all sorts
+in there (comma-joined strings, stray quotes, odd capitalization, unknown
+names). The handler normalizes it once, caches the result in ndb and hands
+that out until ``db.languages`` changes (a signal handler in
+world.wod20th.signals drops the cache), so checking whether each listener
+in a room understands a line is a set lookup rather than a cleanup pass and
+an Attribute save per listener:
+
+    character.languages.knows('Spanish')
+    character.languages.all()       # ['English', 'Spanish', ...]
+"""
+from world.wod20th.utils.language_data import AVAILABLE_LANGUAGES
+
+# Lowercased language name -> its proper name
+LANGUAGE_NAMES = {}
+for _name in AVAILABLE_LANGUAGES.values():
+    LANGUAGE_NAMES.setdefault(_name.lower(), _name)
+
+DEFAULT_LANGUAGE = "English"
+
+
+def normalize_languages(raw):
+    """
+    Clean up a stored language list: split comma-joined entries, strip
+    quotes and brackets, drop unknown names and duplicates, and put English
+    first.
+
+    Returns:
+        list: Proper language names.
+    """
+    if not raw:
+        raw = []
+    elif isinstance(raw, str) or not hasattr(raw, '__iter__'):
+        raw = [raw]
+
+    languages, seen = [], {DEFAULT_LANGUAGE.lower()}
+    for entry in raw:
+        text = str(entry).replace('"', '').replace("'", '').replace('[', '').replace(']', '')
+        for part in text.split(','):
+            key = part.strip().lower()
+            if key in LANGUAGE_NAMES and key not in seen:
+                languages.append(LANGUAGE_NAMES[key])
+                seen.add(key)
+    return [DEFAULT_LANGUAGE] + languages
+
+
+class LanguageHandler:
+    """
+    A character's known languages.
+
+    The normalized list and a set of lowercased names are kept in
+    ``ndb.language_cache``. ``db.languages`` is only rewritten when the
+    stored value wasn't already clean, or when set() changes it.
+    """
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def _load(self):
+        cached = self.obj.ndb.language_cache
+        if cached is None:
+            raw = self.obj.db.languages
+            languages = normalize_languages(raw)
+            if raw != languages:
+                self.obj.db.languages = languages
+            cached = (tuple(languages), frozenset(name.lower() for name in languages))
+            self.obj.ndb.language_cache = cached
+        return cached
+
+    def all(self):
+        """Return the known languages, English first, as a new list."""
+        return list(self._load()[0])
+
+    def knows(self, language):
+        """Return True if the character knows language (any capitalization)."""
+        return bool(language) and str(language).strip().lower() in self._load()[1]
+
+    def set(self, languages):
+        """Replace the known languages; they're normalized first."""
+        languages = normalize_languages(languages)
+        if self.obj.db.languages != languages:
+            self.obj.db.languages = languages
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop the cached list; the next read rebuilds it from db.languages."""
+        self.obj.ndb.language_cache = None
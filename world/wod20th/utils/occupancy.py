@@ -0,0 +1,141 @@
+"""
+Live index of which puppeted characters are in which room, by plane.
+
+Room look, room messages, say/pose, scene detection and the fae commands
+all want "the players in this room (on my plane)". Rather than walking
+``location.contents`` and reading tags on every object each time, the
+index is kept up to date by the Character hooks that change it: moving
+(at_post_move), puppeting and unpuppeting, and changing plane (set_plane in
+world.wod20th.utils.plane_state). Queries are dict lookups:
+
+    OCCUPANCY.occupants(room)              # everyone, in arrival order
+    OCCUPANCY.occupants(room, UMBRA)       # just those in the Umbra
+    OCCUPANCY.count(room, OCCUPANCY.plane(character))
+
+The index lives in memory, so it's rebuilt from the connected sessions the
+first time it's used after a start or reload. OCCUPANCY.check() compares it
+with a full scan and lists any differences.
+"""
+
+from world.wod20th.utils.plane_state import PLANES, plane_of, stored_plane
+
+
+class OccupancyIndex:
+    """Puppeted characters by room and plane."""
+
+    def __init__(self):
+        self._loaded = False
+        # room id -> {plane: {character id: character}}
+        self._rooms = {}
+        # character id -> (room id, plane)
+        self._placed = {}
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.rebuild()
+
+    def rebuild(self):
+        """Rebuild the index from the connected sessions."""
+        import evennia
+        self._rooms.clear()
+        self._placed.clear()
+        self._loaded = True
+        if evennia.SESSION_HANDLER is None:
+            return
+        for session in evennia.SESSION_HANDLER.get_sessions():
+            puppet = session.puppet
+            if puppet is not None and puppet.id not in self._placed:
+                self.update(puppet)
+
+    def _remove(self, obj):
+        placed = self._placed.pop(obj.id, None)
+        if placed:
+            room_id, plane = placed
+            planes = self._rooms.get(room_id)
+            if planes:
+                planes[plane].pop(obj.id, None)
+                if not any(planes.values()):
+                    del self._rooms[room_id]
+
+    def update(self, obj):
+        """Re-index obj after it moved, changed plane, or was (un)puppeted."""
+        self._ensure_loaded()
+        self._remove(obj)
+        location = obj.location
+        if location is None or not obj.has_account:
+            return
+        plane = plane_of(obj)
+        planes = self._rooms.setdefault(location.id, {p: {} for p in PLANES})
+        planes[plane][obj.id] = obj
+        self._placed[obj.id] = (location.id, plane)
+
+    def is_indexed(self, obj):
+        """True if obj is in the index (without loading it)."""
+        return obj.id in self._placed
+
+    def discard(self, obj):
+        """Drop obj from the index."""
+        self._remove(obj)
+
+    def plane(self, obj):
+        """Return the plane obj is indexed on, or its current plane if it isn't indexed."""
+        self._ensure_loaded()
+        placed = self._placed.get(obj.id)
+        return placed[1] if placed else plane_of(obj)
+
+    def occupants(self, room, plane=None):
+        """Return the puppeted characters in room, optionally only those on plane."""
+        self._ensure_loaded()
+        planes = self._rooms.get(room.id) if room else None
+        if not planes:
+            return []
+        if plane is not None:
+            return list(planes[plane].values())
+        return [obj for p in PLANES for obj in planes[p].values()]
+
+    def count(self, room, plane=None):
+        """Return how many puppeted characters are in room (on plane)."""
+        self._ensure_loaded()
+        planes = self._rooms.get(room.id) if room else None
+        if not planes:
+            return 0
+        if plane is not None:
+            return len(planes[plane])
+        return sum(len(chars) for chars in planes.values())
+
+    def check(self):
+        """
+        Compare the index with the rooms' actual contents.
+
+        Returns:
+            list: Descriptions of any differences; empty if it's consistent.
+        """
+        from typeclasses.characters import Character
+        self._ensure_loaded()
+        problems = []
+        rooms = {}
+        for obj_id, (room_id, plane) in self._placed.items():
+            obj = self._rooms[room_id][plane][obj_id]
+            if obj.location:
+                rooms[obj.location.id] = obj.location
+            if obj.location is None or obj.location.id != room_id:
+                problems.append(f"{obj.key}(#{obj_id}) is indexed in #{room_id} but is in {obj.location}.")
+            elif not obj.has_account:
+                problems.append(f"{obj.key}(#{obj_id}) is indexed but isn't puppeted.")
+            elif stored_plane(obj) != plane:
+                problems.append(f"{obj.key}(#{obj_id}) is indexed as {plane} but is {stored_plane(obj)}.")
+
+        import evennia
+        sessions = evennia.SESSION_HANDLER.get_sessions() if evennia.SESSION_HANDLER else []
+        for session in sessions:
+            puppet = session.puppet
+            if puppet is not None and puppet.location:
+                rooms[puppet.location.id] = puppet.location
+        for room in rooms.values():
+            for obj in room.contents:
+                if isinstance(obj, Character) and obj.has_account and obj.id not in self._placed:
+                    problems.append(f"{obj.key}(#{obj.id}) is in #{room.id} but isn't indexed.")
+        return problems
+
+
+OCCUPANCY = OccupancyIndex()
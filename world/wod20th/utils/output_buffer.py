@@ -0,0 +1,138 @@
+"""
+Per-command output buffering.
+
+While a command runs, everything sent to any session (the pose break, the
+pose, replies to the caller, ...) is held, and when the command finishes
+each session's output goes out in order, with runs of plain text joined
+into a single payload. So a pose costs each listener one send across the
+Server -> Portal link rather than one per msg() call.
+
+server.conf.serversession.ServerSession wires this in:
+
+    with OUTPUT_BUFFER.command():      # around data_in
+        ...
+    OUTPUT_BUFFER.hold(session, kwargs)   # in data_out
+
+Output sent outside a command (tickers, scripts, and anything a command
+sends after yielding) goes out straight away. OUTPUT_STATS counts
+'messages' (data_out calls) and 'sends' (payloads sent to the Portal);
+@outputstats shows them, and can turn buffering off to compare.
+"""
+from contextlib import contextmanager
+
+OUTPUT_STATS = {'commands': 0, 'messages': 0, 'sends': 0}
+
+# Keys a payload may have and still be joined with its neighbours
+PLAIN_TEXT_KEYS = frozenset({'text', 'options'})
+
+
+def _plain_text(kwargs):
+    """
+    Return (text, text options, options) if kwargs is just text that can be
+    joined with other text, else None.
+    """
+    if not PLAIN_TEXT_KEYS.issuperset(kwargs):
+        return None
+    text = kwargs.get('text')
+    if isinstance(text, str):
+        return text, None, kwargs.get('options')
+    if (isinstance(text, (tuple, list)) and len(text) == 2
+            and isinstance(text[0], str) and isinstance(text[1], dict)):
+        return text[0], text[1], kwargs.get('options')
+    return None
+
+
+def coalesce(payloads):
+    """
+    Join runs of plain-text payloads that share the same options, keeping
+    everything in order.
+
+    Args:
+        payloads (list): data_out kwargs, in the order they were sent.
+
+    Returns:
+        list: The payloads to send.
+    """
+    merged = []
+    run = None  # [texts, text options, options, first payload] for the current text run
+    for kwargs in payloads:
+        plain = _plain_text(kwargs)
+        if plain is not None and run is not None and (plain[1], plain[2]) == (run[1], run[2]):
+            run[0].append(plain[0])
+            continue
+        if run is not None:
+            merged.append(_join(run))
+            run = None
+        if plain is not None:
+            run = [[plain[0]], plain[1], plain[2], kwargs]
+        else:
+            merged.append(kwargs)
+    if run is not None:
+        merged.append(_join(run))
+    return merged
+
+
+def _join(run):
+    texts, text_options, options, first = run
+    if len(texts) == 1:
+        return first
+    text = '\n'.join(texts)
+    kwargs = {'text': text if text_options is None else (text, text_options)}
+    if options is not None:
+        kwargs['options'] = options
+    return kwargs
+
+
+class OutputBuffer:
+    """Holds session output while a command runs."""
+
+    def __init__(self):
+        self.enabled = True
+        self._depth = 0
+        # sessid -> (session, [data_out kwargs, ...]), keyed by sessid since
+        # sessions compare by address; dicts keep sessions in the order they
+        # were first sent to
+        self._pending = {}
+
+    @contextmanager
+    def command(self):
+        """Hold output until the outermost command finishes."""
+        self._depth += 1
+        OUTPUT_STATS['commands'] += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                self.flush()
+
+    def hold(self, session, kwargs):
+        """
+        Hold kwargs for session if a command is running.
+
+        Returns:
+            bool: True if held; False means the caller should send it now.
+        """
+        OUTPUT_STATS['messages'] += 1
+        if not self.enabled or not self._depth:
+            OUTPUT_STATS['sends'] += 1
+            return False
+        self._pending.setdefault(session.sessid, (session, []))[1].append(kwargs)
+        return True
+
+    def flush(self):
+        """Send everything held, one coalesced batch per session."""
+        pending, self._pending = self._pending, {}
+        for session, payloads in pending.values():
+            for kwargs in coalesce(payloads):
+                OUTPUT_STATS['sends'] += 1
+                session.send_out(**kwargs)
+
+
+OUTPUT_BUFFER = OutputBuffer()
+
+
+def reset_output_stats():
+    """Zero the counters."""
+    for key in OUTPUT_STATS:
+        OUTPUT_STATS[key] = 0
@@ -0,0 +1,57 @@
+"""
+Which plane an object is on: the material world or the Umbra.
+
+The plane is stored three ways for the benefit of older code and builder
+commands: the "in_umbra" / "in_material" state tags and ``db.in_umbra``.
+The tag is the source of truth. plane_of() reads it once and caches the
+answer in ``ndb.plane``, so room messages, looks and who lists don't run a
+tag query per object:
+
+    if plane_of(looker) == UMBRA: ...
+    in_umbra(puppet)
+
+set_plane() is the one way to change planes. It writes the tags,
+db.in_umbra and the cache together, and re-indexes the object in the room
+occupancy index. Adding or removing the tags by hand (@tag and the like)
+drops the cache and re-indexes the object through a signal; tags.clear()
+sends none, so call refresh_plane() after it.
+"""
+MATERIAL = 'material'
+UMBRA = 'umbra'
+PLANES = (MATERIAL, UMBRA)
+
+
+def stored_plane(obj):
+    """Return obj's plane as stored in its tags, bypassing the cache."""
+    return UMBRA if obj.tags.has("in_umbra", category="state") else MATERIAL
+
+
+def plane_of(obj):
+    """Return the plane obj is on."""
+    plane = obj.ndb.plane
+    if plane is None:
+        plane = obj.ndb.plane = stored_plane(obj)
+    return plane
+
+
+def in_umbra(obj):
+    """True if obj is in the Umbra."""
+    return plane_of(obj) == UMBRA
+
+
+def set_plane(obj, plane):
+    """Move obj to plane, updating its tags, db.in_umbra, the cache and the occupancy index."""
+    from world.wod20th.utils.occupancy import OCCUPANCY
+
+    umbra = plane == UMBRA
+    obj.tags.remove("in_material" if umbra else "in_umbra", category="state")
+    obj.tags.add("in_umbra" if umbra else "in_material", category="state")
+    if obj.attributes.get('in_umbra') != umbra:
+        obj.attributes.add('in_umbra', umbra)
+    obj.ndb.plane = plane
+    OCCUPANCY.update(obj)
+
+
+def refresh_plane(obj):
+    """Drop obj's cached plane, e.g. after its tags were edited by hand."""
+    obj.ndb.plane = None
@@ -0,0 +1,76 @@
+"""
+Pose compiler for language-tagged speech.
+
+A pose like
+
+    waves and says "~Bonjour!" then "hello".
+
+is split once into literal text and "~tagged" speech segments. Rendering
+runs the speaker's prepare_say once per speech segment and assembles the
+two variants everyone sees: quotes in full for those who follow the
+speaker's language, a placeholder for those who don't. Sending is then one
+lookup per listener rather than a parse per listener:
+
+    pose = CompiledPose(text)
+    understood, not_understood = pose.render(caller, prefix=f"{caller.key} ")
+"""
+import re
+
+SPEECH_PATTERN = re.compile(r'"~([^"]+)"')
+
+
+class CompiledPose:
+    """
+    A pose split into literal and speech segments.
+
+    Args:
+        text (str): The pose text, with special characters already processed.
+
+    Attributes:
+        literals (tuple): The text around the speech; always one longer than
+            speech.
+        speech (tuple): The tagged speech, without the quotes and tilde.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        literals, speech = [], []
+        position = 0
+        for match in SPEECH_PATTERN.finditer(text):
+            literals.append(text[position:match.start()])
+            speech.append(match.group(1))
+            position = match.end()
+        literals.append(text[position:])
+        self.literals = tuple(literals)
+        self.speech = tuple(speech)
+
+    @property
+    def has_speech(self):
+        """True if the pose has any language-tagged speech."""
+        return bool(self.speech)
+
+    def assemble(self, quotes, prefix=''):
+        """Interleave the literal segments with rendered quotes."""
+        parts = [prefix, self.literals[0]]
+        for quote, literal in zip(quotes, self.literals[1:]):
+            parts.append(f'"{quote}"')
+            parts.append(literal)
+        return ''.join(parts)
+
+    def render(self, speaker, prefix=''):
+        """
+        Render the pose for both audiences.
+
+        Args:
+            speaker (Character): Whose speaking language the speech is in.
+            prefix (str): Prepended to both variants, e.g. the poser's name.
+
+        Returns:
+            tuple: (text for those who understand, text for those who don't).
+        """
+        understood, not_understood = [], []
+        for speech in self.speech:
+            _, msg_understand, msg_not_understand, _ = speaker.prepare_say(speech, language_only=True)
+            understood.append(msg_understand)
+            not_understood.append(msg_not_understand)
+        return self.assemble(understood, prefix), self.assemble(not_understood, prefix)
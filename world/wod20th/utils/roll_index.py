@@ -0,0 +1,116 @@
+"""
+Per-character stat lookup index for dice rolls.
+
++roll resolves every term of an expression ('dex', 'Firearms', 'prim urge')
+against the roller's own sheet. The index is built once from the sheet and
+reused until the sheet changes (see StatHandler.roll_index), so each term is
+a couple of dict lookups plus, for partial names, a walk down a prefix trie
+as long as the term itself.
+
+Resolution order, as +roll has always done it:
+
+1. Abbreviations (STAT_ABBREVIATIONS: 'dex' -> 'dexterity').
+2. Primal-Urge ('primal', 'primalurge').
+3. An exact name among secondary abilities.
+4. An exact name, then an exact name ignoring spaces and hyphens.
+5. The shortest name starting with the term.
+"""
+from world.wod20th.utils.fuzzy_index import STAT_ABBREVIATIONS, normalize, compact
+
+PRIMAL_URGE = 'Primal-Urge'
+
+
+class RollIndex:
+    """
+    Lookup index over one character's stats.
+
+    Args:
+        entries (iterable): (category, stat_type, name, perm, temp) tuples,
+            as yielded by StatHandler.items().
+        version (int): The sheet version the index was built from.
+    """
+
+    def __init__(self, entries, version=None):
+        self.version = version
+        self._primal = None
+        self._secondary = {}
+        self._exact = {}
+        self._nospace = {}
+        # Trie nodes are [children, (rank, entry)]; each node keeps the best
+        # (shortest, then earliest) name passing through it.
+        self._trie = [{}, None]
+
+        for order, entry in enumerate(entries):
+            category, stat_type, name, perm, temp = entry
+            if category == 'secondary_abilities':
+                self._secondary.setdefault(normalize(name), entry)
+                continue
+            if name == PRIMAL_URGE:
+                if (category, stat_type) == ('abilities', 'talent'):
+                    self._primal = entry
+                continue
+            key, nospace = normalize(name), compact(name)
+            self._exact.setdefault(key, entry)
+            self._nospace.setdefault(nospace, entry)
+            rank = (len(key), order)
+            self._insert(key, rank, entry)
+            self._insert(nospace, rank, entry)
+
+    def _insert(self, key, rank, entry):
+        node = self._trie
+        for char in key:
+            node = node[0].setdefault(char, [{}, None])
+            if node[1] is None or rank < node[1][0]:
+                node[1] = (rank, entry)
+
+    def _prefix(self, key):
+        """Return (rank, entry) for the best name starting with key, or None."""
+        node = self._trie
+        for char in key:
+            node = node[0].get(char)
+            if node is None:
+                return None
+        return node[1]
+
+    def lookup(self, term):
+        """
+        Resolve a roll term.
+
+        Returns:
+            tuple: (value, full name). Unknown stats give (0, term.capitalize()).
+        """
+        key = normalize(term)
+        nospace = compact(key)
+        if nospace in STAT_ABBREVIATIONS:
+            key = nospace = STAT_ABBREVIATIONS[nospace]
+
+        if nospace in ('primalurge', 'primal'):
+            if self._primal is None:
+                return 0, PRIMAL_URGE
+            return self._current(self._primal, nonzero=True), PRIMAL_URGE
+
+        entry = self._secondary.get(key)
+        if entry is not None:
+            return self._current(entry, nonzero=True), entry[2]
+
+        if not key:
+            return 0, term.capitalize()
+        entry = self._exact.get(key) or self._nospace.get(nospace)
+        if entry is None:
+            candidates = [found for found in (self._prefix(key), self._prefix(nospace)) if found]
+            if candidates:
+                entry = min(candidates)[1]
+        if entry is None:
+            return 0, term.capitalize()
+        return self._current(entry), entry[2]
+
+    @staticmethod
+    def _current(entry, nonzero=False):
+        """
+        The value to roll: the temporary value if the stat has one (or, for
+        secondary abilities and Primal-Urge, if it isn't 0), else permanent.
+        """
+        perm, temp = entry[3], entry[4]
+        if temp is not None and (temp or not nonzero):
+            return temp
+        return perm or 0
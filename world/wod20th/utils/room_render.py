@@ -0,0 +1,150 @@
+"""
+Render cache for room looks.
+
+A room look is the framed description, then the characters, objects and
+exits in the room. Only the character list (idle times, who's on your
+plane) really changes from one look to the next, so:
+
+- the header and formatted description, and the footer, are kept on the
+  room (in ndb) for each plane, width and viewer tier they were rendered
+  for, and dropped by a signal handler when one of ROOM_ATTRIBUTES (desc,
+  umbra_desc, gradient_name, ...) is saved or deleted;
+- the section dividers are built once;
+- each character's short description column, and each object's and
+  exit's line, is kept on that object, tagged with the values it was
+  built from, and rebuilt only when they differ.
+"""
+from evennia.utils.ansi import ANSIString
+
+from world.wod20th.utils.ansi_utils import wrap_ansi
+from world.wod20th.utils.formatting import divider
+
+# Attributes a room's cached header, description or footer depend on
+ROOM_ATTRIBUTES = frozenset({'desc', 'umbra_desc', 'gradient_name', 'roomtype', 'resources'})
+
+SHORTDESC_WIDTH = 55
+NO_SHORTDESC = "|h|xType '|n+shortdesc <desc>|h|x' to set a short description.|n"
+
+# (title, border color, width) -> the section divider
+_DIVIDERS = {}
+
+# Process-wide counters: 'hits' and 'misses' are room frames served from
+# and added to the cache, 'invalidations' is room attribute changes seen.
+ROOM_RENDER_STATS = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+
+def format_room_desc(desc, width=78):
+    """
+    Format a room description: %R/%r start a paragraph, %t/%T an indented
+    line, and every line is wrapped to width.
+    """
+    desc = str(desc)  # Start with raw string to preserve all codes
+
+    # Split description into paragraphs using %R or %r while preserving ANSI
+    paragraphs = []
+    for p in desc.split('%R'):
+        paragraphs.extend(p.split('%r'))
+
+    formatted_paragraphs = []
+    for paragraph in paragraphs:
+        if not paragraph.strip():
+            continue
+
+        # Split paragraph into lines by tabs
+        tab_lines = []
+        for line in paragraph.split('%t'):
+            tab_lines.extend(line.split('%T'))
+
+        formatted_lines = []
+        for i, line in enumerate(tab_lines):
+            line = line.strip()
+            if i > 0:  # Add indentation for tabbed lines
+                # Check if line starts with a color code
+                if line.startswith('|'):
+                    color_end = line.find(' ')
+                    if color_end > 0:
+                        # Preserve color code and add indentation after it
+                        color_code = line[:color_end]
+                        rest_of_line = line[color_end:].strip()
+                        line = f"{color_code}    {rest_of_line}"
+                    else:
+                        line = "    " + line
+                else:
+                    line = "    " + line
+
+            # Process line for word wrapping while preserving ANSI
+            wrapped = wrap_ansi(line, width=width)
+            if wrapped:
+                formatted_lines.append(wrapped)
+
+        if formatted_lines:
+            formatted_paragraphs.append("\n".join(formatted_lines))
+
+    # Join all paragraphs with single newlines
+    return "\n".join(formatted_paragraphs)
+
+
+def section_divider(title, border_color, width=78):
+    """Return the divider for a section of the look; they never change, so each is built once."""
+    key = (title, border_color, width)
+    text = _DIVIDERS.get(key)
+    if text is None:
+        text = _DIVIDERS[key] = divider(title, width=width, fillchar=ANSIString(f"{border_color}-|n")) + "\n"
+    return text
+
+
+def invalidate_room_render(room):
+    """Drop room's cached frames."""
+    room.ndb.render_cache = None
+    ROOM_RENDER_STATS['invalidations'] += 1
+
+
+def get_room_frame(room, key, render):
+    """
+    Return room's (header and description, footer) for key, which should
+    be (plane, width, viewer tier); render() builds them when they aren't
+    cached.
+    """
+    cache = room.ndb.render_cache
+    if cache is None:
+        cache = room.ndb.render_cache = {}
+    frame = cache.get(key)
+    if frame is None:
+        ROOM_RENDER_STATS['misses'] += 1
+        frame = cache[key] = render()
+    else:
+        ROOM_RENDER_STATS['hits'] += 1
+    return frame
+
+
+def fragment(obj, source, render):
+    """
+    Return obj's cached room-look fragment if it was built from source,
+    else build it with render() and keep it.
+    """
+    cached = obj.ndb.room_fragment
+    if cached is not None and cached[0] == source:
+        return cached[1]
+    text = render()
+    obj.ndb.room_fragment = (source, text)
+    return text
+
+
+def shortdesc_column(character):
+    """Return character's short description, cut or padded to its column."""
+    shortdesc = character.db.shortdesc
+
+    def _render():
+        shortdesc_str = f"{shortdesc}" if shortdesc else NO_SHORTDESC
+        if len(ANSIString(shortdesc_str).strip()) > SHORTDESC_WIDTH:
+            shortdesc_str = ANSIString(shortdesc_str)[:SHORTDESC_WIDTH]
+            return ANSIString(shortdesc_str[:-3] + "...|n")
+        return ANSIString(shortdesc_str).ljust(SHORTDESC_WIDTH, ' ')
+
+    return fragment(character, shortdesc, _render)
+
+
+def hit_rate():
+    """Return the fraction of room looks whose frame came from the cache."""
+    total = ROOM_RENDER_STATS['hits'] + ROOM_RENDER_STATS['misses']
+    return ROOM_RENDER_STATS['hits'] / total if total else 0.0
@@ -0,0 +1,263 @@
+"""
+Scene logs.
+
+Every say, pose, emit and roll in a live scene (see scene_tracker) is
+appended to that scene's log on disk, as compressed segments:
+
+    SCENE_LOG_DIR/<scene key>/000001.jsonl.gz
+                             /000002.jsonl.gz
+                             ...
+
+Each segment is a run of gzip members, one per batch of lines written, so
+a file is only ever appended to and a segment cut short by a crash still
+reads back up to its last whole member. Once a segment passes
+SEGMENT_BYTES the next batch starts a new one, as does the first batch
+for a scene after a restart.
+
+Writes happen on a background thread, so the reactor never waits on the
+disk:
+
+    SCENE_LOG.append(record.scene_key, 'pose', character.key, text)
+
+append() hands entries to the writer through a bounded queue. If the
+writer falls behind and the queue fills up, entries wait in a backlog and
+go over as one batch once there's room; past MAX_BACKLOG the oldest are
+dropped and counted in SCENE_LOG_STATS.
+
+Language-tagged speech is logged as those who didn't follow the language
+saw it, with the understood text alongside; entry_text() shows the latter
+only to staff and readers who follow the language.
+
+Reading decompresses the segments in order as it goes (entries(), page());
++scene/log does it through run_async.
+"""
+import gzip
+import json
+import os
+import queue
+import re
+import threading
+import time
+import zlib
+from collections import deque
+from itertools import islice
+
+from django.conf import settings
+from evennia.utils import logger
+from twisted.internet import reactor
+
+from world.wod20th.utils.broadcast import follows
+
+SEGMENT_BYTES = 256 * 1024
+SEGMENT_SUFFIX = '.jsonl.gz'
+# Batches waiting for the writer
+QUEUE_SIZE = 64
+# Entries held back while the queue is full
+MAX_BACKLOG = 5000
+PAGE_SIZE = 20
+
+SCENE_KEY_PATTERN = re.compile(r'^\d+-\d{14}(-[a-z]+)?$')
+
+SCENE_LOG_STATS = {'entries': 0, 'written': 0, 'writes': 0, 'dropped': 0, 'errors': 0}
+
+
+def entry_text(entry, reader=None):
+    """
+    Return what reader may read of an entry: the understood text of
+    language-tagged speech if they follow the language (staff and Universal
+    Language included), else what those who didn't follow it saw.
+    """
+    understood = entry.get('understood')
+    if understood is not None and reader is not None and follows(reader, entry.get('language'),
+                                                                 staff=True, universal=True):
+        return understood
+    return entry['text']
+
+
+def format_entry(entry, reader=None):
+    """Return an entry as a line of text: its time, then what reader may read of it."""
+    return f"|x[{time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['at']))}]|n {entry_text(entry, reader)}"
+
+
+class SceneLog:
+    """
+    Append-only, compressed logs, one per scene, written by a background
+    thread.
+
+    Args:
+        directory (str): Where the scene directories go.
+        queue_size (int): Batches the writer may have waiting.
+        max_backlog (int): Entries to hold back while the writer's queue
+            is full before dropping the oldest.
+    """
+
+    def __init__(self, directory, queue_size=QUEUE_SIZE, max_backlog=MAX_BACKLOG):
+        self.directory = directory
+        self.max_backlog = max_backlog
+        self._queue = queue.Queue(maxsize=queue_size)
+        # (scene key, entry) not yet handed to the writer; reactor side only
+        self._backlog = deque()
+        self._thread = None
+        # Scene key -> (segment number, bytes in it); writer thread only
+        self._segments = {}
+
+    def scene_dir(self, key):
+        if not SCENE_KEY_PATTERN.match(key):
+            raise ValueError(f"Not a scene key: {key!r}")
+        return os.path.join(self.directory, key)
+
+    def segments(self, key):
+        """Return the paths of key's segments, oldest first."""
+        scene_dir = self.scene_dir(key)
+        try:
+            names = sorted(name for name in os.listdir(scene_dir) if name.endswith(SEGMENT_SUFFIX))
+        except FileNotFoundError:
+            return []
+        return [os.path.join(scene_dir, name) for name in names]
+
+    def append(self, key, kind, who, text, at=None, language=None, understood=None):
+        """
+        Log a line of a scene.
+
+        Args:
+            key (str): The scene's key.
+            kind (str): 'say', 'pose', 'emit' or 'roll'.
+            who (str): Who said or did it.
+            text (str): The line as the room saw it; for language-tagged
+                speech, as those who didn't follow the language saw it.
+            at (float, optional): When, as a timestamp; defaults to now.
+            language (str, optional): The language the line was spoken in.
+            understood (str, optional): The line as those who followed
+                the language saw it.
+        """
+        entry = {'at': at or time.time(), 'kind': kind, 'who': who, 'text': text}
+        if understood is not None and understood != text:
+            entry['language'] = language
+            entry['understood'] = understood
+        self._backlog.append((key, entry))
+        SCENE_LOG_STATS['entries'] += 1
+        self.offer()
+
+    def offer(self):
+        """
+        Hand the backlog to the writer if its queue has room.
+
+        Returns:
+            bool: True if nothing is left waiting.
+        """
+        if not self._backlog:
+            return True
+        self._start()
+        try:
+            self._queue.put_nowait(list(self._backlog))
+        except queue.Full:
+            excess = len(self._backlog) - self.max_backlog
+            for _ in range(max(excess, 0)):
+                self._backlog.popleft()
+            if excess > 0:
+                SCENE_LOG_STATS['dropped'] += excess
+            return False
+        self._backlog.clear()
+        return True
+
+    def pending(self):
+        """Return how many entries are waiting for the writer."""
+        return len(self._backlog) + sum(len(batch) for batch in list(self._queue.queue) if batch)
+
+    def close(self, timeout=5):
+        """Write out everything waiting and stop the writer (at shutdown)."""
+        if not self._backlog and (self._thread is None or not self._thread.is_alive()):
+            return
+        self._start()
+        if self._backlog:
+            self._queue.put(list(self._backlog), timeout=timeout)
+            self._backlog.clear()
+        self._queue.put(None, timeout=timeout)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='scene-log-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                return
+            stop = False
+            # Take everything else waiting too, so a busy scene is one
+            # write rather than one per line
+            while True:
+                try:
+                    more = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    stop = True
+                    break
+                batch.extend(more)
+            self._write(batch)
+            if self._backlog:
+                reactor.callFromThread(self.offer)
+            if stop:
+                return
+
+    def _write(self, batch):
+        by_scene = {}
+        for key, entry in batch:
+            by_scene.setdefault(key, []).append(entry)
+        for key, entries in by_scene.items():
+            data = ''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries)
+            member = gzip.compress(data.encode('utf-8'))
+            try:
+                number, size = self._segments.get(key) or self._next_segment(key)
+                if size and size + len(member) > SEGMENT_BYTES:
+                    number, size = number + 1, 0
+                with open(os.path.join(self.scene_dir(key), f"{number:06d}{SEGMENT_SUFFIX}"), 'ab') as handle:
+                    handle.write(member)
+            except (OSError, ValueError) as err:
+                SCENE_LOG_STATS['errors'] += 1
+                logger.log_err(f"Scene log {key}: could not write {len(entries)} line(s): {err}")
+                continue
+            self._segments[key] = (number, size + len(member))
+            SCENE_LOG_STATS['written'] += len(entries)
+            SCENE_LOG_STATS['writes'] += 1
+
+    def _next_segment(self, key):
+        # A new segment for each scene the first time this process writes to
+        # it, so nothing is appended after a member cut short by a crash
+        os.makedirs(self.scene_dir(key), exist_ok=True)
+        paths = self.segments(key)
+        if not paths:
+            return 1, 0
+        return int(os.path.basename(paths[-1])[:-len(SEGMENT_SUFFIX)]) + 1, 0
+
+    def entries(self, key):
+        """Yield key's entries in order, decompressing as it goes."""
+        for path in self.segments(key):
+            try:
+                with gzip.open(path, 'rt', encoding='utf-8') as handle:
+                    for line in handle:
+                        if not line.endswith('\n'):
+                            break
+                        yield json.loads(line)
+            except (EOFError, gzip.BadGzipFile, zlib.error):
+                # A member cut short by a crash; what came before it stands
+                continue
+
+    def page(self, key, number, per_page=PAGE_SIZE):
+        """
+        Return one page of key's log.
+
+        Returns:
+            tuple: (entries on the page, whether there are later pages).
+        """
+        start = (number - 1) * per_page
+        entries = list(islice(self.entries(key), start, start + per_page + 1))
+        return entries[:per_page], len(entries) > per_page
+
+
+SCENE_LOG = SceneLog(getattr(settings, 'SCENE_LOG_DIR', None)
+                     or os.path.join(settings.GAME_DIR, 'server', 'logs', 'scenes'))
@@ -0,0 +1,291 @@
+"""
+Scene tracking for weekly XP.
+
+A room with two or more players on the same plane acting in it has a
+scene on that plane; the material world and the Umbra of one room have
+separate scenes, as they can't hear each other. A scene lives in memory as
+a SceneSession in the room's ``ndb.scene_sessions`` (plane -> session), and
+each participant's part in it is a SceneRecord row:
+
+    SCENES.record_activity(character)   # on every say/pose/emote
+    SCENES.leave(character)             # their part is over
+    SCENES.end_scene(room, plane)       # +xp/endscene
+
+Rows are only written when someone joins or leaves a scene. Activity in
+between just updates the in-memory copies, which flush() saves every
+FLUSH_INTERVAL seconds (and at shutdown). A part that lasts at least
+MIN_SCENE_MINUTES counts as a completed scene; the weekly XP award reads
+those with completed_counts() and then mark_awarded().
+
+Each scene has a key, shared by its SceneRecords, under which what's said
+in it is logged; see world.wod20th.utils.scene_log.
+"""
+from datetime import timedelta
+
+from django.db.models import Count
+from django.utils import timezone
+
+from world.wod20th.utils.occupancy import OCCUPANCY
+from world.wod20th.utils.plane_state import MATERIAL
+
+MIN_SCENE_MINUTES = 20
+FLUSH_INTERVAL = 5 * 60
+HISTORY_LIMIT = 20
+
+
+def scene_model():
+    from world.wod20th.models import SceneRecord
+    return SceneRecord
+
+
+def make_scene_key(room, started, plane=MATERIAL):
+    """
+    Name a new scene: the room and when it started, e.g. '42-20261017193000',
+    with the plane after that for scenes off the material plane
+    ('42-20261017193000-umbra').
+    """
+    key = f"{room.id}-{started:%Y%m%d%H%M%S}"
+    return key if plane == MATERIAL else f"{key}-{plane}"
+
+
+def is_scene_location(character):
+    """True if character is in an IC room with another player on their plane."""
+    location = character.location
+    if not location or getattr(location.db, 'roomtype', None) == 'OOC Area':
+        return False
+    return any(obj != character for obj in OCCUPANCY.occupants(location, OCCUPANCY.plane(character)))
+
+
+class SceneSession:
+    """
+    A room's current scene on one plane.
+
+    Attributes:
+        plane (str): The plane the scene is on.
+        key (str): Names the scene in its SceneRecords and its log.
+        participants (dict): Character id -> their open SceneRecord.
+        last_activity (datetime): The last time anyone acted in the scene.
+    """
+
+    def __init__(self, room, started, key=None, plane=MATERIAL):
+        self.room = room
+        self.plane = plane
+        self.started = started
+        self.key = key or make_scene_key(room, started, plane)
+        self.last_activity = started
+        self.participants = {}
+        self._dirty = set()
+
+    def touch(self, character, now):
+        """Record character acting in the scene, joining it if they're new."""
+        record = self.participants.get(character.id)
+        if record is None:
+            record = scene_model().objects.create(
+                character_id=character.id, room_id=self.room.id, plane=self.plane,
+                scene_key=self.key, started_at=now, last_activity=now)
+            self.participants[character.id] = record
+        else:
+            record.last_activity = now
+            self._dirty.add(character.id)
+        self.last_activity = now
+        return record
+
+    def close(self, character_id, now):
+        """Close a participant's record and return it, or None if they weren't in the scene."""
+        record = self.participants.pop(character_id, None)
+        self._dirty.discard(character_id)
+        if record is None:
+            return None
+        record.ended_at = now
+        record.completed = now - record.started_at >= timedelta(minutes=MIN_SCENE_MINUTES)
+        # update() rather than save(), so a participant deleted mid-scene is skipped
+        scene_model().objects.filter(pk=record.pk).update(
+            last_activity=record.last_activity, ended_at=record.ended_at, completed=record.completed)
+        return record
+
+    def flush(self):
+        """Save pending activity times; return how many records were written."""
+        records = [self.participants[character_id] for character_id in self._dirty]
+        self._dirty.clear()
+        if records:
+            scene_model().objects.bulk_update(records, ['last_activity'])
+        return len(records)
+
+
+class SceneTracker:
+    """The live scenes, one SceneSession per room and plane."""
+
+    def __init__(self):
+        # room id -> room, for rooms with a live session
+        self._rooms = {}
+        # Characters whose leftover open records (from before a reload)
+        # have been dealt with
+        self._settled = set()
+
+    def session(self, room, plane=MATERIAL):
+        """Return room's live SceneSession on plane, or None."""
+        return (room.ndb.scene_sessions or {}).get(plane) if room else None
+
+    def sessions(self, room):
+        """Return room's live SceneSessions, on any plane."""
+        return list((room.ndb.scene_sessions or {}).values()) if room else []
+
+    def _open_session(self, room, plane, now):
+        session = SceneSession(room, now, plane=plane)
+        # Pick up the parts that were open when the server last stopped
+        for record in scene_model().objects.filter(room_id=room.id, plane=plane,
+                                                   ended_at__isnull=True).order_by('started_at'):
+            if not session.participants and record.scene_key:
+                session.key = record.scene_key
+            session.participants[record.character_id] = record
+            session.started = min(session.started, record.started_at)
+        if room.ndb.scene_sessions is None:
+            room.ndb.scene_sessions = {}
+        room.ndb.scene_sessions[plane] = session
+        self._rooms[room.id] = room
+        return session
+
+    def _settle(self, character, now):
+        """Close open records character left behind in other rooms or on other planes."""
+        self._settled.add(character.id)
+        location_id = character.location.id if character.location else None
+        plane = OCCUPANCY.plane(character)
+        for record in scene_model().objects.filter(character_id=character.id, ended_at__isnull=True):
+            if record.room_id == location_id and record.plane == plane:
+                continue
+            session = self.session(self._rooms.get(record.room_id), record.plane)
+            if session and character.id in session.participants:
+                self._close(session, character.id, now)
+            else:
+                record.ended_at = record.last_activity
+                record.completed = record.ended_at - record.started_at >= timedelta(minutes=MIN_SCENE_MINUTES)
+                record.save(update_fields=['ended_at', 'completed'])
+
+    def current(self, character):
+        """Return the SceneSession character is taking part in, or None."""
+        session = character.ndb.scene_session or self.session(character.location, OCCUPANCY.plane(character))
+        if session is not None and character.id not in session.participants:
+            session = None
+        character.ndb.scene_session = session
+        return session
+
+    def record_activity(self, character, now=None):
+        """
+        Note that character acted where they are: join or continue the
+        scene on their plane of the room, leaving any scene elsewhere.
+
+        Returns:
+            SceneRecord: Their record in the room's scene, or None if the
+                room doesn't have one (OOC, or nobody else there).
+        """
+        now = now or timezone.now()
+        if character.id not in self._settled:
+            self._settle(character, now)
+        current = self.current(character)
+        if not is_scene_location(character):
+            if current:
+                self.leave(character, now)
+            return None
+        location = character.location
+        plane = OCCUPANCY.plane(character)
+        if current and (current.room != location or current.plane != plane):
+            self.leave(character, now)
+        session = self.session(location, plane) or self._open_session(location, plane, now)
+        record = session.touch(character, now)
+        character.ndb.scene_session = session
+        return record
+
+    def leave(self, character, now=None):
+        """
+        End character's part in their current scene.
+
+        Returns:
+            SceneRecord: The closed record, or None if they weren't in one.
+        """
+        session = self.current(character)
+        if session is None:
+            return None
+        character.ndb.scene_session = None
+        return self._close(session, character.id, now or timezone.now())
+
+    def _close(self, session, character_id, now):
+        record = session.close(character_id, now)
+        if not session.participants:
+            self._drop(session)
+        return record
+
+    def _drop(self, session):
+        room = session.room
+        sessions = room.ndb.scene_sessions or {}
+        sessions.pop(session.plane, None)
+        if not sessions:
+            room.ndb.scene_sessions = None
+            self._rooms.pop(room.id, None)
+
+    def end_scene(self, room, plane=MATERIAL, now=None):
+        """
+        End room's scene on plane for everyone in it.
+
+        Returns:
+            dict: Character id -> their closed SceneRecord.
+        """
+        session = self.session(room, plane)
+        if session is None:
+            return {}
+        now = now or timezone.now()
+        closed = {character_id: session.close(character_id, now)
+                  for character_id in list(session.participants)}
+        self._drop(session)
+        return closed
+
+    def flush(self):
+        """Save pending activity for every live scene; return how many records were written."""
+        return sum(session.flush() for room in list(self._rooms.values()) for session in self.sessions(room))
+
+    def status(self, character):
+        """
+        Return (open SceneRecord or None, completed scenes not yet awarded)
+        for character, for display.
+        """
+        session = self.current(character)
+        record = session.participants[character.id] if session else None
+        return record, self.completed_count(character)
+
+    def completed_count(self, character):
+        """Return character's completed scenes not yet counted by a weekly award."""
+        return scene_model().objects.filter(completed=True, awarded=False, character_id=character.id).count()
+
+    def completed_counts(self):
+        """Return {character id: completed scenes} for scenes not yet counted by a weekly award."""
+        rows = (scene_model().objects.filter(completed=True, awarded=False)
+                .values('character_id').annotate(scenes=Count('id')))
+        return {row['character_id']: row['scenes'] for row in rows}
+
+    def history(self, character, limit=HISTORY_LIMIT):
+        """Return character's most recent SceneRecords, newest first."""
+        return list(scene_model().objects.filter(character_id=character.id).exclude(scene_key='')
+                    .select_related('room').order_by('-started_at')[:limit])
+
+    def took_part(self, character, key):
+        """True if character was in the scene named key."""
+        return scene_model().objects.filter(scene_key=key, character_id=character.id).exists()
+
+    def participants(self, key):
+        """Return the names of everyone in the scene named key, in the order they joined."""
+        return list(scene_model().objects.filter(scene_key=key).order_by('started_at')
+                    .values_list('character__db_key', flat=True))
+
+    def mark_awarded(self, character_ids=None):
+        """Mark completed scenes as counted by a weekly award, for everyone or just character_ids."""
+        records = scene_model().objects.filter(completed=True, awarded=False)
+        if character_ids is not None:
+            records = records.filter(character_id__in=character_ids)
+        return records.update(awarded=True)
+
+
+SCENES = SceneTracker()
+
+
+def flush_scenes():
+    """Ticker callback: save pending scene activity."""
+    SCENES.flush()
@@ -0,0 +1,68 @@
+"""
+Render cache for +sheet.
+
+A rendered sheet is kept on the character (in ndb, so it goes away with the
+object) for each viewer tier and client width it was rendered for, tagged
+with the sheet version it was rendered from. The version is made up of:
+
+- the stats handler's change counter, for stat changes;
+- a counter bumped by a signal handler whenever one of SHEET_ATTRIBUTES
+  (health, XP, specialties, approval, ...) is saved or deleted;
+- the character's key and the stat catalog's version.
+
+So a cached sheet is served only as long as nothing it shows has changed.
+"""
+from world.wod20th.utils.stat_catalog import STAT_CATALOG
+
+# Attributes, other than stats, that +sheet shows or depends on
+SHEET_ATTRIBUTES = frozenset({
+    'approved', 'current_form', 'specialties', 'xp',
+    'bashing', 'lethal', 'agg', 'injury_level', 'health_levels', 'char_type',
+})
+
+# Process-wide counters: 'hits' and 'misses' are +sheet renders served from
+# and added to the cache, 'invalidations' is sheet attribute changes seen.
+SHEET_CACHE_STATS = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+
+def sheet_version(character):
+    """Return a value that changes whenever anything on the sheet may have."""
+    return (character.stats.version, character.ndb.sheet_version or 0,
+            character.key, STAT_CATALOG.version)
+
+
+def invalidate_sheet(character):
+    """Mark character's cached sheets as stale."""
+    character.ndb.sheet_version = (character.ndb.sheet_version or 0) + 1
+    character.ndb.sheet_cache = None
+    SHEET_CACHE_STATS['invalidations'] += 1
+
+
+def get_cached_sheet(character, tier, width):
+    """
+    Return the cached sheet for this viewer tier and width, or None if there
+    isn't a current one.
+    """
+    cache = character.ndb.sheet_cache
+    entry = cache.get((tier, width)) if cache else None
+    if entry is not None and entry[0] == sheet_version(character):
+        SHEET_CACHE_STATS['hits'] += 1
+        return entry[1]
+    SHEET_CACHE_STATS['misses'] += 1
+    return None
+
+
+def cache_sheet(character, tier, width, text):
+    """
+    Cache a rendered sheet. Call this after rendering, since rendering can
+    itself fill in missing stats.
+    """
+    if character.ndb.sheet_cache is None:
+        character.ndb.sheet_cache = {}
+    character.ndb.sheet_cache[(tier, width)] = (sheet_version(character), text)
+
+
+def hit_rate():
+    """Return the fraction of +sheet views served from the cache."""
+    total = SHEET_CACHE_STATS['hits'] + SHEET_CACHE_STATS['misses']
+    return SHEET_CACHE_STATS['hits'] / total if total else 0.0
@@ -0,0 +1,280 @@
+"""
+In-memory catalog of Stat definitions.
+
+The Stat table is effectively static at runtime - it's only changed by the
+loader commands and by staff through the admin - but nearly every command that
+touches a sheet looks stats up by name. The catalog loads the table once per
+process and keeps hash indexes over it so those lookups never hit the database.
+
+It's kept coherent by the post_save/post_delete handlers in
+world.wod20th.signals. Bulk operations (bulk_create, queryset.update/delete)
+don't fire signals, so code using them must call STAT_CATALOG.invalidate()
+afterwards.
+
+Caches kept on disk across restarts (the +info search index) can't use the
+catalog's in-process version, so every change to the table also bumps a
+generation number stored in the database: the signal handlers and
+apply_diff() call bump_stat_generation(), and stat_generation() reads it.
+
+The catalog hands out the Stat instances themselves. They're shared between
+callers, so copy one before changing any of its fields.
+"""
+from collections import defaultdict
+from world.wod20th.utils.fuzzy_index import FuzzyIndex
+
+GENERATION_KEY = "wod20th_stat_generation"
+
+
+def _norm(value):
+    """Normalize a key for case-insensitive lookups."""
+    return (value or '').strip().lower()
+
+
+class StatCatalog:
+    """
+    Process-wide registry of Stat objects with lookup indexes.
+
+    Lists returned by the lookup methods are ordered by primary key, matching
+    what an unordered queryset gives back in practice.
+    """
+
+    def __init__(self):
+        self._loaded = False
+        # Bumped on every change so dependent caches can tell they're stale
+        self.version = 0
+        self._by_id = {}
+        self._by_name = defaultdict(list)
+        self._by_name_type = {}
+        self._by_category_type = defaultdict(list)
+        self._by_stat_type = defaultdict(list)
+        self._by_splat = defaultdict(list)
+        self._by_shifter_type = defaultdict(list)
+        self._by_auspice = defaultdict(list)
+        self._by_breed = defaultdict(list)
+        self._by_tribe = defaultdict(list)
+        self._fuzzy = FuzzyIndex()
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.reload()
+
+    def reload(self):
+        """Rebuild every index from the database."""
+        from world.wod20th.models import Stat
+
+        self._clear()
+        for stat in Stat.objects.all().order_by('id'):
+            self._index(stat)
+        self._loaded = True
+        self.version += 1
+
+    def invalidate(self):
+        """Drop the catalog; it is rebuilt on the next lookup."""
+        self._clear()
+        self._loaded = False
+        self.version += 1
+
+    def _clear(self):
+        self._by_id.clear()
+        for index in (self._by_name, self._by_category_type, self._by_stat_type,
+                      self._by_splat, self._by_shifter_type, self._by_auspice,
+                      self._by_breed, self._by_tribe):
+            index.clear()
+        self._by_name_type.clear()
+        self._fuzzy.clear()
+
+    def _index_keys(self, stat):
+        """Yield (index, key) pairs for every list index the stat belongs to."""
+        yield self._by_name, _norm(stat.name)
+        yield self._by_category_type, (_norm(stat.category), _norm(stat.stat_type))
+        yield self._by_stat_type, _norm(stat.stat_type)
+        if stat.splat:
+            yield self._by_splat, _norm(stat.splat)
+        if stat.shifter_type and stat.shifter_type != 'none':
+            yield self._by_shifter_type, _norm(stat.shifter_type)
+        if stat.auspice and stat.auspice != 'none':
+            yield self._by_auspice, _norm(stat.auspice)
+        if stat.breed and stat.breed != 'none':
+            yield self._by_breed, _norm(stat.breed)
+        if isinstance(stat.tribe, (list, tuple)):
+            for tribe in stat.tribe:
+                if isinstance(tribe, str) and tribe:
+                    yield self._by_tribe, _norm(tribe)
+
+    def _index(self, stat):
+        self._by_id[stat.id] = stat
+        if not self._by_name.get(_norm(stat.name)):
+            self._fuzzy.add(stat.name)
+        self._by_name_type[(_norm(stat.name), _norm(stat.stat_type))] = stat
+        for index, key in self._index_keys(stat):
+            bucket = index[key]
+            bucket.append(stat)
+            if len(bucket) > 1 and bucket[-2].id > stat.id:
+                bucket.sort(key=lambda s: s.id)
+
+    def _unindex(self, stat):
+        stat = self._by_id.pop(stat.id, None)
+        if stat is None:
+            return
+        key = (_norm(stat.name), _norm(stat.stat_type))
+        if self._by_name_type.get(key) is stat:
+            del self._by_name_type[key]
+        for index, key in self._index_keys(stat):
+            bucket = index.get(key)
+            if bucket is None:
+                continue
+            bucket[:] = [s for s in bucket if s.id != stat.id]
+            if not bucket:
+                del index[key]
+                if index is self._by_name:
+                    self._fuzzy.discard(key)
+
+    def add(self, stat):
+        """Add or replace a single stat. Called from the post_save handler."""
+        if not self._loaded:
+            # Nothing to keep in sync yet; the first lookup loads everything.
+            return
+        self._unindex(stat)
+        self._index(stat)
+        self.version += 1
+
+    def discard(self, stat):
+        """Remove a single stat. Called from the post_delete handler."""
+        if self._loaded:
+            self._unindex(stat)
+            self.version += 1
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def all(self):
+        """Return every stat, ordered by id."""
+        self._ensure_loaded()
+        return sorted(self._by_id.values(), key=lambda s: s.id)
+
+    def get(self, name, stat_type=None):
+        """
+        Return the stat with this name (case-insensitive), or None.
+
+        Args:
+            name (str): The stat name.
+            stat_type (str, optional): Restrict to this stat_type.
+        """
+        self._ensure_loaded()
+        if stat_type:
+            return self._by_name_type.get((_norm(name), _norm(stat_type)))
+        matches = self._by_name.get(_norm(name))
+        return matches[0] if matches else None
+
+    def filter_name(self, name):
+        """Return all stats whose name matches exactly (case-insensitive)."""
+        self._ensure_loaded()
+        return list(self._by_name.get(_norm(name), ()))
+
+    def _stats_for(self, keys):
+        return sorted(
+            (stat for key in keys for stat in self._by_name.get(key, ())),
+            key=lambda s: s.id
+        )
+
+    def contains(self, text):
+        """Return all stats whose name contains the text (case-insensitive)."""
+        self._ensure_loaded()
+        return self._stats_for(self._fuzzy.contains(text))
+
+    def expand(self, text):
+        """
+        Return the stats an abbreviation stands for ('dex', 'prim urge'),
+        or an empty list.
+        """
+        self._ensure_loaded()
+        key = self._fuzzy.expand(text)
+        return list(self._by_name.get(key, ())) if key else []
+
+    def suggest(self, text, limit=5):
+        """Return up to limit stat names similar to text, best match first."""
+        self._ensure_loaded()
+        return [self._by_name[key][0].name for key in self._fuzzy.suggest(text, limit=limit)]
+
+    def search(self, name):
+        """
+        Find stats by name the way the +stats commands always have: an exact
+        match if there is one, then a known abbreviation, then a substring
+        match.
+        """
+        self._ensure_loaded()
+        exact = self.filter_name(name)
+        if exact:
+            return exact
+        abbreviation = self._fuzzy.abbreviations.get(_norm(name).replace('-', '').replace(' ', ''))
+        if abbreviation:
+            return self.filter_name(abbreviation)
+        return self.contains(name)
+
+    def did_you_mean(self, name):
+        """Return a ' Did you mean ...?' hint for an unknown stat, or ''."""
+        suggestions = self.suggest(name, limit=3)
+        if not suggestions:
+            return ''
+        return f" Did you mean {', '.join(suggestions)}?"
+
+    def by_category(self, category, stat_type):
+        """Return all stats in the given category and stat_type."""
+        self._ensure_loaded()
+        return list(self._by_category_type.get((_norm(category), _norm(stat_type)), ()))
+
+    def by_stat_type(self, *stat_types):
+        """Return all stats of any of the given stat_types, ordered by id."""
+        self._ensure_loaded()
+        result = []
+        for stat_type in stat_types:
+            result.extend(self._by_stat_type.get(_norm(stat_type), ()))
+        if len(stat_types) > 1:
+            result.sort(key=lambda s: s.id)
+        return result
+
+    def by_splat(self, splat):
+        self._ensure_loaded()
+        return list(self._by_splat.get(_norm(splat), ()))
+
+    def by_shifter_type(self, shifter_type):
+        self._ensure_loaded()
+        return list(self._by_shifter_type.get(_norm(shifter_type), ()))
+
+    def by_auspice(self, auspice):
+        self._ensure_loaded()
+        return list(self._by_auspice.get(_norm(auspice), ()))
+
+    def by_breed(self, breed):
+        self._ensure_loaded()
+        return list(self._by_breed.get(_norm(breed), ()))
+
+    def by_tribe(self, tribe):
+        self._ensure_loaded()
+        return list(self._by_tribe.get(_norm(tribe), ()))
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._by_id)
+
+
+def stat_generation():
+    """Return how many times the Stat table has been changed, as recorded in the database."""
+    from evennia.server.models import ServerConfig
+    return ServerConfig.objects.conf(GENERATION_KEY, default=0) or 0
+
+
+def bump_stat_generation():
+    """Record a change to the Stat table. Returns the new generation."""
+    from evennia.server.models import ServerConfig
+    generation = stat_generation() + 1
+    ServerConfig.objects.conf(GENERATION_KEY, value=generation)
+    return generation
+
+
+STAT_CATALOG = StatCatalog()
@@ -0,0 +1,405 @@
+"""
+Per-character stat storage.
+
+A character's stats live in CharacterStat rows, one per
+(category, stat_type, name), read and written through ``character.stats``:
+
+    character.stats.get('attributes', 'physical', 'Strength')
+    character.stats.set('attributes', 'physical', 'Strength', 3)
+    character.stats.bulk_set([('attributes', 'physical', 'Strength', 3),
+                              ('attributes', 'physical', 'Dexterity', 2)])
+
+Setting one stat writes one row instead of re-pickling the whole sheet, and
+the table can be queried across characters.
+
+The rows are the store. The old nested ``db.stats`` Attribute (category ->
+stat_type -> name -> {'perm', 'temp'}) is derived from them for the code that
+still reads it directly: handler writes only touch rows, and db.stats is
+brought up to date the next time something reads it (see
+StatAttributeHandler), so a run of writes costs at most one db.stats save.
+``with character.stats.batch():`` defers row writes to the end of the block.
+Code that writes to ``db.stats`` directly is picked up by a signal handler
+(see world.wod20th.signals), which brings the rows back in line with it.
+"""
+from contextlib import contextmanager
+
+from django.db import transaction
+from evennia.typeclasses.attributes import AttributeHandler
+from evennia.utils.utils import make_iter
+
+from world.wod20th.models import CharacterStat
+from world.wod20th.utils.roll_index import RollIndex
+
+BATCH_SIZE = 500
+
+# Process-wide write counters: 'saves' is sheet writes actually made,
+# 'buffered' is changes made inside stats.batch(), and 'avoided' is the
+# saves batching spared.
+WRITE_COUNTS = {'saves': 0, 'buffered': 0, 'avoided': 0}
+
+
+def flatten_stats(stats):
+    """
+    Flatten a nested db.stats dict.
+
+    Returns:
+        dict: {(category, stat_type, name): [perm, temp]}. Stats stored
+        directly under a category get a stat_type of '', and temp is None
+        for stats that have never had a temporary value.
+    """
+    flat = {}
+    for category, types in (stats or {}).items():
+        if not isinstance(types, dict):
+            continue
+        for stat_type, entries in types.items():
+            if not isinstance(entries, dict):
+                continue
+            if 'perm' in entries or 'temp' in entries:
+                flat[(category, '', stat_type)] = [entries.get('perm', 0), entries.get('temp')]
+                continue
+            for name, data in entries.items():
+                if isinstance(data, dict):
+                    flat[(category, stat_type, name)] = [data.get('perm', 0), data.get('temp')]
+    return flat
+
+
+class StatHandler:
+    """
+    Handler for a character's stats, available as ``character.stats``.
+
+    Rows are loaded once and cached; all reads are served from the cache.
+    """
+
+    def __init__(self, obj):
+        self.obj = obj
+        # (category, stat_type, name) -> [perm, temp]
+        self._cache = None
+        # Bumped on every change, so derived data can tell when to rebuild
+        self.version = 0
+        self._roll_index = None
+        # Called with the changed keys (or None for "everything") on change
+        self._listeners = []
+        # Set while we write db.stats ourselves, so the signal ignores it
+        self._mirroring = False
+        # True when db.stats may be behind the rows; it may have been left
+        # behind by an earlier process, so start out unchecked.
+        self._legacy_stale = True
+        # batch() state: key -> [perm, temp], or None for a removal
+        self._batch_depth = 0
+        self._pending = {}
+        self._batch_writes = 0
+
+    # ------------------------------------------------------------------
+    # Loading and syncing
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        if self._cache is None:
+            self._cache = {
+                (category, stat_type, name): [perm, temp]
+                for category, stat_type, name, perm, temp in CharacterStat.objects.filter(
+                    character_id=self.obj.id
+                ).values_list('category', 'stat_type', 'name', 'perm', 'temp')
+            }
+            if not self._cache and self._legacy():
+                # Sheet from before the table existed (or written directly
+                # while no handler was watching).
+                self.sync_from_legacy()
+        return self._cache
+
+    def _legacy(self):
+        """Return a plain copy of db.stats as stored, without updating it first."""
+        attr = self.obj.attributes.backend.get('stats', None)
+        stats = attr[0].value if attr else None
+        if stats is None:
+            return {}
+        return stats.deserialize() if hasattr(stats, 'deserialize') else dict(stats)
+
+    def invalidate(self):
+        """Drop the cache; it is reloaded on next use."""
+        self._cache = None
+        self._legacy_stale = True
+        self.version += 1
+        self._notify(None)
+
+    def update_legacy(self):
+        """
+        Bring db.stats up to date with the rows. Called before db.stats is
+        read; does nothing unless stats changed since it was last updated.
+        Inside a batch the buffered changes are written out first, so code
+        reading db.stats sees the same sheet the handler does.
+        """
+        if self._mirroring or not (self._legacy_stale or self._pending):
+            return
+        if self._pending:
+            self.flush()
+        cache = self._load()
+        stored = flatten_stats(self._legacy())
+        to_write = {key: entry for key, entry in cache.items() if stored.get(key) != entry}
+        to_delete = [key for key in stored if key not in cache]
+        self._legacy_stale = False
+        if to_write or to_delete:
+            self._write_legacy(to_write, to_delete)
+
+    def subscribe(self, callback):
+        """
+        Call callback(keys) whenever stats change, with the set of changed
+        (category, stat_type, name) keys, or None if any stat may have.
+        Buffered changes inside a batch are reported as they are made.
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, keys):
+        for callback in self._listeners:
+            callback(keys)
+
+    def sync_from_legacy(self):
+        """
+        Bring the rows in line with db.stats, writing only what differs.
+        db.stats has already been saved, so the differences are written
+        straight away even inside a batch; stats with changes already
+        buffered are left alone.
+        """
+        cache = self._load()
+        pending = self._pending
+        wanted = flatten_stats(self._legacy())
+        to_write = {key: entry for key, entry in wanted.items()
+                    if key not in pending and cache.get(key) != entry}
+        to_delete = [key for key in cache if key not in wanted and key not in pending]
+        if to_write or to_delete:
+            self._write_rows(to_write, to_delete)
+
+    def at_legacy_saved(self):
+        """Called when db.stats was saved."""
+        if not self._mirroring:
+            self.sync_from_legacy()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def get(self, category, stat_type, name, temp=False, default=None):
+        """
+        Return a stat's permanent (or temporary) value.
+
+        Args:
+            category (str): Main category (attributes, abilities, etc.)
+            stat_type (str): Subcategory (physical, talent, etc.); falsy for
+                stats stored directly under the category.
+            name (str): Name of the stat.
+            temp (bool): Return the temporary value instead.
+            default: Returned if the character doesn't have the stat.
+        """
+        entry = self._load().get((category, stat_type or '', name))
+        if entry is None:
+            return default
+        value = entry[1] if temp else entry[0]
+        return 0 if value is None else value
+
+    def has(self, category, stat_type, name):
+        return (category, stat_type or '', name) in self._load()
+
+    def items(self, category=None, stat_type=None):
+        """Yield (category, stat_type, name, perm, temp), optionally filtered."""
+        for (cat, typ, name), (perm, temp) in self._load().items():
+            if category is not None and cat != category:
+                continue
+            if stat_type is not None and typ != stat_type:
+                continue
+            yield cat, typ, name, perm, temp
+
+    def roll_index(self):
+        """Return the RollIndex for this sheet, rebuilt only after changes."""
+        if self._roll_index is None or self._roll_index.version != self.version:
+            self._roll_index = RollIndex(self.items(), self.version)
+        return self._roll_index
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def set(self, category, stat_type, name, value, temp=False):
+        """Set a stat's permanent (or temporary) value, creating it if needed."""
+        self.bulk_set([(category, stat_type, name, value)], temp=temp)
+
+    def bulk_set(self, entries, temp=False):
+        """
+        Set several stats in one transaction.
+
+        Args:
+            entries (iterable): (category, stat_type, name, value) tuples.
+            temp (bool): Set temporary values instead of permanent ones.
+        """
+        cache = self._load()
+        index = 1 if temp else 0
+        to_write = {}
+        for category, stat_type, name, value in entries:
+            key = (category, stat_type or '', name)
+            entry = list(to_write.get(key) or cache.get(key) or [0, 0])
+            entry[index] = value
+            if cache.get(key) != entry:
+                to_write[key] = entry
+            else:
+                # A later entry for the same stat can put it back as it was
+                to_write.pop(key, None)
+        if to_write:
+            self._stage(to_write, [])
+
+    def remove(self, category, stat_type, name):
+        """Remove a stat entirely."""
+        key = (category, stat_type or '', name)
+        if key in self._load():
+            self._stage({}, [key])
+
+    @contextmanager
+    def batch(self):
+        """
+        Buffer every change made inside the block and write them together
+        (one transaction, one db.stats save) when the outermost block exits.
+
+        Reads through the handler see buffered changes straight away.
+        Reading db.stats inside the block writes out what has been buffered
+        so far, so code run inside a batch should read through the handler.
+        If the block raises, the changes still buffered are discarded;
+        changes already written (including direct db.stats writes) stay.
+
+        Example:
+            with character.stats.batch():
+                for name, value in attributes.items():
+                    character.set_stat('attributes', 'physical', name, value)
+        """
+        self._load()
+        self._batch_depth += 1
+        try:
+            yield self
+        except Exception:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._pending.clear()
+                self._batch_writes = 0
+                # Reload from the rows; db.stats is brought back in line
+                # with them the next time it is read.
+                self.invalidate()
+            raise
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            self.flush()
+
+    @property
+    def in_batch(self):
+        return self._batch_depth > 0
+
+    def flush(self):
+        """Write out changes buffered by batch()."""
+        pending, self._pending = self._pending, {}
+        writes, self._batch_writes = self._batch_writes, 0
+        if pending:
+            self._write(
+                {key: entry for key, entry in pending.items() if entry is not None},
+                [key for key, entry in pending.items() if entry is None]
+            )
+            WRITE_COUNTS['avoided'] += writes - 1
+
+    def _stage(self, to_write, to_delete):
+        """Write changes now, or buffer them if a batch is open."""
+        if not self._batch_depth:
+            self._write(to_write, to_delete)
+            return
+        for key in to_delete:
+            self._cache.pop(key, None)
+            self._pending[key] = None
+        for key, entry in to_write.items():
+            self._cache[key] = entry
+            self._pending[key] = entry
+        self.version += 1
+        self._notify(set(to_write) | set(to_delete))
+        self._batch_writes += 1
+        WRITE_COUNTS['buffered'] += 1
+
+    def _write(self, to_write, to_delete):
+        self._write_rows(to_write, to_delete)
+        self._legacy_stale = True
+        WRITE_COUNTS['saves'] += 1
+
+    def _write_rows(self, to_write, to_delete):
+        cache = self._cache
+        char_id = self.obj.id
+        with transaction.atomic():
+            for category, stat_type, name in to_delete:
+                CharacterStat.objects.filter(
+                    character_id=char_id, category=category,
+                    stat_type=stat_type, name=name
+                ).delete()
+            rows = {}
+            if to_write:
+                rows = {
+                    (row.category, row.stat_type, row.name): row
+                    for row in CharacterStat.objects.filter(
+                        character_id=char_id, name__in={key[2] for key in to_write}
+                    )
+                }
+            updated, created = [], []
+            for key, (perm, temp) in to_write.items():
+                row = rows.get(key)
+                if row is None:
+                    category, stat_type, name = key
+                    row = CharacterStat(character_id=char_id, category=category,
+                                        stat_type=stat_type, name=name)
+                    created.append(row)
+                else:
+                    updated.append(row)
+                row.set_values(perm, temp)
+            CharacterStat.objects.bulk_update(updated, CharacterStat.VALUE_FIELDS, batch_size=BATCH_SIZE)
+            CharacterStat.objects.bulk_create(created, batch_size=BATCH_SIZE)
+        for key in to_delete:
+            cache.pop(key, None)
+        cache.update(to_write)
+        self.version += 1
+        self._notify(set(to_write) | set(to_delete))
+
+    def _write_legacy(self, to_write, to_delete):
+        """Apply changes to db.stats with a single save."""
+        stats = self._legacy()
+        for (category, stat_type, name), (perm, temp) in to_write.items():
+            types = stats.setdefault(category, {})
+            entries = types.setdefault(stat_type, {}) if stat_type else types
+            data = entries.setdefault(name, {})
+            data['perm'] = perm
+            if temp is None:
+                data.pop('temp', None)
+            else:
+                data['temp'] = temp
+        for category, stat_type, name in to_delete:
+            types = stats.get(category, {})
+            entries = types.get(stat_type, {}) if stat_type else types
+            entries.pop(name, None)
+            if stat_type and not entries:
+                types.pop(stat_type, None)
+            if not types:
+                stats.pop(category, None)
+        self._mirroring = True
+        try:
+            attr = self.obj.attributes.get('stats', return_obj=True)
+            if attr is None:
+                self.obj.attributes.add('stats', stats)
+            else:
+                # attributes.add() would save the Attribute twice
+                attr.value = stats
+        finally:
+            self._mirroring = False
+
+
+class StatAttributeHandler(AttributeHandler):
+    """
+    Attribute handler for objects with a StatHandler: brings db.stats up to
+    date with the CharacterStat rows before it is read.
+    """
+
+    def get(self, key=None, *args, **kwargs):
+        if 'stats' in make_iter(key):
+            self.obj.stats.update_legacy()
+        return super().get(key, *args, **kwargs)
+
+    def all(self, *args, **kwargs):
+        self.obj.stats.update_legacy()
+        return super().all(*args, **kwargs)
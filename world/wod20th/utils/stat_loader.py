@@ -0,0 +1,235 @@
+"""
+Diff-aware bulk loading of Stat definitions from the JSON files in data/.
+
+Files are parsed up front into normalized records. Each record and each
+existing row is reduced to a content hash over the fields the loader owns,
+so rows whose data hasn't changed are skipped entirely. The remaining
+creates and updates are written with bulk_create/bulk_update inside a
+single transaction.
+
+Rows are matched on (name, stat_type), the model's unique key. A stat whose
+stat_type changed in the data therefore gets a new row. The old row is not
+touched, since a load of one file can't tell it from a stat of the same
+name in another file. diff_stats() reports it as stale instead, so it can
+be checked and deleted by hand.
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import transaction
+
+from world.wod20th.models import Stat
+from world.wod20th.utils.stat_catalog import STAT_CATALOG, bump_stat_generation
+
+# Fields the loader sets, with the default used when a record omits them
+LOADED_FIELDS = {
+    'description': '',
+    'game_line': 'general',
+    'category': 'other',
+    'stat_type': 'other',
+    'values': [],
+    'splat': None,
+    'hidden': False,
+    'locked': False,
+    'instanced': False,
+    'default': None,
+}
+
+BATCH_SIZE = 500
+
+
+def normalize_stat(stat_data):
+    """Reduce raw JSON data to the loaded fields plus name, or None if unusable."""
+    if not isinstance(stat_data, dict) or not stat_data.get('name'):
+        return None
+    record = {'name': stat_data['name']}
+    for field, default in LOADED_FIELDS.items():
+        if isinstance(default, list):
+            default = list(default)
+        # Coerce to what the column will hand back (e.g. default: 1 -> '1'),
+        # otherwise such rows would never compare as unchanged.
+        record[field] = Stat._meta.get_field(field).to_python(stat_data.get(field, default))
+    return record
+
+
+def stat_hash(record):
+    """Hash the loaded fields of a record or row."""
+    payload = json.dumps(
+        [record.get('name')] + [record.get(field) for field in LOADED_FIELDS],
+        sort_keys=True, default=str
+    )
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _is_splat_group(data):
+    """True for a splat -> category -> stats grouping rather than a single stat."""
+    return (
+        isinstance(data, dict) and bool(data)
+        and 'name' not in data and 'stat_type' not in data
+        and all(isinstance(group, dict) and all(isinstance(stat, dict) for stat in group.values())
+                for group in data.values())
+    )
+
+
+def parse_stat_file(file_path):
+    """
+    Parse one JSON file.
+
+    Returns:
+        tuple: (file_path, records, errors) where errors is a list of strings.
+    """
+    records, errors = [], []
+    try:
+        with open(file_path, 'r') as f:
+            data = json.load(f)
+    except json.JSONDecodeError:
+        return file_path, records, [f'Invalid JSON in file: {file_path}']
+    except OSError as e:
+        return file_path, records, [f'Error reading {file_path}: {e}']
+
+    if isinstance(data, list):
+        raw_stats = data
+    elif isinstance(data, dict):
+        # A dictionary of name -> stat data or name -> plain value
+        raw_stats = []
+        for stat_name, stat_data in data.items():
+            if _is_splat_group(stat_data):
+                # splat_abilities.json: splat -> category -> name -> stat data
+                for abilities in stat_data.values():
+                    for ability_name, ability_data in abilities.items():
+                        raw_stats.append(dict({'splat': stat_name, 'name': ability_name}, **ability_data))
+            elif isinstance(stat_data, dict):
+                raw_stats.append(dict(stat_data, name=stat_name))
+            else:
+                raw_stats.append({
+                    'name': stat_name,
+                    'value': stat_data,
+                    'category': 'other',
+                    'stat_type': 'other'
+                })
+    else:
+        return file_path, records, [f'Unsupported JSON layout in file: {file_path}']
+
+    for stat_data in raw_stats:
+        record = normalize_stat(stat_data)
+        if record is None:
+            errors.append(f'Invalid or unnamed stat in {file_path}: {str(stat_data)[:60]}')
+        else:
+            records.append(record)
+    return file_path, records, errors
+
+
+def parse_stat_files(file_paths, jobs=1):
+    """Parse several files, optionally across jobs worker processes, in order."""
+    if jobs > 1 and len(file_paths) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(parse_stat_file, file_paths))
+    return [parse_stat_file(path) for path in file_paths]
+
+
+def list_stat_files(data_dir):
+    """Return the JSON files in data_dir, sorted so later files win consistently."""
+    return [
+        os.path.join(data_dir, filename)
+        for filename in sorted(os.listdir(data_dir))
+        if filename.endswith('.json')
+    ]
+
+
+class StatDiff:
+    """The changes needed to bring the Stat table in line with a set of records."""
+
+    def __init__(self):
+        self.to_create = []      # records
+        self.to_update = []      # (row id, record, [changed fields])
+        # (row id, name, stat_type) of rows that share a name with a new
+        # record but match no record: usually a stat whose type changed
+        self.stale = []
+        self.unchanged = 0
+
+    def __bool__(self):
+        return bool(self.to_create or self.to_update)
+
+    def summary(self):
+        summary = (f"{len(self.to_create)} to create, {len(self.to_update)} to update, "
+                   f"{self.unchanged} unchanged")
+        if self.stale:
+            summary += f", {len(self.stale)} stale"
+        return summary
+
+
+def diff_stats(records):
+    """
+    Compare records against the database with a single query.
+
+    Later records with the same (name, stat_type) replace earlier ones.
+    """
+    wanted = {}
+    for record in records:
+        wanted[(record['name'], record['stat_type'])] = record
+
+    existing = {}
+    for row in Stat.objects.values('id', 'name', *LOADED_FIELDS):
+        existing[(row['name'], row['stat_type'])] = row
+
+    diff = StatDiff()
+    for key, record in wanted.items():
+        row = existing.get(key)
+        if row is None:
+            diff.to_create.append(record)
+        elif stat_hash(row) == stat_hash(record):
+            diff.unchanged += 1
+        else:
+            changed = [field for field in LOADED_FIELDS if row.get(field) != record[field]]
+            diff.to_update.append((row['id'], record, changed))
+
+    created_names = {record['name'] for record in diff.to_create}
+    for key, row in existing.items():
+        if key[0] in created_names and key not in wanted:
+            diff.stale.append((row['id'], row['name'], row['stat_type']))
+    return diff
+
+
+def missing_stats(records):
+    """
+    Return a StatDiff that only creates: records whose name has no row yet,
+    the first record for each name winning. Rows that exist are counted as
+    unchanged whatever their data.
+    """
+    existing = set(Stat.objects.values_list('name', flat=True))
+    diff = StatDiff()
+    for record in records:
+        if record['name'] in existing:
+            diff.unchanged += 1
+            continue
+        existing.add(record['name'])
+        diff.to_create.append(record)
+    return diff
+
+
+def apply_diff(diff, invalidate=True):
+    """
+    Write a diff in one transaction. Returns (created, updated).
+
+    Bulk writes don't send post_save, so the stat catalog is invalidated
+    afterwards. Pass invalidate=False when calling from a worker thread and
+    invalidate from the main thread instead.
+    """
+    if not diff:
+        return 0, 0
+    with transaction.atomic():
+        Stat.objects.bulk_create(
+            [Stat(**record) for record in diff.to_create],
+            batch_size=BATCH_SIZE
+        )
+        Stat.objects.bulk_update(
+            [Stat(id=row_id, **record) for row_id, record, _changed in diff.to_update],
+            list(LOADED_FIELDS),
+            batch_size=BATCH_SIZE
+        )
+        bump_stat_generation()
+    if invalidate:
+        STAT_CATALOG.invalidate()
+    return len(diff.to_create), len(diff.to_update)
@@ -0,0 +1,211 @@
+"""
+Cross-character stat queries for staff (+stats/find).
+
+A query is a boolean expression over stats, compiled into a single SQL query
+against the CharacterStat table and its indexed number/text projections of
+each value. Results come back as (id, name) pairs straight from the
+database; no character typeclass is loaded.
+
+    Clan=Toreador and Auspex>=3 and approved
+    Natural Linguist                    has the stat, rated above 0
+    merits:Natural Linguist             only in the given category
+    Willpower.temp<3                    compare the temporary value
+    not (Splat=Vampire or Splat=Mortal)
+    Enlightenment="Power and the Inner Voice"
+
+The comparison operators are = != > >= < <=. Whole numbers compare as
+numbers and anything else as case-insensitive text; only = and != work on
+text. ``approved`` matches approved characters, and values containing
+and/or/not (or brackets) must be quoted.
+"""
+import re
+from collections import namedtuple
+
+from django.db.models import Q
+from django.db.models.functions import Lower
+from evennia.objects.models import ObjectDB
+
+from world.wod20th.models import CharacterStat
+
+_TOKEN_RE = re.compile(r'\s*(?:"(?P<quoted>[^"]*)"|(?P<paren>[()])|(?P<op>>=|<=|!=|=|<|>)|(?P<word>[^\s()<>=!"]+))')
+_NUMBER_RE = re.compile(r'-?\d+')
+KEYWORDS = ('and', 'or', 'not')
+NUMBER_LOOKUPS = {'=': 'exact', '>': 'gt', '>=': 'gte', '<': 'lt', '<=': 'lte'}
+# Text projections of values that don't count as having a stat
+EMPTY_VALUES = ('', '0', 'false')
+
+StatQueryPage = namedtuple('StatQueryPage', 'results page page_count total')
+
+
+class StatQueryError(ValueError):
+    """Raised for a query that can't be parsed."""
+
+
+def tokenize(text):
+    """Split a query into (kind, text) tokens; kind is 'quoted', 'paren', 'op' or 'word'."""
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if not match:
+            raise StatQueryError(f"Can't read the query from: {text[pos:].strip()}")
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        pos = match.end()
+    return tokens
+
+
+class StatQuery:
+    """
+    A parsed query.
+
+    Args:
+        text (str): The query, e.g. 'Clan=Toreador and Auspex>=3'.
+
+    Raises:
+        StatQueryError: If the query can't be parsed.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self._tokens = tokenize(text)
+        self._pos = 0
+        # Lowercased names of the stats the query mentions
+        self.stat_names = []
+        if not self._tokens:
+            raise StatQueryError("The query is empty.")
+        self.q = self._or()
+        if self._pos < len(self._tokens):
+            raise StatQueryError(f"Unexpected '{self._tokens[self._pos][1]}'.")
+
+    # Recursive descent: or binds loosest, then and, then not.
+
+    def _peek(self):
+        return self._tokens[self._pos] if self._pos < len(self._tokens) else (None, None)
+
+    def _keyword(self, word):
+        kind, text = self._peek()
+        if kind == 'word' and text.lower() == word:
+            self._pos += 1
+            return True
+        return False
+
+    def _or(self):
+        q = self._and()
+        while self._keyword('or'):
+            q |= self._and()
+        return q
+
+    def _and(self):
+        q = self._not()
+        while self._keyword('and'):
+            q &= self._not()
+        return q
+
+    def _not(self):
+        if self._keyword('not'):
+            return ~self._not()
+        return self._atom()
+
+    def _atom(self):
+        kind, text = self._peek()
+        if (kind, text) == ('paren', '('):
+            self._pos += 1
+            q = self._or()
+            if self._peek() != ('paren', ')'):
+                raise StatQueryError("Missing ')'.")
+            self._pos += 1
+            return q
+        name, quoted = self._words()
+        if not name:
+            raise StatQueryError(f"Expected a stat name, got '{text}'." if text else "The query ends too soon.")
+        op = value = None
+        if self._peek()[0] == 'op':
+            op = self._peek()[1]
+            self._pos += 1
+            value, _ = self._words()
+            if not value:
+                raise StatQueryError(f"Expected a value after '{name}{op}'.")
+        elif name.lower() == 'approved' and not quoted:
+            return Q(id__in=ObjectDB.objects.filter(
+                db_attributes__db_key='approved', db_attributes__db_value=True
+            ).values('id'))
+        return self._predicate(name, op, value)
+
+    def _words(self):
+        """Read consecutive words (or one quoted string) up to the next operator or keyword."""
+        words, quoted = [], False
+        while self._pos < len(self._tokens):
+            kind, text = self._tokens[self._pos]
+            if kind == 'quoted':
+                quoted = True
+            elif kind != 'word' or text.lower() in KEYWORDS:
+                break
+            words.append(text)
+            self._pos += 1
+        return ' '.join(words).strip(), quoted
+
+    def _predicate(self, name, op, value):
+        category = None
+        if ':' in name:
+            category, name = (part.strip() for part in name.split(':', 1))
+        field = 'perm'
+        base, _, suffix = name.rpartition('.')
+        if base and suffix.lower() in ('perm', 'temp'):
+            name, field = base.strip(), suffix.lower()
+        self.stat_names.append(name.lower())
+
+        q = Q(name_lower=name.lower())
+        if category:
+            q &= Q(category=category.lower())
+        negate = op == '!='
+        if op is None:
+            q &= ~Q(**{f'{field}_text__in': EMPTY_VALUES})
+        elif _NUMBER_RE.fullmatch(value):
+            lookup = NUMBER_LOOKUPS.get(op, 'exact')
+            q &= Q(**{f'{field}_number__{lookup}': int(value)})
+        elif op in ('=', '!='):
+            q &= Q(**{f'{field}_text': value.lower()[:255]})
+        else:
+            raise StatQueryError(f"'{value}' isn't a number, so it can't be compared with {op}.")
+
+        q = Q(id__in=CharacterStat.objects.alias(name_lower=Lower('name')).filter(q).values('character_id'))
+        return ~q if negate else q
+
+    def characters(self):
+        """Return a queryset of matching characters, ordered by name."""
+        return ObjectDB.objects.filter(
+            self.q, id__in=CharacterStat.objects.values('character_id')
+        ).order_by(Lower('db_key'))
+
+    def page(self, page=1, page_size=20):
+        """
+        Return one page of results.
+
+        Returns:
+            StatQueryPage: results is a list of (id, name, stats), where stats
+            is a list of (stat name, perm, temp) for the stats the query
+            mentions.
+        """
+        characters = self.characters()
+        total = characters.count()
+        page_count = max(1, (total + page_size - 1) // page_size)
+        rows = list(characters.values_list('id', 'db_key')[(page - 1) * page_size:page * page_size])
+
+        stats = {}
+        if rows and self.stat_names:
+            for char_id, name, perm, temp in CharacterStat.objects.alias(name_lower=Lower('name')).filter(
+                character_id__in=[char_id for char_id, _ in rows], name_lower__in=set(self.stat_names)
+            ).order_by('name').values_list('character_id', 'name', 'perm', 'temp'):
+                stats.setdefault(char_id, []).append((name, perm, temp))
+        results = [(char_id, key, stats.get(char_id, [])) for char_id, key in rows]
+        return StatQueryPage(results, page, page_count, total)
+
+
+def find_characters(query, page=1, page_size=20):
+    """
+    Run a stat query and return one page of results; see StatQuery.page.
+
+    Raises:
+        StatQueryError: If the query can't be parsed.
+    """
+    return StatQuery(query).page(page, page_size)
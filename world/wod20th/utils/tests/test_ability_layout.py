@@ -0,0 +1,49 @@
+import unittest
+
+from world.wod20th.models import Stat
+from world.wod20th.utils.ability_layout import AbilityLayouts, layout_key
+from world.wod20th.utils.stat_catalog import StatCatalog
+
+
+class TestAbilityLayout(unittest.TestCase):
+    def setUp(self):
+        self.catalog = StatCatalog()
+        self.catalog._loaded = True
+        for i, (name, stat_type) in enumerate([
+            ("Brawl", "talent"), ("Alertness", "talent"), ("Primal-Urge", "talent"),
+            ("Flight", "ability"), ("Drive", "skill"), ("Rituals", "knowledge"),
+            ("Occult", "knowledge"), ("Homebrew", "talent"),
+        ], 1):
+            self.catalog.add(Stat(id=i, name=name, category="abilities", stat_type=stat_type))
+        self.layouts = AbilityLayouts(self.catalog)
+
+    def names(self, layout, column):
+        return [stat.name for stat in layout.primary[column]]
+
+    def test_base_layout(self):
+        layout = self.layouts.get('Mortal')
+        self.assertEqual(self.names(layout, 'talent'), ['Alertness', 'Brawl'])
+        self.assertEqual(self.names(layout, 'knowledge'), ['Occult'])
+        self.assertNotIn('Blatancy', layout.secondary['secondary_talent'])
+        self.assertIn('Blatancy', self.layouts.get('Mage').secondary['secondary_talent'])
+
+    def test_splat_extras(self):
+        self.assertEqual(self.names(self.layouts.get('Shifter', 'Garou'), 'talent'),
+                         ['Alertness', 'Brawl', 'Primal-Urge'])
+        corax = self.layouts.get('Shifter', 'Corax')
+        self.assertEqual(self.names(corax, 'talent'), ['Alertness', 'Brawl', 'Flight', 'Primal-Urge'])
+        self.assertEqual(self.names(corax, 'knowledge'), ['Occult', 'Rituals'])
+        self.assertEqual(self.names(self.layouts.get('Vampire', '', 'Gargoyle'), 'talent'),
+                         ['Alertness', 'Brawl', 'Flight'])
+
+    def test_layouts_are_shared(self):
+        self.assertEqual(layout_key('Mortal', 'Corax', 'Gargoyle'), ('Mortal', '', ''))
+        self.assertIs(self.layouts.get('Vampire', 'Corax', 'Brujah'), self.layouts.get('Vampire', '', 'Brujah'))
+        self.assertIsNot(self.layouts.get('Vampire', '', 'Brujah'), self.layouts.get('Vampire', '', 'Gargoyle'))
+
+    def test_rebuilt_when_catalog_changes(self):
+        before = self.layouts.get('Mortal')
+        self.catalog.add(Stat(id=20, name="Awareness", category="abilities", stat_type="talent"))
+        after = self.layouts.get('Mortal')
+        self.assertIsNot(before, after)
+        self.assertEqual(self.names(after, 'talent'), ['Alertness', 'Awareness', 'Brawl'])
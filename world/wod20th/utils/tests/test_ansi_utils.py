@@ -0,0 +1,49 @@
+import unittest
+
+from world.wod20th.utils.ansi_utils import wrap_ansi, visible_width
+
+
+class TestWrapAnsi(unittest.TestCase):
+    # (text, width, options, expected)
+    CORPUS = [
+        ("", 10, {}, ""),
+        ("one two three four", 9, {}, "one two\nthree\nfour"),
+        ("|rred words|n here", 9, {}, "|rred words|n\nhere"),
+        ("|500xterm |[=a grey |#ff0000 hex|n end", 12, {}, "|500xterm |[=a grey\n|#ff0000hex|n end"),
+        ("a || b {{ c", 5, {}, "a || b\n{{ c"),
+        ("%chbold%cn words", 5, {}, "%chbold%cn\nwords"),
+        ("abcdefghij klm", 4, {}, "abcd\nefgh\nij\nklm"),
+        ("one two three", 9, {'left_padding': 1, 'right_padding': 1}, " one two \n three "),
+        ("one two three four", 10, {'hanging_indent': 2}, "one two\n  three\n  four"),
+        ("    Indent kept   inside", 30, {}, "    Indent kept   inside"),
+        ("|r    Indent after a code", 30, {}, "|r    Indent after a code"),
+        ("first\nsecond|/third%rfourth", 20, {}, "first\nsecond\nthird\nfourth"),
+        ("trailing code |n", 20, {}, "trailing code|n"),
+    ]
+
+    def test_corpus(self):
+        for text, width, options, expected in self.CORPUS:
+            with self.subTest(text=text, width=width):
+                self.assertEqual(wrap_ansi(text, width, **options), expected)
+
+    def test_visible_width(self):
+        self.assertEqual(visible_width("|rred|n || |[=a%ch"), 6)
+        self.assertEqual(visible_width("|lclook|ltLook|le"), 4)
+
+    def test_lines_fit_and_keep_everything(self):
+        words = ["|rcrimson|n", "mist", "%chbright%cn", "||pipe", "a", "verylongwordthatneverends",
+                 "|[bbg|n", "|125xterm|n", "moss-covered"]
+        text = " ".join(words[i * 7 % len(words)] for i in range(300))
+        for width in (5, 12, 40, 78):
+            with self.subTest(width=width):
+                wrapped = wrap_ansi(text, width, hanging_indent=2 if width > 5 else 0)
+                for line in wrapped.split("\n"):
+                    self.assertLessEqual(visible_width(line), width)
+                # Nothing but whitespace is added or lost
+                self.assertEqual("".join(wrapped.split()), "".join(text.split()))
+
+    def test_bad_widths(self):
+        with self.assertRaises(ValueError):
+            wrap_ansi("text", 10, left_padding=5, right_padding=5)
+        with self.assertRaises(ValueError):
+            wrap_ansi("text", 10, hanging_indent=10)
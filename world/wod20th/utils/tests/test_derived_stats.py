@@ -0,0 +1,25 @@
+import unittest
+
+from world.wod20th.models import shifter_starting_pools, willpower_from_virtues
+from world.wod20th.utils.derived_stats import DERIVED_GRAPH, SPLAT, ENLIGHTENMENT
+
+
+class TestDerivedStats(unittest.TestCase):
+    def test_affected(self):
+        self.assertEqual(DERIVED_GRAPH.affected[ENLIGHTENMENT], {'willpower', 'road'})
+        self.assertEqual(DERIVED_GRAPH.affected[SPLAT],
+                         {'starting_pools', 'rage', 'gnosis', 'blood_pool'})
+        self.assertEqual(DERIVED_GRAPH.affected[('identity', 'lineage', 'Auspice')],
+                         {'starting_pools', 'rage', 'gnosis', 'blood_pool'})
+        self.assertNotIn(('attributes', 'physical', 'Strength'), DERIVED_GRAPH.affected)
+
+    def test_willpower(self):
+        self.assertEqual(willpower_from_virtues({'Courage': 3, 'Conscience': 2}, 'Humanity'), 5)
+        self.assertEqual(willpower_from_virtues({'Courage': 3, 'Conviction': 4}, 'Night'), 7)
+        self.assertEqual(willpower_from_virtues({}, None), 1)
+
+    def test_shifter_starting_pools(self):
+        self.assertEqual(shifter_starting_pools('Garou', {'Breed': 'Lupus', 'Auspice': 'Ahroun'}),
+                         {'Rage': 5, 'Gnosis': 5})
+        self.assertEqual(shifter_starting_pools('Corax', {}), {'Rage': 1, 'Gnosis': 6, 'Willpower': 3})
+        self.assertEqual(shifter_starting_pools('Ajaba', {'Aspect': 'noon'}), {'Willpower': 3})
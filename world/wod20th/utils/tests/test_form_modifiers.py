@@ -0,0 +1,23 @@
+import unittest
+
+from world.wod20th.models import ShapeshifterForm
+from world.wod20th.utils.form_modifiers import CompiledForm
+
+
+class TestCompiledForm(unittest.TestCase):
+    # Strength, Dexterity, Stamina, Charisma, Manipulation, Appearance, Perception, Intelligence, Wits
+    PERMS = (2, 3, 2, 2, 1, 3, 2, 2, 2)
+
+    def compile(self, name, modifiers):
+        return CompiledForm(ShapeshifterForm(name=name, shifter_type='garou', stat_modifiers=modifiers))
+
+    def test_modifiers(self):
+        form = self.compile('Hispo', {'strength': 3, 'Dexterity': 2, 'Manipulation': -3, 'Rage': 1})
+        self.assertEqual(form.apply(self.PERMS), (5, 5, None, None, 0, None, None, None, None))
+
+    def test_war_forms(self):
+        crinos = self.compile('Crinos', {'Strength': 4, 'Manipulation': -3})
+        self.assertEqual(crinos.apply(self.PERMS), (6, None, None, None, 0, 0, None, None, None))
+        sokto = self.compile('Sokto', {'Appearance': 2})
+        self.assertEqual(sokto.apply(self.PERMS)[5], 0)
+        self.assertEqual(self.compile('Homid', {}).apply(self.PERMS), (None,) * 9)
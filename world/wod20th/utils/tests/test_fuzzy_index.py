@@ -0,0 +1,35 @@
+import unittest
+
+from world.wod20th.utils.fuzzy_index import FuzzyIndex
+
+
+class TestFuzzyIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = FuzzyIndex()
+        for name in ["Primal-Urge", "Brawl", "Streetwise", "Strength", "Animal Ken", "Awareness"]:
+            self.index.add(name)
+
+    def test_contains(self):
+        self.assertEqual(self.index.contains("aw"), ["awareness", "brawl"])
+        self.assertEqual(self.index.contains("rima"), ["primal-urge"])
+        self.assertEqual(self.index.contains("primalurge"), ["primal-urge"])
+
+    def test_prefix(self):
+        self.assertEqual(self.index.prefix("str"), ["strength", "streetwise"])
+
+    def test_expand(self):
+        self.assertEqual(self.index.expand("dex"), "dexterity")
+        self.assertEqual(self.index.expand("prim urge"), "primal-urge")
+        self.assertEqual(self.index.expand("anim"), "animal ken")
+        self.assertIsNone(self.index.expand("xyz"))
+
+    def test_suggest_ranks_closest_first(self):
+        self.assertEqual(self.index.suggest("Streetwize")[0], "streetwise")
+        self.assertEqual(self.index.suggest("primal urg")[0], "primal-urge")
+
+    def test_incremental_update(self):
+        self.index.discard("Brawl")
+        self.assertNotIn("brawl", self.index)
+        self.assertEqual(self.index.contains("aw"), ["awareness"])
+        self.index.add("Brawling")
+        self.assertEqual(self.index.contains("brawl"), ["brawling"])
@@ -0,0 +1,40 @@
+import json
+import os
+import tempfile
+
+from django.test import TestCase
+
+from world.wod20th.models import Stat
+from world.wod20th.utils.init_db import BOOT_DATA_FILES, SHIFTER_FORMS_KEY, compute_manifest, load_stats
+
+
+class TestBootSeeding(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.write('attributes_merits_flaws_basic_backgrounds.json', [
+            {'name': 'Appearance', 'category': 'attributes', 'stat_type': 'social', 'values': [0, 1, 2, 3, 4, 5]},
+            {'name': 'Strength', 'category': 'attributes', 'stat_type': 'physical'},
+        ])
+        self.write('test_script.json', [
+            {'name': 'Appearance', 'category': 'attributes', 'stat_type': 'social', 'values': [1, 2, 3, 4, 5]},
+        ])
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, filename, data):
+        with open(os.path.join(self.tmpdir.name, filename), 'w') as handle:
+            json.dump(data, handle)
+
+    def test_manifest_covers_boot_files_only(self):
+        manifest = compute_manifest(self.tmpdir.name)
+        self.assertEqual(set(manifest), {BOOT_DATA_FILES[0], SHIFTER_FORMS_KEY})
+
+    def test_creates_missing_stats_only(self):
+        Stat.objects.create(name='Strength', category='attributes', stat_type='physical',
+                            description='Edited by staff.')
+        diff = load_stats(self.tmpdir.name)
+        self.assertEqual([record['name'] for record in diff.to_create], ['Appearance'])
+        self.assertEqual(Stat.objects.get(name='Appearance').values, [0, 1, 2, 3, 4, 5])
+        self.assertEqual(Stat.objects.get(name='Strength').description, 'Edited by staff.')
+        self.assertFalse(load_stats(self.tmpdir.name))
@@ -0,0 +1,11 @@
+import unittest
+
+from world.wod20th.utils.language_handler import normalize_languages
+
+
+class TestNormalizeLanguages(unittest.TestCase):
+    def test_cleanup(self):
+        self.assertEqual(normalize_languages(None), ['English'])
+        self.assertEqual(normalize_languages("['spanish', 'French']"), ['English', 'Spanish', 'French'])
+        self.assertEqual(normalize_languages(['French', 'english', 'Klingon', 'FRENCH', 'farsi']),
+                         ['English', 'French', 'Farsi'])
@@ -0,0 +1,68 @@
+from unittest.mock import MagicMock, patch
+
+from evennia.utils import create
+from evennia.utils.test_resources import EvenniaTest
+
+from typeclasses.characters import Character
+from world.wod20th.utils.occupancy import OccupancyIndex
+from world.wod20th.utils.plane_state import MATERIAL, UMBRA
+
+
+class TestOccupancyIndex(EvenniaTest):
+    def setUp(self):
+        super().setUp()
+        self.alice = create.create_object(Character, key="Alice", location=self.room1)
+        self.bob = create.create_object(Character, key="Bob", location=self.room1)
+        self.carol = create.create_object(Character, key="Carol", location=self.room1)
+        self.index = OccupancyIndex()
+        self.puppeted, self.sessions = set(), []
+        for patcher in (
+            patch.object(Character, 'has_account', new=property(lambda obj: obj.id in self.puppeted)),
+            patch.object(Character, 'at_look', return_value=''),
+            patch('evennia.SESSION_HANDLER', MagicMock(get_sessions=lambda: list(self.sessions))),
+            patch('typeclasses.characters.OCCUPANCY', self.index),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _puppet(self, *characters):
+        for character in characters:
+            self.puppeted.add(character.id)
+            self.sessions.append(MagicMock(puppet=character))
+
+    def test_rebuilt_from_sessions(self):
+        self.bob.tags.add("in_umbra", category="state")
+        self._puppet(self.alice, self.bob)
+        self.assertEqual(self.index.occupants(self.room1), [self.alice, self.bob])
+        self.assertEqual(self.index.occupants(self.room1, UMBRA), [self.bob])
+        self.assertEqual(self.index.count(self.room1, MATERIAL), 1)
+        self.assertEqual(self.index.plane(self.bob), UMBRA)
+        self.assertEqual(self.index.count(self.room2), 0)
+
+    def test_check(self):
+        self._puppet(self.alice, self.bob)
+        self.assertEqual(self.index.check(), [])
+        # Changes made behind the hooks' backs
+        self.alice.location = self.room2
+        self.bob.tags.add("in_umbra", category="state")
+        self._puppet(self.carol)
+        problems = self.index.check()
+        self.assertEqual(len(problems), 3)
+        self.assertIn(f"Alice(#{self.alice.id}) is indexed in #{self.room1.id}", problems[0])
+        self.assertIn("is indexed as material but is umbra", problems[1])
+        self.assertIn(f"Carol(#{self.carol.id}) is in #{self.room1.id} but isn't indexed", problems[2])
+
+    def test_hooks_keep_index_current(self):
+        self._puppet(self.bob)
+        self.puppeted.add(self.alice.id)
+        self.alice.at_post_puppet()
+        self.assertEqual(self.index.occupants(self.room1), [self.bob, self.alice])
+
+        self.alice.move_to(self.room2, quiet=True)
+        self.assertEqual(self.index.occupants(self.room1), [self.bob])
+        self.assertEqual(self.index.occupants(self.room2), [self.alice])
+
+        self.puppeted.discard(self.alice.id)
+        self.alice.at_post_unpuppet()
+        self.assertEqual(self.index.count(self.room2), 0)
+        self.assertEqual(self.index.check(), [])
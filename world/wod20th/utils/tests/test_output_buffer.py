@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import MagicMock
+
+from world.wod20th.utils.output_buffer import OUTPUT_STATS, OutputBuffer, coalesce, reset_output_stats
+
+
+class TestCoalesce(unittest.TestCase):
+    def test_joins_text_runs_in_order(self):
+        payloads = [{'text': 'break', 'options': None}, {'text': 'pose', 'options': None},
+                    {'prompt': '>'}, {'text': 'after'}]
+        self.assertEqual(coalesce(payloads), [{'text': 'break\npose'}, {'prompt': '>'}, {'text': 'after'}])
+
+    def test_keeps_differently_typed_text_apart(self):
+        payloads = [{'text': ('said', {'type': 'say'})}, {'text': ('again', {'type': 'say'})},
+                    {'text': 'plain'}]
+        self.assertEqual(coalesce(payloads), [{'text': ('said\nagain', {'type': 'say'})}, {'text': 'plain'}])
+
+
+class TestOutputBuffer(unittest.TestCase):
+    def setUp(self):
+        self.buffer = OutputBuffer()
+        self.alice, self.bob = MagicMock(sessid=1), MagicMock(sessid=2)
+        reset_output_stats()
+
+    def _sent(self, session):
+        return [call.kwargs for call in session.send_out.call_args_list]
+
+    def test_outside_a_command_sends_now(self):
+        self.assertFalse(self.buffer.hold(self.alice, {'text': 'tick'}))
+        self.assertEqual(OUTPUT_STATS['sends'], 1)
+
+    def test_held_until_outermost_command_finishes(self):
+        with self.buffer.command():
+            self.assertTrue(self.buffer.hold(self.alice, {'text': 'one'}))
+            with self.buffer.command():
+                self.buffer.hold(self.alice, {'text': 'two'})
+            self.alice.send_out.assert_not_called()
+            self.buffer.hold(self.alice, {'text': 'three'})
+        self.assertEqual(self._sent(self.alice), [{'text': 'one\ntwo\nthree'}])
+        self.assertEqual(OUTPUT_STATS, {'commands': 2, 'messages': 3, 'sends': 1})
+
+    def test_flush_keeps_order_per_session(self):
+        with self.buffer.command():
+            self.buffer.hold(self.alice, {'text': 'break'})
+            self.buffer.hold(self.bob, {'text': 'pose'})
+            self.buffer.hold(self.alice, {'prompt': '>'})
+            self.buffer.hold(self.alice, {'text': 'pose'})
+            self.buffer.hold(self.bob, {'text': 'reply'})
+        self.assertEqual(self._sent(self.alice), [{'text': 'break'}, {'prompt': '>'}, {'text': 'pose'}])
+        self.assertEqual(self._sent(self.bob), [{'text': 'pose\nreply'}])
+
+    def test_flushed_even_if_the_command_fails(self):
+        with self.assertRaises(ValueError):
+            with self.buffer.command():
+                self.buffer.hold(self.alice, {'text': 'partial'})
+                raise ValueError
+        self.assertEqual(self._sent(self.alice), [{'text': 'partial'}])
+
+    def test_disabled(self):
+        self.buffer.enabled = False
+        with self.buffer.command():
+            self.assertFalse(self.buffer.hold(self.alice, {'text': 'one'}))
+            self.assertFalse(self.buffer.hold(self.alice, {'text': 'two'}))
+        self.alice.send_out.assert_not_called()
+        self.assertEqual(OUTPUT_STATS['sends'], 2)
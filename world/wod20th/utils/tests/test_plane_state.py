@@ -0,0 +1,59 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from evennia.utils import create
+from evennia.utils.test_resources import EvenniaTest
+
+from typeclasses.characters import Character
+from world.wod20th.utils.occupancy import OccupancyIndex
+from world.wod20th.utils.plane_state import MATERIAL, UMBRA, plane_of, refresh_plane
+
+
+def _character(*tags):
+    character = MagicMock()
+    character.ndb.plane = None
+    character.tags.has.side_effect = lambda key, category=None: key in tags
+    return character
+
+
+class TestPlaneState(unittest.TestCase):
+    def test_plane_read_once_then_cached(self):
+        character = _character("in_umbra")
+        self.assertEqual(plane_of(character), UMBRA)
+        self.assertEqual(plane_of(character), UMBRA)
+        self.assertEqual(character.tags.has.call_count, 1)
+
+    def test_refresh_rereads_tags(self):
+        character = _character("in_umbra")
+        plane_of(character)
+        character.tags.has.side_effect = lambda key, category=None: key == "in_material"
+        refresh_plane(character)
+        self.assertEqual(plane_of(character), MATERIAL)
+
+
+class TestPlaneTags(EvenniaTest):
+    def setUp(self):
+        super().setUp()
+        self.character = create.create_object(Character, key="Walker", location=self.room1)
+        self.index = OccupancyIndex()
+        for patcher in (
+            patch.object(Character, 'has_account', new=property(lambda obj: True)),
+            patch('evennia.SESSION_HANDLER', MagicMock(get_sessions=lambda: [MagicMock(puppet=self.character)])),
+            patch('world.wod20th.signals.OCCUPANCY', self.index),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.index.rebuild()
+
+    def test_tag_edit_reindexes(self):
+        self.assertEqual(self.index.plane(self.character), MATERIAL)
+        self.character.tags.add("in_umbra", category="state")
+        self.assertEqual(self.index.plane(self.character), UMBRA)
+        self.assertEqual(self.index.occupants(self.room1, UMBRA), [self.character])
+        self.character.tags.remove("in_umbra", category="state")
+        self.assertEqual(self.index.plane(self.character), MATERIAL)
+        self.assertEqual(self.index.occupants(self.room1, MATERIAL), [self.character])
+
+    def test_unindexed_object_stays_out(self):
+        self.room1.tags.add("in_umbra", category="state")
+        self.assertFalse(self.index.is_indexed(self.room1))
@@ -0,0 +1,20 @@
+import unittest
+
+from world.wod20th.utils.pose_compiler import CompiledPose
+
+
+class TestCompiledPose(unittest.TestCase):
+    class Speaker:
+        def prepare_say(self, speech, language_only=False):
+            return None, f"{speech} << in French >>", "<< something in French >>", "French"
+
+    def test_segments(self):
+        pose = CompiledPose('waves, "~Bonjour!" then "hi" and "~Salut."')
+        self.assertEqual(pose.literals, ('waves, ', ' then "hi" and ', ''))
+        self.assertEqual(pose.speech, ('Bonjour!', 'Salut.'))
+        self.assertFalse(CompiledPose('just "hi".').has_speech)
+
+    def test_render(self):
+        understood, not_understood = CompiledPose('says "~Oui" softly.').render(self.Speaker(), prefix="Jo ")
+        self.assertEqual(understood, 'Jo says "Oui << in French >>" softly.')
+        self.assertEqual(not_understood, 'Jo says "<< something in French >>" softly.')
@@ -0,0 +1,33 @@
+import unittest
+
+from world.wod20th.utils.roll_index import RollIndex
+
+
+class TestRollIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = RollIndex([
+            ('attributes', 'physical', 'Dexterity', 3, None),
+            ('attributes', 'physical', 'Strength', 2, 4),
+            ('abilities', 'talent', 'Primal-Urge', 2, 0),
+            ('abilities', 'skill', 'Animal Ken', 1, 1),
+            ('abilities', 'skill', 'Athletics', 2, 2),
+            ('abilities', 'knowledge', 'Academics', 1, 1),
+            ('secondary_abilities', 'secondary_talent', 'Carousing', 2, 0),
+        ])
+
+    def test_exact_and_abbreviation(self):
+        self.assertEqual(self.index.lookup('Dexterity'), (3, 'Dexterity'))
+        self.assertEqual(self.index.lookup('str'), (4, 'Strength'))
+
+    def test_primal_urge_and_secondary_ignore_zero_temp(self):
+        self.assertEqual(self.index.lookup('primal'), (2, 'Primal-Urge'))
+        self.assertEqual(self.index.lookup('carousing'), (2, 'Carousing'))
+
+    def test_spaces_and_prefixes(self):
+        self.assertEqual(self.index.lookup('animalken'), (1, 'Animal Ken'))
+        self.assertEqual(self.index.lookup('animal k'), (1, 'Animal Ken'))
+        self.assertEqual(self.index.lookup('ac'), (1, 'Academics'))
+        self.assertEqual(self.index.lookup('ath'), (2, 'Athletics'))
+
+    def test_unknown(self):
+        self.assertEqual(self.index.lookup('stealth'), (0, 'Stealth'))
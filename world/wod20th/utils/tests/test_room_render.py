@@ -0,0 +1,19 @@
+import unittest
+from unittest.mock import MagicMock
+
+from world.wod20th.utils.room_render import format_room_desc, fragment
+
+
+class TestRoomRender(unittest.TestCase):
+    def test_paragraphs_and_tabs(self):
+        lines = format_room_desc("A room.%rA door.%tA mat.").split("\n")
+        self.assertEqual(lines[:2], ["A room.", "A door."])
+        self.assertEqual(lines[2], "    A mat.")
+
+    def test_fragment_rebuilt_only_when_source_changes(self):
+        obj, built = MagicMock(), []
+        obj.ndb.room_fragment = None
+        render = lambda: built.append(1) or len(built)
+        self.assertEqual(fragment(obj, ('Crate', ''), render), 1)
+        self.assertEqual(fragment(obj, ('Crate', ''), render), 1)
+        self.assertEqual(fragment(obj, ('Crate', 'Heavy.'), render), 2)
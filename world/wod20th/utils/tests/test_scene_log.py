@@ -0,0 +1,70 @@
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from world.wod20th.utils.scene_log import SceneLog, entry_text, format_entry
+
+
+class TestSceneLog(unittest.TestCase):
+    KEY = '7-20260101120000'
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log = SceneLog(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_appends_and_pages_in_order(self):
+        for i in range(25):
+            self.log.append(self.KEY, 'pose', 'Ann', f'Ann waves {i}.')
+        self.log.close()
+        entries, more = self.log.page(self.KEY, 2, per_page=20)
+        self.assertEqual([entry['text'] for entry in entries], [f'Ann waves {i}.' for i in range(20, 25)])
+        self.assertFalse(more)
+
+    def test_segment_cut_short_keeps_earlier_lines(self):
+        self.log.append(self.KEY, 'say', 'Ann', 'first')
+        self.log.close()
+        with open(self.log.segments(self.KEY)[-1], 'ab') as handle:
+            handle.write(b'\x1f\x8b\x08\x00')
+        restarted = SceneLog(self.tmp.name)
+        restarted.append(self.KEY, 'say', 'Ann', 'after restart')
+        restarted.close()
+        self.assertEqual([entry['text'] for entry in self.log.entries(self.KEY)], ['first', 'after restart'])
+
+    def test_rejects_paths(self):
+        with self.assertRaises(ValueError):
+            self.log.segments('../../etc')
+
+    def test_language_tagged_lines(self):
+        self.log.append(self.KEY, 'say', 'Ann', 'Ann says something in French',
+                        language='French', understood='Ann says, "Bonjour << in French >>"')
+        self.log.append(self.KEY, 'say', 'Ann', 'Ann says, "Hi"', language=None, understood='Ann says, "Hi"')
+        self.log.close()
+        tagged, plain = self.log.entries(self.KEY)
+        self.assertNotIn('understood', plain)
+
+        french, other = _reader('French'), _reader('German')
+        self.assertEqual(entry_text(tagged), 'Ann says something in French')
+        self.assertEqual(entry_text(tagged, other), 'Ann says something in French')
+        self.assertEqual(entry_text(tagged, french), 'Ann says, "Bonjour << in French >>"')
+        self.assertTrue(format_entry(tagged, french).endswith('Bonjour << in French >>"'))
+        self.assertEqual(entry_text(plain, other), 'Ann says, "Hi"')
+
+    def test_staff_read_every_language(self):
+        staff = _reader()
+        staff.account = MagicMock()
+        staff.account.check_permstring.return_value = True
+        entry = {'at': 0, 'kind': 'say', 'who': 'Ann', 'text': 'hidden', 'language': 'French', 'understood': 'shown'}
+        self.assertEqual(entry_text(entry, staff), 'shown')
+
+
+def _reader(*languages):
+    """A reader who knows languages and has no account or merits."""
+    reader = MagicMock()
+    reader.account = None
+    reader.ndb.universal_language = None
+    reader.stats.items.return_value = []
+    reader.languages.knows.side_effect = lambda language: language in languages
+    return reader
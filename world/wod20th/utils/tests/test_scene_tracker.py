@@ -0,0 +1,110 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.utils import timezone
+from evennia.utils import create
+from evennia.utils.test_resources import EvenniaTest
+
+from world.wod20th.models import SceneRecord
+from world.wod20th.utils.plane_state import MATERIAL, UMBRA, set_plane
+from world.wod20th.utils.scene_tracker import SceneTracker
+
+
+class TestSceneTracker(EvenniaTest):
+    def setUp(self):
+        super().setUp()
+        self.alice = create.create_object("typeclasses.characters.Character", key="Alice", location=self.room1)
+        self.bob = create.create_object("typeclasses.characters.Character", key="Bob", location=self.room1)
+        patcher = patch('world.wod20th.utils.scene_tracker.is_scene_location', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tracker = SceneTracker()
+        self.start = timezone.now() - timedelta(hours=1)
+
+    def _at(self, minutes):
+        return self.start + timedelta(minutes=minutes)
+
+    def _reload(self):
+        """Save pending activity and forget everything held in memory, as a server reload would."""
+        self.tracker.flush()
+        for room in (self.room1, self.room2):
+            room.ndb.scene_sessions = None
+        for character in (self.alice, self.bob):
+            character.ndb.scene_session = None
+        self.tracker = SceneTracker()
+
+    def test_join_flush_and_leave(self):
+        first = self.tracker.record_activity(self.alice, self._at(0))
+        self.tracker.record_activity(self.bob, self._at(1))
+        session = self.tracker.session(self.room1)
+        self.assertEqual(set(session.participants), {self.alice.id, self.bob.id})
+        self.assertEqual(set(SceneRecord.objects.values_list('scene_key', flat=True)), {session.key})
+
+        # Activity only touches the in-memory record until flushed
+        self.assertIs(self.tracker.record_activity(self.alice, self._at(5)), first)
+        self.assertEqual(SceneRecord.objects.get(pk=first.pk).last_activity, self._at(0))
+        self.assertEqual(self.tracker.flush(), 1)
+        self.assertEqual(SceneRecord.objects.get(pk=first.pk).last_activity, self._at(5))
+        self.assertEqual(self.tracker.flush(), 0)
+
+        self.assertTrue(self.tracker.leave(self.alice, self._at(25)).completed)
+        self.assertIsNone(self.tracker.current(self.alice))
+        self.assertFalse(self.tracker.leave(self.bob, self._at(10)).completed)
+        self.assertIsNone(self.tracker.session(self.room1))
+        self.assertEqual(SceneRecord.objects.filter(ended_at__isnull=True).count(), 0)
+
+    def test_reload_picks_up_open_scene(self):
+        self.tracker.record_activity(self.alice, self._at(0))
+        self.tracker.record_activity(self.bob, self._at(1))
+        key = self.tracker.session(self.room1).key
+        self._reload()
+
+        self.tracker.record_activity(self.alice, self._at(30))
+        session = self.tracker.session(self.room1)
+        self.assertEqual(session.key, key)
+        self.assertEqual(session.started, self._at(0))
+        self.assertEqual(set(session.participants), {self.alice.id, self.bob.id})
+        self.assertEqual(SceneRecord.objects.count(), 2)
+        self.assertTrue(self.tracker.leave(self.alice, self._at(30)).completed)
+
+    def test_reload_closes_parts_left_elsewhere(self):
+        self.alice.location = self.room2
+        self.tracker.record_activity(self.alice, self._at(0))
+        self.tracker.record_activity(self.alice, self._at(30))
+        self._reload()
+
+        self.alice.location = self.room1
+        self.tracker.record_activity(self.alice, self._at(40))
+        old = SceneRecord.objects.get(room=self.room2)
+        self.assertEqual(old.ended_at, self._at(30))
+        self.assertTrue(old.completed)
+        self.assertEqual(self.tracker.current(self.alice).room, self.room1)
+
+    def test_planes_have_separate_scenes(self):
+        set_plane(self.bob, UMBRA)
+        self.tracker.record_activity(self.alice, self._at(0))
+        self.tracker.record_activity(self.bob, self._at(1))
+        material, umbra = self.tracker.session(self.room1), self.tracker.session(self.room1, UMBRA)
+        self.assertEqual(set(material.participants), {self.alice.id})
+        self.assertEqual(set(umbra.participants), {self.bob.id})
+        self.assertTrue(umbra.key.endswith('-umbra'))
+        # So neither can read the other's log
+        self.assertFalse(self.tracker.took_part(self.alice, umbra.key))
+        self.assertFalse(self.tracker.took_part(self.bob, material.key))
+
+        # Stepping sideways leaves the old plane's scene
+        set_plane(self.bob, MATERIAL)
+        self.tracker.record_activity(self.bob, self._at(5))
+        self.assertIsNone(self.tracker.session(self.room1, UMBRA))
+        self.assertEqual(set(material.participants), {self.alice.id, self.bob.id})
+
+    def test_completed_counts_and_mark_awarded(self):
+        for character, completed in ((self.alice, True), (self.alice, True), (self.bob, True), (self.bob, False)):
+            SceneRecord.objects.create(character=character, room=self.room1, started_at=self._at(0),
+                                       last_activity=self._at(30), ended_at=self._at(30), completed=completed)
+        self.assertEqual(self.tracker.completed_counts(), {self.alice.id: 2, self.bob.id: 1})
+        self.assertEqual(self.tracker.mark_awarded([self.alice.id]), 2)
+        self.assertEqual(self.tracker.completed_counts(), {self.bob.id: 1})
+        self.assertEqual(self.tracker.completed_count(self.bob), 1)
+        self.assertEqual(self.tracker.mark_awarded(), 1)
+        self.assertEqual(self.tracker.completed_counts(), {})
@@ -0,0 +1,65 @@
+from unittest.mock import patch
+
+from evennia.utils import create
+from evennia.utils.test_resources import EvenniaTest
+
+from commands.CmdSheet import CmdSheet
+from world.wod20th.utils.sheet_cache import cache_sheet, get_cached_sheet
+
+
+class TestSheetCache(EvenniaTest):
+    def setUp(self):
+        super().setUp()
+        self.character = create.create_object("typeclasses.characters.Character", key="TestChar",
+                                              location=self.room1)
+        self.character.db.stats = {'other': {'splat': {'Splat': {'perm': 'Mortal', 'temp': 'Mortal'}}}}
+        self.character.db.xp = {'current': 1}
+        cache_sheet(self.character, 'player', 78, 'sheet')
+
+    def test_cached_per_tier_and_width(self):
+        self.assertEqual(get_cached_sheet(self.character, 'player', 78), 'sheet')
+        self.assertIsNone(get_cached_sheet(self.character, 'staff', 78))
+        self.assertIsNone(get_cached_sheet(self.character, 'player', 100))
+
+    def test_stat_write_invalidates(self):
+        self.character.stats.set('attributes', 'physical', 'Strength', 3)
+        self.assertIsNone(get_cached_sheet(self.character, 'player', 78))
+
+    def test_direct_stats_write_invalidates(self):
+        self.character.db.stats['attributes'] = {'physical': {'Strength': {'perm': 3, 'temp': 3}}}
+        self.assertIsNone(get_cached_sheet(self.character, 'player', 78))
+
+    def test_sheet_attribute_write_invalidates(self):
+        self.character.db.xp = {'current': 2}
+        self.assertIsNone(get_cached_sheet(self.character, 'player', 78))
+
+    def test_new_sheet_attribute_invalidates(self):
+        self.character.db.bashing = 1
+        self.assertIsNone(get_cached_sheet(self.character, 'player', 78))
+
+    def test_sheet_attribute_delete_invalidates(self):
+        del self.character.db.xp
+        self.assertIsNone(get_cached_sheet(self.character, 'player', 78))
+
+    def test_other_attribute_keeps_cache(self):
+        self.character.db.desc = "Tall."
+        self.assertEqual(get_cached_sheet(self.character, 'player', 78), 'sheet')
+
+    def _sheet(self):
+        cmd = CmdSheet()
+        cmd.caller = self.character
+        cmd.args = ""
+        cmd.session = None
+        cmd.func()
+
+    @patch.object(CmdSheet, 'render_sheet', return_value='rendered')
+    def test_command_renders_only_after_changes(self, render_sheet):
+        self.character.ndb.sheet_cache = None
+        self._sheet()
+        self._sheet()
+        self.assertEqual(render_sheet.call_count, 1)
+        self.character.stats.set('attributes', 'physical', 'Strength', 3)
+        self._sheet()
+        self.character.db.xp = {'current': 2}
+        self._sheet()
+        self.assertEqual(render_sheet.call_count, 3)
@@ -0,0 +1,68 @@
+import unittest
+
+from django.test import TestCase
+
+from world.wod20th.models import Stat
+from world.wod20th.utils.stat_catalog import StatCatalog, stat_generation
+
+
+class TestStatCatalog(unittest.TestCase):
+    def setUp(self):
+        self.catalog = StatCatalog()
+        # Mark as loaded so add() indexes without touching the database
+        self.catalog._loaded = True
+        self.stats = [
+            Stat(id=1, name="Strength", category="attributes", stat_type="physical"),
+            Stat(id=2, name="Primal-Urge", category="abilities", stat_type="talent", splat="Shifter"),
+            Stat(id=3, name="Rank", category="advantages", stat_type="background"),
+            Stat(id=4, name="Rank", category="identity", stat_type="lineage", splat="Shifter"),
+            Stat(id=5, name="Mother's Touch", category="powers", stat_type="gift",
+                 shifter_type="garou", auspice="theurge", tribe=["Children of Gaia"]),
+        ]
+        for stat in self.stats:
+            self.catalog.add(stat)
+
+    def test_get_is_case_insensitive(self):
+        self.assertEqual(self.catalog.get("strength").id, 1)
+        self.assertIsNone(self.catalog.get("Dexterity"))
+
+    def test_get_by_stat_type(self):
+        self.assertEqual(self.catalog.get("rank", "lineage").category, "identity")
+
+    def test_search_prefers_exact_match(self):
+        self.assertEqual([s.id for s in self.catalog.search("Rank")], [3, 4])
+        self.assertEqual([s.id for s in self.catalog.search("urge")], [2])
+
+    def test_secondary_indexes(self):
+        self.assertEqual([s.id for s in self.catalog.by_splat("shifter")], [2, 4])
+        self.assertEqual([s.id for s in self.catalog.by_category("abilities", "talent")], [2])
+        self.assertEqual([s.id for s in self.catalog.by_shifter_type("Garou")], [5])
+        self.assertEqual([s.id for s in self.catalog.by_auspice("theurge")], [5])
+        self.assertEqual([s.id for s in self.catalog.by_tribe("children of gaia")], [5])
+
+    def test_add_replaces_renamed_stat(self):
+        self.catalog.add(Stat(id=1, name="Might", category="attributes", stat_type="physical"))
+        self.assertIsNone(self.catalog.get("Strength"))
+        self.assertEqual(self.catalog.get("might").id, 1)
+        self.assertEqual(len(self.catalog), 5)
+
+    def test_discard(self):
+        self.catalog.discard(self.stats[2])
+        self.assertEqual([s.id for s in self.catalog.filter_name("rank")], [4])
+        self.assertEqual(len(self.catalog), 4)
+
+    def test_search_expands_abbreviations(self):
+        self.assertEqual([s.id for s in self.catalog.search("str")], [1])
+
+    def test_did_you_mean(self):
+        self.assertIn("Strength", self.catalog.did_you_mean("Strenght"))
+        self.assertEqual(self.catalog.did_you_mean("zzzz"), "")
+
+
+class TestStatGeneration(TestCase):
+    def test_saves_and_deletes_bump_generation(self):
+        start = stat_generation()
+        stat = Stat.objects.create(name="Strength", category="attributes", stat_type="physical")
+        self.assertEqual(stat_generation(), start + 1)
+        stat.delete()
+        self.assertEqual(stat_generation(), start + 2)
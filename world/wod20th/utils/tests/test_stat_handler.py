@@ -0,0 +1,139 @@
+import unittest
+from unittest.mock import patch
+
+from evennia.utils import create
+from evennia.utils.test_resources import EvenniaTest
+
+from world.wod20th.models import CharacterStat
+from world.wod20th.utils.stat_handler import flatten_stats
+
+
+class TestFlattenStats(unittest.TestCase):
+    def test_flatten(self):
+        stats = {
+            'attributes': {'physical': {'Strength': {'perm': 3, 'temp': 2}, 'Dexterity': {'perm': 1}}},
+            'pools': {'Willpower': {'perm': 5, 'temp': 4}},
+            'junk': 'not a dict',
+        }
+        self.assertEqual(flatten_stats(stats), {
+            ('attributes', 'physical', 'Strength'): [3, 2],
+            ('attributes', 'physical', 'Dexterity'): [1, None],
+            ('pools', '', 'Willpower'): [5, 4],
+        })
+
+
+class TestStatHandler(EvenniaTest):
+    def setUp(self):
+        super().setUp()
+        self.character = create.create_object("typeclasses.characters.Character", key="TestChar",
+                                              location=self.room1)
+        self.character.db.stats = {'attributes': {'physical': {'Strength': {'perm': 2, 'temp': 2}}}}
+
+    def _stored(self):
+        """db.stats as saved, without bringing it up to date first."""
+        return self.character.attributes.backend.get('stats', None)[0].value
+
+    def test_writes_touch_rows_only(self):
+        self.character.stats.set('attributes', 'physical', 'Strength', 4)
+        self.character.stats.set('attributes', 'physical', 'Dexterity', 3)
+        row = CharacterStat.objects.get(character_id=self.character.id, name='Strength')
+        self.assertEqual(row.perm, 4)
+        self.assertEqual(self._stored()['attributes']['physical']['Strength']['perm'], 2)
+        self.assertNotIn('Dexterity', self._stored()['attributes']['physical'])
+
+    def test_db_stats_updated_on_read(self):
+        self.character.stats.set('attributes', 'physical', 'Strength', 4)
+        self.character.stats.remove('attributes', 'physical', 'Strength')
+        self.character.stats.set('attributes', 'physical', 'Dexterity', 3)
+        self.assertEqual(self.character.db.stats, {'attributes': {'physical': {'Dexterity': {'perm': 3, 'temp': 0}}}})
+
+    def test_direct_write_reaches_rows(self):
+        self.character.db.stats['attributes']['physical']['Strength']['perm'] = 5
+        self.assertEqual(self.character.stats.get('attributes', 'physical', 'Strength'), 5)
+        self.assertEqual(CharacterStat.objects.get(character_id=self.character.id, name='Strength').perm, 5)
+
+    def test_set_stat_zero_removes_after_language_check(self):
+        self.character.db.approved = False
+        self.character.stats.set('merits', 'social', 'Language', 2)
+        with patch('commands.CmdLanguage.CmdLanguage.validate_languages') as validate:
+            validate.side_effect = lambda: self.assertEqual(
+                self.character.stats.get('merits', 'social', 'Language'), 0)
+            self.character.set_stat('merits', 'social', 'Language', 0)
+        validate.assert_called_once()
+        self.assertFalse(self.character.stats.has('merits', 'social', 'Language'))
+
+
+class TestStatBatch(EvenniaTest):
+    def setUp(self):
+        super().setUp()
+        self.character = create.create_object("typeclasses.characters.Character", key="TestChar",
+                                              location=self.room1)
+        self.character.db.stats = {'attributes': {'physical': {'Strength': {'perm': 2, 'temp': 2}}}}
+        self.stats = self.character.stats
+
+    def _row(self, name):
+        return CharacterStat.objects.filter(character_id=self.character.id, name=name).first()
+
+    def test_reads_see_buffered_changes(self):
+        with self.stats.batch():
+            self.stats.set('attributes', 'physical', 'Strength', 4)
+            self.stats.remove('attributes', 'physical', 'Strength')
+            self.stats.set('attributes', 'physical', 'Dexterity', 3)
+            self.assertFalse(self.stats.has('attributes', 'physical', 'Strength'))
+            self.assertEqual(self.stats.get('attributes', 'physical', 'Dexterity'), 3)
+            self.assertEqual(self._row('Strength').perm, 2)
+            self.assertIsNone(self._row('Dexterity'))
+        self.assertIsNone(self._row('Strength'))
+        self.assertEqual(self._row('Dexterity').perm, 3)
+
+    def test_last_change_to_a_stat_wins(self):
+        with self.stats.batch():
+            self.stats.remove('attributes', 'physical', 'Strength')
+            self.stats.set('attributes', 'physical', 'Strength', 5)
+        self.assertEqual(self._row('Strength').perm, 5)
+
+    def test_db_stats_read_writes_out_buffered_changes(self):
+        with self.stats.batch():
+            self.stats.set('attributes', 'physical', 'Strength', 4)
+            self.assertEqual(self.character.db.stats['attributes']['physical']['Strength']['perm'], 4)
+            self.assertEqual(self._row('Strength').perm, 4)
+            self.stats.set('attributes', 'physical', 'Strength', 5)
+        self.assertEqual(self._row('Strength').perm, 5)
+        self.assertEqual(self.character.db.stats['attributes']['physical']['Strength']['perm'], 5)
+
+    def test_direct_write_does_not_undo_buffered_change(self):
+        with self.stats.batch():
+            self.stats.set('attributes', 'physical', 'Strength', 4)
+            self.character.db.stats = {'attributes': {'physical': {'Strength': {'perm': 2, 'temp': 2},
+                                                                   'Stamina': {'perm': 3, 'temp': 3}}}}
+        self.assertEqual(self._row('Strength').perm, 4)
+        self.assertEqual(self._row('Stamina').perm, 3)
+
+    def test_error_discards_buffered_changes(self):
+        with self.assertRaises(ValueError):
+            with self.stats.batch():
+                self.stats.set('attributes', 'physical', 'Strength', 4)
+                raise ValueError
+        self.assertEqual(self.stats.get('attributes', 'physical', 'Strength'), 2)
+        self.assertEqual(self._row('Strength').perm, 2)
+
+    def test_error_keeps_earlier_writes(self):
+        self.stats.set('attributes', 'physical', 'Strength', 4)
+        with self.assertRaises(ValueError):
+            with self.stats.batch():
+                self.stats.set('attributes', 'physical', 'Strength', 5)
+                raise ValueError
+        self.assertEqual(self.stats.get('attributes', 'physical', 'Strength'), 4)
+        self.assertEqual(self._row('Strength').perm, 4)
+        self.assertEqual(self.character.db.stats['attributes']['physical']['Strength']['perm'], 4)
+
+    def test_error_keeps_direct_writes(self):
+        with self.assertRaises(ValueError):
+            with self.stats.batch():
+                self.stats.set('attributes', 'physical', 'Strength', 4)
+                self.character.db.stats['attributes']['physical']['Stamina'] = {'perm': 3, 'temp': 3}
+                self.stats.set('attributes', 'physical', 'Strength', 5)
+                raise ValueError
+        self.assertEqual(self._row('Strength').perm, 4)
+        self.assertEqual(self._row('Stamina').perm, 3)
+        self.assertEqual(self.character.db.stats['attributes']['physical']['Strength']['perm'], 4)
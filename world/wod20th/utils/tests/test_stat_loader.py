@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from world.wod20th.models import Stat
+from world.wod20th.utils.stat_loader import apply_diff, diff_stats, normalize_stat
+
+
+def _record(name, stat_type, **fields):
+    return normalize_stat(dict(fields, name=name, stat_type=stat_type, category='merits'))
+
+
+class TestStatLoader(TestCase):
+    def setUp(self):
+        apply_diff(diff_stats([_record('Acute Senses', 'physical'), _record('Ambidextrous', 'physical')]))
+
+    def test_diff_sorts_records(self):
+        diff = diff_stats([
+            _record('Acute Senses', 'physical'),
+            _record('Ambidextrous', 'physical', description='Both hands.'),
+            _record('Catlike Balance', 'physical', description='First.'),
+            _record('Catlike Balance', 'physical', description='Later files win.'),
+        ])
+        self.assertEqual(diff.unchanged, 1)
+        self.assertEqual([(record['name'], changed) for _row_id, record, changed in diff.to_update],
+                         [('Ambidextrous', ['description'])])
+        self.assertEqual([record['description'] for record in diff.to_create], ['Later files win.'])
+        self.assertEqual(diff.stale, [])
+
+    def test_apply_writes_once(self):
+        diff = diff_stats([_record('Ambidextrous', 'physical', description='Both hands.'),
+                           _record('Catlike Balance', 'physical')])
+        self.assertEqual(apply_diff(diff), (1, 1))
+        self.assertEqual(Stat.objects.get(name='Ambidextrous').description, 'Both hands.')
+        self.assertFalse(diff_stats([_record('Catlike Balance', 'physical')]))
+
+    def test_changed_stat_type_reports_old_row(self):
+        old = Stat.objects.get(name='Acute Senses')
+        diff = diff_stats([_record('Acute Senses', 'supernatural'), _record('Ambidextrous', 'physical')])
+        self.assertEqual([record['stat_type'] for record in diff.to_create], ['supernatural'])
+        self.assertEqual(diff.stale, [(old.id, 'Acute Senses', 'physical')])
+        self.assertIn('1 stale', diff.summary())
+
+    def test_dry_run_writes_nothing(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            with open(os.path.join(data_dir, 'merits.json'), 'w') as handle:
+                json.dump([{'name': 'Catlike Balance', 'category': 'merits', 'stat_type': 'physical'},
+                           {'name': 'Acute Senses', 'category': 'merits', 'stat_type': 'supernatural'}],
+                          handle)
+            out = StringIO()
+            call_command('load_wod20th_stats', dir=data_dir, dry_run=True, stdout=out)
+        output = out.getvalue()
+        self.assertIn('+ Catlike Balance (physical)', output)
+        self.assertIn('! Acute Senses (physical)', output)
+        self.assertIn('Dry run: 2 to create, 0 to update, 0 unchanged, 1 stale', output)
+        self.assertFalse(Stat.objects.filter(name='Catlike Balance').exists())
@@ -0,0 +1,27 @@
+import unittest
+
+from world.wod20th.models import project_stat_value
+from world.wod20th.utils.stat_query import StatQuery, StatQueryError, tokenize
+
+
+class TestStatQuery(unittest.TestCase):
+    def test_tokenize(self):
+        self.assertEqual(tokenize('Auspex>=3 and (Clan="Children of Gaia")'), [
+            ('word', 'Auspex'), ('op', '>='), ('word', '3'), ('word', 'and'), ('paren', '('),
+            ('word', 'Clan'), ('op', '='), ('quoted', 'Children of Gaia'), ('paren', ')'),
+        ])
+
+    def test_stat_names(self):
+        query = StatQuery('merits:Natural Linguist or not (Willpower.temp<3 and Clan=Toreador)')
+        self.assertEqual(query.stat_names, ['natural linguist', 'willpower', 'clan'])
+
+    def test_errors(self):
+        for text in ('', 'Clan>Toreador', '(Auspex', 'Auspex>=', 'and Auspex', 'Auspex Clan)'):
+            with self.assertRaises(StatQueryError):
+                StatQuery(text)
+
+    def test_projection(self):
+        self.assertEqual(project_stat_value(3), (3, '3'))
+        self.assertEqual(project_stat_value('Toreador'), (None, 'toreador'))
+        self.assertEqual(project_stat_value(None), (None, ''))
+        self.assertEqual(project_stat_value(True), (None, 'true'))
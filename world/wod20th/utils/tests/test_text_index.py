@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from world.wod20th.models import Stat
+from world.wod20th.utils.text_index import DescriptionIndex, SearchQuery, STAT_CATALOG
+
+
+class TestDescriptionIndex(unittest.TestCase):
+    def setUp(self):
+        self.stats = [
+            Stat(id=1, name="Razor Claws", stat_type="gift", splat="Shifter",
+                 description="The Garou sharpens her claws on stone. Silver claws are another matter."),
+            Stat(id=2, name="Celerity", stat_type="discipline", splat="Vampire",
+                 description="Supernatural speed. The vampire moves faster than claws can follow."),
+            Stat(id=3, name="Potence", stat_type="discipline", splat="Vampire",
+                 description="Supernatural strength, enough to crush stone."),
+        ]
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.index = DescriptionIndex(os.path.join(self.tmpdir.name, "info.idx"))
+        self.index.build(self.stats)
+        # Pretend we're in sync with the catalog so search() doesn't reload
+        self.index._loaded = True
+        self.index._catalog_version = STAT_CATALOG.version
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_query_parsing(self):
+        query = SearchQuery('"silver claws" stone type:gift splat:Shifter')
+        self.assertEqual(query.phrases, [["silver", "claws"]])
+        self.assertEqual(query.terms, ["stone"])
+        self.assertEqual((query.stat_type, query.splat), ("gift", "shifter"))
+        self.assertEqual(query.text, "silver claws stone")
+
+    def test_ranked_search(self):
+        # Razor Claws mentions claws twice, Celerity once
+        self.assertEqual(self.index.search("claws"), [1, 2])
+        self.assertEqual(self.index.search("supernatural stone"), [3])
+
+    def test_phrase_and_filters(self):
+        self.assertEqual(self.index.search('"silver claws"'), [1])
+        self.assertEqual(self.index.search('"claws silver"'), [])
+        self.assertEqual(self.index.search("claws type:discipline"), [2])
+        self.assertEqual(self.index.search("stone splat:vampire"), [3])
+        self.assertEqual(self.index.search("stone", stat_types=["gift"]), [1])
+
+    def test_persistence(self):
+        self.index.build(self.stats, generation=3)
+        self.index.save()
+        loaded = DescriptionIndex(self.index.path)
+        self.assertTrue(loaded.load(3))
+        self.assertEqual(loaded.docs, self.index.docs)
+        self.assertFalse(loaded.load(4))
+
+    def test_boot_reuses_file_at_same_generation(self):
+        self.index.build(self.stats, generation=3)
+        self.index.save()
+        booted = DescriptionIndex(self.index.path)
+        with patch('world.wod20th.utils.text_index.stat_generation', return_value=3), \
+                patch('world.wod20th.utils.text_index.STAT_CATALOG') as catalog:
+            self.assertEqual(booted.search("claws"), [1, 2])
+        catalog.all.assert_not_called()
+
+    def test_boot_rebuilds_at_new_generation(self):
+        self.index.build(self.stats, generation=3)
+        self.index.save()
+        booted = DescriptionIndex(self.index.path)
+        with patch('world.wod20th.utils.text_index.stat_generation', return_value=4), \
+                patch('world.wod20th.utils.text_index.STAT_CATALOG') as catalog:
+            catalog.all.return_value = self.stats[2:]
+            self.assertEqual(booted.search("stone"), [3])
+        self.assertTrue(DescriptionIndex(self.index.path).load(4))
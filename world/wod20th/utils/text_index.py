@@ -0,0 +1,285 @@
+"""
+Inverted full-text index over Stat descriptions for +info/search.
+
+Descriptions are tokenized into lowercase words and stored as positional
+postings (word -> {stat id: [positions]}), which gives BM25 ranking and exact
+phrase matching without touching the database.
+
+The index is built from the stat catalog and pickled to
+settings.INFO_SEARCH_INDEX_PATH together with the stat generation it was
+built at (see stat_catalog.stat_generation). On the next boot the file is
+reused if the generation still matches, without reading any descriptions,
+and rebuilt otherwise. Single-stat edits are applied in memory by the Stat
+signal handlers; any other change to the catalog (a bulk load, say) makes
+the index re-check the generation on the next search.
+"""
+import math
+import os
+import pickle
+import re
+import shlex
+from collections import defaultdict
+
+from django.conf import settings
+from evennia.utils import logger
+
+from world.wod20th.utils.stat_catalog import STAT_CATALOG, stat_generation
+
+INDEX_VERSION = 2
+
+# BM25 tuning constants (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens."""
+    return _TOKEN_RE.findall((text or '').lower())
+
+
+class SearchQuery:
+    """
+    A parsed search string.
+
+    Quoted parts are phrases, ``type:<stat_type>`` and ``splat:<splat>``
+    are filters, everything else is a plain term. All terms and phrases must
+    match.
+    """
+
+    def __init__(self, text):
+        self.terms = []
+        self.phrases = []
+        self.stat_type = None
+        self.splat = None
+        # The query with filters and quotes removed, for matching names
+        self.text = ''
+        raw = []
+        try:
+            parts = shlex.split(text)
+        except ValueError:
+            # Unbalanced quotes - treat the whole thing as plain words.
+            parts = text.replace('"', ' ').split()
+        for part in parts:
+            lowered = part.lower()
+            if lowered.startswith('type:'):
+                self.stat_type = lowered[5:] or None
+            elif lowered.startswith('splat:'):
+                self.splat = lowered[6:] or None
+            elif ' ' in part.strip():
+                tokens = tokenize(part)
+                if len(tokens) > 1:
+                    self.phrases.append(tokens)
+                else:
+                    self.terms.extend(tokens)
+            else:
+                self.terms.extend(tokenize(part))
+            if not lowered.startswith(('type:', 'splat:')):
+                raw.append(part.strip())
+        self.text = ' '.join(raw)
+
+    @property
+    def words(self):
+        """Every word the query needs, phrase words included."""
+        words = list(self.terms)
+        for phrase in self.phrases:
+            words.extend(phrase)
+        return list(dict.fromkeys(words))
+
+    def __bool__(self):
+        return bool(self.terms or self.phrases)
+
+
+class DescriptionIndex:
+    """Positional inverted index with BM25 ranking."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self._loaded = False
+        self._catalog_version = None
+        self._reset()
+
+    def _reset(self):
+        self.generation = None
+        # word -> {stat id: [positions]}
+        self.postings = defaultdict(dict)
+        # stat id -> (document length, stat_type, splat)
+        self.docs = {}
+        # stat id -> distinct words, so a stat can be dropped without a scan
+        self.doc_words = {}
+        self.total_length = 0
+
+    # ------------------------------------------------------------------
+    # Building and persistence
+    # ------------------------------------------------------------------
+
+    def _ensure_loaded(self):
+        if self._loaded and self._catalog_version == STAT_CATALOG.version:
+            return
+        generation = stat_generation()
+        if not (self._loaded and generation == self.generation) and not self.load(generation):
+            self.build(STAT_CATALOG.all(), generation)
+            self.save()
+        self._loaded = True
+        self._catalog_version = STAT_CATALOG.version
+
+    def build(self, stats, generation=None):
+        """Index every stat from scratch."""
+        self._reset()
+        for stat in stats:
+            self._add(stat)
+        self.generation = generation
+
+    def load(self, generation):
+        """Load the index from disk if it was saved at this stat generation."""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'rb') as handle:
+                data = pickle.load(handle)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+            return False
+        if data.get('version') != INDEX_VERSION or data.get('generation') != generation:
+            return False
+        self._reset()
+        self.generation = generation
+        self.postings.update(data['postings'])
+        self.docs = data['docs']
+        self.doc_words = data['doc_words']
+        self.total_length = data['total_length']
+        return True
+
+    def save(self):
+        """Write the index to disk. Failures only cost a rebuild next boot."""
+        if not self.path:
+            return
+        data = {
+            'version': INDEX_VERSION,
+            'generation': self.generation,
+            'postings': dict(self.postings),
+            'docs': self.docs,
+            'doc_words': self.doc_words,
+            'total_length': self.total_length,
+        }
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, 'wb') as handle:
+                pickle.dump(data, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.log_err(f"Could not save +info search index: {e}")
+
+    def invalidate(self):
+        """Forget the in-memory index; it is reloaded or rebuilt on next use."""
+        self._reset()
+        self._loaded = False
+
+    def _add(self, stat):
+        tokens = tokenize(stat.description)
+        positions = defaultdict(list)
+        for pos, token in enumerate(tokens):
+            positions[token].append(pos)
+        for token, token_positions in positions.items():
+            self.postings[token][stat.id] = token_positions
+        self.docs[stat.id] = (len(tokens), (stat.stat_type or '').lower(), (stat.splat or '').lower())
+        self.doc_words[stat.id] = tuple(positions)
+        self.total_length += len(tokens)
+
+    def _remove(self, stat_id):
+        doc = self.docs.pop(stat_id, None)
+        if doc is None:
+            return
+        self.total_length -= doc[0]
+        for token in self.doc_words.pop(stat_id, ()):
+            docs = self.postings.get(token)
+            if docs is not None:
+                docs.pop(stat_id, None)
+                if not docs:
+                    del self.postings[token]
+
+    def _in_step(self):
+        """
+        True if the only catalog change since we last synced is the one
+        being applied now; otherwise leave it to the next generation check.
+        """
+        return self._loaded and self._catalog_version == STAT_CATALOG.version - 1
+
+    def update(self, stat, generation=None):
+        """Re-index a single stat after it was saved, at the generation that saved it."""
+        if not self._in_step():
+            return
+        self._remove(stat.id)
+        self._add(stat)
+        self.generation = generation
+        self._catalog_version = STAT_CATALOG.version
+
+    def remove(self, stat, generation=None):
+        """Drop a single stat after it was deleted."""
+        if not self._in_step():
+            return
+        self._remove(stat.id)
+        self.generation = generation
+        self._catalog_version = STAT_CATALOG.version
+
+    # ------------------------------------------------------------------
+    # Searching
+    # ------------------------------------------------------------------
+
+    def _matches_phrase(self, stat_id, phrase):
+        first = self.postings.get(phrase[0], {}).get(stat_id)
+        if not first:
+            return False
+        rest = [set(self.postings.get(word, {}).get(stat_id, ())) for word in phrase[1:]]
+        return any(all(start + offset + 1 in positions for offset, positions in enumerate(rest))
+                   for start in first)
+
+    def search(self, text, stat_types=None):
+        """
+        Return stat ids matching the query, best first.
+
+        Args:
+            text (str): The query; see SearchQuery for the syntax.
+            stat_types (iterable, optional): Only return stats of these types.
+        """
+        self._ensure_loaded()
+        query = text if isinstance(text, SearchQuery) else SearchQuery(text)
+        words = query.words
+        if not words or not self.docs:
+            return []
+
+        # Every word must be present; start from the rarest posting list.
+        postings = [self.postings.get(word) for word in words]
+        if not all(postings):
+            return []
+        postings.sort(key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+
+        allowed = {t.lower() for t in stat_types} if stat_types else None
+        results = []
+        doc_count = len(self.docs)
+        avg_length = self.total_length / doc_count if doc_count else 0
+        for stat_id in candidates:
+            length, stat_type, splat = self.docs[stat_id]
+            if allowed is not None and stat_type not in allowed:
+                continue
+            if query.stat_type and stat_type != query.stat_type:
+                continue
+            if query.splat and splat != query.splat:
+                continue
+            if not all(self._matches_phrase(stat_id, phrase) for phrase in query.phrases):
+                continue
+            score = 0.0
+            for word in words:
+                docs = self.postings[word]
+                freq = len(docs[stat_id])
+                idf = math.log(1 + (doc_count - len(docs) + 0.5) / (len(docs) + 0.5))
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length) if avg_length else BM25_K1
+                score += idf * freq * (BM25_K1 + 1) / (freq + norm)
+            results.append((score, stat_id))
+        results.sort(key=lambda item: (-item[0], item[1]))
+        return [stat_id for score, stat_id in results]
+
+
+DESCRIPTION_INDEX = DescriptionIndex(getattr(settings, 'INFO_SEARCH_INDEX_PATH', None))